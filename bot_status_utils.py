@@ -4,15 +4,113 @@ Common utilities for Discord bots to send status and startup messages
 """
 
 import os
+import sys
+import time
 import discord
 from discord.ext import commands
 import asyncio
 import logging
+import subprocess
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Libraries that should only be imported when a command needs them
+HEAVY_MODULES = ("matplotlib", "pandas", "numpy", "seaborn", "sklearn", "torch",
+                 "sentence_transformers", "faiss")
+
+
+def _process_start_time() -> float:
+    """Start of this process (epoch seconds) from /proc, or now if unavailable"""
+    try:
+        with open('/proc/self/stat') as f:
+            # Field 22 (after the command name in parentheses) is the start time in clock ticks since boot
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/stat') as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith('btime'))
+        return boot_time + start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, StopIteration):
+        return time.time()
+
+
+PROCESS_START_TIME = _process_start_time()
+
+
+def capture_import_times(script_path: str, top: int = 10, timeout: int = 120) -> List[Tuple[str, float]]:
+    """
+    Run the module level of a bot script with -X importtime and list the slowest imports
+    
+    The script runs under a different __name__, so its `if __name__ == "__main__"`
+    block (and the bot) does not start.
+    
+    Returns:
+        (module, cumulative seconds) of the slowest top-level imports, slowest first
+    """
+    script_path = os.path.abspath(script_path)
+    script_dir = os.path.dirname(script_path)
+    code = (f"import runpy, sys; sys.path.insert(0, {script_dir!r}); "
+            f"runpy.run_path({script_path!r}, run_name='__startup_probe__')")
+    try:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, timeout=timeout, cwd=script_dir,
+            env={**os.environ, 'BOT_STARTUP_PROBE': 'true'}
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.error(f"Import profiling of {script_path} failed: {e}")
+        return []
+    
+    # "import time: self [us] | cumulative | imported package"; nested imports are indented
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or parts[2].startswith('  ') or not parts[1].strip().isdigit():
+            continue
+        imports.append((parts[2].strip(), int(parts[1]) / 1_000_000))
+    
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:top]
+
+
+class StartupProfiler:
+    """Startup timings of a bot: imports done and Discord ready, relative to process start"""
+    
+    def __init__(self):
+        self.marks: Dict[str, float] = {}
+        self.import_profile: List[Tuple[str, float]] = []
+    
+    def mark(self, phase: str):
+        """Record the first time a phase ("imports", "ready") is reached"""
+        self.marks.setdefault(phase, time.time() - PROCESS_START_TIME)
+    
+    @staticmethod
+    def heavy_modules_loaded() -> List[str]:
+        """Heavy libraries already imported in this process"""
+        return [name for name in HEAVY_MODULES if name in sys.modules]
+    
+    def summary(self) -> Dict[str, object]:
+        return {
+            'imports_seconds': self.marks.get('imports'),
+            'ready_seconds': self.marks.get('ready'),
+            'heavy_modules_loaded': self.heavy_modules_loaded(),
+            'import_profile': self.import_profile,
+        }
+    
+    def format_summary(self) -> str:
+        """One-line summary for logs and status embeds"""
+        parts = []
+        for phase, label in (('imports', 'imports'), ('ready', 'on_ready')):
+            if phase in self.marks:
+                parts.append(f"{label} {self.marks[phase]:.2f}s")
+        heavy = self.heavy_modules_loaded()
+        parts.append(f"heavy modules: {', '.join(heavy) if heavy else 'none'}")
+        return " • ".join(parts)
+    
+    def format_import_profile(self) -> str:
+        return "\n".join(f"`{module}` {seconds:.2f}s" for module, seconds in self.import_profile)
+
 class BotStatusManager:
     """Manages bot status messages and announcements"""
     
@@ -23,6 +121,11 @@ class BotStatusManager:
         self.startup_message_enabled = os.getenv('BOT_STARTUP_MESSAGE', 'false').lower() == 'true'
         self.status_channel_id = self._get_status_channel_id()
         self.start_time = datetime.now()
+        
+        # Created after the bot module's imports, so this marks the end of the import phase
+        self.profiler = StartupProfiler()
+        self.profiler.mark('imports')
+        self.profile_imports = os.getenv('BOT_PROFILE_IMPORTS', 'false').lower() == 'true'
     
     def _get_status_channel_id(self) -> Optional[int]:
         """Get the appropriate status channel ID based on bot type"""
@@ -39,7 +142,10 @@ class BotStatusManager:
             'Weekly Planning Bot': 'WEEKLY_PLANNING_CHANNEL_ID',
             'Preisvergleich Bot': 'PREISVERGLEICH_CHANNEL_ID',
             'Meal Plan Bot': 'MEAL_PLAN_CHANNEL_ID',
-            'Weekly Todo Bot': 'TODOLISTE_CHANNEL_ID'
+            'Weekly Todo Bot': 'TODOLISTE_CHANNEL_ID',
+            'Todo Bot': 'WEEKLY_PLANNING_CHANNEL_ID',
+            'Allgemeine Wohl Bot': 'ALLGEMEINE_WOHL_CHANNEL_ID',
+            'Log Bot': 'LOGS_CHANNEL_ID'
         }
         
         # Get specific channel for this bot
@@ -73,6 +179,10 @@ class BotStatusManager:
     
     async def send_startup_message(self):
         """Send a startup message when the bot comes online"""
+        if self.bot.is_ready():
+            self.profiler.mark('ready')
+        logger.info(f"⚡ {self.bot_name} startup: {self.profiler.format_summary()}")
+        
         if not self.startup_message_enabled:
             return
         
@@ -115,11 +225,22 @@ class BotStatusManager:
                 inline=True
             )
             
+            self.profiler.mark('ready')
+            embed.add_field(
+                name="⚡ Startup",
+                value=self.profiler.format_summary(),
+                inline=False
+            )
+            
             embed.set_footer(text=f"{self.bot_name} • Docker Deployment")
             
             await channel.send(embed=embed)
             logger.info(f"✅ Startup message sent for {self.bot_name}")
             
+            if self.profile_imports:
+                # Runs the script once more in a subprocess; don't hold up on_ready for it
+                asyncio.create_task(self.send_import_profile())
+            
         except Exception as e:
             logger.error(f"❌ Failed to send startup message for {self.bot_name}: {e}")
     
@@ -162,6 +283,18 @@ class BotStatusManager:
         except Exception as e:
             logger.error(f"❌ Failed to send shutdown message for {self.bot_name}: {e}")
     
+    async def send_import_profile(self, script_path: str = None):
+        """Profile the bot script's imports with -X importtime and post the slowest ones"""
+        script_path = script_path or getattr(sys.modules.get('__main__'), '__file__', None)
+        if not script_path or os.getenv('BOT_STARTUP_PROBE') == 'true':
+            return
+        
+        self.profiler.import_profile = await asyncio.to_thread(capture_import_times, script_path)
+        if self.profiler.import_profile:
+            await self.send_status_update(
+                f"Slowest imports (-X importtime):\n{self.profiler.format_import_profile()}"
+            )
+    
     async def send_status_update(self, message: str, status_type: str = "info"):
         """Send a general status update"""
         if not self.status_channel_id:
@@ -225,4 +358,12 @@ def with_startup_message(bot_name: str = None):
         bot_class.__init__ = new_init
         return bot_class
     
-    return decorator 
\ No newline at end of file
+    return decorator 
+
+if __name__ == "__main__":
+    # python bot_status_utils.py path/to/bot.py  ->  slowest imports of the bot script
+    if len(sys.argv) != 2:
+        print("Usage: python bot_status_utils.py <bot_script.py>")
+        sys.exit(1)
+    for module, seconds in capture_import_times(sys.argv[1], top=20):
+        print(f"{seconds:8.3f}s  {module}")
@@ -23,16 +23,27 @@ import sys
 
 # Add log bot directory to path for API monitoring
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'log_bot'))
-from api_monitor_shared import track_openrouter_call
+from api_monitor_shared import track_openrouter_call, track_llm_cache_lookup
+from llm_cache import get_llm_cache
 
 # API Clients
 from notion_client import Client as NotionClient
-from openai import OpenAI
+
+# Shared async Notion gateway lives in the repository root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from notion_gateway import get_notion_gateway
+from bot_status_utils import add_status_to_bot
+from lazy_imports import lazy_import, lazy_object
+
+# The OpenAI SDK takes about a second to import; load it with the first analysis
+openai = lazy_import("openai")
 
 # Import monthly report modules
 from notion_data_reader import CalorieDataExtractor
 from chart_generator import CalorieChartGenerator
 from monthly_report import MonthlyReportGenerator
+from ground_truth_index import FoodKeywordMatcher, GroundTruthStore, normalize_text
+from nutrition_store import NutritionStore
 
 # Import logging system
 from logger_config import bot_logger
@@ -49,12 +60,15 @@ NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 FOODIATE_DB_ID = os.getenv("FOODIATE_DB_ID", "20ed42a1faf5807497c2f350ff84ea8d")
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
-# Initialize clients
-notion = NotionClient(auth=NOTION_TOKEN)
-openai_client = OpenAI(
+# Initialize clients. They (and the stores below) are created on first use:
+# the monthly report's chart workers re-run this script as __mp_main__ and
+# must not build clients, stores or a log writer they never use.
+notion = lazy_object(lambda: NotionClient(auth=NOTION_TOKEN))
+notion_gateway = lazy_object(lambda: get_notion_gateway(NOTION_TOKEN))
+openai_client = lazy_object(lambda: openai.OpenAI(
     api_key=OPENROUTER_API_KEY,
     base_url="https://openrouter.ai/api/v1"
-)
+))
 
 # Set up Discord bot
 intents = discord.Intents.default()
@@ -62,6 +76,7 @@ intents.message_content = True
 intents.guild_messages = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
+status_manager = add_status_to_bot(bot, "Calories Bot")
 
 class FoodAnalysisResult:
     """Represents the result of AI food analysis with complete nutritional information"""
@@ -98,37 +113,44 @@ class GroundTruthHandler:
     
     def __init__(self):
         self.ground_truth_file = os.path.join(os.path.dirname(__file__), 'ground_truth_foods.json')
+        self.store = GroundTruthStore(self.ground_truth_file)
         self.foods_db = self._load_ground_truth_db()
+        self.matcher = self._build_matcher()
     
     def _load_ground_truth_db(self) -> dict:
-        """Load the ground truth foods database"""
+        """Load the ground truth foods database (snapshot plus appended foods)"""
         try:
-            if os.path.exists(self.ground_truth_file):
-                with open(self.ground_truth_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
+            if not os.path.exists(self.ground_truth_file):
                 bot_logger.log_error("File not found", "Ground truth database file not found")
-                return {"foods": {}}
+            return self.store.load()
         except Exception as e:
             bot_logger.log_error("Ground truth error", f"Error loading ground truth database: {e}")
             return {"foods": {}}
     
+    def _build_matcher(self) -> FoodKeywordMatcher:
+        """Index all food keys and keywords once"""
+        matcher = FoodKeywordMatcher()
+        for food_key, food_data in self.foods_db.get("foods", {}).items():
+            matcher.add_food(food_key, food_data)
+        return matcher
+    
     def search_ground_truth(self, text: str) -> Optional[FoodAnalysisResult]:
         """Search for food in ground truth database"""
         try:
-            text_lower = text.lower().strip()
+            text_lower = normalize_text(text)
+            foods = self.foods_db.get("foods", {})
             
             # Direct match first
-            if text_lower in self.foods_db.get("foods", {}):
-                return self._create_result_from_ground_truth(text_lower, self.foods_db["foods"][text_lower])
+            if text_lower in foods:
+                return self._create_result_from_ground_truth(text_lower, foods[text_lower])
             
-            # Keyword matching
-            for food_key, food_data in self.foods_db.get("foods", {}).items():
-                keywords = food_data.get("keywords", [])
-                for keyword in keywords:
-                    if keyword.lower() in text_lower or text_lower in keyword.lower():
-                        print(f"Ground truth match found: {food_key} (keyword: {keyword})")
-                        return self._create_result_from_ground_truth(food_key, food_data)
+            # Keyword matching, most specific food wins
+            if getattr(self, "matcher", None) is None:
+                self.matcher = self._build_matcher()
+            food_key = self.matcher.best_match(text_lower)
+            if food_key is not None and food_key in foods:
+                print(f"Ground truth match found: {food_key}")
+                return self._create_result_from_ground_truth(food_key, foods[food_key])
             
             return None
             
@@ -161,11 +183,12 @@ class GroundTruthHandler:
             if "foods" not in self.foods_db:
                 self.foods_db["foods"] = {}
             
-            self.foods_db["foods"][food_text.lower()] = nutrition_data
+            food_key = normalize_text(food_text)
+            self.foods_db["foods"][food_key] = nutrition_data
             
-            # Save to file
-            with open(self.ground_truth_file, 'w', encoding='utf-8') as f:
-                json.dump(self.foods_db, f, indent=2, ensure_ascii=False)
+            # Append to the log instead of rewriting the whole file
+            self.store.append(food_key, nutrition_data, self.foods_db)
+            self.matcher.add_food(food_key, nutrition_data)
             
             print(f"Added {food_text} to ground truth database")
             return True
@@ -230,24 +253,33 @@ class AITextHandler:
             Base your estimates on typical serving sizes and be realistic about portions.
             """
             
-            # Use Kimi model for text analysis - fix: use sync client
-            response = openai_client.chat.completions.create(
-                model="moonshotai/kimi-k2:free",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.3
-            )
-            
-            # Track successful API call
-            track_openrouter_call("calories-bot", "moonshotai/kimi-k2:free", True)
+            # Repeated meal descriptions are answered from the shared response cache
+            llm_cache = get_llm_cache()
+            response_text = llm_cache.get("moonshotai/kimi-k2:free", prompt, 0.3)
+            from_cache = response_text is not None
+            track_llm_cache_lookup("calories-bot", "moonshotai/kimi-k2:free", from_cache)
             
-            response_text = response.choices[0].message.content.strip()
-            print(f"🤖 AI Text Response: {response_text}")
+            if not from_cache:
+                # Use Kimi model for text analysis - fix: use sync client
+                response = openai_client.chat.completions.create(
+                    model="moonshotai/kimi-k2:free",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=800,
+                    temperature=0.3
+                )
+                
+                # Track successful API call
+                track_openrouter_call("calories-bot", "moonshotai/kimi-k2:free", True)
+                
+                response_text = response.choices[0].message.content.strip()
+            print(f"🤖 AI Text Response{' (cached)' if from_cache else ''}: {response_text}")
             
             # Extract JSON from response
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
             if json_match:
                 json_data = json.loads(json_match.group())
+                if not from_cache:
+                    llm_cache.set("moonshotai/kimi-k2:free", prompt, response_text, 0.3)
                 
                 return FoodAnalysisResult(
                     food_name=json_data.get("food_name", "Unknown Food"),
@@ -457,7 +489,7 @@ class NotionHandler:
         """Match Discord username to best Notion select option"""
         try:
             # Get database schema to find available select options
-            database_info = notion.databases.retrieve(database_id=FOODIATE_DB_ID)
+            database_info = await notion_gateway.retrieve_database(FOODIATE_DB_ID)
             person_property = database_info.get("properties", {}).get("person", {})
             
             if person_property.get("type") == "select":
@@ -578,11 +610,16 @@ class NotionHandler:
                 }
             
             # Create new page in Notion database
-            new_page = notion.pages.create(
+            new_page = await notion_gateway.create_page(
                 parent={"database_id": FOODIATE_DB_ID},
                 properties=properties
             )
             
+            # Write through to the local store so commands see the meal immediately
+            entry = nutrition_store.data_extractor.parse_page(new_page)
+            if entry:
+                nutrition_store.upsert_entry(new_page["id"], entry, new_page.get("last_edited_time"))
+            
             print(f"✅ Successfully saved to Notion: {analysis.food_name}")
             return True
             
@@ -913,8 +950,9 @@ async def process_monthly_command(message: discord.Message, current_month: bool
         # Get Discord username and match to Notion person
         discord_username = str(message.author.display_name)
         
-        # Try to find matching user in the data
-        all_users = data_extractor.get_all_users(target_year, target_month)
+        # Fetch the month once; users and report figures come from the same rollups
+        rollups = await asyncio.to_thread(data_extractor.get_monthly_rollups, target_year, target_month)
+        all_users = list(rollups.keys())
         
         if not all_users:
             bot_logger.log_error(
@@ -946,7 +984,8 @@ async def process_monthly_command(message: discord.Message, current_month: bool
             await processing_msg.edit(content=f"⚠️ Using data for '{user_match}' (couldn't match your Discord name exactly)")
         
         # Generate the monthly report
-        report_data = await report_generator.generate_monthly_report(target_year, target_month, user_match)
+        report_data = await report_generator.generate_monthly_report(target_year, target_month, user_match,
+                                                                     rollup=rollups[user_match])
         
         # Log the monthly report generation
         bot_logger.log_monthly_report({
@@ -999,8 +1038,16 @@ async def process_monthly_command(message: discord.Message, current_month: bool
         )
         await message.channel.send(f"❌ Error generating monthly report: {str(e)}")
 
-# Initialize handlers after class definitions
-ground_truth_handler = GroundTruthHandler()
+# Initialize handlers after class definitions (on first use, see above)
+ground_truth_handler = lazy_object(GroundTruthHandler)
+nutrition_store = lazy_object(NutritionStore)
+# Startup sync task; referenced here so it isn't garbage collected while running
+nutrition_sync_task = None
+
+def log_nutrition_sync_failure(task: asyncio.Task):
+    """Report a startup sync that raised instead of leaving the exception unretrieved"""
+    if not task.cancelled() and task.exception():
+        bot_logger.log_error("Nutrition store sync error", f"Startup sync failed: {task.exception()}")
 
 @bot.event
 async def on_ready():
@@ -1017,6 +1064,13 @@ async def on_ready():
         'notion_configured': bool(NOTION_TOKEN)
     })
     
+    # Fill the local nutrition store from Notion without blocking the event loop
+    global nutrition_sync_task
+    nutrition_sync_task = asyncio.create_task(asyncio.to_thread(nutrition_store.sync_if_stale))
+    nutrition_sync_task.add_done_callback(log_nutrition_sync_failure)
+    
+    await status_manager.send_startup_message()
+    
     # Send startup message to Discord channel
     try:
         channel = bot.get_channel(CALORIES_CHANNEL_ID)
@@ -1111,21 +1165,10 @@ async def nutrition_today(ctx):
         today = datetime.now()
         discord_username = str(ctx.author.display_name)
         
-        # Extract today's data
-        data_extractor = CalorieDataExtractor()
-        monthly_data = data_extractor.get_monthly_data(today.year, today.month)
-        
-        # Filter for today and user
-        user_data = [
-            entry for entry in monthly_data 
-            if entry.get("person", "").lower() in discord_username.lower() or 
-               discord_username.lower() in entry.get("person", "").lower()
-        ]
-        
-        today_data = [
-            entry for entry in user_data 
-            if entry.get("date") == today.date()
-        ]
+        # Today's meals for the user from the local store
+        await asyncio.to_thread(nutrition_store.sync_if_stale)
+        persons = nutrition_store.match_persons(discord_username)
+        today_data = nutrition_store.get_entries(today.date(), today.date(), persons)
         
         if not today_data:
             embed = discord.Embed(
@@ -1137,10 +1180,11 @@ async def nutrition_today(ctx):
             return
         
         # Calculate today's totals
-        total_calories = sum(entry.get("calories", 0) for entry in today_data)
-        total_protein = sum(entry.get("protein", 0) for entry in today_data)
-        total_carbs = sum(entry.get("carbohydrates", 0) for entry in today_data)
-        total_fat = sum(entry.get("fat", 0) for entry in today_data)
+        totals = nutrition_store.get_totals(today.date(), today.date(), persons)
+        total_calories = totals["calories"]
+        total_protein = totals["protein"]
+        total_carbs = totals["carbohydrates"]
+        total_fat = totals["fat"]
         
         # Create embed
         embed = discord.Embed(
@@ -1208,12 +1252,10 @@ async def frequent_meals(ctx):
         today = datetime.now()
         discord_username = str(ctx.author.display_name)
         
-        # Extract data
-        data_extractor = CalorieDataExtractor()
-        monthly_data = data_extractor.get_monthly_data(today.year, today.month)
-        
-        # Find matching user
-        all_users = list(set(entry.get("person", "") for entry in monthly_data))
+        # Find matching user among this month's entries in the local store
+        await asyncio.to_thread(nutrition_store.sync_if_stale)
+        month_start = today.date().replace(day=1)
+        all_users = nutrition_store.get_persons(month_start, today.date())
         user_match = None
         
         for user in all_users:
@@ -1229,7 +1271,8 @@ async def frequent_meals(ctx):
             return
         
         # Get meal frequency analysis
-        meal_frequency = data_extractor.get_meal_frequency_analysis(monthly_data, user_match)
+        monthly_data = nutrition_store.get_entries(month_start, today.date(), [user_match])
+        meal_frequency = nutrition_store.data_extractor.get_meal_frequency_analysis(monthly_data, user_match)
         
         if meal_frequency.get('error'):
             await ctx.send("❌ Fehler bei der Mahlzeiten-Analyse.")
@@ -1300,21 +1343,10 @@ async def weekly_summary(ctx):
         week_start = today - timedelta(days=today.weekday())  # Monday
         discord_username = str(ctx.author.display_name)
         
-        # Extract monthly data (we'll filter for the week)
-        data_extractor = CalorieDataExtractor()
-        monthly_data = data_extractor.get_monthly_data(today.year, today.month)
-        
-        # Filter for user and this week
-        user_data = [
-            entry for entry in monthly_data 
-            if entry.get("person", "").lower() in discord_username.lower() or 
-               discord_username.lower() in entry.get("person", "").lower()
-        ]
-        
-        week_data = [
-            entry for entry in user_data 
-            if entry.get("date") >= week_start.date() and entry.get("date") <= today.date()
-        ]
+        # This week's meals for the user from the local store (also across month boundaries)
+        await asyncio.to_thread(nutrition_store.sync_if_stale)
+        persons = nutrition_store.match_persons(discord_username)
+        week_data = nutrition_store.get_entries(week_start.date(), today.date(), persons)
         
         if not week_data:
             embed = discord.Embed(
@@ -1326,13 +1358,14 @@ async def weekly_summary(ctx):
             return
         
         # Calculate weekly totals
-        total_calories = sum(entry.get("calories", 0) for entry in week_data)
-        total_protein = sum(entry.get("protein", 0) for entry in week_data)
-        total_carbs = sum(entry.get("carbohydrates", 0) for entry in week_data)
-        total_fat = sum(entry.get("fat", 0) for entry in week_data)
+        totals = nutrition_store.get_totals(week_start.date(), today.date(), persons)
+        total_calories = totals["calories"]
+        total_protein = totals["protein"]
+        total_carbs = totals["carbohydrates"]
+        total_fat = totals["fat"]
         
         # Calculate daily averages
-        unique_days = len(set(entry.get("date") for entry in week_data))
+        unique_days = totals["days"]
         avg_calories = total_calories / unique_days if unique_days > 0 else 0
         avg_protein = total_protein / unique_days if unique_days > 0 else 0
         avg_carbs = total_carbs / unique_days if unique_days > 0 else 0
@@ -1369,13 +1402,7 @@ async def weekly_summary(ctx):
             )
         
         # Daily breakdown
-        daily_breakdown = {}
-        for entry in week_data:
-            date = entry.get("date")
-            if date not in daily_breakdown:
-                daily_breakdown[date] = {"calories": 0, "meals": 0}
-            daily_breakdown[date]["calories"] += entry.get("calories", 0)
-            daily_breakdown[date]["meals"] += 1
+        daily_breakdown = nutrition_store.get_daily_breakdown(week_start.date(), today.date(), persons)
         
         daily_text = ""
         for date in sorted(daily_breakdown.keys()):
@@ -1421,21 +1448,10 @@ async def weekly_nutrition(ctx):
         week_start = today - timedelta(days=today.weekday())  # Monday
         discord_username = str(ctx.author.display_name)
         
-        # Extract data
-        data_extractor = CalorieDataExtractor()
-        monthly_data = data_extractor.get_monthly_data(today.year, today.month)
-        
-        # Filter for user and this week
-        user_data = [
-            entry for entry in monthly_data 
-            if entry.get("person", "").lower() in discord_username.lower() or 
-               discord_username.lower() in entry.get("person", "").lower()
-        ]
-        
-        week_data = [
-            entry for entry in user_data 
-            if entry.get("date") >= week_start.date() and entry.get("date") <= today.date()
-        ]
+        # This week's meals for the user from the local store (also across month boundaries)
+        await asyncio.to_thread(nutrition_store.sync_if_stale)
+        persons = nutrition_store.match_persons(discord_username)
+        week_data = nutrition_store.get_entries(week_start.date(), today.date(), persons)
         
         if not week_data:
             embed = discord.Embed(
@@ -1447,13 +1463,14 @@ async def weekly_nutrition(ctx):
             return
         
         # Calculate weekly totals and averages
-        total_calories = sum(entry.get("calories", 0) for entry in week_data)
-        total_protein = sum(entry.get("protein", 0) for entry in week_data)
-        total_carbs = sum(entry.get("carbohydrates", 0) for entry in week_data)
-        total_fat = sum(entry.get("fat", 0) for entry in week_data)
+        totals = nutrition_store.get_totals(week_start.date(), today.date(), persons)
+        total_calories = totals["calories"]
+        total_protein = totals["protein"]
+        total_carbs = totals["carbohydrates"]
+        total_fat = totals["fat"]
         
         # Calculate unique days with data
-        unique_days = len(set(entry.get("date") for entry in week_data))
+        unique_days = totals["days"]
         
         avg_calories = total_calories / unique_days if unique_days > 0 else 0
         avg_protein = total_protein / unique_days if unique_days > 0 else 0
@@ -1476,13 +1493,7 @@ async def weekly_nutrition(ctx):
         embed.add_field(name="🧈 Ø Fette/Tag", value=f"{avg_fat:.1f}g", inline=True)
         
         # Daily breakdown
-        daily_breakdown = {}
-        for entry in week_data:
-            date = entry.get("date")
-            if date not in daily_breakdown:
-                daily_breakdown[date] = {"calories": 0, "meals": 0}
-            daily_breakdown[date]["calories"] += entry.get("calories", 0)
-            daily_breakdown[date]["meals"] += 1
+        daily_breakdown = nutrition_store.get_daily_breakdown(week_start.date(), today.date(), persons)
         
         # Show daily summary
         daily_text = []
@@ -1636,7 +1647,9 @@ async def show_logs(ctx):
             for dir_info in directories:
                 path = dir_info.get('path', 'unknown')
                 file_count = dir_info.get('file_count', 0)
-                log_info.append(f"📊 **{path}**: {file_count} files")
+                entry_count = dir_info.get('entry_count', 0)
+                size_mb = dir_info.get('size_bytes', 0) / (1024 * 1024)
+                log_info.append(f"📊 **{path}**: {file_count} files, {entry_count:,} entries ({size_mb:.1f} MB)")
             
             embed.add_field(
                 name="📚 Log Categories",
@@ -1652,7 +1665,7 @@ async def show_logs(ctx):
         
         embed.add_field(
             name="📝 Log Features",
-            value="• JSON structured data\n• Rotating file logs\n• Daily organization\n• Error categorization",
+            value="• JSON-Lines structured data\n• Rotating file logs\n• Daily organization\n• Error categorization",
             inline=True
         )
         
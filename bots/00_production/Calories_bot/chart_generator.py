@@ -4,15 +4,22 @@ Chart Generator for Monthly Calorie Reports
 Creates beautiful visualizations of calorie data using matplotlib
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import pandas as pd
+from __future__ import annotations
+
 from datetime import datetime, date
 from typing import Dict, Any, Optional
 import os
+import sys
 from calendar import monthrange
 import locale
 
+# matplotlib and pandas are imported on the first chart, not at bot startup
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from lazy_imports import lazy_import, lazy_pyplot
+plt = lazy_pyplot()
+mdates = lazy_import("matplotlib.dates")
+pd = lazy_import("pandas")
+
 # Set German locale for month names (fallback to English if not available)
 try:
     locale.setlocale(locale.LC_TIME, 'de_DE.UTF-8')
@@ -26,12 +33,18 @@ class CalorieChartGenerator:
     """Generates charts and visualizations for calorie data"""
     
     def __init__(self):
-        # Set up matplotlib style
+        self._style_applied = False
+    
+    def _apply_style(self):
+        """Set up matplotlib style (imports matplotlib on the first chart)"""
+        if self._style_applied:
+            return
         plt.style.use('default')
         plt.rcParams['figure.figsize'] = (12, 8)
         plt.rcParams['font.size'] = 10
         plt.rcParams['axes.grid'] = True
         plt.rcParams['grid.alpha'] = 0.3
+        self._style_applied = True
         
     def create_monthly_chart(self, df: pd.DataFrame, stats: Dict[str, Any], output_path: str) -> bool:
         """
@@ -50,6 +63,8 @@ class CalorieChartGenerator:
                 print("⚠️ No data to plot")
                 return False
             
+            self._apply_style()
+            
             # Create figure with subplots
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10), height_ratios=[3, 1])
             
@@ -214,6 +229,7 @@ class CalorieChartGenerator:
             True if successful, False otherwise
         """
         try:
+            self._apply_style()
             fig, ax = plt.subplots(figsize=(10, 6))
             
             categories = ['Gesamtkalorien', 'Durchschnitt/Tag', 'Höchster Tag', 'Getrackte Tage']
@@ -266,6 +282,20 @@ class CalorieChartGenerator:
             print(f"❌ Error creating comparison chart: {e}")
             return False
 
+def render_monthly_chart(df: pd.DataFrame, stats: Dict[str, Any], output_path: str) -> bool:
+    """
+    Render one monthly chart; module-level so it can run in a worker process
+    
+    Args:
+        df: DataFrame with 'date' and 'calories' columns
+        stats: Dictionary with monthly statistics
+        output_path: Path to save the chart image
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    return CalorieChartGenerator().create_monthly_chart(df, stats, output_path)
+
 # Test function
 def test_chart_generation():
     """Test function for chart generation"""
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Ground Truth Food Index
+Aho-Corasick keyword matcher and append-only persistence for the ground truth food database
+"""
+
+import os
+import json
+import difflib
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return " ".join(text.lower().split())
+
+
+def _deletion_variants(token: str) -> Set[str]:
+    """The token itself plus every string with one character removed"""
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class FoodKeywordMatcher:
+    """Matches food keywords inside free text in a single pass
+
+    Keywords live in an Aho-Corasick automaton, so a lookup costs O(len(text) + matches)
+    no matter how many foods are indexed. Foods can be added at any time; failure
+    links are rebuilt lazily before the next lookup.
+    """
+
+    # Typo tolerance for the fuzzy token fallback
+    FUZZY_CUTOFF = 0.8
+    FUZZY_MIN_TOKEN_LENGTH = 4
+    # Shortest text that may match as the beginning of a longer keyword
+    PREFIX_MIN_LENGTH = 3
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[Optional[int]] = [None]  # keyword id ending at node
+        self._output: List[List[int]] = [[]]  # keyword ids ending at node or its suffixes
+        self._dirty = False
+
+        self.keywords: List[str] = []
+        self._keyword_ids: Dict[str, int] = {}
+        self._keyword_foods: List[List[str]] = []  # keyword id -> food keys, in insertion order
+        self._food_keywords: Dict[str, List[int]] = {}  # food key -> keyword ids it is indexed under
+        self._token_keywords: Dict[str, List[int]] = {}  # keyword token -> keyword ids
+        self._deletion_index: Dict[str, Set[str]] = {}  # token minus one char -> tokens
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def add_food(self, food_key: str, food_data: dict):
+        """Index a food under its key and all of its keywords, replacing an earlier entry"""
+        self.remove_food(food_key)
+        self.add_keyword(food_key, food_key)
+        for keyword in food_data.get("keywords", []):
+            self.add_keyword(keyword, food_key)
+
+    def remove_food(self, food_key: str):
+        """Unlink a food from its keywords; keywords left without foods stay in the trie but never match"""
+        for keyword_id in self._food_keywords.pop(food_key, []):
+            self._keyword_foods[keyword_id].remove(food_key)
+
+    def add_keyword(self, keyword: str, food_key: str):
+        """Insert one keyword -> food mapping into the trie"""
+        keyword = normalize_text(keyword)
+        if not keyword:
+            return
+
+        keyword_id = self._keyword_ids.get(keyword)
+        if keyword_id is not None:
+            if food_key not in self._keyword_foods[keyword_id]:
+                self._keyword_foods[keyword_id].append(food_key)
+                self._food_keywords.setdefault(food_key, []).append(keyword_id)
+            return
+
+        keyword_id = len(self.keywords)
+        self.keywords.append(keyword)
+        self._keyword_ids[keyword] = keyword_id
+        self._keyword_foods.append([food_key])
+        self._food_keywords.setdefault(food_key, []).append(keyword_id)
+
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(None)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._terminal[node] = keyword_id
+
+        for token in keyword.split():
+            if token not in self._token_keywords and len(token) >= self.FUZZY_MIN_TOKEN_LENGTH:
+                for variant in _deletion_variants(token):
+                    self._deletion_index.setdefault(variant, set()).add(token)
+            self._token_keywords.setdefault(token, []).append(keyword_id)
+
+        self._dirty = True
+
+    def _build_failure_links(self):
+        """Breadth-first pass computing failure links and merged outputs"""
+        self._fail[0] = 0
+        self._output[0] = []
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            fallback = self._output[self._fail[node]]
+            own = self._terminal[node]
+            self._output[node] = ([own] if own is not None else []) + fallback
+
+            for char, child in self._goto[node].items():
+                state = self._fail[node]
+                while state and char not in self._goto[state]:
+                    state = self._fail[state]
+                target = self._goto[state].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                queue.append(child)
+
+        self._dirty = False
+
+    def find_keywords(self, text: str) -> List[Tuple[int, int, int]]:
+        """Return (keyword id, start, end) for every keyword occurring in the normalized text"""
+        if self._dirty:
+            self._build_failure_links()
+
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword_id in self._output[node]:
+                length = len(self.keywords[keyword_id])
+                matches.append((keyword_id, position - length + 1, position + 1))
+        return matches
+
+    def _keyword_weight(self, keyword_id: int) -> float:
+        """Longer keywords are more specific; keywords shared by many foods less so"""
+        return len(self.keywords[keyword_id]) / len(self._keyword_foods[keyword_id])
+
+    def _rank(self, scores: Dict[str, float]) -> List[Tuple[str, float]]:
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def search(self, text: str) -> List[Tuple[str, float]]:
+        """Rank candidate foods for the text, best first
+
+        Exact keyword occurrences are scored by specificity (whole-word matches count
+        double). Without any occurrence, the text is tried as the start of a longer
+        keyword and finally as a set of tokens with small typos.
+        """
+        text = normalize_text(text)
+        if not text:
+            return []
+
+        scores: Dict[str, float] = {}
+        seen_keywords = set()
+        for keyword_id, start, end in self.find_keywords(text):
+            if keyword_id in seen_keywords or not self._keyword_foods[keyword_id]:
+                continue
+            seen_keywords.add(keyword_id)
+
+            whole_word = ((start == 0 or not text[start - 1].isalnum()) and
+                          (end == len(text) or not text[end].isalnum()))
+            weight = self._keyword_weight(keyword_id) * (2.0 if whole_word else 1.0)
+            for food_key in self._keyword_foods[keyword_id]:
+                scores[food_key] = scores.get(food_key, 0.0) + weight
+        if scores:
+            return self._rank(scores)
+
+        if len(text) >= self.PREFIX_MIN_LENGTH:
+            for keyword_id in self._keywords_with_prefix(text):
+                # Closer in length to the typed text means a more specific completion
+                weight = len(text) / len(self.keywords[keyword_id])
+                for food_key in self._keyword_foods[keyword_id]:
+                    scores[food_key] = max(scores.get(food_key, 0.0), weight)
+            if scores:
+                return self._rank(scores)
+
+        for token in text.split():
+            if len(token) < self.FUZZY_MIN_TOKEN_LENGTH:
+                continue
+            # Tokens sharing a one-deletion variant are within one edit (or a swap)
+            candidates = set()
+            for variant in _deletion_variants(token):
+                candidates.update(self._deletion_index.get(variant, ()))
+            for candidate in candidates:
+                similarity = difflib.SequenceMatcher(None, token, candidate).ratio()
+                if similarity < self.FUZZY_CUTOFF:
+                    continue
+                for keyword_id in self._token_keywords[candidate]:
+                    if not self._keyword_foods[keyword_id]:
+                        continue
+                    weight = similarity * len(candidate) / len(self._keyword_foods[keyword_id])
+                    for food_key in self._keyword_foods[keyword_id]:
+                        scores[food_key] = scores.get(food_key, 0.0) + weight
+        return self._rank(scores)
+
+    def _keywords_with_prefix(self, prefix: str) -> List[int]:
+        """Keyword ids in the trie below the node reached by the prefix"""
+        node = 0
+        for char in prefix:
+            node = self._goto[node].get(char)
+            if node is None:
+                return []
+
+        keyword_ids = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if self._terminal[current] is not None:
+                keyword_ids.append(self._terminal[current])
+            stack.extend(self._goto[current].values())
+        return keyword_ids
+
+    def best_match(self, text: str) -> Optional[str]:
+        """Key of the best matching food, or None"""
+        ranked = self.search(text)
+        return ranked[0][0] if ranked else None
+
+
+class GroundTruthStore:
+    """JSON snapshot plus an append-only JSONL log of added foods
+
+    Adding a food appends one line instead of rewriting the snapshot; the log
+    is folded back into the snapshot once it grows past compact_after entries.
+    """
+
+    def __init__(self, snapshot_file: str, compact_after: int = 500):
+        self.snapshot_file = snapshot_file
+        self.log_file = os.path.splitext(snapshot_file)[0] + ".log.jsonl"
+        self.compact_after = compact_after
+        self.log_entries = 0
+
+    def load(self) -> dict:
+        """Read the snapshot and replay the log on top of it"""
+        foods_db = {"foods": {}}
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                foods_db = json.load(f)
+        foods_db.setdefault("foods", {})
+
+        self.log_entries = 0
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-append can leave a truncated last line
+                        continue
+                    foods_db["foods"][entry["key"]] = entry["data"]
+                    self.log_entries += 1
+        return foods_db
+
+    def append(self, food_key: str, food_data: dict, foods_db: dict):
+        """Persist one added food, compacting the log when it gets long"""
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"key": food_key, "data": food_data}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.log_entries += 1
+
+        if self.log_entries >= self.compact_after:
+            self.compact(foods_db)
+
+    def compact(self, foods_db: dict):
+        """Write the full database as the new snapshot and clear the log"""
+        tmp_file = self.snapshot_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(foods_db, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.snapshot_file)
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+        self.log_entries = 0
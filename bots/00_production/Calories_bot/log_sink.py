@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+JSON-Lines Log Sink for the Calories Bot
+Append-only structured log files with size rotation, written by a buffered
+background thread, plus a small index of per-file entry counts
+"""
+
+import os
+import glob
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class JsonlLogSink:
+    """Appends JSON entries as single lines to log files in a background thread
+
+    Callers pass a base path such as ``logs/errors/errors_20250911``; entries go to
+    ``errors_20250911.jsonl`` and, once that file reaches max_bytes, to numbered
+    segments ``errors_20250911.1.jsonl``, ``.2.jsonl``, ... Dated base paths give
+    time rotation, max_bytes gives size rotation.
+
+    Appending never rewrites existing data, and a crash can at most truncate the
+    last line, which readers skip.
+    """
+
+    INDEX_FILE = "index.json"
+    # Files of past days stop receiving entries; close them after this many idle seconds
+    IDLE_CLOSE_SECONDS = 600
+
+    def __init__(self, log_dir: str, max_bytes: int = 10 * 1024 * 1024,
+                 flush_interval: float = 1.0, max_batch: int = 200,
+                 error_logger: Optional[logging.Logger] = None):
+        """
+        Create the sink; its writer thread starts with the first entry
+
+        Args:
+            log_dir: Root log directory (holds the index)
+            max_bytes: Size at which a file rolls over to the next segment
+            flush_interval: Seconds between flushes of buffered entries
+            max_batch: Entries written per batch
+            error_logger: Logger for write failures (printed if None)
+        """
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.error_logger = error_logger
+
+        self.lock = threading.Lock()
+        self.files: Dict[str, Any] = {}  # base path -> open segment file
+        self.last_used: Dict[str, float] = {}
+        self.index_path = os.path.join(log_dir, self.INDEX_FILE)
+        self.index_dirty = False
+        self.index: Dict[str, Dict[str, Any]] = self._load_index()
+
+        self.queue: "queue.Queue" = queue.Queue()
+        self.closed = False
+        # Started on first write, so processes that never log (e.g. chart workers) get no thread
+        self.writer: Optional[threading.Thread] = None
+        atexit.register(self.close)
+
+    def _report_error(self, message: str):
+        if self.error_logger:
+            self.error_logger.error(message)
+        else:
+            print(f"⚠️ {message}")
+
+    # ----- writing -----
+
+    def write(self, base_path: str, entry: Dict[str, Any]):
+        """
+        Queue one entry for appending (returns immediately)
+
+        Args:
+            base_path: Log file path without extension
+            entry: JSON-serializable dictionary
+        """
+        if self.closed:
+            return
+        # Open the segment right away so the file exists as soon as something is logged
+        with self.lock:
+            if base_path not in self.files:
+                try:
+                    self._open_segment(base_path)
+                except OSError as e:
+                    self._report_error(f"Failed to open log file {base_path}: {e}")
+                    return
+            if self.writer is None:
+                self.writer = threading.Thread(target=self._run, name="jsonl-log-writer", daemon=True)
+                self.writer.start()
+        self.queue.put((base_path, entry))
+
+    def _segment_path(self, base_path: str, number: int) -> str:
+        return f"{base_path}.jsonl" if number == 0 else f"{base_path}.{number}.jsonl"
+
+    def _open_segment(self, base_path: str, number: int = None):
+        """Open the newest segment of a base path, or segment `number` (lock held)"""
+        if number is None:
+            number = 0
+            while os.path.exists(self._segment_path(base_path, number + 1)):
+                number += 1
+            if os.path.exists(self._segment_path(base_path, number)) and \
+                    os.path.getsize(self._segment_path(base_path, number)) >= self.max_bytes:
+                number += 1
+
+        old = self.files.pop(base_path, None)
+        if old is not None:
+            old.close()
+        path = self._segment_path(base_path, number)
+        handle = open(path, 'a', encoding='utf-8')
+        if handle.tell() > 0:
+            # Terminate a line left truncated by a crash so the next entry stays intact
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    handle.write("\n")
+        handle.segment = number
+        self.files[base_path] = handle
+        self.last_used[base_path] = time.monotonic()
+        return handle
+
+    def _run(self):
+        """Writer thread: batch queued entries and append them"""
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._persist_index()
+                self._close_idle_files()
+                continue
+
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(entry is None for entry in batch)
+            self._write_batch([entry for entry in batch if entry is not None])
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                self._persist_index()
+                return
+
+    def _write_batch(self, batch: List[tuple]):
+        with self.lock:
+            touched = set()
+            for base_path, entry in batch:
+                try:
+                    line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+                    handle = self.files.get(base_path) or self._open_segment(base_path)
+                    if handle.tell() >= self.max_bytes:
+                        handle.flush()
+                        handle = self._open_segment(base_path, handle.segment + 1)
+                    handle.write(line)
+                    touched.add(base_path)
+                    self.last_used[base_path] = time.monotonic()
+                    self._count(handle.name, entry, len(line.encode('utf-8')))
+                except Exception as e:
+                    self._report_error(f"Failed to write log entry to {base_path}: {e}")
+
+            for base_path in touched:
+                try:
+                    self.files[base_path].flush()
+                except Exception as e:
+                    self._report_error(f"Failed to flush log file {base_path}: {e}")
+
+    def _close_idle_files(self):
+        with self.lock:
+            now = time.monotonic()
+            for base_path in list(self.files):
+                if now - self.last_used.get(base_path, now) > self.IDLE_CLOSE_SECONDS:
+                    self.files.pop(base_path).close()
+                    self.last_used.pop(base_path, None)
+
+    def flush(self):
+        """Block until every queued entry is written and the index is saved"""
+        if not self.closed:
+            self.queue.join()
+        self._persist_index()
+
+    def close(self):
+        """Drain the queue, stop the writer and close all files"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join(timeout=10)
+        else:
+            self._persist_index()
+        with self.lock:
+            for handle in self.files.values():
+                handle.close()
+            self.files.clear()
+
+    # ----- index -----
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.log_dir)
+
+    def _count(self, path: str, entry: Dict[str, Any], size: int):
+        """Update the index counts for one written line (lock held)"""
+        stats = self.index.setdefault(self._relative(path), {"entries": 0, "bytes": 0, "first": None, "last": None})
+        stats["entries"] += 1
+        stats["bytes"] += size
+        timestamp = entry.get("timestamp")
+        if timestamp:
+            stats["first"] = stats["first"] or timestamp
+            stats["last"] = timestamp
+        self.index_dirty = True
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read the index and recount files it does not describe (e.g. after a crash)"""
+        index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+
+        current = {}
+        for path in glob.glob(os.path.join(self.log_dir, "**", "*.jsonl"), recursive=True):
+            relative = self._relative(path)
+            stats = index.get(relative)
+            if stats is None or stats.get("bytes") != os.path.getsize(path):
+                stats = self._scan_file(path)
+            current[relative] = stats
+        self.index_dirty = current != index
+        return current
+
+    def _scan_file(self, path: str) -> Dict[str, Any]:
+        stats = {"entries": 0, "bytes": os.path.getsize(path), "first": None, "last": None}
+        for entry in self.iter_file(path):
+            stats["entries"] += 1
+            timestamp = entry.get("timestamp")
+            if timestamp:
+                stats["first"] = stats["first"] or timestamp
+                stats["last"] = timestamp
+        return stats
+
+    def _persist_index(self):
+        with self.lock:
+            if not self.index_dirty:
+                return
+            snapshot = json.dumps(self.index, indent=2)
+            self.index_dirty = False
+        try:
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            self._report_error(f"Failed to save log index: {e}")
+
+    def get_index(self) -> Dict[str, Dict[str, Any]]:
+        """Per-file entry counts, sizes and first/last timestamps"""
+        with self.lock:
+            return {path: dict(stats) for path, stats in self.index.items()}
+
+    # ----- reading -----
+
+    @staticmethod
+    def iter_file(path: str) -> Iterator[Dict[str, Any]]:
+        """Stream the entries of one JSONL file, skipping damaged lines"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def iter_entries(self, category: str, prefix: str = "") -> Iterator[Dict[str, Any]]:
+        """
+        Stream entries of a log category in file order
+
+        Args:
+            category: Subdirectory of the log directory, e.g. "errors"
+            prefix: Only files whose name starts with this, e.g. "errors_202509"
+        """
+        def sort_key(path):
+            # analysis_20250911.jsonl, analysis_20250911.1.jsonl, ... in segment order
+            name = os.path.basename(path)[:-len(".jsonl")]
+            base, _, number = name.partition(".")
+            return base, int(number or 0)
+
+        paths = glob.glob(os.path.join(self.log_dir, category, f"{prefix}*.jsonl"))
+        for path in sorted(paths, key=sort_key):
+            yield from self.iter_file(path)
@@ -11,6 +11,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from logging.handlers import RotatingFileHandler
 
+from log_sink import JsonlLogSink
+
 class CaloriesBotLogger:
     """Centralized logging system for the Calories Bot"""
     
@@ -18,6 +20,8 @@ class CaloriesBotLogger:
         self.log_dir = log_dir
         self.setup_logging_directories()
         self.setup_loggers()
+        # Structured JSON-Lines logs, appended by a background writer thread
+        self.json_sink = JsonlLogSink(log_dir, error_logger=self.error_logger)
         
     def setup_logging_directories(self):
         """Create logging directory structure"""
@@ -130,7 +134,7 @@ class CaloriesBotLogger:
         analysis_file = os.path.join(
             self.log_dir, 
             "food_analysis", 
-            f"analysis_{datetime.now().strftime('%Y%m%d')}.json"
+            f"analysis_{datetime.now().strftime('%Y%m%d')}"
         )
         
         # Append to daily JSON file
@@ -171,7 +175,7 @@ class CaloriesBotLogger:
         report_file = os.path.join(
             self.log_dir, 
             "monthly_reports", 
-            f"reports_{year}_{month:02d}.json"
+            f"reports_{year}_{month:02d}"
         )
         
         report_entry = {
@@ -190,7 +194,7 @@ class CaloriesBotLogger:
         command_file = os.path.join(
             self.log_dir, 
             "user_activity", 
-            f"commands_{datetime.now().strftime('%Y%m%d')}.json"
+            f"commands_{datetime.now().strftime('%Y%m%d')}"
         )
         
         command_entry = {
@@ -214,7 +218,7 @@ class CaloriesBotLogger:
         error_file = os.path.join(
             self.log_dir, 
             "errors", 
-            f"errors_{datetime.now().strftime('%Y%m%d')}.json"
+            f"errors_{datetime.now().strftime('%Y%m%d')}"
         )
         
         error_entry = {
@@ -238,7 +242,7 @@ class CaloriesBotLogger:
         error_file = os.path.join(
             self.log_dir, 
             "errors", 
-            f"errors_{datetime.now().strftime('%Y%m%d')}.json"
+            f"errors_{datetime.now().strftime('%Y%m%d')}"
         )
         
         warning_entry = {
@@ -261,7 +265,7 @@ class CaloriesBotLogger:
         system_file = os.path.join(
             self.log_dir, 
             "system", 
-            f"system_{datetime.now().strftime('%Y%m%d')}.json"
+            f"system_{datetime.now().strftime('%Y%m%d')}"
         )
         
         system_entry = {
@@ -274,24 +278,19 @@ class CaloriesBotLogger:
         self._append_to_json_file(system_file, system_entry)
     
     def _append_to_json_file(self, file_path: str, entry: Dict[str, Any]):
-        """Append entry to JSON file (creates array if file doesn't exist)"""
+        """Queue entry for the JSON-Lines file at file_path (without extension)"""
         try:
-            # Read existing data
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-            else:
-                data = []
-            
-            # Append new entry
-            data.append(entry)
-            
-            # Write back to file
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            self.json_sink.write(file_path, entry)
         except Exception as e:
-            self.error_logger.error(f"Failed to write to JSON file {file_path}: {e}")
+            self.error_logger.error(f"Failed to write to JSON log {file_path}: {e}")
+    
+    def flush(self):
+        """Write all queued JSON log entries to disk"""
+        self.json_sink.flush()
+    
+    def iter_json_entries(self, category: str, prefix: str = ""):
+        """Stream the JSON log entries of a category, e.g. ("errors", "errors_202509")"""
+        return self.json_sink.iter_entries(category, prefix)
     
     def get_log_summary(self) -> Dict[str, Any]:
         """Get summary of logging activity"""
@@ -302,15 +301,26 @@ class CaloriesBotLogger:
                 "recent_activity": {}
             }
             
+            # Entry counts come from the sink's index instead of reading the files
+            index = self.json_sink.get_index()
+            
             # Get directory sizes and file counts
             for root, dirs, files in os.walk(self.log_dir):
+                rel_path = os.path.relpath(root, self.log_dir)
+                files = [name for name in files if name != JsonlLogSink.INDEX_FILE]
                 if files:
-                    rel_path = os.path.relpath(root, self.log_dir)
+                    entries = [index[os.path.join(rel_path, name)] for name in files
+                               if os.path.join(rel_path, name) in index]
                     summary["directories"].append({
                         "path": rel_path,
                         "file_count": len(files),
-                        "files": files
+                        "files": files,
+                        "entry_count": sum(stats["entries"] for stats in entries),
+                        "size_bytes": sum(os.path.getsize(os.path.join(root, name)) for name in files)
                     })
+                    last = max((stats["last"] for stats in entries if stats.get("last")), default=None)
+                    if last:
+                        summary["recent_activity"][rel_path] = last
             
             return summary
             
@@ -7,14 +7,17 @@ Main module for creating and sending monthly calorie reports via Discord
 import discord
 from discord.ext import commands
 import os
+import sys
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Import our custom modules
 from notion_data_reader import CalorieDataExtractor
-from chart_generator import CalorieChartGenerator
+from chart_generator import CalorieChartGenerator, render_monthly_chart
 
 # Import logging system
 from logger_config import bot_logger
@@ -26,13 +29,25 @@ load_dotenv(env_path)
 # Configuration
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 CALORIES_CHANNEL_ID = int(os.getenv("CALORIES_CHANNEL_ID", "1382099540391497818"))
+REPORT_CHART_WORKERS = int(os.getenv("REPORT_CHART_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+def _importable_by_workers(func) -> bool:
+    """
+    Worker processes receive functions by module name. Under multibot_host
+    the bot's modules are removed from sys.modules and its directory from
+    sys.path after loading, so they can't be found that way.
+    """
+    module = sys.modules.get(func.__module__)
+    return getattr(module, func.__qualname__, None) is func
+
 
 class MonthlyReportGenerator:
     """Generates and sends monthly calorie reports"""
     
-    def __init__(self):
+    def __init__(self, chart_workers: int = REPORT_CHART_WORKERS):
         self.data_extractor = CalorieDataExtractor()
         self.chart_generator = CalorieChartGenerator()
+        self.chart_workers = max(1, chart_workers)
         
         # Set up Discord bot
         intents = discord.Intents.default()
@@ -52,7 +67,9 @@ class MonthlyReportGenerator:
             print(f"📊 Bot user: {self.bot.user}")
             print(f"🔗 Connected to Discord")
     
-    async def generate_monthly_report(self, year: int, month: int, username: str) -> Dict[str, Any]:
+    async def generate_monthly_report(self, year: int, month: int, username: str,
+                                      rollup: Optional[Dict[str, Any]] = None,
+                                      chart_executor: Optional[Executor] = None) -> Dict[str, Any]:
         """
         Generate complete monthly report for a user with enhanced macronutrient analysis
         
@@ -60,6 +77,8 @@ class MonthlyReportGenerator:
             year: Target year
             month: Target month
             username: Username to generate report for
+            rollup: Precomputed user rollup from get_monthly_rollups (fetched if None)
+            chart_executor: Executor to render the chart in (rendered in-process if None)
             
         Returns:
             Dictionary with report data and file paths
@@ -67,12 +86,21 @@ class MonthlyReportGenerator:
         try:
             print(f"📊 Generating enhanced monthly report for {username} - {month}/{year}")
             
-            # Extract basic data from Notion
-            monthly_data = self.data_extractor.get_monthly_data(year, month)
-            df = self.data_extractor.get_user_monthly_data(year, month, username)
-            stats = self.data_extractor.get_monthly_stats(year, month, username)
+            if rollup is None:
+                # Fetch the month once (off the event loop) and pick this user's figures
+                rollups = await asyncio.to_thread(self.data_extractor.get_monthly_rollups, year, month)
+                rollup = next((value for name, value in rollups.items() if name.lower() == username.lower()), None)
+            
+            if rollup is None:
+                stats = {
+                    "username": username, "month": month, "year": year,
+                    "total_calories": 0, "average_daily": 0, "max_daily": 0,
+                    "min_daily": 0, "days_tracked": 0
+                }
+            else:
+                stats = rollup['stats']
             
-            if df.empty or stats.get('days_tracked', 0) == 0:
+            if rollup is None or rollup['daily'].empty or stats.get('days_tracked', 0) == 0:
                 print(f"⚠️ No data found for {username} in {month}/{year}")
                 return {
                     'success': False,
@@ -80,9 +108,9 @@ class MonthlyReportGenerator:
                     'stats': stats
                 }
             
-            # Get enhanced analysis
-            meal_frequency = self.data_extractor.get_meal_frequency_analysis(monthly_data, username)
-            macro_analysis = self.data_extractor.get_macronutrient_analysis(monthly_data, username)
+            df = rollup['daily']
+            meal_frequency = rollup['meal_frequency']
+            macro_analysis = rollup['macro_analysis']
             
             # Generate chart
             chart_filename = f"calorie_report_{username}_{year}_{month:02d}.png"
@@ -91,7 +119,12 @@ class MonthlyReportGenerator:
             # Create reports directory if it doesn't exist
             os.makedirs(os.path.dirname(chart_path), exist_ok=True)
             
-            chart_success = self.chart_generator.create_monthly_chart(df, stats, chart_path)
+            if chart_executor is None:
+                chart_success = self.chart_generator.create_monthly_chart(df, stats, chart_path)
+            else:
+                chart_success = await asyncio.get_running_loop().run_in_executor(
+                    chart_executor, render_monthly_chart, df, stats, chart_path
+                )
             
             if not chart_success:
                 return {
@@ -307,7 +340,45 @@ class MonthlyReportGenerator:
         except Exception:
             return "🎯 Weiter so beim Kalorie-Tracking!"
     
-    async def send_monthly_report(self, year: int, month: int, username: str) -> bool:
+    async def generate_all_monthly_reports(self, year: int, month: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate the reports of all users with data from a single fetch of the month
+        
+        Stats come from one set of vectorized group-bys and the charts are
+        rendered concurrently in a process pool (one at a time in a worker
+        thread when hosted by multibot_host).
+        
+        Args:
+            year: Target year
+            month: Target month
+            
+        Returns:
+            Dictionary mapping username to report data
+        """
+        rollups = await asyncio.to_thread(self.data_extractor.get_monthly_rollups, year, month)
+        if not rollups:
+            return {}
+        
+        if _importable_by_workers(render_monthly_chart):
+            # Spawned workers re-run the launching script (calories_bot.py) as
+            # __mp_main__; its clients, stores and log writer are created lazily,
+            # so a worker only pays for the imports and an unconnected Bot object.
+            # pyplot is not thread-safe, hence processes instead of threads.
+            executor = ProcessPoolExecutor(max_workers=min(len(rollups), self.chart_workers),
+                                           mp_context=multiprocessing.get_context("spawn"))
+        else:
+            # A single thread keeps pyplot use sequential
+            executor = ThreadPoolExecutor(max_workers=1)
+        
+        with executor:
+            reports = await asyncio.gather(*[
+                self.generate_monthly_report(year, month, username, rollup=rollup, chart_executor=executor)
+                for username, rollup in rollups.items()
+            ])
+        return dict(zip(rollups.keys(), reports))
+    
+    async def send_monthly_report(self, year: int, month: int, username: str,
+                                  report_data: Optional[Dict[str, Any]] = None) -> bool:
         """
         Generate and send monthly report for a specific user
         
@@ -315,6 +386,7 @@ class MonthlyReportGenerator:
             year: Target year
             month: Target month
             username: Username to send report to
+            report_data: Already generated report (generated if None)
             
         Returns:
             True if successful, False otherwise
@@ -323,7 +395,8 @@ class MonthlyReportGenerator:
             print(f"📤 Sending monthly report for {username}")
             
             # Generate report
-            report_data = await self.generate_monthly_report(year, month, username)
+            if report_data is None:
+                report_data = await self.generate_monthly_report(year, month, username)
             
             # Create embed
             embed = self.create_report_embed(report_data)
@@ -372,8 +445,9 @@ class MonthlyReportGenerator:
         try:
             print(f"📊 Generating monthly reports for all users - {month}/{year}")
             
-            # Get all users with data for the month
-            users = self.data_extractor.get_all_users(year, month)
+            # Fetch the month once and build every user's report
+            reports = await self.generate_all_monthly_reports(year, month)
+            users = list(reports.keys())
             
             if not users:
                 print(f"⚠️ No users found with data for {month}/{year}")
@@ -398,7 +472,7 @@ class MonthlyReportGenerator:
             
             for username in users:
                 try:
-                    success = await self.send_monthly_report(year, month, username)
+                    success = await self.send_monthly_report(year, month, username, reports[username])
                     if success:
                         results['reports_sent'] += 1
                         results['details'].append(f"✅ {username}: Erfolgreich gesendet")
@@ -4,14 +4,21 @@ Notion Data Reader for Monthly Calorie Reports
 Extracts and processes calorie data from Notion database for analysis
 """
 
+from __future__ import annotations
+
 import os
+import sys
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-import pandas as pd
 from notion_client import Client as NotionClient
 from dotenv import load_dotenv
 import re
 
+# pandas is imported when a DataFrame is first built, not at bot startup
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from lazy_imports import lazy_import
+pd = lazy_import("pandas")
+
 # Load environment variables
 env_path = os.path.join(os.path.dirname(__file__), '../../../.env')
 print(f"🔍 Loading .env from: {env_path}")
@@ -48,6 +55,103 @@ class CalorieDataExtractor:
         except (ValueError, TypeError):
             return 0
     
+    def query_all_pages(self, **query) -> List[Dict[str, Any]]:
+        """
+        Run a database query and follow next_cursor until every page is fetched
+        
+        Args:
+            **query: filter/sorts arguments passed to notion.databases.query
+            
+        Returns:
+            List of raw Notion page objects
+        """
+        pages = []
+        cursor = None
+        while True:
+            if cursor:
+                query["start_cursor"] = cursor
+            response = self.notion.databases.query(database_id=self.db_id, page_size=100, **query)
+            pages.extend(response.get("results", []))
+            if not response.get("has_more"):
+                return pages
+            cursor = response.get("next_cursor")
+    
+    def parse_page(self, page: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Convert one Notion page into a calorie entry
+        
+        Args:
+            page: Raw Notion page object
+            
+        Returns:
+            Entry dictionary, or None if the page has no valid date, person or calories
+        """
+        try:
+            properties = page["properties"]
+            
+            # Extract data from Notion properties
+            food_name = ""
+            if "Food" in properties and properties["Food"]["title"]:
+                food_name = properties["Food"]["title"][0]["text"]["content"]
+            
+            calories_raw = ""
+            if "Calories" in properties:
+                if properties["Calories"]["rich_text"]:
+                    calories_raw = properties["Calories"]["rich_text"][0]["text"]["content"]
+            
+            date_str = ""
+            if "date" in properties and properties["date"]["date"]:
+                date_str = properties["date"]["date"]["start"]
+            
+            person = ""
+            if "person" in properties and properties["person"]["select"]:
+                person = properties["person"]["select"]["name"]
+            
+            confidence = 0
+            if "confidence" in properties and properties["confidence"]["number"]:
+                confidence = properties["confidence"]["number"]
+            
+            # Extract macronutrient data
+            protein = 0.0
+            if "Protein" in properties and properties["Protein"]["number"]:
+                protein = properties["Protein"]["number"]
+            
+            carbohydrates = 0.0
+            if "Carbs" in properties and properties["Carbs"]["number"]:
+                carbohydrates = properties["Carbs"]["number"]
+            
+            fat = 0.0
+            if "Fat" in properties and properties["Fat"]["number"]:
+                fat = properties["Fat"]["number"]
+            
+            # Extract meal hash for similarity detection
+            meal_hash = ""
+            if "meal_hash" in properties and properties["meal_hash"]["rich_text"]:
+                meal_hash = properties["meal_hash"]["rich_text"][0]["text"]["content"]
+            
+            # Process the data
+            calories = self.extract_calories_from_text(calories_raw)
+            
+            # Only include entries with valid data
+            if date_str and person and calories > 0:
+                return {
+                    "date": datetime.fromisoformat(date_str).date(),
+                    "food_name": food_name,
+                    "calories": calories,
+                    "protein": protein,
+                    "carbohydrates": carbohydrates,
+                    "fat": fat,
+                    "person": person,
+                    "confidence": confidence,
+                    "calories_raw": calories_raw,
+                    "meal_hash": meal_hash
+                }
+            return None
+            
+        except Exception as e:
+            print(f"⚠️ Error processing page: {e}")
+            return None
+    
     def get_monthly_data(self, year: int, month: int) -> List[Dict[str, Any]]:
         """
         Extract all calorie data for a specific month
@@ -88,9 +192,8 @@ class CalorieDataExtractor:
                 ]
             }
             
-            # Query the database
-            response = notion.databases.query(
-                database_id=self.db_id,
+            # Query the database (all pages, not just the first 100 results)
+            pages = self.query_all_pages(
                 filter=query_filter,
                 sorts=[
                     {
@@ -102,71 +205,10 @@ class CalorieDataExtractor:
             
             processed_data = []
             
-            for page in response["results"]:
-                try:
-                    properties = page["properties"]
-                    
-                    # Extract data from Notion properties
-                    food_name = ""
-                    if "Food" in properties and properties["Food"]["title"]:
-                        food_name = properties["Food"]["title"][0]["text"]["content"]
-                    
-                    calories_raw = ""
-                    if "Calories" in properties:
-                        if properties["Calories"]["rich_text"]:
-                            calories_raw = properties["Calories"]["rich_text"][0]["text"]["content"]
-                    
-                    date_str = ""
-                    if "date" in properties and properties["date"]["date"]:
-                        date_str = properties["date"]["date"]["start"]
-                    
-                    person = ""
-                    if "person" in properties and properties["person"]["select"]:
-                        person = properties["person"]["select"]["name"]
-                    
-                    confidence = 0
-                    if "confidence" in properties and properties["confidence"]["number"]:
-                        confidence = properties["confidence"]["number"]
-                    
-                    # Extract macronutrient data
-                    protein = 0.0
-                    if "Protein" in properties and properties["Protein"]["number"]:
-                        protein = properties["Protein"]["number"]
-                    
-                    carbohydrates = 0.0
-                    if "Carbs" in properties and properties["Carbs"]["number"]:
-                        carbohydrates = properties["Carbs"]["number"]
-                    
-                    fat = 0.0
-                    if "Fat" in properties and properties["Fat"]["number"]:
-                        fat = properties["Fat"]["number"]
-                    
-                    # Extract meal hash for similarity detection
-                    meal_hash = ""
-                    if "meal_hash" in properties and properties["meal_hash"]["rich_text"]:
-                        meal_hash = properties["meal_hash"]["rich_text"][0]["text"]["content"]
-                    
-                    # Process the data
-                    calories = self.extract_calories_from_text(calories_raw)
-                    
-                    # Only include entries with valid data
-                    if date_str and person and calories > 0:
-                        processed_data.append({
-                            "date": datetime.fromisoformat(date_str).date(),
-                            "food_name": food_name,
-                            "calories": calories,
-                            "protein": protein,
-                            "carbohydrates": carbohydrates,
-                            "fat": fat,
-                            "person": person,
-                            "confidence": confidence,
-                            "calories_raw": calories_raw,
-                            "meal_hash": meal_hash
-                        })
-                    
-                except Exception as e:
-                    print(f"⚠️ Error processing page: {e}")
-                    continue
+            for page in pages:
+                entry = self.parse_page(page)
+                if entry:
+                    processed_data.append(entry)
             
             print(f"✅ Extracted {len(processed_data)} valid entries")
             return processed_data
@@ -277,6 +319,123 @@ class CalorieDataExtractor:
             print(f"❌ Error calculating stats: {e}")
             return {}
     
+    def get_monthly_rollups(self, year: int, month: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the month once and compute every user's report figures
+        
+        Args:
+            year: Target year
+            month: Target month
+            
+        Returns:
+            Dictionary mapping username to its rollup (see summarize_entries)
+        """
+        rollups = self.summarize_entries(self.get_monthly_data(year, month))
+        for username, rollup in rollups.items():
+            rollup["stats"].update({"username": username, "month": month, "year": year})
+        return rollups
+    
+    def summarize_entries(self, data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute daily totals, stats, meal frequency and macro analysis for all
+        users in one pass of vectorized group-bys
+        
+        Args:
+            data: List of food entries (get_monthly_data format)
+            
+        Returns:
+            Dictionary mapping username to a dictionary with 'daily' (DataFrame
+            with 'date' and 'calories'), 'stats', 'meal_frequency' and 'macro_analysis'
+        """
+        df = pd.DataFrame(data)
+        if df.empty:
+            return {}
+        
+        df = df[df["person"].fillna("") != ""].copy()
+        if df.empty:
+            return {}
+        df[["calories", "protein", "carbohydrates", "fat"]] = df[["calories", "protein", "carbohydrates", "fat"]].fillna(0)
+        df["food_name"] = df["food_name"].fillna("Unknown")
+        df["meal_hash"] = df["meal_hash"].fillna("")
+        
+        daily = (df.groupby(["person", "date"], sort=True)[["calories", "protein", "carbohydrates", "fat"]]
+                 .sum()
+                 .reset_index())
+        daily_stats = daily.groupby("person")["calories"].agg(["sum", "mean", "max", "min", "count"])
+        totals = df.groupby("person")[["calories", "protein", "carbohydrates", "fat"]].sum()
+        meal_counts = df.groupby(["person", "food_name"], sort=False).size()
+        unique_foods = df.groupby("person")["food_name"].nunique()
+        total_meals = df.groupby("person").size()
+        hash_groups = (df[df["meal_hash"] != ""]
+                       .groupby(["person", "meal_hash"], sort=False)["food_name"]
+                       .agg(list))
+        
+        rollups = {}
+        for person, user_daily in daily.groupby("person", sort=False):
+            row = daily_stats.loc[person]
+            stats = {
+                "username": person,
+                "total_calories": int(row["sum"]),
+                "average_daily": int(row["mean"]),
+                "max_daily": int(row["max"]),
+                "min_daily": int(row["min"]),
+                "days_tracked": int(row["count"])
+            }
+            
+            # Stable sort keeps first-seen order between equally frequent meals
+            counts = meal_counts.loc[person].sort_values(ascending=False, kind="stable")
+            top_meals = [(name, int(count)) for name, count in counts.head(10).items()]
+            similar_meals = {}
+            if person in hash_groups.index.get_level_values(0):
+                for meal_hash, names in hash_groups.loc[person].items():
+                    if len(names) > 1:
+                        similar_meals[meal_hash] = {
+                            "count": len(names),
+                            "names": names,
+                            "representative_name": names[0]
+                        }
+            meals = int(total_meals.loc[person])
+            meal_frequency = {
+                "total_meals": meals,
+                "unique_foods": int(unique_foods.loc[person]),
+                "variety_score": round(unique_foods.loc[person] / meals * 100, 1),
+                "top_meals": top_meals,
+                "similar_meal_groups": similar_meals,
+                "most_repeated_meal": top_meals[0] if top_meals else ("None", 0)
+            }
+            
+            total = totals.loc[person]
+            days = stats["days_tracked"]
+            total_macros = total["protein"] + total["carbohydrates"] + total["fat"]
+            macro_analysis = {
+                "total_protein": round(float(total["protein"]), 1),
+                "total_carbs": round(float(total["carbohydrates"]), 1),
+                "total_fat": round(float(total["fat"]), 1),
+                "total_calories": int(total["calories"]),
+                "avg_daily_protein": round(float(total["protein"]) / days, 1),
+                "avg_daily_carbs": round(float(total["carbohydrates"]) / days, 1),
+                "avg_daily_fat": round(float(total["fat"]) / days, 1),
+                "avg_daily_calories": round(float(total["calories"]) / days, 1),
+                "protein_percentage": round(float(total["protein"] / total_macros * 100), 1) if total_macros > 0 else 0,
+                "carbs_percentage": round(float(total["carbohydrates"] / total_macros * 100), 1) if total_macros > 0 else 0,
+                "fat_percentage": round(float(total["fat"] / total_macros * 100), 1) if total_macros > 0 else 0,
+                "days_tracked": days,
+                "daily_breakdown": {
+                    day.date: {"protein": float(day.protein), "carbs": float(day.carbohydrates),
+                               "fat": float(day.fat), "calories": int(day.calories)}
+                    for day in user_daily.itertuples()
+                }
+            }
+            
+            rollups[person] = {
+                "daily": user_daily[["date", "calories"]].reset_index(drop=True),
+                "stats": stats,
+                "meal_frequency": meal_frequency,
+                "macro_analysis": macro_analysis
+            }
+        
+        return rollups
+    
     def get_meal_frequency_analysis(self, data: List[Dict[str, Any]], username: str) -> Dict[str, Any]:
         """
         Analyze meal frequency and repetition patterns
@@ -289,59 +448,11 @@ class CalorieDataExtractor:
             Dictionary with meal frequency analysis
         """
         try:
-            # Filter data for the specific user
             user_data = [entry for entry in data if entry.get("person") == username]
-            
-            if not user_data:
+            rollup = self.summarize_entries(user_data).get(username)
+            if not rollup:
                 return {"error": "No data found for user"}
-            
-            # Count meal frequencies by name and hash
-            meal_counts = {}
-            meal_hashes = {}
-            
-            for entry in user_data:
-                food_name = entry.get("food_name", "Unknown")
-                meal_hash = entry.get("meal_hash", "")
-                
-                # Count by food name
-                if food_name in meal_counts:
-                    meal_counts[food_name] += 1
-                else:
-                    meal_counts[food_name] = 1
-                
-                # Count by meal hash (for similar meals)
-                if meal_hash and meal_hash in meal_hashes:
-                    meal_hashes[meal_hash]["count"] += 1
-                    meal_hashes[meal_hash]["names"].append(food_name)
-                elif meal_hash:
-                    meal_hashes[meal_hash] = {
-                        "count": 1,
-                        "names": [food_name],
-                        "representative_name": food_name
-                    }
-            
-            # Get top 10 most frequent meals
-            top_meals = sorted(meal_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            
-            # Get similar meal groups (meals with same hash appearing more than once)
-            similar_meals = {
-                hash_val: data for hash_val, data in meal_hashes.items() 
-                if data["count"] > 1
-            }
-            
-            # Calculate variety metrics
-            total_meals = len(user_data)
-            unique_foods = len(meal_counts)
-            variety_score = (unique_foods / total_meals * 100) if total_meals > 0 else 0
-            
-            return {
-                "total_meals": total_meals,
-                "unique_foods": unique_foods,
-                "variety_score": round(variety_score, 1),
-                "top_meals": top_meals,
-                "similar_meal_groups": similar_meals,
-                "most_repeated_meal": top_meals[0] if top_meals else ("None", 0)
-            }
+            return rollup["meal_frequency"]
             
         except Exception as e:
             print(f"❌ Error in meal frequency analysis: {e}")
@@ -359,59 +470,11 @@ class CalorieDataExtractor:
             Dictionary with macronutrient analysis
         """
         try:
-            # Filter data for the specific user
             user_data = [entry for entry in data if entry.get("person") == username]
-            
-            if not user_data:
+            rollup = self.summarize_entries(user_data).get(username)
+            if not rollup:
                 return {"error": "No data found for user"}
-            
-            # Calculate totals
-            total_protein = sum(entry.get("protein", 0) for entry in user_data)
-            total_carbs = sum(entry.get("carbohydrates", 0) for entry in user_data)
-            total_fat = sum(entry.get("fat", 0) for entry in user_data)
-            total_calories = sum(entry.get("calories", 0) for entry in user_data)
-            
-            # Calculate averages per day
-            unique_dates = len(set(entry.get("date") for entry in user_data))
-            avg_protein = total_protein / unique_dates if unique_dates > 0 else 0
-            avg_carbs = total_carbs / unique_dates if unique_dates > 0 else 0
-            avg_fat = total_fat / unique_dates if unique_dates > 0 else 0
-            avg_calories = total_calories / unique_dates if unique_dates > 0 else 0
-            
-            # Calculate macronutrient distribution percentages
-            total_macros = total_protein + total_carbs + total_fat
-            protein_pct = (total_protein / total_macros * 100) if total_macros > 0 else 0
-            carbs_pct = (total_carbs / total_macros * 100) if total_macros > 0 else 0
-            fat_pct = (total_fat / total_macros * 100) if total_macros > 0 else 0
-            
-            # Daily breakdowns
-            daily_macros = {}
-            for entry in user_data:
-                date = entry.get("date")
-                if date not in daily_macros:
-                    daily_macros[date] = {
-                        "protein": 0, "carbs": 0, "fat": 0, "calories": 0
-                    }
-                daily_macros[date]["protein"] += entry.get("protein", 0)
-                daily_macros[date]["carbs"] += entry.get("carbohydrates", 0)
-                daily_macros[date]["fat"] += entry.get("fat", 0)
-                daily_macros[date]["calories"] += entry.get("calories", 0)
-            
-            return {
-                "total_protein": round(total_protein, 1),
-                "total_carbs": round(total_carbs, 1),
-                "total_fat": round(total_fat, 1),
-                "total_calories": total_calories,
-                "avg_daily_protein": round(avg_protein, 1),
-                "avg_daily_carbs": round(avg_carbs, 1),
-                "avg_daily_fat": round(avg_fat, 1),
-                "avg_daily_calories": round(avg_calories, 1),
-                "protein_percentage": round(protein_pct, 1),
-                "carbs_percentage": round(carbs_pct, 1),
-                "fat_percentage": round(fat_pct, 1),
-                "days_tracked": unique_dates,
-                "daily_breakdown": daily_macros
-            }
+            return rollup["macro_analysis"]
             
         except Exception as e:
             print(f"❌ Error in macronutrient analysis: {e}")
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Local Nutrition Store for the Calories Bot
+SQLite mirror of the Notion calories database, kept fresh by incremental sync
+on last_edited_time, so nutrition commands run indexed local queries
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from notion_data_reader import CalorieDataExtractor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from notion_gateway import NotionGateway, get_notion_gateway
+
+DEFAULT_STORE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nutrition_store.db")
+
+
+class NutritionStore:
+    """Local copy of all meal entries with per-user, per-day aggregate queries"""
+
+    def __init__(self, db_path: str = None, data_extractor: CalorieDataExtractor = None,
+                 min_sync_interval: int = 60, full_sync_interval: int = 24 * 3600,
+                 gateway: NotionGateway = None):
+        """
+        Open (or create) the store
+
+        Args:
+            db_path: SQLite file, defaults to NUTRITION_STORE_DB or nutrition_store.db
+            data_extractor: Parses Notion pages and names the database
+            min_sync_interval: Seconds between Notion syncs triggered by commands
+            full_sync_interval: Seconds between full syncs that drop meals deleted in Notion
+            gateway: Notion gateway used for syncing, defaults to the one for NOTION_TOKEN
+        """
+        self.db_path = db_path or os.getenv("NUTRITION_STORE_DB", DEFAULT_STORE_DB)
+        self.data_extractor = data_extractor or CalorieDataExtractor()
+        self.gateway = gateway or get_notion_gateway()
+        self.min_sync_interval = min_sync_interval
+        self.full_sync_interval = full_sync_interval
+        self.last_sync = 0.0
+        # 0 makes the first sync after startup a full one
+        self.last_full_sync = 0.0
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        """Create tables and indexes"""
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS meals (
+                    page_id TEXT PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    person TEXT NOT NULL,
+                    food_name TEXT,
+                    calories INTEGER DEFAULT 0,
+                    protein REAL DEFAULT 0,
+                    carbohydrates REAL DEFAULT 0,
+                    fat REAL DEFAULT 0,
+                    confidence REAL DEFAULT 0,
+                    calories_raw TEXT,
+                    meal_hash TEXT,
+                    last_edited_time TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_meals_person_date ON meals(person, date)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_meals_date ON meals(date)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            self.conn.commit()
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def upsert_entry(self, page_id: str, entry: Dict[str, Any], last_edited_time: str = None) -> bool:
+        """
+        Insert or update one meal (used for write-through after saving to Notion)
+
+        Args:
+            page_id: Notion page id
+            entry: Entry dictionary in CalorieDataExtractor.parse_page format
+            last_edited_time: Notion last_edited_time of the page
+
+        Returns:
+            True if stored
+        """
+        try:
+            with self.lock:
+                self._upsert(page_id, entry, last_edited_time)
+                self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"❌ Error storing meal {page_id}: {e}")
+            return False
+
+    def _upsert(self, page_id: str, entry: Dict[str, Any], last_edited_time: Optional[str]):
+        entry_date = entry["date"]
+        if isinstance(entry_date, (date, datetime)):
+            entry_date = entry_date.isoformat()[:10]
+        self.conn.execute("""
+            INSERT OR REPLACE INTO meals
+            (page_id, date, person, food_name, calories, protein, carbohydrates, fat,
+             confidence, calories_raw, meal_hash, last_edited_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            page_id, entry_date, entry["person"], entry.get("food_name", ""),
+            entry.get("calories", 0), entry.get("protein", 0.0) or 0.0,
+            entry.get("carbohydrates", 0.0) or 0.0, entry.get("fat", 0.0) or 0.0,
+            entry.get("confidence", 0) or 0, entry.get("calories_raw", ""),
+            entry.get("meal_hash", ""), last_edited_time
+        ))
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Pull pages edited since the last sync from Notion
+
+        Runs outside the event loop (the bot calls it via asyncio.to_thread);
+        the gateway keeps it within the shared rate limit.
+
+        Args:
+            full: Re-read the whole database and drop meals deleted in Notion
+
+        Returns:
+            Number of pages applied
+        """
+        with self.lock:
+            watermark = None if full else self._get_state("last_edited_time")
+
+        sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+        query_filter = None
+        if watermark:
+            # Notion timestamps have minute precision, so re-read the watermark minute
+            query_filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": watermark}
+            }
+
+        pages = self.gateway.run_sync(
+            self.gateway.query_database_all(self.data_extractor.db_id, filter=query_filter, sorts=sorts)
+        )
+
+        applied = 0
+        with self.lock:
+            for page in pages:
+                edited = page.get("last_edited_time")
+                entry = self.data_extractor.parse_page(page)
+                if page.get("archived") or page.get("in_trash") or entry is None:
+                    # Edited into an invalid entry (or deleted): drop the local copy
+                    self.conn.execute("DELETE FROM meals WHERE page_id = ?", (page["id"],))
+                else:
+                    self._upsert(page["id"], entry, edited)
+                    applied += 1
+                if edited and (watermark is None or edited > watermark):
+                    watermark = edited
+
+            if full:
+                # Deleted pages never show up in queries, not even as archived
+                seen = {page["id"] for page in pages}
+                stale = [row["page_id"] for row in self.conn.execute("SELECT page_id FROM meals")
+                         if row["page_id"] not in seen]
+                self.conn.executemany("DELETE FROM meals WHERE page_id = ?", [(page_id,) for page_id in stale])
+                self.last_full_sync = time.time()
+
+            if watermark:
+                self._set_state("last_edited_time", watermark)
+            self.conn.commit()
+            self.last_sync = time.time()
+
+        print(f"🔄 Nutrition store synced {applied} changed entries from Notion")
+        return applied
+
+    def sync_if_stale(self) -> int:
+        """Sync when the last sync is older than min_sync_interval; full sync on startup and then daily"""
+        now = time.time()
+        if now - self.last_sync < self.min_sync_interval:
+            return 0
+        try:
+            return self.sync(full=now - self.last_full_sync >= self.full_sync_interval)
+        except Exception as e:
+            print(f"⚠️ Nutrition store sync failed, using local data: {e}")
+            return 0
+
+    def get_persons(self, start_date: date = None, end_date: date = None) -> List[str]:
+        """All persons with entries in the date range"""
+        sql = "SELECT DISTINCT person FROM meals"
+        params: List[Any] = []
+        if start_date and end_date:
+            sql += " WHERE date BETWEEN ? AND ?"
+            params = [start_date.isoformat(), end_date.isoformat()]
+        with self.lock:
+            return [row["person"] for row in self.conn.execute(sql, params)]
+
+    def match_persons(self, username: str) -> List[str]:
+        """Persons whose name contains, or is contained in, the Discord username"""
+        username = username.lower()
+        return [
+            person for person in self.get_persons()
+            if person.lower() in username or username in person.lower()
+        ]
+
+    def _person_filter(self, persons: List[str]) -> str:
+        return f"person IN ({','.join('?' * len(persons))})"
+
+    def get_entries(self, start_date: date, end_date: date, persons: List[str]) -> List[Dict[str, Any]]:
+        """
+        Meals of the given persons in the date range, oldest first
+
+        Returns:
+            Entries in CalorieDataExtractor.parse_page format
+        """
+        if not persons:
+            return []
+        with self.lock:
+            rows = self.conn.execute(f"""
+                SELECT * FROM meals
+                WHERE {self._person_filter(persons)} AND date BETWEEN ? AND ?
+                ORDER BY date, rowid
+            """, [*persons, start_date.isoformat(), end_date.isoformat()]).fetchall()
+
+        return [
+            {
+                "date": date.fromisoformat(row["date"]),
+                "food_name": row["food_name"],
+                "calories": row["calories"],
+                "protein": row["protein"],
+                "carbohydrates": row["carbohydrates"],
+                "fat": row["fat"],
+                "person": row["person"],
+                "confidence": row["confidence"],
+                "calories_raw": row["calories_raw"],
+                "meal_hash": row["meal_hash"]
+            }
+            for row in rows
+        ]
+
+    def get_totals(self, start_date: date, end_date: date, persons: List[str]) -> Dict[str, Any]:
+        """Summed calories and macros, meal count and tracked days for the range"""
+        totals = {"meals": 0, "days": 0, "calories": 0, "protein": 0.0, "carbohydrates": 0.0, "fat": 0.0}
+        if not persons:
+            return totals
+        with self.lock:
+            row = self.conn.execute(f"""
+                SELECT COUNT(*) AS meals, COUNT(DISTINCT date) AS days,
+                       COALESCE(SUM(calories), 0) AS calories, COALESCE(SUM(protein), 0) AS protein,
+                       COALESCE(SUM(carbohydrates), 0) AS carbohydrates, COALESCE(SUM(fat), 0) AS fat
+                FROM meals
+                WHERE {self._person_filter(persons)} AND date BETWEEN ? AND ?
+            """, [*persons, start_date.isoformat(), end_date.isoformat()]).fetchone()
+        return dict(row)
+
+    def get_daily_breakdown(self, start_date: date, end_date: date, persons: List[str]) -> Dict[date, Dict[str, Any]]:
+        """Per-day calories and meal counts for the range"""
+        if not persons:
+            return {}
+        with self.lock:
+            rows = self.conn.execute(f"""
+                SELECT date, SUM(calories) AS calories, COUNT(*) AS meals
+                FROM meals
+                WHERE {self._person_filter(persons)} AND date BETWEEN ? AND ?
+                GROUP BY date
+                ORDER BY date
+            """, [*persons, start_date.isoformat(), end_date.isoformat()]).fetchall()
+        return {
+            date.fromisoformat(row["date"]): {"calories": row["calories"], "meals": row["meals"]}
+            for row in rows
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
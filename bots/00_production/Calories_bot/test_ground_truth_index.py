@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the ground truth food index
+Covers keyword matching, specificity ranking and append-only persistence
+"""
+
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+
+# Add the bot directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ground_truth_index import FoodKeywordMatcher, GroundTruthStore
+
+FOODS = {
+    "apfel": {"calories": 95, "keywords": ["apfel", "apple", "obst", "frucht"]},
+    "banane": {"calories": 105, "keywords": ["banane", "banana", "obst", "frucht"]},
+    "apfelkuchen": {"calories": 350, "keywords": ["apfelkuchen", "kuchen"]},
+    "butterbrezel mit honig": {"calories": 420, "keywords": ["butterbrezel", "brezel", "honig"]},
+}
+
+
+class TestFoodKeywordMatcher(unittest.TestCase):
+    """Test keyword lookups and ranking"""
+
+    def setUp(self):
+        self.matcher = FoodKeywordMatcher()
+        for food_key, food_data in FOODS.items():
+            self.matcher.add_food(food_key, food_data)
+
+    def test_keyword_inside_text(self):
+        """Test a keyword found inside a longer message"""
+        self.assertEqual(self.matcher.best_match("ich hatte eine banana zum frühstück"), "banane")
+
+    def test_most_specific_keyword_wins(self):
+        """Test longer keywords beat the shorter keywords they contain"""
+        self.assertEqual(self.matcher.best_match("ein stück apfelkuchen"), "apfelkuchen")
+        self.assertEqual(self.matcher.best_match("ein apfel"), "apfel")
+
+    def test_shared_keywords_rank_below_specific_ones(self):
+        """Test a keyword shared by several foods does not decide the match"""
+        self.assertEqual(self.matcher.best_match("obst: banane"), "banane")
+
+    def test_prefix_match(self):
+        """Test a partially typed food name"""
+        self.assertEqual(self.matcher.best_match("butterbre"), "butterbrezel mit honig")
+
+    def test_fuzzy_token_match(self):
+        """Test a small typo still matches"""
+        self.assertEqual(self.matcher.best_match("bananne"), "banane")
+
+    def test_no_match(self):
+        """Test unrelated text returns nothing"""
+        self.assertIsNone(self.matcher.best_match("pizza"))
+
+    def test_incremental_add(self):
+        """Test foods added after the first lookup are found"""
+        self.assertIsNone(self.matcher.best_match("pizza margherita"))
+        self.matcher.add_food("pizza margherita", {"keywords": ["pizza"]})
+        self.assertEqual(self.matcher.best_match("eine pizza"), "pizza margherita")
+
+    def test_readding_food_replaces_keywords(self):
+        """Test an updated food is no longer found under keywords it dropped"""
+        self.matcher.add_food("apfelkuchen", {"keywords": ["apfeltarte"]})
+        self.matcher.add_food("banane", {"keywords": ["banana"]})
+
+        self.assertIsNone(self.matcher.best_match("kuchen"))
+        self.assertEqual(self.matcher.best_match("apfeltarte"), "apfelkuchen")
+        self.assertEqual([food_key for food_key, _ in self.matcher.search("obst")], ["apfel"])
+        self.assertEqual(self.matcher.best_match("banana"), "banane")
+
+
+class TestGroundTruthStore(unittest.TestCase):
+    """Test snapshot plus append-only log persistence"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.snapshot_file = os.path.join(self.test_dir, "ground_truth_foods.json")
+        with open(self.snapshot_file, 'w', encoding='utf-8') as f:
+            json.dump({"foods": {"apfel": FOODS["apfel"]}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_append_and_reload(self):
+        """Test appended foods survive a reload without rewriting the snapshot"""
+        store = GroundTruthStore(self.snapshot_file)
+        foods_db = store.load()
+        foods_db["foods"]["banane"] = FOODS["banane"]
+        store.append("banane", FOODS["banane"], foods_db)
+
+        with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+            self.assertNotIn("banane", json.load(f)["foods"])
+
+        reloaded = GroundTruthStore(self.snapshot_file).load()
+        self.assertEqual(set(reloaded["foods"]), {"apfel", "banane"})
+
+    def test_truncated_log_line_is_skipped(self):
+        """Test a partially written last line does not break loading"""
+        store = GroundTruthStore(self.snapshot_file)
+        foods_db = store.load()
+        store.append("banane", FOODS["banane"], foods_db)
+        with open(store.log_file, 'a', encoding='utf-8') as f:
+            f.write('{"key": "kuch')
+
+        reloaded = GroundTruthStore(self.snapshot_file).load()
+        self.assertEqual(set(reloaded["foods"]), {"apfel", "banane"})
+
+    def test_compaction(self):
+        """Test the log is folded into the snapshot once it is long enough"""
+        store = GroundTruthStore(self.snapshot_file, compact_after=2)
+        foods_db = store.load()
+        for food_key in ["banane", "apfelkuchen"]:
+            foods_db["foods"][food_key] = FOODS[food_key]
+            store.append(food_key, FOODS[food_key], foods_db)
+
+        self.assertFalse(os.path.exists(store.log_file))
+        with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(set(json.load(f)["foods"]), {"apfel", "banane", "apfelkuchen"})
+
+
+if __name__ == '__main__':
+    unittest.main()
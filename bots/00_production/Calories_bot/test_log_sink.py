@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON-Lines log sink
+Covers background appends, size rotation and the per-file count index
+"""
+
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+
+# Add the bot directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from log_sink import JsonlLogSink
+
+
+class TestJsonlLogSink(unittest.TestCase):
+    """Test appending, rotating and indexing log files"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.test_dir, "errors"))
+        self.base_path = os.path.join(self.test_dir, "errors", "errors_20250911")
+        self.sink = JsonlLogSink(self.test_dir, flush_interval=0.05)
+
+    def tearDown(self):
+        self.sink.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_entries_are_appended_as_lines(self):
+        """Test every entry becomes one JSON line and streams back in order"""
+        for i in range(50):
+            self.sink.write(self.base_path, {"timestamp": f"2025-09-11T10:00:{i:02d}", "n": i})
+        self.sink.flush()
+
+        with open(self.base_path + ".jsonl", encoding="utf-8") as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 50)
+        self.assertEqual(json.loads(lines[-1])["n"], 49)
+        self.assertEqual([entry["n"] for entry in self.sink.iter_entries("errors")], list(range(50)))
+
+    def test_size_rotation(self):
+        """Test a full file rolls over to numbered segments"""
+        self.sink.max_bytes = 200
+        for i in range(20):
+            self.sink.write(self.base_path, {"message": "x" * 40, "n": i})
+        self.sink.flush()
+
+        files = sorted(os.listdir(os.path.join(self.test_dir, "errors")))
+        self.assertIn("errors_20250911.1.jsonl", files)
+        self.assertEqual([entry["n"] for entry in self.sink.iter_entries("errors")], list(range(20)))
+
+    def test_index_counts_and_rebuild(self):
+        """Test the index counts entries and is rebuilt for files it does not match"""
+        for i in range(3):
+            self.sink.write(self.base_path, {"timestamp": f"2025-09-11T10:00:0{i}"})
+        self.sink.flush()
+
+        stats = self.sink.get_index()[os.path.join("errors", "errors_20250911.jsonl")]
+        self.assertEqual(stats["entries"], 3)
+        self.assertEqual(stats["last"], "2025-09-11T10:00:02")
+
+        # Simulate a crash that left a truncated line the index never saw
+        self.sink.close()
+        with open(self.base_path + ".jsonl", "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2025-09-11T10:00:03"}\n{"truncat')
+        reopened = JsonlLogSink(self.test_dir)
+        self.assertEqual(reopened.get_index()[os.path.join("errors", "errors_20250911.jsonl")]["entries"], 4)
+        reopened.write(self.base_path, {"timestamp": "2025-09-11T10:00:04"})
+        reopened.close()
+        self.assertEqual(len(list(reopened.iter_entries("errors"))), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the monthly reports under multibot_host
+The host removes the bot's modules from sys.modules and its directory from
+sys.path after loading, so the charts can't go to a process pool by name
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+from datetime import date
+from unittest.mock import patch
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# multibot_host lives in the production folder
+sys.path.insert(0, os.path.dirname(BOT_DIR))
+
+from multibot_host import HostedBot
+from test_monthly_rollups import make_entry
+
+
+class TestHostedMonthlyReport(unittest.TestCase):
+    """Test generate_all_monthly_reports of a monthly_report loaded by HostedBot"""
+
+    def setUp(self):
+        # Start like the host does: nothing from the bot directory imported or on sys.path
+        self.saved_path = list(sys.path)
+        self.saved_modules = {
+            name: module for name, module in sys.modules.items()
+            if os.path.abspath(getattr(module, "__file__", None) or "").startswith(BOT_DIR + os.sep)
+        }
+        for name in self.saved_modules:
+            del sys.modules[name]
+        sys.path[:] = [path for path in sys.path if os.path.abspath(path or ".") != BOT_DIR]
+        self.chart_paths = []
+
+    def tearDown(self):
+        for path in self.chart_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        sys.path[:] = self.saved_path
+        sys.modules.update(self.saved_modules)
+
+    def test_charts_render_when_hosted(self):
+        """Test the hosted bot renders every user's chart instead of failing to pickle it"""
+        hosted = HostedBot("calories", os.path.join(BOT_DIR, "monthly_report.py"))
+        hosted.load()
+        self.assertNotIn("chart_generator", sys.modules)
+
+        module = hosted.module
+        generator = module.MonthlyReportGenerator(chart_workers=2)
+        entries = [
+            make_entry(date(2026, 9, 1), "Marc", "Pasta", 700),
+            make_entry(date(2026, 9, 2), "Marc", "Salat", 300),
+            make_entry(date(2026, 9, 1), "Anna", "Müsli", 400),
+        ]
+
+        with patch.object(generator.data_extractor, "get_monthly_data", return_value=entries):
+            reports = asyncio.run(generator.generate_all_monthly_reports(2026, 9))
+        self.chart_paths = [report.get("chart_path") for report in reports.values() if report.get("chart_path")]
+
+        self.assertEqual(set(reports), {"Marc", "Anna"})
+        for username, report in reports.items():
+            self.assertTrue(report["success"], f"{username}: {report.get('message')}")
+            self.assertTrue(os.path.exists(report["chart_path"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
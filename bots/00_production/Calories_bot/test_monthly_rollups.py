@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the one-pass monthly rollups
+Covers per-user stats, meal frequency and macro analysis from a single group-by pass
+"""
+
+import unittest
+import os
+import sys
+from datetime import date
+
+# Add the bot directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from notion_data_reader import CalorieDataExtractor
+
+
+def make_entry(day, person, food_name, calories, meal_hash="", protein=10.0, carbs=20.0, fat=5.0):
+    """Build an entry in get_monthly_data format"""
+    return {
+        "date": day,
+        "food_name": food_name,
+        "calories": calories,
+        "protein": protein,
+        "carbohydrates": carbs,
+        "fat": fat,
+        "person": person,
+        "confidence": 90,
+        "calories_raw": f"{calories} kcal",
+        "meal_hash": meal_hash
+    }
+
+
+class TestMonthlyRollups(unittest.TestCase):
+    """Test the vectorized per-user aggregation"""
+
+    def setUp(self):
+        self.extractor = CalorieDataExtractor()
+        self.data = [
+            make_entry(date(2026, 9, 1), "Marc", "Pasta", 700, "h1"),
+            make_entry(date(2026, 9, 1), "Marc", "Apfel", 100),
+            make_entry(date(2026, 9, 2), "Marc", "Pasta", 800, "h1"),
+            make_entry(date(2026, 9, 3), "Marc", "Salat", 300),
+            make_entry(date(2026, 9, 1), "Anna", "Müsli", 400),
+        ]
+
+    def test_stats_per_user(self):
+        """Test daily totals and monthly stats are computed for every user"""
+        rollups = self.extractor.summarize_entries(self.data)
+
+        self.assertEqual(set(rollups), {"Marc", "Anna"})
+        stats = rollups["Marc"]["stats"]
+        self.assertEqual(stats["total_calories"], 1900)
+        self.assertEqual(stats["days_tracked"], 3)
+        self.assertEqual(stats["max_daily"], 800)
+        self.assertEqual(stats["min_daily"], 300)
+        self.assertEqual(list(rollups["Marc"]["daily"]["calories"]), [800, 800, 300])
+
+    def test_matches_single_user_analysis(self):
+        """Test meal frequency and macros match the per-user analysis methods"""
+        rollup = self.extractor.summarize_entries(self.data)["Marc"]
+        frequency = rollup["meal_frequency"]
+
+        self.assertEqual(frequency["most_repeated_meal"], ("Pasta", 2))
+        self.assertEqual(frequency["unique_foods"], 3)
+        self.assertEqual(frequency["similar_meal_groups"]["h1"]["count"], 2)
+        self.assertEqual(rollup["macro_analysis"]["total_protein"], 40.0)
+        self.assertEqual(self.extractor.get_meal_frequency_analysis(self.data, "Marc"), frequency)
+        self.assertEqual(self.extractor.get_macronutrient_analysis(self.data, "Anna")["days_tracked"], 1)
+
+    def test_empty_month(self):
+        """Test no entries produce no rollups"""
+        self.assertEqual(self.extractor.summarize_entries([]), {})
+        self.assertEqual(self.extractor.get_meal_frequency_analysis([], "Marc"), {"error": "No data found for user"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the local nutrition store
+Covers incremental sync, pagination and the aggregate queries used by the commands
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from datetime import date
+
+# Add the bot directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from notion_data_reader import CalorieDataExtractor
+from nutrition_store import NutritionStore
+from notion_gateway import NotionGateway
+
+
+def make_page(page_id, day, person, calories, edited):
+    """Build a Notion page object in the calories database format"""
+    return {
+        "id": page_id,
+        "last_edited_time": edited,
+        "properties": {
+            "Food": {"title": [{"text": {"content": f"Meal {page_id}"}}]},
+            "Calories": {"rich_text": [{"text": {"content": f"{calories} kcal"}}]},
+            "date": {"date": {"start": f"{day}T12:00:00"}},
+            "person": {"select": {"name": person}},
+            "confidence": {"number": 90},
+            "Protein": {"number": 10.0},
+            "Carbs": {"number": 20.0},
+            "Fat": {"number": 5.0},
+            "meal_hash": {"rich_text": []}
+        }
+    }
+
+
+class TestNutritionStore(unittest.TestCase):
+    """Test syncing and querying the local store"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.pages = []
+        self.queries = []
+
+        async def send(method, path, query):
+            # Database queries as the Notion API answers them, without HTTP
+            self.queries.append(query)
+            pages = sorted(self.pages, key=lambda page: page["last_edited_time"])
+            if "filter" in query:
+                since = query["filter"]["last_edited_time"]["on_or_after"]
+                pages = [page for page in pages if page["last_edited_time"] >= since]
+            page_size = query["page_size"]
+            start = int(query.get("start_cursor") or 0)
+            has_more = start + page_size < len(pages)
+            return {
+                "results": pages[start:start + page_size],
+                "has_more": has_more,
+                "next_cursor": str(start + page_size) if has_more else None
+            }
+
+        self.extractor = CalorieDataExtractor()
+        self.gateway = NotionGateway("token")
+        self.gateway._send = send
+        self.store = NutritionStore(db_path=os.path.join(self.test_dir, "store.db"),
+                                    data_extractor=self.extractor, gateway=self.gateway)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_full_sync_follows_pagination(self):
+        """Test more than one Notion result page is synced"""
+        for i in range(150):
+            self.pages.append(make_page(f"p{i}", "2026-10-05", "Marc", 100, f"2026-10-05T10:{i % 60:02d}:00.000Z"))
+
+        self.assertEqual(self.store.sync(), 150)
+        self.assertEqual(len(self.queries), 2)
+        totals = self.store.get_totals(date(2026, 10, 1), date(2026, 10, 31), ["Marc"])
+        self.assertEqual(totals["meals"], 150)
+
+    def test_incremental_sync_uses_watermark(self):
+        """Test the second sync only asks Notion for newer edits"""
+        self.pages.append(make_page("a", "2026-10-05", "Marc", 300, "2026-10-05T10:00:00.000Z"))
+        self.store.sync()
+        self.pages.append(make_page("b", "2026-10-06", "Marc", 400, "2026-10-06T10:00:00.000Z"))
+        self.store.sync()
+
+        last_query = self.queries[-1]
+        self.assertEqual(last_query["filter"]["last_edited_time"]["on_or_after"], "2026-10-05T10:00:00.000Z")
+        totals = self.store.get_totals(date(2026, 10, 1), date(2026, 10, 31), ["Marc"])
+        self.assertEqual(totals["calories"], 700)
+
+    def test_full_sync_drops_meals_deleted_in_notion(self):
+        """Test a full sync removes local meals whose pages Notion no longer returns"""
+        self.pages.append(make_page("a", "2026-10-05", "Marc", 300, "2026-10-05T10:00:00.000Z"))
+        self.pages.append(make_page("b", "2026-10-05", "Marc", 400, "2026-10-05T11:00:00.000Z"))
+        self.store.sync()
+        self.pages.pop()
+
+        self.store.sync()
+        totals = self.store.get_totals(date(2026, 10, 1), date(2026, 10, 31), ["Marc"])
+        self.assertEqual(totals["calories"], 700)
+
+        self.store.sync(full=True)
+        totals = self.store.get_totals(date(2026, 10, 1), date(2026, 10, 31), ["Marc"])
+        self.assertEqual(totals["calories"], 300)
+
+    def test_first_stale_sync_is_full(self):
+        """Test the first sync_if_stale after startup prunes, later ones are incremental"""
+        self.pages.append(make_page("a", "2026-10-05", "Marc", 300, "2026-10-05T10:00:00.000Z"))
+        self.store.sync()
+
+        self.store.last_sync = 0.0
+        self.store.sync_if_stale()
+        self.assertNotIn("filter", self.queries[-1])
+        self.store.last_sync = 0.0
+        self.store.sync_if_stale()
+        self.assertIn("filter", self.queries[-1])
+
+    def test_aggregates_by_person_and_day(self):
+        """Test per-user daily breakdown and person matching"""
+        for page_id, day, person, calories in [("a", "2026-10-05", "Marc", 300), ("b", "2026-10-05", "Marc", 200),
+                                               ("c", "2026-10-06", "Marc", 500), ("d", "2026-10-05", "Anna", 900)]:
+            entry = self.extractor.parse_page(make_page(page_id, day, person, calories, "2026-10-06T10:00:00.000Z"))
+            self.store.upsert_entry(page_id, entry)
+
+        persons = self.store.match_persons("marc b.")
+        self.assertEqual(persons, ["Marc"])
+        breakdown = self.store.get_daily_breakdown(date(2026, 10, 5), date(2026, 10, 6), persons)
+        self.assertEqual(breakdown[date(2026, 10, 5)], {"calories": 500, "meals": 2})
+        self.assertEqual(breakdown[date(2026, 10, 6)], {"calories": 500, "meals": 1})
+        self.assertEqual(len(self.store.get_entries(date(2026, 10, 5), date(2026, 10, 5), persons)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
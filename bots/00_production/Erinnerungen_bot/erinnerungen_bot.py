@@ -7,6 +7,7 @@ Automatically sends daily reminders for birthdays and waste collection
 import discord
 from discord.ext import commands
 import os
+import sys
 import logging
 import asyncio
 from datetime import datetime
@@ -21,6 +22,13 @@ from geburtstage import GeburtstageManager
 from muellkalender import MuellkalenderManager
 from scheduler import ErinnerungsScheduler
 
+# Status channel announcements; only available when run from the repository checkout
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+try:
+    from bot_status_utils import add_status_to_bot
+except ImportError:
+    add_status_to_bot = None
+
 # Load environment variables from parent directory
 env_path = os.path.join(os.path.dirname(__file__), '../../../.env')
 load_dotenv(env_path)
@@ -45,6 +53,7 @@ TIMEZONE = pytz.timezone(os.getenv("TIMEZONE", "Europe/Berlin"))
 intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix="!", intents=intents)
+status_manager = add_status_to_bot(bot, "Erinnerungen Bot") if add_status_to_bot else None
 
 # Service instances
 notion_manager = None
@@ -87,6 +96,9 @@ async def on_ready():
         scheduler_thread.start()
         logger.info("Scheduler started")
         
+        if status_manager:
+            await status_manager.send_startup_message()
+        
         # Send startup message to Discord channel
         try:
             channel = bot.get_channel(ERINNERUNGEN_CHANNEL_ID)
@@ -13,6 +13,13 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'log_bot'))
 from api_monitor_shared import track_openrouter_call
 
+# Repository root; the Docker image only gets this script and bot_state.json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+try:
+    from bot_status_utils import add_status_to_bot
+except ImportError:
+    add_status_to_bot = None
+
 # --- Environment Variable Loading ---
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
 load_dotenv(dotenv_path=dotenv_path)
@@ -37,6 +44,7 @@ intents = discord.Intents.default()
 intents.messages = True
 intents.message_content = True
 client = discord.Client(intents=intents)
+status_manager = add_status_to_bot(client, "Allgemeine Wohl Bot") if add_status_to_bot else None
 
 # --- Bot State ---
 bot_state = {
@@ -425,6 +433,9 @@ async def on_ready():
     await populate_ground_truth_if_empty()
     await load_ground_truth_cache()
     
+    if status_manager:
+        await status_manager.send_startup_message()
+    
     channel = client.get_channel(CHANNEL_ID)
     if channel:
         await send_start_message(channel)
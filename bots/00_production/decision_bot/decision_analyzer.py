@@ -1,3 +1,4 @@
+import os
 import logging
 from typing import Dict, Any, Optional
 
@@ -36,7 +37,9 @@ class DecisionAnalyzer:
                 self.rag_system = RAGSystem(
                     upload_folder=upload_folder,
                     model_name="all-MiniLM-L6-v2",  # Free HuggingFace model
-                    index_path="./vector_index"
+                    index_path="./vector_index",
+                    # "mmap_int8" keeps vectors and text on disk for low-memory hosts
+                    storage_mode=os.getenv('VECTOR_STORAGE_MODE', 'memory')
                 )
                 logger.info("RAG system initialized")
             except Exception as e:
@@ -145,6 +148,9 @@ class DecisionAnalyzer:
         try:
             context_parts = []
             
+            # Encode the question once; the context lookups below hit the embedding cache
+            self.rag_system.embed_query_variants([question])
+            
             # Get relevant context from RAG system (most important)
             rag_context = self.rag_system.get_relevant_context(question, max_context_length=1500)
             if rag_context:
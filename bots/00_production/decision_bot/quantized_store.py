@@ -0,0 +1,193 @@
+"""
+Quantized On-Disk Storage for the Vector Store
+Keeps int8 vectors in a memory-mapped file and document text in an
+offset-indexed side file, so resident memory stays small for large corpora
+"""
+
+import os
+import json
+import logging
+import numpy as np
+from dataclasses import asdict
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+from document_processor import Document
+
+logger = logging.getLogger(__name__)
+
+# Normalized embeddings lie in [-1, 1]; map that range onto int8
+INT8_SCALE = 127.0
+
+
+def quantize_int8(vectors: np.ndarray) -> np.ndarray:
+    """Quantize normalized float vectors to int8"""
+    return np.clip(np.rint(vectors * INT8_SCALE), -127, 127).astype(np.int8)
+
+
+class Int8VectorIndex:
+    """Brute-force inner-product index over memory-mapped int8 vectors
+
+    Mirrors the subset of the FAISS ID-map API used by VectorStore
+    (ntotal, add_with_ids, remove_ids, search). Mutations materialize the
+    affected vectors in RAM until save() writes them back and re-maps the file.
+    """
+
+    VECTORS_FILE = "vectors.int8"
+    IDS_FILE = "vector_ids.npy"
+    SCAN_BLOCK_ROWS = 4096
+
+    def __init__(self, dim: int, vectors: Optional[np.ndarray] = None,
+                 ids: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.vectors = vectors if vectors is not None else np.empty((0, dim), dtype=np.int8)
+        self.ids = ids if ids is not None else np.empty(0, dtype=np.int64)
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return all(os.path.exists(os.path.join(path, f)) for f in [cls.VECTORS_FILE, cls.IDS_FILE])
+
+    @classmethod
+    def load(cls, path: str, dim: int) -> "Int8VectorIndex":
+        """Open the vector file read-only as a memory map"""
+        ids = np.load(os.path.join(path, cls.IDS_FILE))
+        vectors_file = os.path.join(path, cls.VECTORS_FILE)
+        if len(ids) == 0:
+            return cls(dim)
+        vectors = np.memmap(vectors_file, dtype=np.int8, mode='r', shape=(len(ids), dim))
+        return cls(dim, vectors, ids)
+
+    def save(self, path: str):
+        """Write vectors and ids, then re-open the vectors as a memory map"""
+        vectors_file = os.path.join(path, self.VECTORS_FILE)
+        ids_file = os.path.join(path, self.IDS_FILE)
+
+        tmp_vectors = vectors_file + ".tmp"
+        np.ascontiguousarray(self.vectors, dtype=np.int8).tofile(tmp_vectors)
+        os.replace(tmp_vectors, vectors_file)
+
+        tmp_ids = ids_file + ".tmp.npy"
+        np.save(tmp_ids, self.ids)
+        os.replace(tmp_ids, ids_file)
+
+        if self.ntotal:
+            self.vectors = np.memmap(vectors_file, dtype=np.int8, mode='r', shape=(self.ntotal, self.dim))
+
+    def add_with_ids(self, vectors: np.ndarray, ids: np.ndarray):
+        self.vectors = np.concatenate([np.asarray(self.vectors), quantize_int8(vectors)])
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+
+    def remove_ids(self, ids: np.ndarray):
+        keep = ~np.isin(self.ids, ids)
+        self.vectors = np.asarray(self.vectors)[keep]
+        self.ids = self.ids[keep]
+
+    def subset(self, ids: np.ndarray) -> "Int8IndexView":
+        """View restricted to the given ids (rows are read from disk on search)"""
+        rows = np.flatnonzero(np.isin(self.ids, ids))
+        return Int8IndexView(self, rows)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self._search_rows(queries, k, None)
+
+    def _search_rows(self, queries: np.ndarray, k: int,
+                     rows: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Scan vectors block by block so only one block is paged in at a time"""
+        query = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)[0]
+        total = self.ntotal if rows is None else len(rows)
+        k = min(k, total)
+
+        scores = np.full((1, k), -np.inf, dtype=np.float32)
+        ids = np.full((1, k), -1, dtype=np.int64)
+        if k <= 0:
+            return scores, ids
+
+        all_scores = np.empty(total, dtype=np.float32)
+        for start in range(0, total, self.SCAN_BLOCK_ROWS):
+            end = min(start + self.SCAN_BLOCK_ROWS, total)
+            block = self.vectors[start:end] if rows is None else self.vectors[rows[start:end]]
+            all_scores[start:end] = block.astype(np.float32) @ query
+        all_scores /= INT8_SCALE
+
+        top = np.argpartition(-all_scores, k - 1)[:k]
+        top = top[np.argsort(-all_scores[top])]
+
+        scores[0] = all_scores[top]
+        ids[0] = self.ids[top] if rows is None else self.ids[rows[top]]
+        return scores, ids
+
+
+class Int8IndexView:
+    """Read-only subset of an Int8VectorIndex (used for category filters)"""
+
+    def __init__(self, parent: Int8VectorIndex, rows: np.ndarray):
+        self.parent = parent
+        self.rows = rows
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.rows)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self.parent._search_rows(queries, k, self.rows)
+
+
+class LazyDocumentStore(Mapping):
+    """Read-only mapping of vector id -> Document backed by a side file
+
+    Only the id/offset table is held in memory; each Document is decoded
+    from disk when it is looked up.
+    """
+
+    DATA_FILE = "documents.dat"
+    OFFSETS_FILE = "documents.idx.npy"
+
+    def __init__(self, path: str):
+        self.data_file = os.path.join(path, self.DATA_FILE)
+        # Rows of (vector_id, offset, length)
+        table = np.load(os.path.join(path, self.OFFSETS_FILE))
+        self._offsets: Dict[int, Tuple[int, int]] = {
+            int(vector_id): (int(offset), int(length)) for vector_id, offset, length in table
+        }
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return all(os.path.exists(os.path.join(path, f)) for f in [cls.DATA_FILE, cls.OFFSETS_FILE])
+
+    @classmethod
+    def write(cls, path: str, documents: Mapping):
+        """Serialize documents as JSON records and write the offset table"""
+        data_file = os.path.join(path, cls.DATA_FILE)
+        offsets_file = os.path.join(path, cls.OFFSETS_FILE)
+
+        table: List[Tuple[int, int, int]] = []
+        tmp_data = data_file + ".tmp"
+        with open(tmp_data, 'wb') as f:
+            for vector_id, doc in documents.items():
+                record = json.dumps(asdict(doc), ensure_ascii=False, default=str).encode('utf-8')
+                table.append((int(vector_id), f.tell(), len(record)))
+                f.write(record + b"\n")
+
+        tmp_offsets = offsets_file + ".tmp.npy"
+        np.save(tmp_offsets, np.array(table, dtype=np.int64).reshape(-1, 3))
+        os.replace(tmp_data, data_file)
+        os.replace(tmp_offsets, offsets_file)
+
+    def __getitem__(self, vector_id: int) -> Document:
+        offset, length = self._offsets[int(vector_id)]
+        with open(self.data_file, 'rb') as f:
+            f.seek(offset)
+            record = json.loads(f.read(length).decode('utf-8'))
+        return Document(**record)
+
+    def __contains__(self, vector_id) -> bool:
+        return int(vector_id) in self._offsets
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
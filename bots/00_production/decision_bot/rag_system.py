@@ -17,7 +17,8 @@ class RAGSystem:
     def __init__(self, upload_folder: str = "./upload", 
                  model_name: str = "all-MiniLM-L6-v2",
                  index_path: str = "./vector_index",
-                 force_rebuild: bool = False):
+                 force_rebuild: bool = False,
+                 storage_mode: str = "memory"):
         """
         Initialize RAG system
         
@@ -26,6 +27,7 @@ class RAGSystem:
             model_name: HuggingFace model for embeddings
             index_path: Path for vector index storage
             force_rebuild: Whether to force rebuild the index
+            storage_mode: Vector storage mode ("memory" or "mmap_int8")
         """
         self.upload_folder = upload_folder
         self.model_name = model_name
@@ -34,11 +36,13 @@ class RAGSystem:
         
         # Initialize components
         self.doc_processor = DocumentProcessor(upload_folder)
-        self.vector_store = VectorStore(model_name, index_path, force_rebuild)
+        self.vector_store = VectorStore(model_name, index_path, force_rebuild,
+                                        storage_mode=storage_mode)
         
         # Track initialization status
         self.is_initialized = False
         self.documents = []
+        self.document_stats: Dict[str, Any] = {}
         
         # Category mappings for better retrieval
         self.category_keywords = {
@@ -79,8 +83,14 @@ class RAGSystem:
             
             if success:
                 self.is_initialized = True
+                self.document_stats = self.doc_processor.get_document_stats()
                 logger.info(f"RAG system initialized with {len(self.documents)} documents")
                 
+                if self.vector_store.storage_mode != "memory":
+                    # Document text is served from disk; drop the parsed copies
+                    self.documents = []
+                    self.doc_processor.documents = []
+                
                 # Log statistics
                 stats = self.get_system_stats()
                 logger.info(f"Document categories: {list(stats['doc_categories'].keys())}")
@@ -114,13 +124,19 @@ class RAGSystem:
             relevant_categories = self._identify_relevant_categories(question)
             
             if relevant_categories:
+                # Embed the question once for all category and general searches
+                query_embedding = self.vector_store.embed_query(question)
+                
                 # Search within relevant categories
                 category_results = self.vector_store.search_by_categories(
-                    question, relevant_categories, top_k_per_category=2
+                    question, relevant_categories, top_k_per_category=2,
+                    query_embedding=query_embedding
                 )
                 
                 # Also do a general search
-                general_results = self.vector_store.search(question, top_k=3)
+                general_results = self.vector_store.search(
+                    question, top_k=3, query_embedding=query_embedding
+                )
                 
                 # Combine and format results
                 context = self._format_context_from_results(
@@ -136,6 +152,21 @@ class RAGSystem:
             logger.error(f"Error getting relevant context: {e}")
             return ""
     
+    def embed_query_variants(self, queries: List[str]):
+        """
+        Encode several query variants in one forward pass
+        
+        The embeddings land in the vector store's query cache, so later
+        context lookups for any of these queries skip the model entirely.
+        
+        Args:
+            queries: Query texts to encode
+            
+        Returns:
+            Array of query embeddings, one row per query
+        """
+        return self.vector_store.embed_queries(queries)
+    
     def search_personal_data(self, query: str, category: Optional[str] = None, 
                            top_k: int = 5) -> List[Tuple[Document, float]]:
         """
@@ -274,14 +305,11 @@ class RAGSystem:
         return "\n\n".join(context_parts)
     
     async def reload_data(self) -> bool:
-        """Reload and reindex all data"""
+        """Reload all data and reindex only chunks that were added, changed or removed"""
         try:
             logger.info("Reloading RAG system data...")
             
-            # Set force rebuild
-            self.vector_store.force_rebuild = True
-            
-            # Reinitialize
+            # Reinitialize; the vector store diffs against its manifest
             return await self.initialize()
             
         except Exception as e:
@@ -292,14 +320,14 @@ class RAGSystem:
         """Get comprehensive system statistics"""
         stats = {
             'is_initialized': self.is_initialized,
-            'total_documents': len(self.documents),
+            'total_documents': self.document_stats.get('total_documents', len(self.documents)),
             'doc_categories': {},
             'vector_store_stats': {}
         }
         
-        if self.documents:
+        if self.document_stats:
             # Document statistics
-            doc_stats = self.doc_processor.get_document_stats()
+            doc_stats = self.document_stats
             stats['doc_categories'] = doc_stats.get('categories', {})
             stats['total_words'] = doc_stats.get('total_words', 0)
             
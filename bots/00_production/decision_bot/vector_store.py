@@ -4,23 +4,40 @@ Manages embeddings and similarity search using HuggingFace models and FAISS
 """
 
 import os
+import sys
 import json
 import pickle
+import hashlib
 import logging
+import threading
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional
-from sentence_transformers import SentenceTransformer
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple, Optional, Mapping
 import faiss
 from document_processor import Document
+from quantized_store import Int8VectorIndex, LazyDocumentStore
+
+# Shared embedding model (one copy per process or sidecar) from the repository root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+try:
+    from embedding_service import get_embedder
+except ImportError:
+    from sentence_transformers import SentenceTransformer as get_embedder
 
 logger = logging.getLogger(__name__)
 
 class VectorStore:
     """Vector store for semantic search using HuggingFace embeddings"""
     
+    # "memory": float32 FAISS index and pickled documents held in RAM
+    # "mmap_int8": int8 vectors memory-mapped from disk, documents read lazily
+    STORAGE_MODES = ("memory", "mmap_int8")
+    
     def __init__(self, model_name: str = "all-MiniLM-L6-v2", 
                  index_path: str = "./vector_index",
-                 force_rebuild: bool = False):
+                 force_rebuild: bool = False,
+                 query_cache_size: int = 256,
+                 storage_mode: str = "memory"):
         """
         Initialize vector store
         
@@ -28,15 +45,28 @@ class VectorStore:
             model_name: HuggingFace sentence transformer model name
             index_path: Path to save/load vector index
             force_rebuild: Whether to force rebuilding the index
+            query_cache_size: Maximum number of cached query embeddings
+            storage_mode: "memory" or "mmap_int8" (see STORAGE_MODES)
         """
+        if storage_mode not in self.STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {storage_mode}")
+        
         self.model_name = model_name
         self.index_path = index_path
         self.force_rebuild = force_rebuild
+        self.storage_mode = storage_mode
+        
+        # Bounded LRU cache of query embeddings keyed by (model, normalized text)
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
         
         # Initialize embedding model
         try:
             logger.info(f"Loading embedding model: {model_name}")
-            self.embedding_model = SentenceTransformer(model_name)
+            self.embedding_model = get_embedder(model_name)
             self.embedding_dim = self.embedding_model.get_sentence_embedding_dimension()
             logger.info(f"Embedding dimension: {self.embedding_dim}")
         except Exception as e:
@@ -48,12 +78,24 @@ class VectorStore:
         self.documents: List[Document] = []
         self.document_metadata: List[Dict[str, Any]] = []
         
+        # Incremental indexing state: chunk_id -> {'id', 'hash', 'category'} and vector id -> Document
+        self.manifest_entries: Dict[str, Dict[str, Any]] = {}
+        self.id_to_document: Mapping[int, Document] = {}
+        self.next_id = 0
+        
+        # Per-category sub-indexes so filtered searches only scan matching vectors
+        self.category_indexes: Dict[str, Any] = {}
+        
         # Create index directory if it doesn't exist
         os.makedirs(index_path, exist_ok=True)
     
     def build_index(self, documents: List[Document]) -> bool:
         """
-        Build vector index from documents
+        Build or incrementally update the vector index from documents
+        
+        Chunks are matched against the persisted manifest by content hash:
+        unchanged chunks keep their vectors, changed or new chunks are
+        embedded, and vectors of chunks that disappeared are removed.
         
         Args:
             documents: List of Document objects to index
@@ -62,53 +104,74 @@ class VectorStore:
             bool: Success status
         """
         try:
-            # Check if index exists and should be loaded
-            if not self.force_rebuild and self._index_exists():
-                logger.info("Loading existing vector index...")
-                return self._load_index()
-            
-            logger.info(f"Building vector index for {len(documents)} documents...")
-            
-            # Extract text content for embedding
-            texts = [doc.content for doc in documents]
-            
-            # Generate embeddings in batches
-            batch_size = 32
-            embeddings = []
-            
-            for i in range(0, len(texts), batch_size):
-                batch_texts = texts[i:i + batch_size]
-                batch_embeddings = self.embedding_model.encode(
-                    batch_texts,
-                    show_progress_bar=True,
-                    normalize_embeddings=True
-                )
-                embeddings.extend(batch_embeddings)
+            if self.force_rebuild or not self._load_index():
+                logger.info("Starting vector index from scratch")
+                self._reset_index()
+            
+            previous_entries = self.manifest_entries
+            previous_documents = self.id_to_document
+            
+            # Vectors of chunks that vanished or changed can be reused by any
+            # chunk with identical content (e.g. CSV rows shifting position)
+            reusable_by_hash: Dict[str, List[int]] = {}
+            current_chunk_ids = {doc.chunk_id for doc in documents}
+            for chunk_id, entry in previous_entries.items():
+                if chunk_id not in current_chunk_ids:
+                    reusable_by_hash.setdefault(entry['hash'], []).append(entry['id'])
+            
+            new_entries: Dict[str, Dict[str, Any]] = {}
+            new_documents: Dict[int, Document] = {}
+            to_embed: List[Tuple[int, Document]] = []
+            kept_ids = set()
+            
+            for doc in documents:
+                content_hash = self._content_hash(doc.content)
+                entry = previous_entries.get(doc.chunk_id)
+                
+                if entry and entry['hash'] == content_hash and entry['id'] not in kept_ids:
+                    vector_id = entry['id']
+                elif reusable_by_hash.get(content_hash):
+                    vector_id = reusable_by_hash[content_hash].pop()
+                else:
+                    vector_id = self.next_id
+                    self.next_id += 1
+                    to_embed.append((vector_id, doc))
                 
-                if i % 100 == 0:
-                    logger.info(f"Processed {i}/{len(texts)} documents")
-            
-            # Convert to numpy array
-            embeddings_array = np.array(embeddings).astype('float32')
-            
-            # Create FAISS index
-            self.index = faiss.IndexFlatIP(self.embedding_dim)  # Inner product for normalized vectors
-            self.index.add(embeddings_array)
-            
-            # Store documents and metadata
-            self.documents = documents
-            self.document_metadata = [
-                {
-                    'chunk_id': doc.chunk_id,
-                    'source': doc.source,
-                    'category': doc.category,
-                    'metadata': doc.metadata
-                }
-                for doc in documents
-            ]
+                kept_ids.add(vector_id)
+                new_entries[doc.chunk_id] = {'id': vector_id, 'hash': content_hash, 'category': doc.category}
+                new_documents[vector_id] = doc
+            
+            stale_ids = [vector_id for vector_id in previous_documents if vector_id not in kept_ids]
+            documents_changed = any(
+                previous_documents.get(vector_id) != doc for vector_id, doc in new_documents.items()
+            )
+            
+            if not to_embed and not stale_ids and not documents_changed:
+                logger.info(f"Vector index up to date ({len(documents)} documents, no embedding needed)")
+                self._set_documents(new_entries, previous_documents)
+                return True
+            
+            logger.info(
+                f"Updating vector index: {len(to_embed)} to embed, {len(stale_ids)} to remove, "
+                f"{len(documents) - len(to_embed)} reused"
+            )
+            
+            # Embed first: if embedding fails, the loaded index is still untouched
+            if to_embed:
+                embeddings_array = self._embed_texts([doc.content for _, doc in to_embed])
+                ids_array = np.array([vector_id for vector_id, _ in to_embed], dtype='int64')
+            
+            if stale_ids:
+                self.index.remove_ids(np.array(stale_ids, dtype='int64'))
+            
+            if to_embed:
+                self.index.add_with_ids(embeddings_array, ids_array)
+            
+            self._set_documents(new_entries, new_documents)
             
             # Save index to disk
             self._save_index()
+            self.force_rebuild = False
             
             logger.info(f"Successfully built vector index with {len(documents)} documents")
             return True
@@ -117,17 +180,189 @@ class VectorStore:
             logger.error(f"Error building vector index: {e}")
             return False
     
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Generate normalized embeddings for texts in batches"""
+        batch_size = 32
+        embeddings = []
+        
+        for i in range(0, len(texts), batch_size):
+            batch_texts = texts[i:i + batch_size]
+            batch_embeddings = self.embedding_model.encode(
+                batch_texts,
+                show_progress_bar=len(texts) > batch_size,
+                normalize_embeddings=True
+            )
+            embeddings.extend(batch_embeddings)
+            
+            if i % 100 == 0:
+                logger.info(f"Processed {i}/{len(texts)} documents")
+        
+        return np.array(embeddings).astype('float32').reshape(-1, self.embedding_dim)
+    
+    def _reset_index(self):
+        """Create an empty ID-mapped index and clear the manifest"""
+        if self.storage_mode == "mmap_int8":
+            self.index = Int8VectorIndex(self.embedding_dim)
+        else:
+            # Inner product on normalized vectors; IDMap2 allows removing single vectors
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_dim))
+        self.manifest_entries = {}
+        self.id_to_document = {}
+        self.category_indexes = {}
+        self.next_id = 0
+        self.documents = []
+        self.document_metadata = []
+    
+    def _set_documents(self, entries: Dict[str, Dict[str, Any]], documents: Mapping[int, Document]):
+        """Replace the document mappings"""
+        self.manifest_entries = entries
+        self.id_to_document = documents
+        if isinstance(documents, LazyDocumentStore):
+            # Served from disk on lookup; keep nothing resident
+            self.documents = []
+            self.document_metadata = []
+        else:
+            self.documents = list(documents.values())
+            self.document_metadata = self._document_metadata(self.documents)
+        self._build_category_indexes()
+    
+    @staticmethod
+    def _document_metadata(documents) -> List[Dict[str, Any]]:
+        """Metadata records written to metadata.json"""
+        return [
+            {
+                'chunk_id': doc.chunk_id,
+                'source': doc.source,
+                'category': doc.category,
+                'metadata': doc.metadata
+            }
+            for doc in documents
+        ]
+    
+    def _vector_categories(self) -> Dict[int, str]:
+        """Map vector id -> category without touching lazily stored documents"""
+        categories = {}
+        for entry in self.manifest_entries.values():
+            category = entry.get('category')
+            if category is None:
+                doc = self.id_to_document.get(entry['id'])
+                category = doc.category if doc else ''
+            categories[entry['id']] = category
+        return categories
+    
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        """Hash of the text that gets embedded"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def _build_category_indexes(self):
+        """Partition the stored vectors into one sub-index per category"""
+        self.category_indexes = {}
+        if self.index is None or self.index.ntotal == 0:
+            return
+        
+        vector_categories = self._vector_categories()
+        
+        if isinstance(self.index, Int8VectorIndex):
+            ids_by_category: Dict[str, List[int]] = {}
+            for vector_id, category in vector_categories.items():
+                if category:
+                    ids_by_category.setdefault(category, []).append(vector_id)
+            for category, ids in ids_by_category.items():
+                # Views only hold row numbers; vectors stay on disk
+                self.category_indexes[category] = self.index.subset(np.array(ids, dtype='int64'))
+        else:
+            ids = faiss.vector_to_array(self.index.id_map).astype('int64')
+            vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+            categories = np.array([vector_categories.get(int(vector_id), '') for vector_id in ids])
+            
+            for category in set(categories.tolist()):
+                if not category:
+                    continue
+                mask = categories == category
+                sub_index = faiss.IndexIDMap(faiss.IndexFlatIP(self.embedding_dim))
+                sub_index.add_with_ids(vectors[mask], ids[mask])
+                self.category_indexes[category] = sub_index
+        
+        logger.debug(f"Built {len(self.category_indexes)} category sub-indexes")
+    
+    @staticmethod
+    def _normalize_query(text: str) -> str:
+        """Normalize query text for cache lookups"""
+        return " ".join(text.split())
+    
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Encode several queries, serving repeats from the LRU cache
+        
+        All cache misses are encoded together in a single forward pass.
+        
+        Args:
+            queries: Query texts (e.g. variants of one question)
+            
+        Returns:
+            Array of normalized float32 embeddings, one row per query
+        """
+        keys = [(self.model_name, self._normalize_query(query)) for query in queries]
+        embeddings: Dict[Tuple[str, str], np.ndarray] = {}
+        
+        with self._query_cache_lock:
+            for key in keys:
+                cached = self._query_cache.get(key)
+                if cached is not None:
+                    self._query_cache.move_to_end(key)
+                    embeddings[key] = cached
+                    self.query_cache_hits += 1
+        
+        missing = list(dict.fromkeys(key for key in keys if key not in embeddings))
+        if missing:
+            encoded = self.embedding_model.encode(
+                [text for _, text in missing],
+                normalize_embeddings=True
+            )
+            encoded = np.asarray(encoded, dtype='float32').reshape(len(missing), -1)
+            
+            with self._query_cache_lock:
+                self.query_cache_misses += len(missing)
+                for key, embedding in zip(missing, encoded):
+                    embeddings[key] = embedding
+                    self._query_cache[key] = embedding
+                    self._query_cache.move_to_end(key)
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        
+        if not keys:
+            return np.empty((0, self.embedding_dim), dtype='float32')
+        return np.stack([embeddings[key] for key in keys])
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """Encode a query into a normalized float32 embedding (cached)"""
+        return self.embed_queries([query])[0]
+    
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of the query embedding cache"""
+        total = self.query_cache_hits + self.query_cache_misses
+        return {
+            'size': len(self._query_cache),
+            'max_size': self.query_cache_size,
+            'hits': self.query_cache_hits,
+            'misses': self.query_cache_misses,
+            'hit_rate': self.query_cache_hits / total if total else 0.0
+        }
+    
     def search(self, query: str, top_k: int = 5, 
                category_filter: Optional[str] = None,
-               min_score: float = 0.0) -> List[Tuple[Document, float]]:
+               min_score: float = 0.0,
+               query_embedding: Optional[np.ndarray] = None) -> List[Tuple[Document, float]]:
         """
         Search for similar documents
         
         Args:
             query: Search query text
             top_k: Number of top results to return
-            category_filter: Filter results by category
+            category_filter: Restrict the search to this category's sub-index
             min_score: Minimum similarity score threshold
+            query_embedding: Precomputed embedding of the query (skips encoding)
             
         Returns:
             List of (Document, similarity_score) tuples
@@ -137,37 +372,40 @@ class VectorStore:
                 logger.error("Vector index not initialized")
                 return []
             
+            if category_filter:
+                index = self.category_indexes.get(category_filter)
+                if index is None:
+                    return []
+            else:
+                index = self.index
+            
+            k = min(top_k, index.ntotal)
+            if k <= 0:
+                return []
+            
             # Generate query embedding
-            query_embedding = self.embedding_model.encode(
-                [query],
-                normalize_embeddings=True
-            )[0]
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
             
-            # Perform similarity search
-            scores, indices = self.index.search(
-                query_embedding.reshape(1, -1).astype('float32'),
-                min(top_k * 2, len(self.documents))  # Get more results for filtering
+            # Perform similarity search; a category sub-index only holds matching vectors
+            scores, indices = index.search(
+                np.asarray(query_embedding, dtype='float32').reshape(1, -1),
+                k
             )
             
             results = []
             for score, idx in zip(scores[0], indices[0]):
-                if idx >= len(self.documents):
+                doc = self.id_to_document.get(int(idx))
+                if doc is None:
                     continue
-                    
-                doc = self.documents[idx]
+                
                 similarity_score = float(score)
                 
                 # Apply filters
                 if min_score > 0 and similarity_score < min_score:
                     continue
                 
-                if category_filter and doc.category != category_filter:
-                    continue
-                
                 results.append((doc, similarity_score))
-                
-                if len(results) >= top_k:
-                    break
             
             logger.debug(f"Found {len(results)} results for query: {query[:50]}...")
             return results
@@ -177,25 +415,37 @@ class VectorStore:
             return []
     
     def search_by_categories(self, query: str, categories: List[str], 
-                           top_k_per_category: int = 2) -> Dict[str, List[Tuple[Document, float]]]:
+                           top_k_per_category: int = 2,
+                           query_embedding: Optional[np.ndarray] = None) -> Dict[str, List[Tuple[Document, float]]]:
         """
         Search for documents across multiple categories
         
+        The query is embedded once and reused for every category sub-index.
+        
         Args:
             query: Search query text
             categories: List of categories to search in
             top_k_per_category: Number of results per category
+            query_embedding: Precomputed embedding of the query (skips encoding)
             
         Returns:
             Dictionary mapping category to list of (Document, score) tuples
         """
         results = {}
         
-        for category in categories:
+        searchable = [category for category in categories if category in self.category_indexes]
+        if not searchable:
+            return results
+        
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+        
+        for category in searchable:
             category_results = self.search(
                 query=query,
                 top_k=top_k_per_category,
-                category_filter=category
+                category_filter=category,
+                query_embedding=query_embedding
             )
             if category_results:
                 results[category] = category_results
@@ -247,41 +497,71 @@ class VectorStore:
             return ""
     
     def _index_exists(self) -> bool:
-        """Check if vector index files exist"""
+        """Check if vector index files exist for the configured storage mode"""
+        manifest_file = os.path.join(self.index_path, "manifest.json")
+        if not os.path.exists(manifest_file):
+            return False
+        
+        if self.storage_mode == "mmap_int8":
+            return Int8VectorIndex.exists(self.index_path) and LazyDocumentStore.exists(self.index_path)
+        
         index_file = os.path.join(self.index_path, "faiss.index")
         docs_file = os.path.join(self.index_path, "documents.pkl")
-        metadata_file = os.path.join(self.index_path, "metadata.json")
-        
-        return all(os.path.exists(f) for f in [index_file, docs_file, metadata_file])
+        return all(os.path.exists(f) for f in [index_file, docs_file])
     
     def _save_index(self):
-        """Save vector index and metadata to disk"""
+        """Save vector index, manifest and metadata to disk"""
         try:
-            # Save FAISS index
-            index_file = os.path.join(self.index_path, "faiss.index")
-            faiss.write_index(self.index, index_file)
-            
-            # Save documents
-            docs_file = os.path.join(self.index_path, "documents.pkl")
-            with open(docs_file, 'wb') as f:
-                pickle.dump(self.documents, f)
+            if self.storage_mode == "mmap_int8":
+                # Quantized vectors and offset-indexed documents, then switch to lazy reads
+                self.index.save(self.index_path)
+                LazyDocumentStore.write(self.index_path, self.id_to_document)
+                document_metadata = self._document_metadata(self.id_to_document.values())
+            else:
+                # Save FAISS index
+                index_file = os.path.join(self.index_path, "faiss.index")
+                faiss.write_index(self.index, index_file)
+                
+                # Save documents keyed by vector id
+                docs_file = os.path.join(self.index_path, "documents.pkl")
+                with open(docs_file, 'wb') as f:
+                    pickle.dump(dict(self.id_to_document), f)
+                document_metadata = self.document_metadata
             
             # Save metadata
             metadata_file = os.path.join(self.index_path, "metadata.json")
             with open(metadata_file, 'w') as f:
-                json.dump(self.document_metadata, f, indent=2)
+                json.dump(document_metadata, f, indent=2, default=str)
             
             # Save model info
             model_info = {
                 'model_name': self.model_name,
                 'embedding_dim': self.embedding_dim,
-                'num_documents': len(self.documents)
+                'num_documents': len(self.id_to_document)
             }
             
             model_file = os.path.join(self.index_path, "model_info.json")
             with open(model_file, 'w') as f:
                 json.dump(model_info, f, indent=2)
             
+            # Save manifest last so it only exists for a complete index
+            manifest = {
+                'model_name': self.model_name,
+                'embedding_dim': self.embedding_dim,
+                'storage_mode': self.storage_mode,
+                'next_id': self.next_id,
+                'chunks': self.manifest_entries
+            }
+            
+            manifest_file = os.path.join(self.index_path, "manifest.json")
+            tmp_file = manifest_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_file, manifest_file)
+            
+            if self.storage_mode == "mmap_int8":
+                self._set_documents(self.manifest_entries, LazyDocumentStore(self.index_path))
+            
             logger.info("Vector index saved successfully")
             
         except Exception as e:
@@ -289,33 +569,54 @@ class VectorStore:
             raise
     
     def _load_index(self) -> bool:
-        """Load vector index and metadata from disk"""
+        """Load vector index, manifest and metadata from disk"""
+        if self.index is not None and self.manifest_entries:
+            # Already in memory from a previous build
+            return True
+        
+        if not self._index_exists():
+            return False
+        
         try:
-            # Load model info and verify compatibility
-            model_file = os.path.join(self.index_path, "model_info.json")
-            if os.path.exists(model_file):
-                with open(model_file, 'r') as f:
-                    model_info = json.load(f)
+            # Load manifest and verify compatibility
+            manifest_file = os.path.join(self.index_path, "manifest.json")
+            with open(manifest_file, 'r') as f:
+                manifest = json.load(f)
+            
+            if manifest.get('model_name') != self.model_name:
+                logger.warning(f"Model mismatch: {manifest.get('model_name')} vs {self.model_name}")
+                return False
+            
+            if manifest.get('storage_mode', 'memory') != self.storage_mode:
+                logger.warning(f"Storage mode changed: {manifest.get('storage_mode', 'memory')} vs {self.storage_mode}")
+                return False
+            
+            if self.storage_mode == "mmap_int8":
+                index = Int8VectorIndex.load(self.index_path, self.embedding_dim)
+                id_to_document = LazyDocumentStore(self.index_path)
+            else:
+                # Load FAISS index
+                index_file = os.path.join(self.index_path, "faiss.index")
+                index = faiss.read_index(index_file)
+                
+                # Load documents
+                docs_file = os.path.join(self.index_path, "documents.pkl")
+                with open(docs_file, 'rb') as f:
+                    id_to_document = pickle.load(f)
                 
-                if model_info.get('model_name') != self.model_name:
-                    logger.warning(f"Model mismatch: {model_info.get('model_name')} vs {self.model_name}")
+                if not isinstance(id_to_document, dict):
+                    logger.warning("Legacy document format found, rebuilding")
                     return False
             
-            # Load FAISS index
-            index_file = os.path.join(self.index_path, "faiss.index")
-            self.index = faiss.read_index(index_file)
+            if index.ntotal != len(id_to_document):
+                logger.warning("Vector index files are inconsistent, rebuilding")
+                return False
             
-            # Load documents
-            docs_file = os.path.join(self.index_path, "documents.pkl")
-            with open(docs_file, 'rb') as f:
-                self.documents = pickle.load(f)
+            self.index = index
+            self.next_id = manifest.get('next_id', 0)
+            self._set_documents(manifest.get('chunks', {}), id_to_document)
             
-            # Load metadata
-            metadata_file = os.path.join(self.index_path, "metadata.json")
-            with open(metadata_file, 'r') as f:
-                self.document_metadata = json.load(f)
-            
-            logger.info(f"Loaded vector index with {len(self.documents)} documents")
+            logger.info(f"Loaded vector index with {len(self.id_to_document)} documents ({self.storage_mode})")
             return True
             
         except Exception as e:
@@ -324,20 +625,24 @@ class VectorStore:
     
     def get_index_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector index"""
-        if not self.documents:
+        if not self.id_to_document:
             return {}
         
         # Count by category
         category_counts = {}
-        for doc in self.documents:
-            category_counts[doc.category] = category_counts.get(doc.category, 0) + 1
+        for category in self._vector_categories().values():
+            category_counts[category] = category_counts.get(category, 0) + 1
+        
+        bytes_per_value = 1 if self.storage_mode == "mmap_int8" else 4
         
         return {
-            'total_documents': len(self.documents),
+            'total_documents': len(self.id_to_document),
             'embedding_dimension': self.embedding_dim,
             'model_name': self.model_name,
+            'storage_mode': self.storage_mode,
             'categories': category_counts,
-            'index_size_mb': self.index.ntotal * self.embedding_dim * 4 / (1024 * 1024) if self.index else 0
+            'query_cache': self.get_query_cache_stats(),
+            'index_size_mb': self.index.ntotal * self.embedding_dim * bytes_per_value / (1024 * 1024) if self.index else 0
         }
     
     def rebuild_index(self, documents: List[Document]) -> bool:
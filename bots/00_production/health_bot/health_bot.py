@@ -11,6 +11,7 @@ from apscheduler.triggers.cron import CronTrigger
 
 from config import Config
 from oura_client import OuraClient, HealthData
+from health_store import OuraDataStore
 from health_analyzer import HealthAnalyzer, HealthInsight
 
 # Import bot status manager
@@ -39,6 +40,7 @@ class HealthBot(commands.Bot):
         
         self.config = Config()
         self.oura_client = OuraClient(self.config.OURA_ACCESS_TOKEN)
+        self.health_store = OuraDataStore(self.oura_client)
         self.health_analyzer = HealthAnalyzer()
         self.scheduler = AsyncIOScheduler()
         
@@ -74,6 +76,8 @@ class HealthBot(commands.Bot):
         logger.info(f'{self.user} has connected to Discord!')
         logger.info(f'Health channel ID: {self.config.HEALTH_CHANNEL_ID}')
         
+        await self.status_manager.send_startup_message()
+        
         # Send custom health bot startup message
         await self.send_health_bot_startup_message()
     
@@ -210,8 +214,9 @@ class HealthBot(commands.Bot):
                 )
                 return
             
-            # Get yesterday's data
-            health_data = self.oura_client.get_yesterday_data()
+            # Fetch only new/revised days, then build the report from the local store
+            await asyncio.to_thread(self.health_store.sync)
+            health_data = await asyncio.to_thread(self.health_store.get_yesterday_data)
             if not health_data:
                 await self._send_user_friendly_error(
                     self.get_channel(self.config.HEALTH_CHANNEL_ID),
@@ -227,8 +232,8 @@ class HealthBot(commands.Bot):
                 )
                 return
             
-            # Analyze health data
-            insight = self.health_analyzer.analyze(health_data)
+            # Analyze health data (in a worker thread, the calories lookup blocks on Notion)
+            insight = await asyncio.to_thread(self.health_analyzer.analyze, health_data)
             
             # Send Discord message
             await self._send_health_message(health_data, insight)
@@ -0,0 +1,205 @@
+"""Local SQLite store of Oura daily data with incremental sync."""
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from oura_client import OuraClient, HealthData, build_health_data, has_meaningful_data
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "health_data.db")
+
+
+class OuraDataStore:
+    """Keeps Oura daily records on disk and serves reports and trends from them.
+
+    Each endpoint has its own watermark (the last day fetched). A sync fetches
+    the days after the watermark in one range request per endpoint, plus a
+    refresh window before it, because Oura revises recent days (activity data
+    arrives with up to 5 days delay).
+    """
+
+    ENDPOINTS = [
+        "daily_sleep",
+        "daily_readiness",
+        "daily_activity",
+        "daily_spo2",
+        "daily_stress",
+        "daily_cardiovascular_age",
+        "daily_resilience",
+    ]
+
+    def __init__(self, client: OuraClient, db_path: Optional[str] = None,
+                 history_days: int = 30, refresh_days: int = 7):
+        """
+        Open (or create) the store.
+
+        Args:
+            client: Oura API client used for syncing
+            db_path: SQLite file, defaults to HEALTH_STORE_DB or health_data.db
+            history_days: Days fetched on the first sync of an endpoint
+            refresh_days: Days before the watermark that are fetched again
+        """
+        self.client = client
+        self.db_path = db_path or os.getenv("HEALTH_STORE_DB", DEFAULT_STORE_PATH)
+        self.history_days = history_days
+        self.refresh_days = refresh_days
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_db()
+
+    def _init_db(self):
+        """Create tables."""
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS oura_daily (
+                    endpoint TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (endpoint, day)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    endpoint TEXT PRIMARY KEY,
+                    synced_until TEXT,
+                    synced_at TEXT
+                )
+            """)
+            self.conn.commit()
+
+    def get_watermark(self, endpoint: str) -> Optional[str]:
+        """Last day fetched for an endpoint (YYYY-MM-DD) or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT synced_until FROM sync_state WHERE endpoint = ?", (endpoint,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def sync(self, today: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Fetch new and revised days of every endpoint.
+
+        Endpoints that fail keep their watermark and are retried on the next sync.
+
+        Returns:
+            Number of stored records per endpoint (-1 for failed endpoints)
+        """
+        today = today or datetime.now()
+        end_date = today.strftime("%Y-%m-%d")
+        results = {}
+
+        for endpoint in self.ENDPOINTS:
+            watermark = self.get_watermark(endpoint)
+            if watermark:
+                start = datetime.strptime(watermark, "%Y-%m-%d") - timedelta(days=self.refresh_days)
+            else:
+                start = today - timedelta(days=self.history_days)
+            start_date = start.strftime("%Y-%m-%d")
+
+            try:
+                records = self.client.get_daily_range(endpoint, start_date, end_date)
+            except Exception as e:
+                logger.error(f"Error syncing {endpoint}: {e}")
+                results[endpoint] = -1
+                continue
+
+            self.store_records(endpoint, records, synced_until=end_date)
+            results[endpoint] = len(records)
+
+        logger.info(f"Health store synced: {results}")
+        return results
+
+    def store_records(self, endpoint: str, records: List[Dict], synced_until: Optional[str] = None):
+        """Upsert daily records of an endpoint and advance its watermark."""
+        rows = [(endpoint, record["day"], json.dumps(record)) for record in records if record.get("day")]
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO oura_daily (endpoint, day, data) VALUES (?, ?, ?)", rows
+            )
+            if synced_until:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (endpoint, synced_until, synced_at) VALUES (?, ?, ?)",
+                    (endpoint, synced_until, datetime.now().isoformat())
+                )
+            self.conn.commit()
+
+    def get_day(self, endpoint: str, date: str) -> Optional[Dict]:
+        """Stored record of an endpoint for one day."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM oura_daily WHERE endpoint = ? AND day = ?", (endpoint, date)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_range(self, endpoint: str, start_date: str, end_date: str) -> List[Dict]:
+        """Stored records of an endpoint between two days (inclusive), oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM oura_daily WHERE endpoint = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (endpoint, start_date, end_date)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_latest_activity_data(self, before: Optional[str] = None) -> Optional[Dict]:
+        """Most recent stored activity record up to yesterday (activity has a 5-day delay)."""
+        end_date = before or (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        start_date = (datetime.strptime(end_date, "%Y-%m-%d") - timedelta(days=29)).strftime("%Y-%m-%d")
+        records = self.get_range("daily_activity", start_date, end_date)
+        return records[-1] if records else None
+
+    def get_comprehensive_health_data(self, date: str) -> Optional[HealthData]:
+        """Build the report for one day from stored records (no API calls)."""
+        return build_health_data(
+            date,
+            sleep_data=self.get_day("daily_sleep", date),
+            readiness_data=self.get_day("daily_readiness", date),
+            spo2_data=self.get_day("daily_spo2", date),
+            stress_data=self.get_day("daily_stress", date),
+            cardio_data=self.get_day("daily_cardiovascular_age", date),
+            resilience_data=self.get_day("daily_resilience", date),
+            activity_data=self.get_latest_activity_data()
+        )
+
+    def get_yesterday_data(self) -> Optional[HealthData]:
+        """Most recent meaningful report of the last 5 days from stored records."""
+        for days_back in range(1, 6):
+            date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+            data = self.get_comprehensive_health_data(date)
+            if data and has_meaningful_data(data):
+                logger.info(f"✅ Found meaningful health data for date: {date}")
+                return data
+
+        logger.warning("❌ No meaningful health data found for the last 5 days")
+        return None
+
+    def get_trend(self, endpoint: str, field: str, days: int = 365) -> List[Tuple[str, float]]:
+        """
+        Daily values of one field over the last days, e.g. ("daily_sleep", "score").
+
+        Args:
+            endpoint: Oura endpoint name
+            field: Top-level field or JSON path below the record, e.g. "spo2_percentage.average"
+            days: Number of days back from today
+
+        Returns:
+            List of (day, value) tuples, oldest first, days without a value skipped
+        """
+        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT day, json_extract(data, ?) FROM oura_daily "
+                "WHERE endpoint = ? AND day >= ? ORDER BY day",
+                (f"$.{field}", endpoint, start_date)
+            ).fetchall()
+        return [(day, value) for day, value in rows if value is not None]
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self.conn.close()
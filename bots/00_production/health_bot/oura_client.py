@@ -1,7 +1,7 @@
 """Oura API client for fetching health data."""
 import requests
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 import logging
 
@@ -182,6 +182,32 @@ class OuraClient:
             logger.error(f"Error fetching latest activity data: {e}")
             return None
     
+    def get_daily_range(self, endpoint: str, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Fetch all daily records of one endpoint in a date range (follows next_token).
+        
+        Args:
+            endpoint: Collection name, e.g. "daily_sleep"
+            start_date: First day (YYYY-MM-DD)
+            end_date: Last day (YYYY-MM-DD), inclusive
+            
+        Returns:
+            List of daily records (raises on API errors)
+        """
+        url = f"{self.BASE_URL}/{endpoint}"
+        params = {"start_date": start_date, "end_date": end_date}
+        records = []
+        
+        while True:
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            records.extend(data.get("data", []))
+            
+            if not data.get("next_token"):
+                return records
+            params["next_token"] = data["next_token"]
+    
     def get_comprehensive_health_data(self, date: str) -> Optional[HealthData]:
         """
         Fetch comprehensive health data combining all available endpoints.
@@ -194,64 +220,17 @@ class OuraClient:
         """
         logger.info(f"Fetching comprehensive health data for: {date}")
         
-        # Get recent data (1-day delay)
-        sleep_data = self.get_daily_sleep(date)
-        readiness_data = self.get_daily_readiness(date)
-        spo2_data = self.get_daily_spo2(date)
-        stress_data = self.get_daily_stress(date)
-        cardio_data = self.get_daily_cardiovascular_age(date)
-        resilience_data = self.get_daily_resilience(date)
-        
-        # Get latest activity data (5-day delay)
-        activity_data = self.get_latest_activity_data()
-        
-        # Determine the most appropriate date for the report
-        report_date = date
-        if activity_data and activity_data.get("day"):
-            # If we have activity data, it might be from a different date
-            activity_date = activity_data.get("day")
-            if activity_date != date:
-                logger.info(f"Using activity data from {activity_date} (most recent available)")
-        
-        # If we have at least one data source, create a report
-        if any([sleep_data, readiness_data, activity_data, spo2_data, stress_data]):
-            logger.info(f"Found data - Sleep: {'✅' if sleep_data else '❌'}, "
-                       f"Readiness: {'✅' if readiness_data else '❌'}, "
-                       f"Activity: {'✅' if activity_data else '❌'}, "
-                       f"SpO2: {'✅' if spo2_data else '❌'}, "
-                       f"Stress: {'✅' if stress_data else '❌'}")
-            
-            return HealthData(
-                date=report_date,
-                # Activity data (may be from different date due to delay)
-                total_calories=activity_data.get("total_calories", 0) if activity_data else 0,
-                active_calories=activity_data.get("active_calories", 0) if activity_data else 0,
-                inactive_calories=activity_data.get("inactive_calories", 0) if activity_data else 0,
-                steps=activity_data.get("steps", 0) if activity_data else 0,
-                activity_score=activity_data.get("score") if activity_data else None,
-                # Sleep data
-                sleep_score=sleep_data.get("score") if sleep_data else None,
-                sleep_contributors=sleep_data.get("contributors") if sleep_data else None,
-                # Readiness data
-                readiness_score=readiness_data.get("score") if readiness_data else None,
-                readiness_contributors=readiness_data.get("contributors") if readiness_data else None,
-                temperature_deviation=readiness_data.get("temperature_deviation") if readiness_data else None,
-                # SpO2 data
-                spo2_average=spo2_data.get("spo2_percentage", {}).get("average") if spo2_data else None,
-                breathing_disturbance_index=spo2_data.get("breathing_disturbance_index") if spo2_data else None,
-                # Stress data
-                stress_high=stress_data.get("stress_high") if stress_data else None,
-                recovery_high=stress_data.get("recovery_high") if stress_data else None,
-                stress_summary=stress_data.get("day_summary") if stress_data else None,
-                # Cardiovascular data
-                cardiovascular_age=cardio_data.get("vascular_age") if cardio_data else None,
-                # Resilience data
-                resilience_level=resilience_data.get("level") if resilience_data else None,
-                resilience_contributors=resilience_data.get("contributors") if resilience_data else None
-            )
-        
-        logger.warning(f"No health data found for date: {date}")
-        return None
+        return build_health_data(
+            date,
+            sleep_data=self.get_daily_sleep(date),
+            readiness_data=self.get_daily_readiness(date),
+            spo2_data=self.get_daily_spo2(date),
+            stress_data=self.get_daily_stress(date),
+            cardio_data=self.get_daily_cardiovascular_age(date),
+            resilience_data=self.get_daily_resilience(date),
+            # Get latest activity data (5-day delay)
+            activity_data=self.get_latest_activity_data()
+        )
     
     def get_yesterday_data(self) -> Optional[HealthData]:
         """Get yesterday's comprehensive health data with intelligent fallback."""
@@ -265,14 +244,7 @@ class OuraClient:
             data = self.get_comprehensive_health_data(date)
             if data:
                 # Validate data quality before returning
-                has_meaningful_data = (
-                    (data.sleep_score and data.sleep_score > 0) or
-                    (data.readiness_score and data.readiness_score > 0) or
-                    (data.total_calories > 0) or
-                    (data.steps > 0)
-                )
-                
-                if has_meaningful_data:
+                if has_meaningful_data(data):
                     logger.info(f"✅ Found meaningful health data for date: {date}")
                     logger.info(f"   Sleep: {'✅' if data.sleep_score else '❌'} "
                               f"Readiness: {'✅' if data.readiness_score else '❌'} "
@@ -283,4 +255,75 @@ class OuraClient:
                     logger.info(f"⚠️ Found data for {date} but it appears to be incomplete")
         
         logger.warning("❌ No meaningful health data found for the last 5 days")
-        return None 
\ No newline at end of file
+        return None 
+
+
+def build_health_data(date: str, sleep_data: Optional[Dict] = None, readiness_data: Optional[Dict] = None,
+                      activity_data: Optional[Dict] = None, spo2_data: Optional[Dict] = None,
+                      stress_data: Optional[Dict] = None, cardio_data: Optional[Dict] = None,
+                      resilience_data: Optional[Dict] = None) -> Optional[HealthData]:
+    """
+    Combine the daily records of all endpoints into one HealthData object.
+    
+    Used for both live API data and records from the local health store.
+    
+    Returns:
+        HealthData object or None if no data available
+    """
+    # Determine the most appropriate date for the report
+    report_date = date
+    if activity_data and activity_data.get("day"):
+        # If we have activity data, it might be from a different date
+        activity_date = activity_data.get("day")
+        if activity_date != date:
+            logger.info(f"Using activity data from {activity_date} (most recent available)")
+    
+    # If we have at least one data source, create a report
+    if any([sleep_data, readiness_data, activity_data, spo2_data, stress_data]):
+        logger.info(f"Found data - Sleep: {'✅' if sleep_data else '❌'}, "
+                   f"Readiness: {'✅' if readiness_data else '❌'}, "
+                   f"Activity: {'✅' if activity_data else '❌'}, "
+                   f"SpO2: {'✅' if spo2_data else '❌'}, "
+                   f"Stress: {'✅' if stress_data else '❌'}")
+        
+        return HealthData(
+            date=report_date,
+            # Activity data (may be from different date due to delay)
+            total_calories=activity_data.get("total_calories", 0) if activity_data else 0,
+            active_calories=activity_data.get("active_calories", 0) if activity_data else 0,
+            inactive_calories=activity_data.get("inactive_calories", 0) if activity_data else 0,
+            steps=activity_data.get("steps", 0) if activity_data else 0,
+            activity_score=activity_data.get("score") if activity_data else None,
+            # Sleep data
+            sleep_score=sleep_data.get("score") if sleep_data else None,
+            sleep_contributors=sleep_data.get("contributors") if sleep_data else None,
+            # Readiness data
+            readiness_score=readiness_data.get("score") if readiness_data else None,
+            readiness_contributors=readiness_data.get("contributors") if readiness_data else None,
+            temperature_deviation=readiness_data.get("temperature_deviation") if readiness_data else None,
+            # SpO2 data
+            spo2_average=spo2_data.get("spo2_percentage", {}).get("average") if spo2_data else None,
+            breathing_disturbance_index=spo2_data.get("breathing_disturbance_index") if spo2_data else None,
+            # Stress data
+            stress_high=stress_data.get("stress_high") if stress_data else None,
+            recovery_high=stress_data.get("recovery_high") if stress_data else None,
+            stress_summary=stress_data.get("day_summary") if stress_data else None,
+            # Cardiovascular data
+            cardiovascular_age=cardio_data.get("vascular_age") if cardio_data else None,
+            # Resilience data
+            resilience_level=resilience_data.get("level") if resilience_data else None,
+            resilience_contributors=resilience_data.get("contributors") if resilience_data else None
+        )
+    
+    logger.warning(f"No health data found for date: {date}")
+    return None
+
+
+def has_meaningful_data(data: HealthData) -> bool:
+    """Check that a report has at least one real sleep, readiness or activity value."""
+    return bool(
+        (data.sleep_score and data.sleep_score > 0) or
+        (data.readiness_score and data.readiness_score > 0) or
+        (data.total_calories > 0) or
+        (data.steps > 0)
+    )
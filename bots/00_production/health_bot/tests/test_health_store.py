@@ -0,0 +1,77 @@
+"""Unit tests for the local Oura data store."""
+import pytest
+from unittest.mock import Mock
+from datetime import datetime, timedelta
+
+from health_store import OuraDataStore
+
+
+def day(days_back: int) -> str:
+    return (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+
+
+class TestOuraDataStore:
+    """Test cases for OuraDataStore."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.client = Mock()
+        self.client.get_daily_range.side_effect = self.fake_range
+        self.records = {
+            "daily_sleep": [{"day": day(1), "score": 82}, {"day": day(2), "score": 75}],
+            "daily_readiness": [{"day": day(1), "score": 88, "temperature_deviation": 0.1}],
+            "daily_activity": [{"day": day(3), "steps": 9000, "total_calories": 2400,
+                                "active_calories": 500, "inactive_calories": 1900, "score": 80}],
+        }
+    
+    def fake_range(self, endpoint, start_date, end_date):
+        return [r for r in self.records.get(endpoint, []) if start_date <= r["day"] <= end_date]
+    
+    def make_store(self, tmp_path):
+        return OuraDataStore(self.client, db_path=str(tmp_path / "health.db"))
+    
+    def test_sync_uses_one_range_call_per_endpoint(self, tmp_path):
+        """Test a sync fetches each endpoint once and stores the records."""
+        store = self.make_store(tmp_path)
+        results = store.sync()
+        
+        assert self.client.get_daily_range.call_count == len(OuraDataStore.ENDPOINTS)
+        assert results["daily_sleep"] == 2
+        assert store.get_day("daily_sleep", day(1))["score"] == 82
+        assert store.get_watermark("daily_sleep") == day(0)
+    
+    def test_incremental_sync_starts_at_watermark(self, tmp_path):
+        """Test later syncs only request the refresh window after the watermark."""
+        store = self.make_store(tmp_path)
+        store.sync()
+        self.client.get_daily_range.reset_mock()
+        
+        store.sync()
+        
+        _, start_date, _ = self.client.get_daily_range.call_args_list[0].args
+        assert start_date == day(store.refresh_days)
+    
+    def test_failed_endpoint_keeps_watermark(self, tmp_path):
+        """Test API errors leave stored data and the watermark untouched."""
+        store = self.make_store(tmp_path)
+        self.client.get_daily_range.side_effect = Exception("API Error")
+        
+        results = store.sync()
+        
+        assert results["daily_sleep"] == -1
+        assert store.get_watermark("daily_sleep") is None
+    
+    def test_reports_and_trends_from_disk(self, tmp_path):
+        """Test the daily report and trends are built without API calls."""
+        store = self.make_store(tmp_path)
+        store.sync()
+        self.client.get_daily_range.reset_mock()
+        
+        data = store.get_yesterday_data()
+        
+        assert data.date == day(1)
+        assert data.sleep_score == 82
+        assert data.readiness_score == 88
+        assert data.steps == 9000
+        assert store.get_trend("daily_sleep", "score") == [(day(2), 75), (day(1), 82)]
+        self.client.get_daily_range.assert_not_called()
@@ -7,6 +7,7 @@ Tracks API calls across all bots and provides daily reporting
 import os
 import json
 import asyncio
+import time
 from datetime import datetime, date
 from typing import Dict, Any
 import logging
@@ -16,10 +17,17 @@ logger = logging.getLogger(__name__)
 class APICallMonitor:
     """Monitors API calls to OpenRouter across all bots"""
     
+    # Cache lookups are counted in memory and written with the next API call,
+    # or after this many lookups / seconds, whichever comes first
+    CACHE_SAVE_EVERY = 50
+    CACHE_SAVE_INTERVAL = 60.0
+    
     def __init__(self, data_file: str = "api_calls.json"):
         self.data_file = data_file
         self.data = self._load_data()
         self.lock = asyncio.Lock()
+        self._unsaved_lookups = 0
+        self._last_save = time.monotonic()
     
     def _load_data(self) -> Dict[str, Any]:
         """Load API call data from file"""
@@ -46,6 +54,8 @@ class APICallMonitor:
         try:
             with open(self.data_file, 'w') as f:
                 json.dump(self.data, f, indent=2)
+            self._unsaved_lookups = 0
+            self._last_save = time.monotonic()
         except Exception as e:
             logger.error(f"Error saving API call data: {e}")
     
@@ -88,6 +98,31 @@ class APICallMonitor:
             
             logger.info(f"📊 API Call tracked: {bot_name} -> {model} ({'success' if success else 'failed'})")
     
+    async def track_cache_lookup(self, bot_name: str, model: str, hit: bool):
+        """Track a response cache lookup (hits are calls that never reached OpenRouter)"""
+        async with self.lock:
+            today = datetime.now().strftime("%Y-%m-%d")
+            day = self.data["daily_calls"].setdefault(today, {
+                "total_calls": 0,
+                "successful_calls": 0,
+                "failed_calls": 0,
+                "by_bot": {},
+                "by_model": {}
+            })
+            
+            cache = day.setdefault("cache", {"hits": 0, "misses": 0, "by_bot": {}})
+            bot_cache = cache["by_bot"].setdefault(bot_name, {"hits": 0, "misses": 0})
+            key = "hits" if hit else "misses"
+            cache[key] += 1
+            bot_cache[key] += 1
+            
+            self._unsaved_lookups += 1
+            if (self._unsaved_lookups >= self.CACHE_SAVE_EVERY
+                    or time.monotonic() - self._last_save >= self.CACHE_SAVE_INTERVAL):
+                self._save_data()
+            
+            logger.debug(f"📊 Cache lookup tracked: {bot_name} -> {model} ({'hit' if hit else 'miss'})")
+    
     def get_daily_stats(self, target_date: str = None) -> Dict[str, Any]:
         """Get statistics for a specific day"""
         if target_date is None:
@@ -100,10 +135,12 @@ class APICallMonitor:
                 "successful_calls": 0,
                 "failed_calls": 0,
                 "by_bot": {},
-                "by_model": {}
+                "by_model": {},
+                "cache": {"hits": 0, "misses": 0, "by_bot": {}}
             }
         
         return {
+            "cache": {"hits": 0, "misses": 0, "by_bot": {}},
             "date": target_date,
             **self.data["daily_calls"][target_date]
         }
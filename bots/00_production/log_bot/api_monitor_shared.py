@@ -43,6 +43,21 @@ def track_openrouter_call(bot_name: str, model: str, success: bool = True):
     else:
         print(f"Warning: API monitor not available for {bot_name} -> {model}")
 
+def track_llm_cache_lookup(bot_name: str, model: str, hit: bool):
+    """Track a hit or miss of the shared LLM response cache"""
+    if api_monitor:
+        try:
+            try:
+                loop = asyncio.get_event_loop()
+                if loop.is_running():
+                    asyncio.create_task(api_monitor.track_cache_lookup(bot_name, model, hit))
+                else:
+                    loop.run_until_complete(api_monitor.track_cache_lookup(bot_name, model, hit))
+            except RuntimeError:
+                asyncio.run(api_monitor.track_cache_lookup(bot_name, model, hit))
+        except Exception as e:
+            print(f"Warning: Failed to track cache lookup: {e}")
+
 def get_daily_stats(target_date: Optional[str] = None) -> dict:
     """Get daily statistics"""
     if api_monitor:
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Shared LLM Response Cache
+Persistent SQLite cache of OpenRouter responses keyed by model, prompt and temperature.
+Can be imported by any bot so repeated prompts are answered without spending API quota.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.db")
+
+
+class LLMResponseCache:
+    """On-disk response cache with TTL expiry and least-recently-used eviction"""
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 10000):
+        self.db_path = db_path or os.getenv("LLM_CACHE_DB", DEFAULT_CACHE_DB)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = self._connect()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the cache database (WAL so several bot processes can share it)"""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses(last_access)")
+            conn.commit()
+            return conn
+        except Exception as e:
+            logger.error(f"Error opening LLM cache at {self.db_path}: {e}")
+            return None
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float = 0.0) -> str:
+        """Hash model, temperature and prompt (whitespace-normalized) into a cache key"""
+        raw = f"{model}\x00{float(temperature):.3f}\x00{' '.join(prompt.split())}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str, temperature: float = 0.0) -> Optional[str]:
+        """Return the cached response, or None if missing or expired"""
+        if self.conn is None:
+            return None
+
+        key = self.make_key(model, prompt, temperature)
+        now = time.time()
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE cache_key = ?", (key,)
+                ).fetchone()
+
+                if row and now - row[1] <= self.ttl_seconds:
+                    self.conn.execute(
+                        "UPDATE llm_responses SET last_access = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                        (now, key)
+                    )
+                    self.conn.commit()
+                    self.hits += 1
+                    return row[0]
+
+                if row:
+                    self.conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+                    self.conn.commit()
+                self.misses += 1
+                return None
+        except Exception as e:
+            logger.error(f"Error reading LLM cache: {e}")
+            return None
+
+    def set(self, model: str, prompt: str, response: str, temperature: float = 0.0) -> bool:
+        """Store a response and evict the least recently used entries beyond max_entries"""
+        if self.conn is None:
+            return False
+
+        key = self.make_key(model, prompt, temperature)
+        now = time.time()
+        try:
+            with self.lock:
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO llm_responses
+                    (cache_key, model, response, created_at, last_access, hit_count)
+                    VALUES (?, ?, ?, ?, ?, 0)
+                """, (key, model, response, now, now))
+
+                count = self.conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+                if count > self.max_entries:
+                    self.conn.execute("""
+                        DELETE FROM llm_responses WHERE cache_key IN (
+                            SELECT cache_key FROM llm_responses ORDER BY last_access ASC LIMIT ?
+                        )
+                    """, (count - self.max_entries,))
+                self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error writing LLM cache: {e}")
+            return False
+
+    def purge_expired(self) -> int:
+        """Delete all entries older than the TTL"""
+        if self.conn is None:
+            return 0
+        try:
+            with self.lock:
+                cursor = self.conn.execute(
+                    "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                )
+                self.conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error purging LLM cache: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current cache size"""
+        entries = 0
+        if self.conn is not None:
+            try:
+                with self.lock:
+                    entries = self.conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            except Exception as e:
+                logger.error(f"Error reading LLM cache stats: {e}")
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache instance configured from LLM_CACHE_* environment variables"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = LLMResponseCache(
+            ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+        )
+    return _shared_cache
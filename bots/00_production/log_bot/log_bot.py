@@ -7,6 +7,7 @@ Collects logs from all active channels and forwards them to a centralized logs c
 import discord
 from discord.ext import commands
 import os
+import sys
 import asyncio
 import json
 import subprocess
@@ -17,6 +18,13 @@ import logging
 from dotenv import load_dotenv
 from api_monitor import APICallMonitor
 
+# Optional: bot_status_utils sits outside the log_bot build context
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+try:
+    from bot_status_utils import add_status_to_bot
+except ImportError:
+    add_status_to_bot = None
+
 # Load environment variables
 env_path = os.path.join(os.path.dirname(__file__), '../../../.env')
 load_dotenv(env_path)
@@ -63,6 +71,7 @@ intents.message_content = True
 intents.guild_messages = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
+status_manager = add_status_to_bot(bot, "Log Bot") if add_status_to_bot else None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -271,6 +280,9 @@ async def on_ready():
     logger.info(f'📊 Monitoring {len(log_collector.channel_mappings)} channels')
     logger.info(f'📝 Logs will be sent to channel ID: {LOGS_CHANNEL_ID}')
     
+    if status_manager:
+        await status_manager.send_startup_message()
+    
     # Get the logs channel
     log_collector.logs_channel = bot.get_channel(LOGS_CHANNEL_ID)
     
@@ -499,6 +511,19 @@ async def daily_api_report():
             logger.error(f"Error in daily API report: {e}")
             await asyncio.sleep(3600)  # Wait 1 hour on error
 
+def format_cache_stats(cache: dict) -> str:
+    """Summarize response cache hits/misses for an embed field"""
+    hits = cache.get("hits", 0)
+    misses = cache.get("misses", 0)
+    lookups = hits + misses
+    if lookups == 0:
+        return ""
+    
+    lines = [f"**{hits / lookups * 100:.1f}%** hit rate ({hits} hits / {misses} misses)"]
+    for bot_name, counts in sorted(cache.get("by_bot", {}).items(), key=lambda x: x[1].get("hits", 0), reverse=True):
+        lines.append(f"• **{bot_name}**: {counts.get('hits', 0)} hits, {counts.get('misses', 0)} misses")
+    return "\n".join(lines)
+
 async def send_daily_api_report():
     """Send daily API call statistics to logs channel"""
     if not log_collector.logs_channel:
@@ -554,6 +579,15 @@ async def send_daily_api_report():
                 inline=False
             )
         
+        # Response cache
+        cache_field = format_cache_stats(stats.get("cache", {}))
+        if cache_field:
+            embed.add_field(
+                name="💾 Response Cache",
+                value=cache_field[:1024],  # Discord field limit
+                inline=False
+            )
+        
         embed.set_footer(text=f"Report generated at {datetime.now().strftime('%H:%M:%S')}")
         
         await log_collector.logs_channel.send(embed=embed)
@@ -632,6 +666,15 @@ async def api_stats(ctx, target_date: str = None):
                     inline=False
                 )
         
+        # Response cache (hits can exist on days without any API call)
+        cache_field = format_cache_stats(stats.get("cache", {}))
+        if cache_field:
+            embed.add_field(
+                name="💾 Response Cache",
+                value=cache_field[:1024],
+                inline=False
+            )
+        
         embed.set_footer(text=f"Requested at {datetime.now().strftime('%H:%M:%S')}")
         await ctx.send(embed=embed)
         
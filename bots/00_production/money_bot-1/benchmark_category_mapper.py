@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the manual category mapper
+Measures amount/category accuracy, how many messages avoid the AI fallback,
+and throughput over a labelled corpus of expense texts
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, List
+
+# Add the current directory to the path so we can import the mapper
+sys.path.append(os.path.dirname(__file__))
+
+from category_mapper import ManualCategoryMapper
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "expense_corpus.jsonl")
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """Read labelled examples: {"text": ..., "amount": float|null, "category": str|null}"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(mapper: ManualCategoryMapper, corpus: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compare mapper output with the labels"""
+    amount_correct = 0
+    category_correct = 0
+    category_false_positives = 0
+    manual_complete = 0
+    errors = []
+
+    for example in corpus:
+        result = mapper.analyze_expense(example["text"])
+
+        expected_amount = example.get("amount")
+        amount_ok = (result["amount"] is None if expected_amount is None
+                     else result["amount"] is not None and abs(result["amount"] - expected_amount) < 0.005)
+        category_ok = result["category"] == example.get("category")
+
+        amount_correct += amount_ok
+        category_correct += category_ok
+        if example.get("category") is None and result["category"] is not None:
+            category_false_positives += 1
+        # Both fields found means the bot does not call the LLM for this message
+        if result["amount"] is not None and result["category"] is not None:
+            manual_complete += 1
+
+        if not (amount_ok and category_ok):
+            errors.append({
+                "text": example["text"],
+                "expected": (expected_amount, example.get("category")),
+                "got": (result["amount"], result["category"])
+            })
+
+    total = len(corpus)
+    return {
+        "examples": total,
+        "amount_accuracy": amount_correct / total if total else 0.0,
+        "category_accuracy": category_correct / total if total else 0.0,
+        "category_false_positives": category_false_positives,
+        "manual_coverage": manual_complete / total if total else 0.0,
+        "errors": errors
+    }
+
+
+def measure_throughput(mapper: ManualCategoryMapper, corpus: List[Dict[str, Any]], repeat: int) -> float:
+    """Messages analyzed per second"""
+    texts = [example["text"] for example in corpus]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            mapper.analyze_expense(text)
+    elapsed = time.perf_counter() - start
+    return len(texts) * repeat / elapsed if elapsed > 0 else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the manual expense categorizer")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Labelled JSONL corpus")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the corpus for throughput")
+    parser.add_argument("--show-errors", action="store_true", help="List misclassified examples")
+    parser.add_argument("--min-category-accuracy", type=float, default=0.0,
+                        help="Exit with status 1 below this category accuracy (0-1)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    mapper = ManualCategoryMapper()
+    report = evaluate(mapper, corpus)
+    throughput = measure_throughput(mapper, corpus, args.repeat)
+
+    print("🧪 Manual Category Mapper Benchmark")
+    print("=" * 50)
+    print(f"Examples:             {report['examples']}")
+    print(f"Amount accuracy:      {report['amount_accuracy'] * 100:.1f}%")
+    print(f"Category accuracy:    {report['category_accuracy'] * 100:.1f}%")
+    print(f"False categories:     {report['category_false_positives']}")
+    print(f"Manual coverage:      {report['manual_coverage'] * 100:.1f}% (no AI fallback needed)")
+    print(f"Throughput:           {throughput:,.0f} messages/s")
+
+    if args.show_errors and report["errors"]:
+        print("\n❌ Misses:")
+        for error in report["errors"]:
+            print(f"  {error['text']!r}: expected {error['expected']}, got {error['got']}")
+
+    if report["category_accuracy"] < args.min_category_accuracy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ Automatically tracks money entries from Discord channel to Notion database.
 import discord
 from discord.ext import commands
 import os
+import sys
 import logging
 import re
 import asyncio
@@ -17,19 +18,35 @@ import aiohttp
 import base64
 from io import BytesIO
 from typing import Optional, Dict, Any
-import matplotlib.pyplot as plt
-import pandas as pd
 from datetime import datetime, timedelta
 import calendar
 import asyncio
-import numpy as np
-import seaborn as sns
-from sklearn.linear_model import LinearRegression
 
 # Import required libraries
-from notion_client import Client as NotionClient
-from openai import AsyncOpenAI
 from category_mapper import ManualCategoryMapper
+from expense_ledger import ExpenseLedger, month_bounds, shift_month
+from chart_cache import ChartCache
+
+# Shared async Notion gateway lives in the repository root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from notion_gateway import get_notion_gateway
+from bot_status_utils import add_status_to_bot
+
+# Chart and analysis libraries are only needed for reports; import them on first use
+from lazy_imports import lazy_import, lazy_object, lazy_pyplot
+plt = lazy_pyplot()  # Agg backend, charts are rendered off the event loop thread
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+openai = lazy_import("openai")  # about a second to import, only needed for the AI fallback
+
+# Shared LLM response cache and API monitoring live in the log bot directory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'log_bot'))
+try:
+    from llm_cache import get_llm_cache
+    from api_monitor_shared import track_llm_cache_lookup
+except ImportError:
+    get_llm_cache = None
+    track_llm_cache_lookup = None
 
 # Load environment variables from main discord directory
 env_path = os.path.join(os.path.dirname(__file__), '../../../.env')
@@ -44,17 +61,21 @@ MONEY_DB_ID = "237d42a1faf5802496cadffa99784181"  # Money database ID
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
 # Initialize clients
-notion = NotionClient(auth=NOTION_TOKEN)
+notion_gateway = get_notion_gateway(NOTION_TOKEN)
+
+# Local expense ledger (synced from Notion) and rendered chart cache
+expense_ledger = ExpenseLedger(notion_gateway, MONEY_DB_ID)
+chart_cache = ChartCache()
+chart_render_lock = asyncio.Lock()
 
 # Initialize manual category mapper
 category_mapper = ManualCategoryMapper()
 
 # Use AsyncOpenAI for non-blocking API calls (fallback only)
-from openai import AsyncOpenAI
-openai_client = AsyncOpenAI(
+openai_client = lazy_object(lambda: openai.AsyncOpenAI(
     api_key=OPENROUTER_API_KEY,
     base_url="https://openrouter.ai/api/v1"
-)
+))
 
 # Setup logging
 logging.basicConfig(
@@ -72,6 +93,7 @@ logger = logging.getLogger('money_bot')
 intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix="!", intents=intents)
+status_manager = add_status_to_bot(bot, "Money Bot")
 
 class MoneyAnalyzer:
     """Analyzes text and images for money-related information using manual categorization first, AI as fallback"""
@@ -156,22 +178,34 @@ class MoneyAnalyzer:
             If no clear money amount is found, set amount to 0.
             """
             
-            response = await openai_client.chat.completions.create(
-                model="deepseek/deepseek-chat-v3.1:free",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.3,
-                timeout=10
-            )
+            model = "deepseek/deepseek-chat-v3.1:free"
             
-            response_text = response.choices[0].message.content.strip()
-            logger.info(f"AI Analysis: {response_text}")
+            # Identical receipt wording is answered from the shared response cache
+            llm_cache = get_llm_cache() if get_llm_cache else None
+            response_text = llm_cache.get(model, prompt, 0.3) if llm_cache else None
+            from_cache = response_text is not None
+            if llm_cache and track_llm_cache_lookup:
+                track_llm_cache_lookup("money-bot", model, from_cache)
+            
+            if not from_cache:
+                response = await openai_client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=300,
+                    temperature=0.3,
+                    timeout=10
+                )
+                response_text = response.choices[0].message.content.strip()
+            
+            logger.info(f"AI Analysis{' (cached)' if from_cache else ''}: {response_text}")
             
             # Extract JSON from response
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
             if json_match:
                 import json
                 data = json.loads(json_match.group())
+                if llm_cache and not from_cache:
+                    llm_cache.set(model, prompt, response_text, 0.3)
                 return {
                     "amount": float(data.get("amount", 0)),
                     "category": data.get("category", "Other"),
@@ -297,11 +331,14 @@ class NotionManager:
                 }
             
             # Create new page in Notion database
-            new_page = notion.pages.create(
+            new_page = await notion_gateway.create_page(
                 parent={"database_id": MONEY_DB_ID},
                 properties=properties
             )
             
+            # Write through so the next analysis sees the entry without a sync
+            expense_ledger.upsert_page(new_page)
+            
             logger.info(f"✅ Successfully saved to Notion")
             return True
             
@@ -311,71 +348,12 @@ class NotionManager:
     
     @staticmethod
     async def get_monthly_data(year: int, month: int) -> list:
-        """Get all expenses for a specific month from Notion database"""
+        """Get all expenses for a specific month from the local ledger"""
         try:
-            # Calculate start and end dates for the month
-            start_date = datetime(year, month, 1)
-            if month == 12:
-                end_date = datetime(year + 1, 1, 1)
-            else:
-                end_date = datetime(year, month + 1, 1)
-            
-            # Query Notion database
-            response = notion.databases.query(
-                database_id=MONEY_DB_ID,
-                filter={
-                    "and": [
-                        {
-                            "property": "Date",
-                            "date": {
-                                "on_or_after": start_date.isoformat()
-                            }
-                        },
-                        {
-                            "property": "Date",
-                            "date": {
-                                "before": end_date.isoformat()
-                            }
-                        }
-                    ]
-                }
-            )
-            
-            expenses = []
-            for page in response.get('results', []):
-                props = page.get('properties', {})
-                
-                # Extract data safely
-                amount = props.get('Amount', {}).get('number', 0) or 0
-                
-                # Extract categories (multi-select)
-                categories = []
-                kategorie_data = props.get('kategorie', {}).get('multi_select', [])
-                for cat in kategorie_data:
-                    categories.append(cat.get('name', ''))
-                category = ', '.join(categories) if categories else 'Other'
-                
-                # Extract person
-                person_data = props.get('Person', {}).get('select', {})
-                person = person_data.get('name', 'Unknown') if person_data else 'Unknown'
-                
-                # Extract description
-                beschreibung_data = props.get('Beschreibung', {}).get('rich_text', [])
-                description = ''
-                if beschreibung_data:
-                    description = beschreibung_data[0].get('text', {}).get('content', '')
-                
-                # Extract date
-                date_data = props.get('Date', {}).get('date', {})
-                date_str = date_data.get('start', '') if date_data else ''
-                
-                expenses.append({
-                    'amount': amount,
-                    'category': category,
-                    'person': person,
-                    'description': description,
-                    'date': date_str
-                })
+            await expense_ledger.sync_if_stale()
+            expenses = expense_ledger.get_month(year, month)[
+                ['amount', 'category', 'person', 'description', 'date']
+            ].to_dict('records')
             
             logger.info(f"Retrieved {len(expenses)} expenses for {month}/{year}")
             return expenses
@@ -391,14 +369,18 @@ class MonthlyAnalyzer:
     async def generate_monthly_report(year: int, month: int) -> Dict[str, Any]:
         """Generate comprehensive monthly expense report"""
         try:
-            expenses = await NotionManager.get_monthly_data(year, month)
+            await expense_ledger.sync_if_stale()
             
-            if not expenses:
-                return {"error": "No expenses found for this month"}
+            # One ledger read covers the month, the previous 6 months and the same month last year
+            history_start, _ = month_bounds(year - 1, month)
+            _, month_end = month_bounds(year, month)
+            history = expense_ledger.get_expenses(history_start, month_end)
+            monthly_totals = history.groupby(history['day'].str[:7])['amount'].sum()
+            
+            df = history[history['day'].str[:7] == f"{year}-{month:02d}"]
             
-            # Convert to DataFrame for easier analysis
-            df = pd.DataFrame(expenses)
-            df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0)
+            if df.empty:
+                return {"error": "No expenses found for this month"}
             
             # Basic statistics
             total_spent = df['amount'].sum()
@@ -414,17 +396,16 @@ class MonthlyAnalyzer:
             # Person-Category breakdown
             person_category = df.groupby(['person', 'category'])['amount'].sum().unstack(fill_value=0)
             
-            # Get previous month and year data for comparison
-            prev_month = month - 1 if month > 1 else 12
-            prev_year = year if month > 1 else year - 1
+            # Daily spending
+            daily_totals = df.groupby('day')['amount'].sum()
             
-            # Get data for previous month and year
-            prev_month_data = await NotionManager.get_monthly_data(prev_year, prev_month)
-            prev_year_data = await NotionManager.get_monthly_data(year - 1, month)
+            def spent_in(past_year: int, past_month: int) -> float:
+                return float(monthly_totals.get(f"{past_year}-{past_month:02d}", 0))
             
             # Calculate spending for previous month and year
-            prev_month_spent = sum(item['amount'] for item in prev_month_data)
-            prev_year_spent = sum(item['amount'] for item in prev_year_data)
+            prev_year, prev_month = shift_month(year, month, -1)
+            prev_month_spent = spent_in(prev_year, prev_month)
+            prev_year_spent = spent_in(year - 1, month)
             
             # Calculate growth rates
             month_growth = ((total_spent - prev_month_spent) / prev_month_spent * 100) if prev_month_spent > 0 else 100
@@ -433,16 +414,11 @@ class MonthlyAnalyzer:
             # Trend analysis - compare with last 6 months
             trend_data = []
             for i in range(1, 7):
-                past_month = month - i if month - i > 0 else 12 + (month - i)
-                past_year = year if month - i > 0 else year - 1
-                
-                past_month_data = await NotionManager.get_monthly_data(past_year, past_month)
-                past_month_spent = sum(item['amount'] for item in past_month_data)
-                
+                past_year, past_month = shift_month(year, month, -i)
                 trend_data.append({
                     'month': past_month,
                     'year': past_year,
-                    'spent': past_month_spent
+                    'spent': spent_in(past_year, past_month)
                 })
             
             # Project next month based on trend
@@ -451,13 +427,14 @@ class MonthlyAnalyzer:
             report = {
                 'month': month,
                 'year': year,
-                'total_spent': total_spent,
-                'avg_expense': avg_expense,
+                'total_spent': float(total_spent),
+                'avg_expense': float(avg_expense),
                 'num_transactions': num_transactions,
                 'category_totals': category_totals.to_dict(),
                 'person_totals': person_totals.to_dict(),
                 'person_category_breakdown': person_category.to_dict(),
-                'raw_data': expenses,
+                'daily_totals': daily_totals.to_dict(),
+                'raw_data': df[['amount', 'category', 'person', 'description', 'date']].to_dict('records'),
                 'prev_month_spent': prev_month_spent,
                 'prev_year_spent': prev_year_spent,
                 'month_growth': month_growth,
@@ -474,158 +451,174 @@ class MonthlyAnalyzer:
     
     @staticmethod
     async def create_charts(report: Dict[str, Any]) -> list:
-        """Create charts from the monthly report data"""
+        """Create charts from the monthly report data, reusing cached renders of identical data"""
         try:
-            chart_files = []
-            month_name = calendar.month_name[report['month']]
-            year = report['year']
-            
-            # Set style for better looking charts
-            plt.style.use('default')
-            
-            # 1. Category Pie Chart
-            if report['category_totals']:
-                fig, ax = plt.subplots(figsize=(10, 8))
-                categories = list(report['category_totals'].keys())
-                amounts = list(report['category_totals'].values())
-                
-                colors = plt.cm.Set3(range(len(categories)))
-                wedges, texts, autotexts = ax.pie(amounts, labels=categories, autopct='%1.1f%%', 
-                                                 colors=colors, startangle=90)
-                
-                ax.set_title(f'Expenses by Category - {month_name} {year}', fontsize=16, fontweight='bold')
-                plt.tight_layout()
-                
-                chart_file = f'category_pie_{year}_{report["month"]:02d}.png'
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                chart_files.append(chart_file)
-                plt.close()
+            chart_data = {key: value for key, value in report.items() if key != 'raw_data'}
+            key = chart_cache.make_key(chart_data)
+            cached = chart_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            # matplotlib's pyplot state is not thread-safe, so render one set at a time
+            async with chart_render_lock:
+                return await asyncio.to_thread(
+                    chart_cache.get_or_render, key,
+                    lambda output_dir: MonthlyAnalyzer.render_charts(report, output_dir)
+                )
             
-            # 2. Person Spending Bar Chart
-            if report['person_totals']:
-                fig, ax = plt.subplots(figsize=(10, 6))
-                persons = list(report['person_totals'].keys())
-                amounts = list(report['person_totals'].values())
-                
-                bars = ax.bar(persons, amounts, color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
-                ax.set_title(f'Total Spending by Person - {month_name} {year}', fontsize=16, fontweight='bold')
-                ax.set_ylabel('Amount (€)', fontsize=12)
-                ax.set_xlabel('Person', fontsize=12)
-                
-                # Add value labels on bars
-                for bar in bars:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height,
-                           f'€{height:.2f}', ha='center', va='bottom', fontweight='bold')
+        except Exception as e:
+            logger.error(f"❌ Error creating charts: {e}")
+            return []
+    
+    @staticmethod
+    def render_charts(report: Dict[str, Any], output_dir: str) -> list:
+        """Render the report charts as PNG files into output_dir"""
+        chart_files = []
+        month_name = calendar.month_name[report['month']]
+        year = report['year']
+        
+        # Set style for better looking charts
+        plt.style.use('default')
+        
+        # 1. Category Pie Chart
+        if report['category_totals']:
+            fig, ax = plt.subplots(figsize=(10, 8))
+            categories = list(report['category_totals'].keys())
+            amounts = list(report['category_totals'].values())
+            
+            colors = plt.cm.Set3(range(len(categories)))
+            wedges, texts, autotexts = ax.pie(amounts, labels=categories, autopct='%1.1f%%', 
+                                             colors=colors, startangle=90)
+            
+            ax.set_title(f'Expenses by Category - {month_name} {year}', fontsize=16, fontweight='bold')
+            plt.tight_layout()
+            
+            chart_file = os.path.join(output_dir, f'category_pie_{year}_{report["month"]:02d}.png')
+            plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+            chart_files.append(chart_file)
+            plt.close()
+        
+        # 2. Person Spending Bar Chart
+        if report['person_totals']:
+            fig, ax = plt.subplots(figsize=(10, 6))
+            persons = list(report['person_totals'].keys())
+            amounts = list(report['person_totals'].values())
+            
+            bars = ax.bar(persons, amounts, color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
+            ax.set_title(f'Total Spending by Person - {month_name} {year}', fontsize=16, fontweight='bold')
+            ax.set_ylabel('Amount (€)', fontsize=12)
+            ax.set_xlabel('Person', fontsize=12)
+            
+            # Add value labels on bars
+            for bar in bars:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height,
+                       f'€{height:.2f}', ha='center', va='bottom', fontweight='bold')
+            
+            plt.tight_layout()
+            chart_file = os.path.join(output_dir, f'person_spending_{year}_{report["month"]:02d}.png')
+            plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+            chart_files.append(chart_file)
+            plt.close()
+        
+        # 3. Person-Category Heatmap
+        if report['person_category_breakdown']:
+            person_category_df = pd.DataFrame(report['person_category_breakdown']).fillna(0)
+            
+            if not person_category_df.empty:
+                fig, ax = plt.subplots(figsize=(12, 8))
+                im = ax.imshow(person_category_df.values, cmap='YlOrRd', aspect='auto')
+                
+                # Set ticks and labels
+                ax.set_xticks(range(len(person_category_df.columns)))
+                ax.set_yticks(range(len(person_category_df.index)))
+                ax.set_xticklabels(person_category_df.columns, rotation=45, ha='right')
+                ax.set_yticklabels(person_category_df.index)
+                
+                # Add text annotations
+                for i in range(len(person_category_df.index)):
+                    for j in range(len(person_category_df.columns)):
+                        value = person_category_df.iloc[i, j]
+                        if value > 0:
+                            text = ax.text(j, i, f'€{value:.0f}', ha="center", va="center", 
+                                         color="black" if value < person_category_df.values.max()/2 else "white",
+                                         fontweight='bold')
+                
+                ax.set_title(f'Spending by Person & Category - {month_name} {year}', 
+                           fontsize=16, fontweight='bold')
+                
+                # Add colorbar
+                cbar = plt.colorbar(im)
+                cbar.set_label('Amount (€)', rotation=270, labelpad=20)
                 
                 plt.tight_layout()
-                chart_file = f'person_spending_{year}_{report["month"]:02d}.png'
+                chart_file = os.path.join(output_dir, f'person_category_heatmap_{year}_{report["month"]:02d}.png')
                 plt.savefig(chart_file, dpi=300, bbox_inches='tight')
                 chart_files.append(chart_file)
                 plt.close()
+        
+        # 4. Trend Graph (last 12 months)
+        if report.get('trend_data'):
+            fig, ax = plt.subplots(figsize=(10, 6))
+            
+            # Prepare data for the trend graph
+            months = [calendar.month_name[data['month']] for data in report['trend_data']]
+            spent = [data['spent'] for data in report['trend_data']]
+            
+            ax.plot(months, spent, marker='o', color='#4ECDC4')
+            
+            ax.set_title(f'Spending Trend - Last 12 Months', fontsize=16, fontweight='bold')
+            ax.set_ylabel('Amount (€)', fontsize=12)
+            ax.set_xlabel('Month', fontsize=12)
+            ax.set_xticklabels(months, rotation=45, ha='right')
+            
+            plt.tight_layout()
+            chart_file = os.path.join(output_dir, f'trend_graph_{year}_{report["month"]:02d}.png')
+            plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+            chart_files.append(chart_file)
+            plt.close()
+        
+        # 5. Projection Graph
+        if report.get('trend_data') and len(report['trend_data']) > 1:
+            fig, ax = plt.subplots(figsize=(10, 6))
             
-            # 3. Person-Category Heatmap
-            if report['person_category_breakdown']:
-                person_category_df = pd.DataFrame(report['person_category_breakdown']).fillna(0)
-                
-                if not person_category_df.empty:
-                    fig, ax = plt.subplots(figsize=(12, 8))
-                    im = ax.imshow(person_category_df.values, cmap='YlOrRd', aspect='auto')
-                    
-                    # Set ticks and labels
-                    ax.set_xticks(range(len(person_category_df.columns)))
-                    ax.set_yticks(range(len(person_category_df.index)))
-                    ax.set_xticklabels(person_category_df.columns, rotation=45, ha='right')
-                    ax.set_yticklabels(person_category_df.index)
-                    
-                    # Add text annotations
-                    for i in range(len(person_category_df.index)):
-                        for j in range(len(person_category_df.columns)):
-                            value = person_category_df.iloc[i, j]
-                            if value > 0:
-                                text = ax.text(j, i, f'€{value:.0f}', ha="center", va="center", 
-                                             color="black" if value < person_category_df.values.max()/2 else "white",
-                                             fontweight='bold')
-                    
-                    ax.set_title(f'Spending by Person & Category - {month_name} {year}', 
-                               fontsize=16, fontweight='bold')
-                    
-                    # Add colorbar
-                    cbar = plt.colorbar(im)
-                    cbar.set_label('Amount (€)', rotation=270, labelpad=20)
-                    
-                    plt.tight_layout()
-                    chart_file = f'person_category_heatmap_{year}_{report["month"]:02d}.png'
-                    plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                    chart_files.append(chart_file)
-                    plt.close()
-            
-            # 4. Trend Graph (last 12 months)
-            if report.get('trend_data'):
-                fig, ax = plt.subplots(figsize=(10, 6))
-                
-                # Prepare data for the trend graph
-                months = [calendar.month_name[data['month']] for data in report['trend_data']]
-                spent = [data['spent'] for data in report['trend_data']]
-                
-                ax.plot(months, spent, marker='o', color='#4ECDC4')
-                
-                ax.set_title(f'Spending Trend - Last 12 Months', fontsize=16, fontweight='bold')
-                ax.set_ylabel('Amount (€)', fontsize=12)
-                ax.set_xlabel('Month', fontsize=12)
-                ax.set_xticklabels(months, rotation=45, ha='right')
-                
-                plt.tight_layout()
-                chart_file = f'trend_graph_{year}_{report["month"]:02d}.png'
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                chart_files.append(chart_file)
-                plt.close()
+            # Prepare data for projection
+            months = [data['month'] for data in report['trend_data']]
+            spent = [data['spent'] for data in report['trend_data']]
             
-            # 5. Projection Graph
-            if report.get('trend_data') and len(report['trend_data']) > 1:
-                fig, ax = plt.subplots(figsize=(10, 6))
-                
-                # Prepare data for projection
-                months = [data['month'] for data in report['trend_data']]
-                spent = [data['spent'] for data in report['trend_data']]
-                
-                # Linear regression for projection
-                from sklearn.linear_model import LinearRegression
-                import numpy as np
-                
-                X = np.array(months).reshape(-1, 1)
-                y = np.array(spent)
-                
-                model = LinearRegression()
-                model.fit(X, y)
-                
-                # Predict next month
-                next_month = months[-1] + 1
-                predicted_spent = model.predict(np.array([[next_month]]))[0]
-                
-                # Plot historical data
-                ax.plot(months, spent, marker='o', label='Actual', color='#4ECDC4')
-                
-                # Plot projection
-                ax.plot(next_month, predicted_spent, marker='o', label='Projected', color='#FF6B6B')
-                
-                ax.set_title(f'Spending Projection - Next Month', fontsize=16, fontweight='bold')
-                ax.set_ylabel('Amount (€)', fontsize=12)
-                ax.set_xlabel('Month', fontsize=12)
-                ax.legend()
-                
-                plt.tight_layout()
-                chart_file = f'projection_graph_{year}_{report["month"]:02d}.png'
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                chart_files.append(chart_file)
-                plt.close()
+            # Linear regression for projection
+            from sklearn.linear_model import LinearRegression
+            import numpy as np
             
-            logger.info(f"Generated {len(chart_files)} charts")
-            return chart_files
+            X = np.array(months).reshape(-1, 1)
+            y = np.array(spent)
             
-        except Exception as e:
-            logger.error(f"❌ Error creating charts: {e}")
-            return []
+            model = LinearRegression()
+            model.fit(X, y)
+            
+            # Predict next month
+            next_month = months[-1] + 1
+            predicted_spent = model.predict(np.array([[next_month]]))[0]
+            
+            # Plot historical data
+            ax.plot(months, spent, marker='o', label='Actual', color='#4ECDC4')
+            
+            # Plot projection
+            ax.plot(next_month, predicted_spent, marker='o', label='Projected', color='#FF6B6B')
+            
+            ax.set_title(f'Spending Projection - Next Month', fontsize=16, fontweight='bold')
+            ax.set_ylabel('Amount (€)', fontsize=12)
+            ax.set_xlabel('Month', fontsize=12)
+            ax.legend()
+            
+            plt.tight_layout()
+            chart_file = os.path.join(output_dir, f'projection_graph_{year}_{report["month"]:02d}.png')
+            plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+            chart_files.append(chart_file)
+            plt.close()
+        
+        logger.info(f"Generated {len(chart_files)} charts")
+        return chart_files
     
     @staticmethod
     def format_report_message(report: Dict[str, Any]) -> str:
@@ -661,6 +654,14 @@ async def on_ready():
     """Bot startup event"""
     logger.info(f"🤖 {bot.user} is now online!")
     logger.info(f"📍 Monitoring money channel ID: {MONEY_CHANNEL_ID}")
+    await status_manager.send_startup_message()
+    
+    # Full sync also removes expenses deleted in Notion since the last run
+    try:
+        synced = await expense_ledger.sync(full=True)
+        logger.info(f"💾 Expense ledger ready ({synced} expenses)")
+    except Exception as e:
+        logger.error(f"❌ Error syncing expense ledger: {e}")
     
     # Send startup notification to the money channel
     try:
@@ -921,18 +922,12 @@ async def analysis(ctx, month: int = None, year: int = None):
         report_message = MonthlyAnalyzer.format_report_message(report)
         await ctx.send(report_message)
         
-        # Send charts
+        # Send charts (cached files are kept for repeated requests)
         for chart_file in chart_files:
             if os.path.exists(chart_file):
                 with open(chart_file, 'rb') as f:
-                    discord_file = discord.File(f, filename=chart_file)
+                    discord_file = discord.File(f, filename=os.path.basename(chart_file))
                     await ctx.send(file=discord_file)
-                
-                # Clean up file
-                try:
-                    os.remove(chart_file)
-                except:
-                    pass
         
         logger.info(f"✅ Monthly analysis completed for {month}/{year}")
         
@@ -972,13 +967,8 @@ async def monthly_check():
                         for chart_file in chart_files:
                             if os.path.exists(chart_file):
                                 with open(chart_file, 'rb') as f:
-                                    discord_file = discord.File(f, filename=chart_file)
+                                    discord_file = discord.File(f, filename=os.path.basename(chart_file))
                                     await channel.send(file=discord_file)
-                                
-                                try:
-                                    os.remove(chart_file)
-                                except:
-                                    pass
                     
                     logger.info(f"✅ Automatic monthly analysis sent for {prev_month}/{prev_year}")
             
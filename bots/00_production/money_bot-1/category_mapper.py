@@ -6,7 +6,7 @@ Maps text patterns to expense categories without using AI
 
 import re
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class CategoryPattern:
@@ -16,23 +16,86 @@ class CategoryPattern:
     description: str
     priority: int = 1  # Higher priority = more specific match
 
+@dataclass
+class CategoryMatch:
+    """A pattern hit in a text with the keywords that triggered it"""
+    pattern: CategoryPattern
+    keywords: List[str] = field(default_factory=list)
+    score: int = 0
+
+# Number with optional thousands separators and up to two decimals:
+# 1.234,56 / 1,234.56 / 25,50 / 25.50 / 25
+NUMBER = r'\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?|\d+(?:[.,]\d{1,2})?'
+
+# One tokenizer for every supported amount notation (text is lowercased first):
+# €25.50, 25,50€, 25.50 eur/euro/euros, or a bare number at the start or end of the text
+AMOUNT_PATTERN = re.compile(
+    rf'€\s*(?P<prefixed>{NUMBER})(?![\d.,])'
+    rf'|(?<![\d.,])(?P<suffixed>{NUMBER})\s*(?:€|eur(?:os?)?\b)'
+    rf'|^(?P<leading>{NUMBER})\s+'
+    rf'|(?<=\s)(?P<trailing>{NUMBER})\s*$'
+)
+
+# Keywords this short only match as whole words ('db' must not hit "feedback")
+SHORT_KEYWORD_LENGTH = 4
+
+def _trie_regex(words: List[str]) -> str:
+    """Regex matching any of the words, with shared prefixes merged into a trie
+    
+    Python's regex engine tries alternatives one by one; a trie-shaped pattern
+    lets it discard all keywords with a different first character at once.
+    Longer continuations are tried first, so the longest keyword wins.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            return ('(?:' + body + ')?') if len(branches) == 1 and len(body) > 1 else body + '?'
+        return body
+    
+    return build(trie)
+
 class ManualCategoryMapper:
-    """Maps expense text to categories using pattern matching"""
+    """Maps expense text to categories using pattern matching
+    
+    All keywords are compiled into a single alternation regex, so one scan of
+    the text finds every pattern hit. Longer keywords may occur inside German
+    compounds ("Stromrechnung"), short ones need word boundaries.
+    """
     
     def __init__(self):
         """Initialize with predefined category patterns"""
         self.patterns = self._initialize_patterns()
-        self.amount_patterns = [
-            r'€\s*(\d+(?:[.,]\d{1,2})?)',  # €25.50, €25,50
-            r'(\d+(?:[.,]\d{1,2})?)\s*€',  # 25.50€, 25,50€
-            r'(\d+(?:[.,]\d{1,2})?)\s*euro',  # 25.50 euro
-            r'(\d+(?:[.,]\d{1,2})?)\s*eur',   # 25.50 eur
-            r'(\d+(?:[.,]\d{1,2})?)\s*€',     # 25.50€
-            r'(\d+(?:[.,]\d{1,2})?)\s*euros', # 25.50 euros
-            r'(\d+(?:[.,]\d{1,2})?)\s*EUR',   # 25.50 EUR
-            r'(\d+(?:[.,]\d{1,2})?)\s*€\s*',  # 25.50€ (with space after)
-            r'^(\d+(?:[.,]\d{1,2})?)\s+',     # 25.50 at start of text
-        ]
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Build the combined keyword regex and the keyword -> pattern lookup"""
+        self.keyword_patterns: Dict[str, List[int]] = {}
+        for index, pattern in enumerate(self.patterns):
+            for keyword in pattern.keywords:
+                keyword = keyword.lower()
+                if index not in self.keyword_patterns.setdefault(keyword, []):
+                    self.keyword_patterns[keyword].append(index)
+        
+        long_keywords = [keyword for keyword in self.keyword_patterns if len(keyword) > SHORT_KEYWORD_LENGTH]
+        short_keywords = [keyword for keyword in self.keyword_patterns if len(keyword) <= SHORT_KEYWORD_LENGTH]
+        alternatives = []
+        if long_keywords:
+            alternatives.append(f'(?P<long>{_trie_regex(long_keywords)})')
+        if short_keywords:
+            # Whole words only, allowing a plural "s" ("tickets", "bars")
+            alternatives.append(rf'(?<!\w)(?P<short>{_trie_regex(short_keywords)})s?(?!\w)')
+        self.keyword_regex = re.compile('|'.join(alternatives)) if alternatives else None
     
     def _initialize_patterns(self) -> List[CategoryPattern]:
         """Initialize category patterns based on common German expense patterns"""
@@ -117,7 +180,7 @@ class ManualCategoryMapper:
                 priority=3
             ),
             CategoryPattern(
-                keywords=['netflix', 'spotify', 'amazon prime', 'disney+', 'youtube premium', 'subscription', 'abo'],
+                keywords=['netflix', 'spotify', 'amazon prime', 'disney+', 'youtube premium', 'subscription', 'abonnement', 'abo'],
                 category='Bills',
                 description='Subscriptions',
                 priority=2
@@ -178,44 +241,66 @@ class ManualCategoryMapper:
             ),
         ]
     
+    @staticmethod
+    def _parse_number(number: str) -> float:
+        """Convert a matched number in German or English notation to float"""
+        if re.fullmatch(r'\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?', number):
+            number = number.replace('.', '')  # 1.234,56
+        elif re.fullmatch(r'\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?', number):
+            number = number.replace(',', '')  # 1,234.56
+        # Convert German decimal format (comma) to float
+        return float(number.replace(',', '.'))
+    
     def extract_amount(self, text: str) -> Optional[float]:
-        """Extract monetary amount from text"""
-        text_lower = text.lower()
+        """Extract monetary amount from text
         
-        for pattern in self.amount_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                amount_str = match.group(1)
-                # Convert German decimal format (comma) to float
-                amount_str = amount_str.replace(',', '.')
-                try:
-                    return float(amount_str)
-                except ValueError:
-                    continue
+        Amounts marked with a currency win over bare numbers, so
+        "2 coffees for €7" yields 7.0; "Lidl 23,87" yields 23.87.
+        """
+        bare = None
+        for match in AMOUNT_PATTERN.finditer(text.lower().strip()):
+            number = match.group('prefixed') or match.group('suffixed')
+            if number:
+                return self._parse_number(number)
+            bare = bare or match.group('leading') or match.group('trailing')
+        
+        return self._parse_number(bare) if bare else None
+    
+    def match_patterns(self, text: str) -> List[CategoryMatch]:
+        """
+        Find every pattern hit in one pass over the text
+        Returns: matches ordered best first (priority, then number of keyword hits,
+        then pattern order)
+        """
+        if not self.keyword_regex:
+            return []
+        
+        hits: Dict[int, CategoryMatch] = {}
+        for match in self.keyword_regex.finditer(text.lower()):
+            keyword = match.group(match.lastgroup)
+            for index in self.keyword_patterns[keyword]:
+                category_match = hits.setdefault(index, CategoryMatch(self.patterns[index]))
+                if keyword not in category_match.keywords:
+                    category_match.keywords.append(keyword)
+        
+        for category_match in hits.values():
+            # Priority dominates; each further distinct keyword adds a little
+            category_match.score = category_match.pattern.priority * 10 + 2 * (len(category_match.keywords) - 1)
         
-        return None
+        ordered = sorted(hits.items(), key=lambda item: (-item[1].score, item[0]))
+        return [category_match for _, category_match in ordered]
     
     def categorize_text(self, text: str) -> Tuple[Optional[str], str, int]:
         """
         Categorize text based on patterns
         Returns: (category, description, confidence_score)
         """
-        text_lower = text.lower()
-        matches = []
-        
-        # Check each pattern
-        for pattern in self.patterns:
-            for keyword in pattern.keywords:
-                if keyword in text_lower:
-                    matches.append((pattern, keyword))
-                    break  # Only match once per pattern
+        matches = self.match_patterns(text)
         
         if not matches:
             return None, "No pattern match found", 0
         
-        # Sort by priority (higher is better) and return best match
-        matches.sort(key=lambda x: x[0].priority, reverse=True)
-        best_match = matches[0][0]
+        best_match = matches[0].pattern
         
         # Calculate confidence based on priority and number of keyword matches
         confidence = best_match.priority * 10
@@ -254,18 +339,10 @@ class ManualCategoryMapper:
         Get all possible category matches for a text
         Returns: List of (category, description, confidence) tuples
         """
-        text_lower = text.lower()
-        suggestions = []
-        
-        for pattern in self.patterns:
-            for keyword in pattern.keywords:
-                if keyword in text_lower:
-                    suggestions.append((pattern.category, pattern.description, pattern.priority))
-                    break
-        
-        # Sort by priority
-        suggestions.sort(key=lambda x: x[2], reverse=True)
-        return suggestions
+        return [
+            (match.pattern.category, match.pattern.description, match.pattern.priority)
+            for match in self.match_patterns(text)
+        ]
 
 # Test the mapper
 if __name__ == "__main__":
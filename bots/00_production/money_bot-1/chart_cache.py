@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Chart Cache for Money Bot
+Rendered chart sets are stored under a hash of the data they show, so an
+unchanged report is never rendered twice
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger('money_bot')
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chart_cache")
+
+
+class ChartCache:
+    """Directory of chart sets keyed by the hash of their input data"""
+
+    # Bump when chart rendering changes so old images are not reused
+    VERSION = 1
+
+    def __init__(self, cache_dir: str = None, max_entries: int = 50):
+        """
+        Args:
+            cache_dir: Cache directory, defaults to MONEY_CHART_CACHE_DIR or chart_cache/
+            max_entries: Chart sets kept before the least recently used are removed
+        """
+        self.cache_dir = cache_dir or os.getenv("MONEY_CHART_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, data: Dict[str, Any]) -> str:
+        """Stable hash of the aggregated data a chart set is rendered from"""
+        payload = json.dumps({"version": self.VERSION, "data": data}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Chart file paths for a key, or None if not cached"""
+        entry_dir = os.path.join(self.cache_dir, key)
+        manifest = os.path.join(entry_dir, "charts.json")
+        if not os.path.exists(manifest):
+            return None
+        try:
+            with open(manifest, 'r', encoding='utf-8') as f:
+                files = [os.path.join(entry_dir, name) for name in json.load(f)]
+        except (OSError, ValueError):
+            return None
+        if not all(os.path.exists(path) for path in files):
+            return None
+        os.utime(entry_dir)  # mark as recently used
+        return files
+
+    def get_or_render(self, key: str, render: Callable[[str], List[str]]) -> List[str]:
+        """
+        Return cached charts, or render them into a fresh directory and cache them
+
+        Args:
+            key: Cache key from make_key
+            render: Function writing charts into the given directory and returning their paths
+        """
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"📦 Using cached charts {key[:12]}")
+            return cached
+
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".render-")
+        try:
+            files = render(tmp_dir)
+            with open(os.path.join(tmp_dir, "charts.json"), 'w', encoding='utf-8') as f:
+                json.dump([os.path.basename(path) for path in files], f)
+
+            entry_dir = os.path.join(self.cache_dir, key)
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        finally:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self._evict()
+        return [os.path.join(entry_dir, os.path.basename(path)) for path in files]
+
+    def _evict(self):
+        """Remove the least recently used chart sets beyond max_entries"""
+        entries = [
+            os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+            if not name.startswith(".")
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Local Expense Ledger for Money Bot
+SQLite mirror of the Notion money database, synced incrementally on
+last_edited_time, so monthly analysis runs on local pandas group-bys
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger('money_bot')
+
+DEFAULT_LEDGER_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "expense_ledger.db")
+
+
+def parse_expense_page(page: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one Notion money page into an expense dictionary"""
+    props = page.get('properties', {})
+
+    # Extract data safely
+    amount = props.get('Amount', {}).get('number', 0) or 0
+
+    # Extract categories (multi-select)
+    categories = []
+    kategorie_data = props.get('kategorie', {}).get('multi_select', [])
+    for cat in kategorie_data:
+        categories.append(cat.get('name', ''))
+    category = ', '.join(categories) if categories else 'Other'
+
+    # Extract person
+    person_data = props.get('Person', {}).get('select', {})
+    person = person_data.get('name', 'Unknown') if person_data else 'Unknown'
+
+    # Extract description
+    beschreibung_data = props.get('Beschreibung', {}).get('rich_text', [])
+    description = ''
+    if beschreibung_data:
+        description = beschreibung_data[0].get('text', {}).get('content', '')
+
+    # Extract date
+    date_data = props.get('Date', {}).get('date', {})
+    date_str = date_data.get('start', '') if date_data else ''
+
+    return {
+        'amount': amount,
+        'category': category,
+        'person': person,
+        'description': description,
+        'date': date_str
+    }
+
+
+class ExpenseLedger:
+    """Local copy of all expenses with month/range queries returning DataFrames"""
+
+    def __init__(self, gateway, database_id: str, db_path: str = None, min_sync_interval: int = 60):
+        """
+        Open (or create) the ledger
+
+        Args:
+            gateway: NotionGateway used for syncing
+            database_id: Notion money database ID
+            db_path: SQLite file, defaults to MONEY_LEDGER_DB or expense_ledger.db
+            min_sync_interval: Seconds between Notion syncs triggered by commands
+        """
+        self.gateway = gateway
+        self.database_id = database_id
+        self.db_path = db_path or os.getenv("MONEY_LEDGER_DB", DEFAULT_LEDGER_DB)
+        self.min_sync_interval = min_sync_interval
+        self.last_sync = 0.0
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        """Create tables and indexes"""
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS expenses (
+                    page_id TEXT PRIMARY KEY,
+                    date TEXT,
+                    day TEXT,
+                    amount REAL DEFAULT 0,
+                    category TEXT,
+                    person TEXT,
+                    description TEXT,
+                    last_edited_time TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_expenses_day ON expenses(day)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            self.conn.commit()
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _upsert(self, page_id: str, expense: Dict[str, Any], last_edited_time: Optional[str]):
+        self.conn.execute("""
+            INSERT OR REPLACE INTO expenses
+            (page_id, date, day, amount, category, person, description, last_edited_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            page_id, expense['date'], (expense['date'] or '')[:10], float(expense['amount'] or 0),
+            expense['category'], expense['person'], expense['description'], last_edited_time
+        ))
+
+    def upsert_page(self, page: Dict[str, Any]) -> bool:
+        """
+        Store one Notion page (write-through after creating it)
+
+        Returns:
+            True if stored
+        """
+        try:
+            with self.lock:
+                self._upsert(page["id"], parse_expense_page(page), page.get("last_edited_time"))
+                self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error storing expense {page.get('id')}: {e}")
+            return False
+
+    async def sync(self, full: bool = False) -> int:
+        """
+        Pull pages edited since the last sync from Notion
+
+        Args:
+            full: Re-read the whole database and drop expenses deleted in Notion
+
+        Returns:
+            Number of pages applied
+        """
+        with self.lock:
+            watermark = None if full else self._get_state("last_edited_time")
+
+        query_filter = None
+        if watermark:
+            # Notion timestamps have minute precision, so re-read the watermark minute
+            query_filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": watermark}
+            }
+
+        pages = await self.gateway.query_database_all(
+            self.database_id,
+            filter=query_filter,
+            sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}]
+        )
+
+        with self.lock:
+            for page in pages:
+                edited = page.get("last_edited_time")
+                if page.get("archived") or page.get("in_trash"):
+                    self.conn.execute("DELETE FROM expenses WHERE page_id = ?", (page["id"],))
+                else:
+                    self._upsert(page["id"], parse_expense_page(page), edited)
+                if edited and (watermark is None or edited > watermark):
+                    watermark = edited
+
+            if full:
+                # Deleted pages never show up in incremental queries
+                seen = {page["id"] for page in pages}
+                stale = [row["page_id"] for row in self.conn.execute("SELECT page_id FROM expenses")
+                         if row["page_id"] not in seen]
+                self.conn.executemany("DELETE FROM expenses WHERE page_id = ?", [(page_id,) for page_id in stale])
+
+            if watermark:
+                self._set_state("last_edited_time", watermark)
+            self.conn.commit()
+            self.last_sync = time.time()
+
+        logger.info(f"🔄 Expense ledger synced {len(pages)} changed pages from Notion")
+        return len(pages)
+
+    async def sync_if_stale(self) -> int:
+        """Sync when the last sync is older than min_sync_interval"""
+        if time.time() - self.last_sync < self.min_sync_interval:
+            return 0
+        try:
+            return await self.sync()
+        except Exception as e:
+            logger.warning(f"⚠️ Expense ledger sync failed, using local data: {e}")
+            return 0
+
+    def get_expenses(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Expenses with start <= date < end
+
+        Returns:
+            DataFrame with amount, category, person, description, date and day columns
+        """
+        # pandas is only imported once analysis is requested, not at bot startup
+        import pandas as pd
+
+        with self.lock:
+            df = pd.read_sql_query(
+                "SELECT amount, category, person, description, date, day FROM expenses "
+                "WHERE day >= ? AND day < ? ORDER BY date",
+                self.conn, params=(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+            )
+        df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0)
+        return df
+
+    def get_month(self, year: int, month: int) -> pd.DataFrame:
+        """All expenses of one month"""
+        return self.get_expenses(*month_bounds(year, month))
+
+    def get_monthly_totals(self, start: datetime, end: datetime) -> Dict[str, float]:
+        """Total spent per month ("YYYY-MM") for start <= date < end"""
+        df = self.get_expenses(start, end)
+        if df.empty:
+            return {}
+        return df.groupby(df['day'].str[:7])['amount'].sum().to_dict()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def month_bounds(year: int, month: int):
+    """First day of the month and first day of the next month"""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def shift_month(year: int, month: int, delta: int):
+    """(year, month) moved by delta months"""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
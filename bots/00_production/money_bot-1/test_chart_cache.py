@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed chart cache
+Covers the cache key, atomic rendering into the cache and LRU eviction
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+# Add the bot directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from chart_cache import ChartCache
+
+
+def make_renderer(*names):
+    """Render function writing one dummy chart per name; counts its calls"""
+    def render(directory):
+        render.calls += 1
+        paths = []
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'wb') as f:
+                f.write(b"png")
+            paths.append(path)
+        return paths
+    render.calls = 0
+    return render
+
+
+class TestChartCache(unittest.TestCase):
+    """Test caching rendered chart sets on disk"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = ChartCache(cache_dir=self.test_dir, max_entries=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_key_depends_on_data_and_version(self):
+        """Test the key ignores dict order but changes with the data and the cache version"""
+        key = self.cache.make_key({"month": "2026-10", "totals": {"Marc": 10.0, "Maggie": 5.0}})
+        self.assertEqual(key, self.cache.make_key({"totals": {"Maggie": 5.0, "Marc": 10.0}, "month": "2026-10"}))
+        self.assertNotEqual(key, self.cache.make_key({"month": "2026-10", "totals": {"Marc": 10.5, "Maggie": 5.0}}))
+
+        self.cache.VERSION = ChartCache.VERSION + 1
+        self.assertNotEqual(key, self.cache.make_key({"month": "2026-10", "totals": {"Marc": 10.0, "Maggie": 5.0}}))
+
+    def test_charts_are_rendered_once(self):
+        """Test a second request for the same key is served from the cache"""
+        render = make_renderer("pie.png", "trend.png")
+        key = self.cache.make_key({"month": "2026-10"})
+
+        files = self.cache.get_or_render(key, render)
+        self.assertEqual([os.path.basename(path) for path in files], ["pie.png", "trend.png"])
+        self.assertTrue(all(os.path.dirname(path) == os.path.join(self.test_dir, key) for path in files))
+        self.assertEqual(self.cache.get_or_render(key, render), files)
+        self.assertEqual(render.calls, 1)
+
+    def test_missing_chart_file_is_rendered_again(self):
+        """Test an entry with a deleted image counts as a miss"""
+        render = make_renderer("pie.png")
+        key = self.cache.make_key({"month": "2026-10"})
+        files = self.cache.get_or_render(key, render)
+        os.remove(files[0])
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.get_or_render(key, render), files)
+        self.assertTrue(os.path.exists(files[0]))
+        self.assertEqual(render.calls, 2)
+
+    def test_failed_render_leaves_no_entry(self):
+        """Test charts only become visible once rendering finished, via one os.replace"""
+        key = self.cache.make_key({"month": "2026-10"})
+
+        def render(directory):
+            with open(os.path.join(directory, "pie.png"), 'wb') as f:
+                f.write(b"half")
+            raise RuntimeError("render failed")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_render(key, render)
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test entries beyond max_entries are removed, oldest use first"""
+        keys = [self.cache.make_key({"month": month}) for month in ("2026-08", "2026-09", "2026-10")]
+        self.cache.get_or_render(keys[0], make_renderer("pie.png"))
+        self.cache.get_or_render(keys[1], make_renderer("pie.png"))
+        # Make the use order explicit; a cache hit then marks keys[0] as recently used
+        os.utime(os.path.join(self.test_dir, keys[0]), (1000, 1000))
+        os.utime(os.path.join(self.test_dir, keys[1]), (2000, 2000))
+        self.assertIsNotNone(self.cache.get(keys[0]))
+
+        self.cache.get_or_render(keys[2], make_renderer("pie.png"))
+        self.assertEqual(sorted(os.listdir(self.test_dir)), sorted([keys[0], keys[2]]))
+        self.assertIsNone(self.cache.get(keys[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the local expense ledger
+Covers the last_edited_time watermark, deletions and the month queries used by the analysis
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import shutil
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+# Add the bot directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from expense_ledger import ExpenseLedger, month_bounds, shift_month
+
+
+def make_page(page_id, day, person, amount, edited, category="Lebensmittel"):
+    """Build a Notion page object in the money database format"""
+    return {
+        "id": page_id,
+        "last_edited_time": edited,
+        "properties": {
+            "Amount": {"number": amount},
+            "kategorie": {"multi_select": [{"name": category}]},
+            "Person": {"select": {"name": person}},
+            "Beschreibung": {"rich_text": [{"text": {"content": f"Expense {page_id}"}}]},
+            "Date": {"date": {"start": day}}
+        }
+    }
+
+
+class TestExpenseLedger(unittest.TestCase):
+    """Test syncing and querying the local ledger"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.pages = []
+
+        async def query_database_all(database_id, filter=None, sorts=None):
+            pages = sorted(self.pages, key=lambda page: page["last_edited_time"])
+            if filter:
+                since = filter["last_edited_time"]["on_or_after"]
+                pages = [page for page in pages if page["last_edited_time"] >= since]
+            return pages
+
+        self.gateway = AsyncMock()
+        self.gateway.query_database_all.side_effect = query_database_all
+        self.ledger = ExpenseLedger(self.gateway, "money-db", db_path=os.path.join(self.test_dir, "ledger.db"))
+
+    def tearDown(self):
+        self.ledger.close()
+        shutil.rmtree(self.test_dir)
+
+    def month_total(self, year, month):
+        return self.ledger.get_month(year, month)["amount"].sum()
+
+    def test_incremental_sync_uses_watermark(self):
+        """Test the second sync only asks Notion for pages edited since the newest one seen"""
+        self.pages.append(make_page("a", "2026-10-05", "Marc", 12.5, "2026-10-05T10:00:00.000Z"))
+        self.pages.append(make_page("b", "2026-10-06", "Maggie", 7.5, "2026-10-06T10:00:00.000Z"))
+        self.assertEqual(asyncio.run(self.ledger.sync()), 2)
+        self.assertIsNone(self.gateway.query_database_all.call_args.kwargs["filter"])
+
+        self.pages.append(make_page("c", "2026-10-07", "Marc", 20.0, "2026-10-07T10:00:00.000Z"))
+        # The watermark minute is re-read, so "b" comes back with "c"
+        self.assertEqual(asyncio.run(self.ledger.sync()), 2)
+
+        last_filter = self.gateway.query_database_all.call_args.kwargs["filter"]
+        self.assertEqual(last_filter["last_edited_time"]["on_or_after"], "2026-10-06T10:00:00.000Z")
+        self.assertEqual(self.month_total(2026, 10), 40.0)
+
+    def test_edited_and_archived_pages_are_applied(self):
+        """Test an incremental sync updates edited expenses and drops archived ones"""
+        self.pages.append(make_page("a", "2026-10-05", "Marc", 12.5, "2026-10-05T10:00:00.000Z"))
+        self.pages.append(make_page("b", "2026-10-05", "Marc", 30.0, "2026-10-05T11:00:00.000Z"))
+        asyncio.run(self.ledger.sync())
+
+        self.pages[0] = make_page("a", "2026-10-05", "Marc", 15.0, "2026-10-06T09:00:00.000Z")
+        self.pages[1] = dict(self.pages[1], archived=True, last_edited_time="2026-10-06T09:30:00.000Z")
+        asyncio.run(self.ledger.sync())
+
+        expenses = self.ledger.get_month(2026, 10)
+        self.assertEqual(list(expenses["amount"]), [15.0])
+
+    def test_full_sync_drops_expenses_deleted_in_notion(self):
+        """Test a full sync removes local expenses whose pages Notion no longer returns"""
+        self.pages.append(make_page("a", "2026-10-05", "Marc", 12.5, "2026-10-05T10:00:00.000Z"))
+        self.pages.append(make_page("b", "2026-10-05", "Marc", 30.0, "2026-10-05T11:00:00.000Z"))
+        asyncio.run(self.ledger.sync())
+        self.pages.pop()
+
+        asyncio.run(self.ledger.sync())
+        self.assertEqual(self.month_total(2026, 10), 42.5)
+
+        asyncio.run(self.ledger.sync(full=True))
+        self.assertIsNone(self.gateway.query_database_all.call_args.kwargs["filter"])
+        self.assertEqual(self.month_total(2026, 10), 12.5)
+
+    def test_month_queries(self):
+        """Test month bounds, month shifting and per-month totals"""
+        for page_id, day, amount in [("a", "2026-11-30", 10.0), ("b", "2026-12-01", 20.0),
+                                     ("c", "2026-12-31", 5.0), ("d", "2027-01-01", 40.0)]:
+            self.ledger.upsert_page(make_page(page_id, day, "Marc", amount, "2027-01-02T10:00:00.000Z"))
+
+        self.assertEqual(month_bounds(2026, 12), (datetime(2026, 12, 1), datetime(2027, 1, 1)))
+        self.assertEqual(shift_month(2026, 12, 1), (2027, 1))
+        self.assertEqual(shift_month(2026, 1, -1), (2025, 12))
+        self.assertEqual(self.month_total(2026, 12), 25.0)
+        totals = self.ledger.get_monthly_totals(datetime(2026, 11, 1), datetime(2027, 2, 1))
+        self.assertEqual(totals, {"2026-11": 10.0, "2026-12": 25.0, "2027-01": 40.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Run several Discord bots as plugins inside one Python process.
+
+The subprocess launchers (start_multibot.py, runBots/run_all_bots.py) start a
+full interpreter per bot, so discord.py, pandas, openai, embedding models etc.
+are loaded once per bot. On the Raspberry Pi that is most of the memory.
+
+This host imports every bot script once into a single process and runs each
+bot as its own asyncio task on one shared event loop:
+
+- Heavy libraries are imported once and shared through sys.modules.
+- Each bot runs in its own task. A crash only stops that task; the host logs
+  it and restarts the bot with exponential backoff.
+- Output (print and logging) is tagged with the bot name and written to
+  logs/multibot/<name>.log, as in subprocess mode.
+
+A bot script is supported if it defines one of (checked in this order):
+- a module-level discord.Client / commands.Bot instance (e.g. `bot`, `client`)
+- an `async def main()` that starts the bot
+- a commands.Bot subclass that can be created without arguments
+
+The `if __name__ == "__main__":` block of a script is not executed. Scripts
+are imported in a worker thread, one at a time, so a slow import doesn't stall
+the bots already running.
+
+Limitations: blocking calls (time.sleep, requests) in one bot stall all bots,
+so the host warns when the event loop lags. Relative paths resolve against the
+host's working directory, like in start_multibot.py's subprocess mode. A bot's
+directory is only on sys.path while its script is imported, so modules of the
+bot itself must be imported at module level, not inside functions.
+"""
+import os
+import sys
+import time
+import signal
+import asyncio
+import logging
+import resource
+import threading
+import importlib.util
+import contextvars
+from datetime import datetime
+
+import discord
+
+LOG_DIR = os.path.join("logs", "multibot")
+
+# Restart backoff: 5s, 10s, 20s ... up to 5 minutes; reset after a stable run
+RESTART_DELAY = 5
+MAX_RESTART_DELAY = 300
+STABLE_RUN_SECONDS = 600
+
+# Warn when a callback blocks the shared event loop longer than this
+LOOP_LAG_WARNING = 2.0
+
+# Name of the bot whose code is currently running (tasks inherit it)
+current_bot = contextvars.ContextVar("current_bot", default="host")
+
+# sys.path and sys.modules are process-wide; import one bot script at a time
+_load_lock = threading.Lock()
+
+logger = logging.getLogger("multibot_host")
+
+
+class _BotLogFiles:
+    """Per-bot log files in LOG_DIR, opened on first use."""
+
+    def __init__(self, log_dir: str):
+        self.log_dir = log_dir
+        self.files = {}
+        os.makedirs(log_dir, exist_ok=True)
+
+    def write(self, name: str, line: str):
+        f = self.files.get(name)
+        if f is None:
+            f = open(os.path.join(self.log_dir, f"{name}.log"), "a", encoding="utf-8")
+            self.files[name] = f
+        f.write(line + "\n")
+        f.flush()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files.clear()
+
+
+class _TaggedStream:
+    """stdout replacement that prefixes every line with the current bot name."""
+
+    def __init__(self, stream, log_files: _BotLogFiles):
+        self.stream = stream
+        self.log_files = log_files
+        self.buffers = {}
+
+    def write(self, text):
+        name = current_bot.get()
+        buffered = self.buffers.get(name, "") + text
+        *lines, rest = buffered.split("\n")
+        self.buffers[name] = rest
+        for line in lines:
+            tagged = f"[{datetime.utcnow().isoformat()}][{name}] {line}"
+            self.stream.write(tagged + "\n")
+            self.log_files.write(name, tagged)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
+
+
+class _BotLogHandler(logging.Handler):
+    """Logging handler writing records to the log file of the current bot."""
+
+    def __init__(self, log_files: _BotLogFiles):
+        super().__init__()
+        self.log_files = log_files
+
+    def emit(self, record):
+        try:
+            self.log_files.write(record.bot, self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class _BotNameFilter(logging.Filter):
+    """Adds the current bot name to log records as %(bot)s."""
+
+    def filter(self, record):
+        record.bot = current_bot.get()
+        return True
+
+
+class HostedBot:
+    """One bot script loaded into the host."""
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = os.path.abspath(path)
+        self.directory = os.path.dirname(self.path)
+        self.module = None
+        self.task = None
+        self.client = None
+        self.status = "pending"
+        self.start_time = None
+        self.restarts = 0
+        self.last_error = None
+
+    def load(self):
+        """
+        Import the bot script under a private module name.
+
+        The bot's directory is removed from sys.path and modules from it
+        are removed from sys.modules afterwards, so the next bot imports its
+        own notion_manager.py, config.py etc. instead of reusing this one's.
+        Shared libraries stay loaded.
+        """
+        safe_name = "".join(c if c.isalnum() else "_" for c in self.name.lower())
+        module_name = f"multibot_{safe_name}"
+        spec = importlib.util.spec_from_file_location(module_name, self.path)
+        module = importlib.util.module_from_spec(spec)
+
+        with _load_lock:
+            before = set(sys.modules)
+            sys.path.insert(0, self.directory)
+            try:
+                spec.loader.exec_module(module)
+            finally:
+                sys.path.remove(self.directory)
+                for name in set(sys.modules) - before:
+                    module_file = getattr(sys.modules[name], "__file__", None) or ""
+                    if os.path.abspath(module_file).startswith(self.directory + os.sep):
+                        del sys.modules[name]
+
+        self.module = module
+
+    def _token(self):
+        """Discord token the script read, falling back to DISCORD_TOKEN."""
+        for attr in ("DISCORD_TOKEN", "DISCORD_BOT_TOKEN", "TOKEN"):
+            token = getattr(self.module, attr, None)
+            if isinstance(token, str) and token:
+                return token
+        return os.getenv("DISCORD_TOKEN")
+
+    def _entry(self):
+        """Find how to start the bot; see the module docstring."""
+        namespace = vars(self.module)
+        for value in namespace.values():
+            if isinstance(value, discord.Client):
+                return "client", value
+
+        main = namespace.get("main")
+        if asyncio.iscoroutinefunction(main):
+            return "main", main
+
+        for value in namespace.values():
+            if (isinstance(value, type) and issubclass(value, discord.Client)
+                    and value.__module__ == self.module.__name__):
+                return "class", value
+
+        raise RuntimeError("no Discord client, async main() or Bot subclass found")
+
+    async def run_once(self):
+        """Load the script if needed and run the bot until it stops."""
+        if self.module is None:
+            # Importing a script can take seconds; keep the other bots' loop running
+            await asyncio.to_thread(self.load)
+
+        kind, entry = self._entry()
+        if kind == "main":
+            self.client = None
+            await entry()
+            return
+
+        client = entry() if kind == "class" else entry
+        if client.is_closed():
+            # Reset the internal state of a client that ran before
+            client.clear()
+        self.client = client
+        try:
+            await client.start(self._token())
+        finally:
+            if not client.is_closed():
+                await client.close()
+
+
+class MultiBotHost:
+    """Runs HostedBots on one event loop and restarts them when they stop."""
+
+    def __init__(self, bot_scripts, log_dir: str = LOG_DIR, stagger: float = 1.0):
+        """
+        Args:
+            bot_scripts: List of (name, path) tuples
+            log_dir: Directory for the per-bot log files
+            stagger: Seconds between bot starts
+        """
+        self.bots = [HostedBot(name, path) for name, path in bot_scripts]
+        self.log_files = _BotLogFiles(log_dir)
+        self.stagger = stagger
+        self.start_time = None
+        self.loop_lag = 0.0
+        self._stopping = False
+
+    def setup_output(self):
+        """Tag stdout and logging with the bot name (before any bot configures logging)."""
+        sys.stdout = _TaggedStream(sys.stdout, self.log_files)
+
+        handler = logging.StreamHandler(sys.__stderr__)
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(bot)s] %(name)s - %(levelname)s - %(message)s"))
+        file_handler = _BotLogHandler(self.log_files)
+        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        for h in (handler, file_handler):
+            h.addFilter(_BotNameFilter())
+            root.addHandler(h)
+
+    async def _supervise(self, bot: HostedBot):
+        """Run one bot forever, restarting it with backoff when it stops or crashes."""
+        current_bot.set(bot.name)
+        delay = RESTART_DELAY
+
+        while not self._stopping:
+            bot.status = "running"
+            bot.start_time = datetime.now()
+            started = time.monotonic()
+            try:
+                await bot.run_once()
+                bot.last_error = None
+                logger.warning(f"Bot '{bot.name}' stopped")
+            except asyncio.CancelledError:
+                bot.status = "stopped"
+                raise
+            except BaseException as e:
+                # SystemExit from a script's sys.exit() must not end the host
+                bot.last_error = f"{type(e).__name__}: {e}"
+                logger.exception(f"Bot '{bot.name}' crashed")
+
+            if self._stopping:
+                break
+
+            if time.monotonic() - started > STABLE_RUN_SECONDS:
+                delay = RESTART_DELAY
+            bot.status = "restarting"
+            bot.restarts += 1
+            logger.warning(f"Restarting '{bot.name}' in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RESTART_DELAY)
+
+        bot.status = "stopped"
+
+    async def _monitor_loop_lag(self):
+        """Warn when a bot blocks the shared event loop."""
+        while True:
+            expected = time.monotonic() + 1.0
+            await asyncio.sleep(1.0)
+            self.loop_lag = max(0.0, time.monotonic() - expected)
+            if self.loop_lag > LOOP_LAG_WARNING:
+                logger.warning(f"Event loop blocked for {self.loop_lag:.1f}s - a bot is making blocking calls")
+
+    def status(self) -> list:
+        """Status of every hosted bot, in the shape of run_all_bots.py's status entries."""
+        return [
+            {
+                "name": bot.name,
+                "path": bot.path,
+                "directory": bot.directory,
+                "status": bot.status,
+                "pid": os.getpid(),
+                "start_time": bot.start_time.isoformat() if bot.start_time else None,
+                "restarts": bot.restarts,
+                "last_error": bot.last_error,
+            }
+            for bot in self.bots
+        ]
+
+    def memory_mb(self) -> float:
+        """Peak resident memory of the host process in MB."""
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    async def run(self):
+        """Start all bots and run until stop() is called."""
+        self.start_time = datetime.now()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        lag_task = asyncio.create_task(self._monitor_loop_lag())
+        for bot in self.bots:
+            if not os.path.exists(bot.path):
+                print(f"❌ Missing bot script: {bot.path}")
+                bot.status = "failed"
+                continue
+            bot.task = asyncio.create_task(self._supervise(bot), name=f"bot:{bot.name}")
+            await asyncio.sleep(self.stagger)  # small stagger
+
+        logger.info(f"Hosting {len(self.bots)} bots in process {os.getpid()} "
+                    f"(peak memory {self.memory_mb():.0f} MB)")
+
+        tasks = [bot.task for bot in self.bots if bot.task]
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            lag_task.cancel()
+            self.log_files.close()
+
+    def stop(self):
+        """Close all bots and end run()."""
+        if self._stopping:
+            return
+        self._stopping = True
+        print("Received shutdown signal, stopping bots...")
+        for bot in self.bots:
+            if bot.task and not bot.task.done():
+                bot.task.cancel()
+
+
+def run(bot_scripts, **kwargs):
+    """Host the given (name, path) bot scripts in this process until stopped."""
+    host = MultiBotHost(bot_scripts, **kwargs)
+    host.setup_output()
+    asyncio.run(host.run())
+    return host
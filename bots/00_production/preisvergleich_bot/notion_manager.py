@@ -1,8 +1,12 @@
 import os
+import sys
 import logging
 import re
 from typing import List, Dict, Any, Optional
-from notion_client import Client
+
+# Shared async Notion gateway lives in the repository root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from notion_gateway import get_notion_gateway
 
 # Set up logging
 logging.basicConfig(
@@ -24,7 +28,7 @@ class NotionProductManager:
             self.notion_token = notion_token or os.getenv("NOTION_TOKEN")
             if not self.notion_token:
                 logger.error("Notion token is missing. Set NOTION_TOKEN in .env or pass as argument.")
-                self.notion = None
+                self.gateway = None
                 self.database_id = None
                 return
             
@@ -32,24 +36,19 @@ class NotionProductManager:
             raw_database_id = database_id or os.getenv("NOTION_DATABASE_ID")
             if not raw_database_id:
                 logger.error("Notion database ID is missing. Set NOTION_DATABASE_ID in .env or pass as argument.")
-                self.notion = None
+                self.gateway = None
                 self.database_id = None
                 return
             
             # Clean the database ID if it's in URL format
             self.database_id = self._clean_database_id(raw_database_id)
             
-            # Initialize the Notion client with error handling
-            try:
-                self.notion = Client(auth=self.notion_token)
-                logger.info("NotionProductManager initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Notion client: {e}")
-                self.notion = None
-                self.database_id = None
+            # Requests go through the process-wide gateway (rate limit, retries, pagination)
+            self.gateway = get_notion_gateway(self.notion_token)
+            logger.info("NotionProductManager initialized successfully")
         except Exception as e:
             logger.error(f"Error during NotionProductManager initialization: {e}")
-            self.notion = None
+            self.gateway = None
             self.database_id = None
     
     def is_initialized(self) -> bool:
@@ -59,7 +58,7 @@ class NotionProductManager:
         Returns:
             True if initialized, False otherwise
         """
-        return self.notion is not None and self.database_id is not None
+        return self.gateway is not None and self.database_id is not None
     
     def _clean_database_id(self, database_id: str) -> str:
         """
@@ -88,9 +87,62 @@ class NotionProductManager:
         logger.info(f"Using Notion database ID: {database_id}")
         return database_id
     
-    def get_watchlist(self) -> List[Dict[str, Any]]:
+    def _parse_product(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Convert one Notion page into a product dictionary
+        
+        Args:
+            item: Raw Notion page object
+            
+        Returns:
+            Product dictionary, or None if the page has no product name
+        """
+        try:
+            # Try different possible property names for product name
+            product_name = None
+            for name_field in ["Produktname", "Name", "Product", "Title"]:
+                name_prop = item["properties"].get(name_field, {})
+                if name_prop.get("title"):
+                    product_name = name_prop["title"][0]["plain_text"]
+                    break
+            
+            if not product_name:
+                logger.warning("Product name not found in Notion item, skipping")
+                return None
+            
+            # Try different possible property names for price
+            regular_price = None
+            for price_field in ["Normalpreis", "Price", "Normal Price", "Regular Price"]:
+                price_prop = item["properties"].get(price_field, {})
+                if price_prop.get("number") is not None:
+                    regular_price = price_prop["number"]
+                    break
+            
+            # Try to get URL if available
+            url = None
+            for url_field in ["URL", "Link", "Product URL"]:
+                url_prop = item["properties"].get(url_field, {})
+                if url_prop.get("url"):
+                    url = url_prop["url"]
+                    break
+            
+            product = {
+                "name": product_name,
+                "normal_price": regular_price,
+                "url": url
+            }
+            
+            return product
+            
+        except (KeyError, IndexError) as e:
+            logger.error(f"Error extracting product data: {e}")
+            return None
+    
+    async def get_watchlist_async(self) -> List[Dict[str, Any]]:
         """
-        Retrieve all products from the Notion watchlist database
+        Retrieve all products without blocking the event loop
+        
+        Uses the shared Notion gateway, which follows pagination past 100 products.
         
         Returns:
             List of product dictionaries with name and price information
@@ -101,55 +153,13 @@ class NotionProductManager:
         
         try:
             logger.info(f"Querying Notion database: {self.database_id}")
-            response = self.notion.databases.query(database_id=self.database_id)
-            
-            products = []
-            
-            for item in response.get("results", []):
-                try:
-                    # Try different possible property names for product name
-                    product_name = None
-                    for name_field in ["Produktname", "Name", "Product", "Title"]:
-                        name_prop = item["properties"].get(name_field, {})
-                        if name_prop.get("title"):
-                            product_name = name_prop["title"][0]["plain_text"]
-                            break
-                    
-                    if not product_name:
-                        logger.warning("Product name not found in Notion item, skipping")
-                        continue
-                    
-                    # Try different possible property names for price
-                    regular_price = None
-                    for price_field in ["Normalpreis", "Price", "Normal Price", "Regular Price"]:
-                        price_prop = item["properties"].get(price_field, {})
-                        if price_prop.get("number") is not None:
-                            regular_price = price_prop["number"]
-                            break
-                    
-                    # Try to get URL if available
-                    url = None
-                    for url_field in ["URL", "Link", "Product URL"]:
-                        url_prop = item["properties"].get(url_field, {})
-                        if url_prop.get("url"):
-                            url = url_prop["url"]
-                            break
-                    
-                    product = {
-                        "name": product_name,
-                        "normal_price": regular_price,
-                        "url": url
-                    }
-                    
-                    products.append(product)
-                    
-                except (KeyError, IndexError) as e:
-                    logger.error(f"Error extracting product data: {e}")
-                    continue
+            pages = await self.gateway.query_database_all(self.database_id)
+            
+            products = [product for product in map(self._parse_product, pages) if product]
             
             logger.info(f"Retrieved {len(products)} products from Notion database")
             return products
             
         except Exception as e:
             logger.error(f"Error querying Notion database: {e}")
-            return []
\ No newline at end of file
+            return []
\ No newline at end of file
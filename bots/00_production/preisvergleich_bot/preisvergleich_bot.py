@@ -1,4 +1,5 @@
 import os
+import sys
 import discord
 import logging
 import asyncio
@@ -10,6 +11,14 @@ from datetime import datetime
 from notion_manager import NotionProductManager
 from enhanced_agent import EnhancedOfferSearchAgent
 from scheduler import OfferScheduler
+
+# Startup embed helper from the repository root, not part of the Docker image's COPY list
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+try:
+    from bot_status_utils import add_status_to_bot
+except ImportError:
+    add_status_to_bot = None
+
 env_path = os.path.join(os.path.dirname(__file__), '../../../.env')
 load_dotenv(env_path)
 
@@ -31,6 +40,7 @@ if CHANNEL_ID:
 intents = discord.Intents.default()
 intents.message_content = True  # Enable message content intent for commands
 client = discord.Client(intents=intents)
+status_manager = add_status_to_bot(client, "Preisvergleich Bot") if add_status_to_bot else None
 
 # Initialize our services
 notion_manager = None
@@ -44,6 +54,9 @@ async def on_ready():
     
     logger.info(f"Logged in as {client.user}")
     
+    if status_manager:
+        await status_manager.send_startup_message()
+    
     if not CHANNEL_ID:
         logger.error("DISCORD_CHANNEL_ID not set in environment variables")
         await client.close()
@@ -145,7 +158,7 @@ async def check_offers():
 
     try:
         # Get products from Notion database
-        products = notion_manager.get_watchlist()
+        products = await notion_manager.get_watchlist_async()
         if not products:
             logger.warning("No products found in the watchlist")
             await channel.send("ℹ️ **No Products**: Your Notion watchlist appears to be empty or inaccessible.")
@@ -228,4 +241,4 @@ if __name__ == "__main__":
         logger.error("DISCORD_TOKEN not set in environment variables")
         exit(1)
         
-    client.run(DISCORD_TOKEN) 
\ No newline at end of file
+    client.run(DISCORD_TOKEN) 
\ No newline at end of file
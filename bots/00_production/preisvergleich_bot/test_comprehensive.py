@@ -63,46 +63,44 @@ class TestNotionProductManager:
             manager = NotionProductManager()
             assert manager.database_id == 'clean_db_id'
     
-    @patch('notion_manager.Client')
-    def test_get_watchlist_success(self, mock_client):
+    @patch('notion_manager.get_notion_gateway')
+    def test_get_watchlist_success(self, mock_gateway):
         """Test successful retrieval of watchlist"""
-        # Mock the Notion client response
-        mock_response = {
-            'results': [
-                {
-                    'properties': {
-                        'Name': {'title': [{'plain_text': 'Test Product'}]},
-                        'Price': {'number': 99.99},
-                        'URL': {'url': 'https://example.com/product'}
-                    }
+        # Mock the pages returned by the Notion gateway
+        mock_pages = [
+            {
+                'properties': {
+                    'Name': {'title': [{'plain_text': 'Test Product'}]},
+                    'Price': {'number': 99.99},
+                    'URL': {'url': 'https://example.com/product'}
                 }
-            ]
-        }
-        mock_client.return_value.databases.query.return_value = mock_response
+            }
+        ]
+        mock_gateway.return_value.query_database_all = AsyncMock(return_value=mock_pages)
         
         with patch.dict(os.environ, {
             'NOTION_TOKEN': 'test_token',
             'NOTION_DATABASE_ID': 'test_db_id'
         }):
             manager = NotionProductManager()
-            products = manager.get_watchlist()
+            products = asyncio.run(manager.get_watchlist_async())
             
             assert len(products) == 1
             assert products[0]['name'] == 'Test Product'
             assert products[0]['price'] == 99.99
             assert products[0]['url'] == 'https://example.com/product'
     
-    @patch('notion_manager.Client')
-    def test_get_watchlist_handles_notion_error(self, mock_client):
-        """Test that get_watchlist handles Notion API errors gracefully"""
-        mock_client.return_value.databases.query.side_effect = Exception("API Error")
+    @patch('notion_manager.get_notion_gateway')
+    def test_get_watchlist_handles_notion_error(self, mock_gateway):
+        """Test that get_watchlist_async handles Notion API errors gracefully"""
+        mock_gateway.return_value.query_database_all = AsyncMock(side_effect=Exception("API Error"))
         
         with patch.dict(os.environ, {
             'NOTION_TOKEN': 'test_token',
             'NOTION_DATABASE_ID': 'test_db_id'
         }):
             manager = NotionProductManager()
-            products = manager.get_watchlist()
+            products = asyncio.run(manager.get_watchlist_async())
             
             assert products == []
 
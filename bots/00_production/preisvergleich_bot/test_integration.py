@@ -3,6 +3,7 @@ Simple integration test for the fixed bot
 """
 import os
 import sys
+import asyncio
 from unittest.mock import patch, Mock
 
 # Add current directory to path
@@ -18,7 +19,7 @@ def test_notion_manager_initialization():
         assert not manager.is_initialized()
         
         # Should return empty list without crashing
-        products = manager.get_watchlist()
+        products = asyncio.run(manager.get_watchlist_async())
         assert products == []
         print("✅ NotionProductManager handles missing credentials gracefully")
 
@@ -30,7 +31,7 @@ def test_notion_manager_with_valid_env():
         'NOTION_TOKEN': 'test_token',
         'NOTION_DATABASE_ID': '1e5d42a1faf580fe9450efa4d13cc4a2?v=xyz'
     }):
-        with patch('notion_manager.Client') as mock_client:
+        with patch('notion_manager.get_notion_gateway') as mock_gateway:
             manager = NotionProductManager()
             assert manager.is_initialized()
             assert manager.database_id == '1e5d42a1faf580fe9450efa4d13cc4a2'
@@ -24,7 +24,7 @@ async def test_offer_search():
         offer_agent = OfferSearchAgent()
         
         # Get products from Notion database
-        products = notion_manager.get_watchlist()
+        products = await notion_manager.get_watchlist_async()
         if not products:
             logger.warning("No products found in the watchlist")
             return
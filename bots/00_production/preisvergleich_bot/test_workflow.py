@@ -74,7 +74,7 @@ async def check_offers():
     try:
         # Get products from Notion database
         await channel.send("📋 Retrieving products from Notion database...")
-        products = notion_manager.get_watchlist()
+        products = await notion_manager.get_watchlist_async()
         if not products:
             await channel.send("ℹ️ No products found in the watchlist. Please add some products to your Notion database.")
             logger.warning("No products found in the watchlist")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Event-driven supervisor for bots running as subprocesses.
+
+Used by start_multibot.py and runBots/run_all_bots.py in subprocess mode.
+Everything runs on one asyncio loop:
+
+- Each bot has its own supervision task that awaits the child's exit
+  (no polling) and restarts it with exponential backoff, 5s up to 5min.
+  A restart never delays the other bots.
+- A bot that crashes CRASH_LOOP_LIMIT times within CRASH_LOOP_WINDOW is
+  marked "crash_loop" and waits CRASH_LOOP_COOLDOWN before the next try.
+- Bots start in parallel, staggered by a fraction of a second.
+- stdout/stderr of every child is read continuously, so pipes never fill
+  up and block the child. Lines are tagged and written to
+  <log_dir>/<name>.log.
+- CPU and RSS of every child are sampled from /proc and written with the
+  bot states to the status file (atomically), for the dashboard.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("process_supervisor")
+
+RESTART_DELAY = 5
+MAX_RESTART_DELAY = 300
+STABLE_RUN_SECONDS = 600
+
+CRASH_LOOP_LIMIT = 5
+CRASH_LOOP_WINDOW = 600
+CRASH_LOOP_COOLDOWN = 900
+
+SAMPLE_INTERVAL = 10
+STOP_TIMEOUT = 10
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def read_proc_stats(pid: int) -> Optional[Dict[str, float]]:
+    """CPU time (seconds) and resident memory (MB) of a process from /proc, None if unavailable"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the command name: utime and stime are fields 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return {
+        "cpu_seconds": (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS,
+        "rss_mb": resident_pages * _PAGE_SIZE / (1024 * 1024),
+    }
+
+
+class ManagedBot:
+    """One bot subprocess and its restart/resource bookkeeping."""
+
+    def __init__(self, name: str, path: str, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.path = path
+        self.cwd = cwd
+        self.env = env
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.status = "pending"
+        self.start_time: Optional[datetime] = None
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.last_exit_code: Optional[int] = None
+        self.next_start: Optional[float] = None
+        self.crash_times: deque = deque()
+        self.cpu_percent: Optional[float] = None
+        self.rss_mb: Optional[float] = None
+        self._last_sample: Optional[tuple] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process and self.process.returncode is None else None
+
+    def sample(self):
+        """Update cpu_percent and rss_mb from /proc"""
+        pid = self.pid
+        stats = read_proc_stats(pid) if pid else None
+        if not stats:
+            self.cpu_percent = None
+            self.rss_mb = None
+            self._last_sample = None
+            return
+
+        now = time.monotonic()
+        if self._last_sample and self._last_sample[0] == pid:
+            _, last_time, last_cpu = self._last_sample
+            elapsed = now - last_time
+            if elapsed > 0:
+                self.cpu_percent = round(100 * (stats["cpu_seconds"] - last_cpu) / elapsed, 1)
+        self._last_sample = (pid, now, stats["cpu_seconds"])
+        self.rss_mb = round(stats["rss_mb"], 1)
+
+    def to_status(self) -> dict:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "directory": self.cwd or os.path.dirname(self.path),
+            "status": self.status,
+            "pid": self.pid,
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "restarts": self.restarts,
+            "consecutive_failures": self.consecutive_failures,
+            "last_exit_code": self.last_exit_code,
+            "next_restart_in": max(0, round(self.next_start - time.monotonic())) if self.next_start else None,
+            "cpu_percent": self.cpu_percent,
+            "rss_mb": self.rss_mb,
+        }
+
+
+class ProcessSupervisor:
+    """Starts bots as subprocesses and keeps them running."""
+
+    def __init__(self, bots: List[ManagedBot], log_dir: str, status_file: Optional[str] = None,
+                 stagger: float = 0.5, echo: bool = True):
+        """
+        Args:
+            bots: Bots to supervise
+            log_dir: Directory for the per-bot log files
+            status_file: JSON file with the state of all bots (not written if None)
+            stagger: Seconds between the starts of consecutive bots
+            echo: Also print the tagged bot output to stdout
+        """
+        self.bots = bots
+        self.log_dir = log_dir
+        self.status_file = status_file
+        self.stagger = stagger
+        self.echo = echo
+        self.start_time = datetime.now()
+        self.listeners: List[Callable[[List[dict]], None]] = []
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        os.makedirs(log_dir, exist_ok=True)
+
+    # ----- output -----
+
+    async def _drain_output(self, bot: ManagedBot, process: asyncio.subprocess.Process):
+        """Read the child's output until EOF so its pipe never fills up"""
+        log_path = os.path.join(self.log_dir, f"{bot.name}.log")
+        with open(log_path, "a", encoding="utf-8") as f:
+            while True:
+                try:
+                    line = await process.stdout.readline()
+                except ValueError:
+                    # Line longer than the stream limit; skip the rest of it
+                    line = await process.stdout.read(64 * 1024)
+                if not line:
+                    break
+                tagged = f"[{datetime.utcnow().isoformat()}][{bot.name}] {line.decode('utf-8', 'replace').rstrip()}"
+                if self.echo:
+                    print(tagged)
+                f.write(tagged + "\n")
+                f.flush()
+
+    # ----- supervision -----
+
+    def _restart_delay(self, bot: ManagedBot, run_seconds: float) -> float:
+        """Backoff after an exit; also detects crash loops"""
+        now = time.monotonic()
+        if run_seconds > STABLE_RUN_SECONDS:
+            bot.consecutive_failures = 0
+            bot.crash_times.clear()
+
+        bot.consecutive_failures += 1
+        bot.crash_times.append(now)
+        while bot.crash_times and now - bot.crash_times[0] > CRASH_LOOP_WINDOW:
+            bot.crash_times.popleft()
+
+        if len(bot.crash_times) >= CRASH_LOOP_LIMIT:
+            bot.status = "crash_loop"
+            bot.crash_times.clear()
+            logger.error(f"Bot '{bot.name}' crashed {CRASH_LOOP_LIMIT} times within "
+                         f"{CRASH_LOOP_WINDOW}s; pausing it for {CRASH_LOOP_COOLDOWN}s")
+            return CRASH_LOOP_COOLDOWN
+
+        bot.status = "restarting"
+        return min(RESTART_DELAY * 2 ** (bot.consecutive_failures - 1), MAX_RESTART_DELAY)
+
+    async def _start(self, bot: ManagedBot) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            sys.executable, bot.path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=bot.cwd,
+            env=bot.env,
+        )
+
+    async def _supervise(self, bot: ManagedBot, initial_delay: float):
+        await asyncio.sleep(initial_delay)
+
+        while not self._stopping:
+            bot.next_start = None
+            try:
+                process = await self._start(bot)
+            except OSError as e:
+                logger.error(f"❌ Error starting {bot.name}: {e}")
+                bot.last_exit_code = None
+                delay = self._restart_delay(bot, 0)
+            else:
+                bot.process = process
+                bot.status = "running"
+                bot.start_time = datetime.now()
+                started = time.monotonic()
+                logger.info(f"✅ {bot.name} started with PID {process.pid}")
+                self.publish()
+
+                drain = asyncio.create_task(self._drain_output(bot, process))
+                # Woken by the child's exit, not by polling
+                bot.last_exit_code = await process.wait()
+                try:
+                    # A grandchild may still hold the pipe open; don't let it delay the restart
+                    await asyncio.wait_for(drain, STOP_TIMEOUT)
+                except asyncio.TimeoutError:
+                    pass
+                bot.sample()
+
+                if self._stopping:
+                    break
+                delay = self._restart_delay(bot, time.monotonic() - started)
+                logger.warning(f"⚠️ Bot '{bot.name}' exited with code {bot.last_exit_code}; "
+                               f"restarting in {delay:.0f}s")
+
+            bot.restarts += 1
+            bot.next_start = time.monotonic() + delay
+            self.publish()
+            await asyncio.sleep(delay)
+
+        bot.status = "stopped"
+        bot.next_start = None
+        self.publish()
+
+    async def _sample_resources(self):
+        while True:
+            for bot in self.bots:
+                bot.sample()
+            self.publish()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    # ----- status -----
+
+    def status(self) -> List[dict]:
+        """State, restarts, CPU and RSS of every bot"""
+        return [bot.to_status() for bot in self.bots]
+
+    def publish(self):
+        """Write the status file and notify listeners"""
+        statuses = self.status()
+        if self.status_file:
+            self._write_status_file(statuses)
+        for listener in self.listeners:
+            try:
+                listener(statuses)
+            except Exception as e:
+                logger.error(f"Status listener failed: {e}")
+
+    def _write_status_file(self, statuses: List[dict]):
+        counts = {"running": 0, "stopped": 0, "failed": 0}
+        for status in statuses:
+            if status["status"] == "running":
+                counts["running"] += 1
+            elif status["status"] in ("crash_loop", "failed"):
+                counts["failed"] += 1
+            else:
+                counts["stopped"] += 1
+
+        data = {
+            "timestamp": datetime.now().isoformat(),
+            "system_start_time": self.start_time.isoformat(),
+            "total_bots": len(statuses),
+            "running_count": counts["running"],
+            "stopped_count": counts["stopped"],
+            "failed_count": counts["failed"],
+            "bots": statuses,
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.status_file)), exist_ok=True)
+            tmp_path = f"{self.status_file}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.status_file)
+        except OSError as e:
+            logger.error(f"Error writing status file: {e}")
+
+    # ----- lifecycle -----
+
+    async def run(self):
+        """Start all bots and supervise them until stop() is called"""
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        tasks = []
+        for index, bot in enumerate(self.bots):
+            if not os.path.exists(bot.path):
+                print(f"❌ Missing bot script: {bot.path}")
+                bot.status = "failed"
+                continue
+            tasks.append(asyncio.create_task(self._supervise(bot, index * self.stagger), name=f"bot:{bot.name}"))
+
+        sampler = asyncio.create_task(self._sample_resources())
+        await self._wakeup.wait()
+
+        sampler.cancel()
+        await self._terminate_all()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for bot in self.bots:
+            bot.next_start = None
+            if bot.status != "failed":
+                bot.status = "stopped"
+        self.publish()
+
+    async def _terminate_all(self):
+        """SIGTERM all children, SIGKILL the ones still alive after STOP_TIMEOUT"""
+        running = [bot for bot in self.bots if bot.pid]
+        for bot in running:
+            logger.info(f"Stopping {bot.name} (PID: {bot.pid})...")
+            bot.process.terminate()
+
+        async def wait_or_kill(bot: ManagedBot):
+            try:
+                await asyncio.wait_for(bot.process.wait(), STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Force killing {bot.name}")
+                bot.process.kill()
+                await bot.process.wait()
+
+        await asyncio.gather(*(wait_or_kill(bot) for bot in running), return_exceptions=True)
+
+    def stop(self):
+        """Stop all bots and end run()"""
+        if self._stopping:
+            return
+        self._stopping = True
+        print("Received shutdown signal, terminating bots...")
+        if self._wakeup:
+            self._wakeup.set()
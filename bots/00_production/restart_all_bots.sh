@@ -70,8 +70,8 @@ build_bot_images() {
                 image_name="${bot_name//-/_}_${bot_name}"
             fi
             
-            # Build mit no-cache für frische Version
-            docker build --no-cache -t "$image_name" . > /dev/null 2>&1
+            # Build mit no-cache für frische Version; repo_root liefert die geteilten Module aus dem Repository-Root
+            docker build --no-cache --build-context repo_root=../../.. -t "$image_name" . > /dev/null 2>&1
             
             if [[ $? -eq 0 ]]; then
                 log_success "Image $image_name gebaut"
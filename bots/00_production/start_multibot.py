@@ -7,10 +7,15 @@
 - Erinnerungen Bot
 
 Each bot runs in its own subprocess so if one crashes others continue.
-We also log stdout lines with a prefix for easy grepping.
+We also log stdout lines with a prefix for easy grepping. Restarts, output
+draining and CPU/RSS sampling are handled by process_supervisor.py; the
+state of all bots is written to logs/multibot/status.json.
+
+With --mode inprocess (or MULTIBOT_MODE=inprocess) all bots are loaded into
+this process instead and share one event loop, see multibot_host.py. That
+needs far less memory; subprocess mode stays the default.
 """
-import subprocess, sys, time, os, signal, threading
-from datetime import datetime
+import sys, os, asyncio, argparse, logging
 
 BOT_SCRIPTS = [
     # name, relative path
@@ -24,11 +29,9 @@ BOT_SCRIPTS = [
     ("whoop", "bots/00_production/whoop_bot/bot.py"),
 ]
 
-processes = {}
-stop_flag = False
-
 LOG_DIR = os.path.join("logs", "multibot")
 os.makedirs(LOG_DIR, exist_ok=True)
+STATUS_FILE = os.getenv("MULTIBOT_STATUS_FILE", os.path.join(LOG_DIR, "status.json"))
 
 ENV_FILE = os.path.join("discord", ".env") if os.path.exists("discord/.env") else ".env"
 if os.path.exists(ENV_FILE):
@@ -36,75 +39,42 @@ if os.path.exists(ENV_FILE):
     load_dotenv(ENV_FILE)
 
 
-def start_bot(name, path):
+def bot_env():
     env = os.environ.copy()
     env['PYTHONPATH'] = '/app'
-    return subprocess.Popen([sys.executable, path], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, env=env)
-
-
-def reader_thread(name, proc):
-    log_path = os.path.join(LOG_DIR, f"{name}.log")
-    with open(log_path, 'a', encoding='utf-8') as f:
-        for line in proc.stdout:
-            ts = datetime.utcnow().isoformat()
-            tagged = f"[{ts}][{name}] {line.rstrip()}"
-            print(tagged)
-            f.write(tagged + "\n")
-    print(f"[{name}] stream ended")
+    env['PYTHONUNBUFFERED'] = '1'
+    return env
 
 
-def supervisor():
-    global stop_flag
-    while not stop_flag:
-        for name, meta in list(processes.items()):
-            proc = meta['proc']
-            if proc.poll() is not None:
-                print(f"⚠️ Bot '{name}' exited with code {proc.returncode}; restarting in 5s")
-                time.sleep(5)
-                new_proc = start_bot(name, meta['path'])
-                processes[name]['proc'] = new_proc
-                t = threading.Thread(target=reader_thread, args=(name, new_proc), daemon=True)
-                t.start()
-        time.sleep(10)
+def main_subprocess():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from process_supervisor import ManagedBot, ProcessSupervisor
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    env = bot_env()
+    supervisor = ProcessSupervisor(
+        [ManagedBot(name, path, env=env) for name, path in BOT_SCRIPTS],
+        log_dir=LOG_DIR,
+        status_file=STATUS_FILE,
+    )
+    asyncio.run(supervisor.run())
 
 
-def shutdown(signum=None, frame=None):
-    global stop_flag
-    stop_flag = True
-    print("Received shutdown signal, terminating bots...")
-    for name, meta in processes.items():
-        proc = meta['proc']
-        if proc.poll() is None:
-            try:
-                proc.terminate()
-                proc.wait(timeout=10)
-            except Exception:
-                proc.kill()
-    sys.exit(0)
+def main_inprocess():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import multibot_host
+    multibot_host.run(BOT_SCRIPTS, log_dir=LOG_DIR)
 
 
 def main():
-    # Start all bots
-    for name, path in BOT_SCRIPTS:
-        if not os.path.exists(path):
-            print(f"❌ Missing bot script: {path}")
-            continue
-        proc = start_bot(name, path)
-        processes[name] = {"proc": proc, "path": path}
-        t = threading.Thread(target=reader_thread, args=(name, proc), daemon=True)
-        t.start()
-        time.sleep(1)  # small stagger
-
-    # Supervisor thread
-    threading.Thread(target=supervisor, daemon=True).start()
-
-    # Signal handlers
-    signal.signal(signal.SIGTERM, shutdown)
-    signal.signal(signal.SIGINT, shutdown)
-
-    # Keep alive
-    while True:
-        time.sleep(1)
+    parser = argparse.ArgumentParser(description="Start the production bots")
+    parser.add_argument("--mode", choices=["subprocess", "inprocess"],
+                        default=os.getenv("MULTIBOT_MODE", "subprocess"),
+                        help="one process per bot (default) or all bots in this process")
+    args = parser.parse_args()
+    if args.mode == "inprocess":
+        main_inprocess()
+    else:
+        main_subprocess()
 
 if __name__ == '__main__':
     main()
@@ -6,6 +6,7 @@ Automatically converts messages to todos and manages family task organization
 
 import os
 import re
+import sys
 import asyncio
 import logging
 from datetime import datetime, timedelta
@@ -17,6 +18,13 @@ from discord.ext import commands
 import requests
 from dotenv import load_dotenv
 
+# The Docker image is built from todo_bot/ alone and has no bot_status_utils
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+try:
+    from bot_status_utils import add_status_to_bot
+except ImportError:
+    add_status_to_bot = None
+
 # Load environment variables
 load_dotenv()
 
@@ -149,6 +157,7 @@ class TodoBot(commands.Bot):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix='!', intents=intents)
+        self.status_manager = add_status_to_bot(self, "Todo Bot") if add_status_to_bot else None
         
         # Initialize Todoist API
         self.todoist = TodoistAPI(os.getenv('TODOIST_API_KEY'))
@@ -197,6 +206,9 @@ class TodoBot(commands.Bot):
         except Exception as e:
             logger.error(f'Failed to connect to Todoist: {e}')
         
+        if self.status_manager:
+            await self.status_manager.send_startup_message()
+        
         # Send startup notification to the todo channel
         try:
             channel = self.get_channel(self.todo_channel_id)
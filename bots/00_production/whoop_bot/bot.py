@@ -23,10 +23,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+from whoop_discord_bot import main as bot_main
+
 async def main():
     """Main function to run the WHOOP bot"""
     try:
-        from whoop_discord_bot import main as bot_main
         logger.info("Starting WHOOP Discord Bot...")
         await bot_main()
     except KeyboardInterrupt:
@@ -0,0 +1,217 @@
+"""
+Async WHOOP API client on a pooled httpx connection.
+Fetches whole days from the collection endpoints with start/end bounds,
+so reports need no per-record detail lookups.
+"""
+
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, List, Dict, Any
+
+import httpx
+
+from .config import WhoopConfig
+from .oauth import WhoopOAuth
+from .rate_limiter import WhoopRateLimiter
+from .token_manager import TokenManager
+from .client import WhoopAPIError, WhoopRateLimitError, WhoopAuthenticationError
+from .models import WhoopUser, WhoopCycle, WhoopSleep, WhoopWorkout
+
+
+class AsyncWhoopClient:
+    """Async client for the WHOOP API v2 collection endpoints."""
+
+    CYCLE_ENDPOINT = "/developer/v2/cycle"
+    SLEEP_ENDPOINT = "/developer/v2/activity/sleep"
+    RECOVERY_ENDPOINT = "/developer/v2/recovery"
+    WORKOUT_ENDPOINT = "/developer/v2/activity/workout"
+
+    # Largest page size the collection endpoints accept
+    PAGE_LIMIT = 25
+    MAX_RETRIES = 3
+
+    def __init__(self, config: WhoopConfig, oauth: Optional[WhoopOAuth] = None,
+                 token_manager: Optional[TokenManager] = None, max_connections: int = 10):
+        """Initialize async WHOOP API client."""
+        self.config = config
+        self.oauth = oauth or WhoopOAuth(config)
+        self.token_manager = token_manager or TokenManager()
+        self.rate_limiter = WhoopRateLimiter(
+            rpm=config.rate_limit_rpm,
+            rpd=config.rate_limit_rpd,
+            state_file=config.rate_limit_state_file
+        )
+        self.max_connections = max_connections
+        self._current_tokens = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created on first use inside the running loop."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.config.api_base_url,
+                timeout=30,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._http
+
+    def _get_auth_headers(self) -> Dict[str, str]:
+        """Get authentication headers from the saved tokens."""
+        if not self._current_tokens:
+            self._current_tokens = self.token_manager.get_valid_tokens()
+
+        if self._current_tokens:
+            return {
+                'Authorization': f"{self._current_tokens['token_type']} {self._current_tokens['access_token']}",
+                'Accept': 'application/json'
+            }
+
+        raise WhoopAuthenticationError("No valid tokens available. Please authenticate first.")
+
+    def is_authenticated(self) -> bool:
+        """Check if we have valid authentication tokens."""
+        return self.token_manager.has_tokens()
+
+    async def _request(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """GET an endpoint with rate limiting and retries on 429/5xx."""
+        headers = self._get_auth_headers()
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self.rate_limiter.acquire()
+            try:
+                response = await self._get_http().get(endpoint, params=params, headers=headers)
+            except httpx.HTTPError as e:
+                if attempt < self.MAX_RETRIES:
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                raise WhoopAPIError(f"Request failed: {e}")
+
+            # Let the limiter follow the server's counters (Retry-After, X-RateLimit-*)
+            self.rate_limiter.update_from_headers(response.headers)
+
+            if response.status_code == 401:
+                # Reload tokens on the next call (they may have been refreshed meanwhile)
+                self._current_tokens = None
+                raise WhoopAuthenticationError("Invalid or expired access token")
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt < self.MAX_RETRIES:
+                    if "Retry-After" not in response.headers:
+                        # acquire() waits out Retry-After; back off explicitly without it
+                        self.rate_limiter.penalize(2 ** attempt)
+                    continue
+                if response.status_code == 429:
+                    raise WhoopRateLimitError("Rate limit exceeded")
+
+            try:
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPStatusError as e:
+                raise WhoopAPIError(f"Request failed: {e}")
+            except ValueError as e:
+                raise WhoopAPIError(f"Invalid JSON response: {e}")
+
+    async def get_collection(self, endpoint: str, start: Optional[datetime] = None,
+                             end: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the records of a collection endpoint, following next_token.
+
+        Args:
+            endpoint: Collection path, e.g. CYCLE_ENDPOINT
+            start: Only records at or after this time
+            end: Only records before this time
+            limit: Stop after this many records (all pages if None)
+        """
+        records = []
+        params = {"limit": min(limit or self.PAGE_LIMIT, self.PAGE_LIMIT)}
+        if start:
+            params["start"] = start.isoformat()
+        if end:
+            params["end"] = end.isoformat()
+
+        while True:
+            data = await self._request(endpoint, params=params)
+            records.extend(data.get("records", []))
+            next_token = data.get("next_token")
+            if not next_token or (limit and len(records) >= limit):
+                break
+            # Responses carry next_token, requests take it as nextToken
+            params["nextToken"] = next_token
+
+        return records[:limit] if limit else records
+
+    async def get_user_profile(self) -> WhoopUser:
+        """Get basic user profile."""
+        data = await self._request("/developer/v2/user/profile/basic")
+        return WhoopUser(**data)
+
+    async def get_day_data(self, day: date) -> Dict[str, Any]:
+        """
+        Get profile, cycle, sleep, recovery and workouts of one UTC day.
+
+        Fetches the four collections concurrently, one bounded query each.
+
+        Returns:
+            Dictionary with profile, cycle, sleep, recovery (raw record),
+            workouts and date, as used by the daily report
+        """
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        end = start + timedelta(days=1)
+
+        profile, cycles, sleeps, recoveries, workouts = await asyncio.gather(
+            self.get_user_profile(),
+            self.get_collection(self.CYCLE_ENDPOINT, start, end),
+            self.get_collection(self.SLEEP_ENDPOINT, start, end),
+            self.get_collection(self.RECOVERY_ENDPOINT, start, end),
+            self.get_collection(self.WORKOUT_ENDPOINT, start, end)
+        )
+
+        # The bounds also return records that started the day before and ended inside it
+        day_cycles = [c for c in (WhoopCycle(**r) for r in cycles) if c.start.date() == day]
+        day_sleeps = [s for s in (WhoopSleep(**r) for r in sleeps) if s.start.date() == day]
+        day_workouts = [w for w in (WhoopWorkout(**r) for r in workouts) if w.start.date() == day]
+
+        cycle = day_cycles[0] if day_cycles else None
+        recovery = None
+        if cycle:
+            # Recoveries belong to a cycle; match by id instead of looking the cycle up
+            recovery = next((r for r in recoveries if str(r.get('cycle_id')) == str(cycle.id)), None)
+
+        return {
+            'profile': profile,
+            'cycle': cycle,
+            'sleep': day_sleeps[0] if day_sleeps else None,
+            'recovery': recovery,
+            'workouts': day_workouts,
+            'date': day.strftime('%Y-%m-%d')
+        }
+
+    async def get_latest_data(self, workout_limit: int = 3) -> Dict[str, Any]:
+        """Get profile and the most recent cycle, sleep, recovery and workouts."""
+        profile, cycles, sleeps, recoveries, workouts = await asyncio.gather(
+            self.get_user_profile(),
+            self.get_collection(self.CYCLE_ENDPOINT, limit=1),
+            self.get_collection(self.SLEEP_ENDPOINT, limit=1),
+            self.get_collection(self.RECOVERY_ENDPOINT, limit=1),
+            self.get_collection(self.WORKOUT_ENDPOINT, limit=workout_limit)
+        )
+
+        return {
+            'profile': profile,
+            'cycle': WhoopCycle(**cycles[0]) if cycles else None,
+            'sleep': WhoopSleep(**sleeps[0]) if sleeps else None,
+            'recovery': recoveries[0] if recoveries else None,
+            'workouts': [WhoopWorkout(**w) for w in workouts],
+            'date': 'Latest'
+        }
+
+    def get_rate_limit_status(self) -> Dict[str, Any]:
+        """Get current rate limiting status."""
+        return self.rate_limiter.get_status()
+
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
@@ -14,6 +14,7 @@ from typing import Optional
 from .config import WhoopConfig
 from .oauth import WhoopOAuth, extract_code_from_url
 from .client import WhoopClient
+from .store import WhoopDataStore
 
 
 @click.group()
@@ -341,12 +342,14 @@ def workouts(ctx, days, output):
 @cli.command()
 @click.option('--days', '-d', default=30, help='Number of days to export')
 @click.option('--output-dir', '-o', default='whoop_export', help='Output directory')
+@click.option('--offline', is_flag=True, help='Export from the local store without contacting the API')
 @click.pass_context
-def export(ctx, days, output_dir):
+def export(ctx, days, output_dir, offline):
     """Export all data to CSV files."""
     config = ctx.obj['config']
     oauth = WhoopOAuth(config)
     client = WhoopClient(config, oauth)
+    store = WhoopDataStore.from_config(config)
     
     try:
         output_path = Path(output_dir)
@@ -359,27 +362,33 @@ def export(ctx, days, output_dir):
         click.echo("=" * 40)
         click.echo(f"Output directory: {output_path.absolute()}")
         
+        # Only download what the local store does not cover yet
+        if not offline:
+            click.echo("\n🔄 Syncing local store...")
+            fetched = store.sync(client, start_date, end_date)
+            click.echo(f"   ✅ {sum(fetched.values())} new or updated records from the API")
+        
         # Export cycles
         click.echo("\n1. Exporting cycles...")
-        cycles = client.get_all_cycles(start=start_date, end=end_date)
+        cycles = store.get_models("cycle", start_date, end_date)
         export_cycles_csv(cycles, output_path / "cycles.csv")
         click.echo(f"   ✅ {len(cycles)} cycles")
         
         # Export sleep
         click.echo("2. Exporting sleep data...")
-        sleep_records = client.get_all_sleep_data(start=start_date, end=end_date)
+        sleep_records = store.get_models("sleep", start_date, end_date)
         export_sleep_csv(sleep_records, output_path / "sleep.csv")
         click.echo(f"   ✅ {len(sleep_records)} sleep records")
         
         # Export recovery
         click.echo("3. Exporting recovery data...")
-        recovery_records = client.get_all_recovery_data(start=start_date, end=end_date)
+        recovery_records = store.get_models("recovery", start_date, end_date)
         export_recovery_csv(recovery_records, output_path / "recovery.csv")
         click.echo(f"   ✅ {len(recovery_records)} recovery records")
         
         # Export workouts
         click.echo("4. Exporting workouts...")
-        workouts = client.get_all_workouts(start=start_date, end=end_date)
+        workouts = store.get_models("workout", start_date, end_date)
         export_workouts_csv(workouts, output_path / "workouts.csv")
         click.echo(f"   ✅ {len(workouts)} workouts")
         
@@ -418,6 +427,44 @@ def export(ctx, days, output_dir):
         ctx.exit(1)
 
 
+@cli.command()
+@click.option('--resource', '-r', default='cycle', type=click.Choice(list(WhoopDataStore.RESOURCES)), help='Resource type')
+@click.option('--field', '-f', default='score.strain', help='Field path inside the record, e.g. score.strain')
+@click.option('--days', '-d', default=365, help='Number of days to analyze')
+@click.option('--offline', is_flag=True, help='Use the local store without contacting the API')
+@click.pass_context
+def trend(ctx, resource, field, days, offline):
+    """Show the daily trend of one metric from the local store."""
+    config = ctx.obj['config']
+    store = WhoopDataStore.from_config(config)
+    
+    try:
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        
+        if not offline:
+            client = WhoopClient(config, WhoopOAuth(config))
+            store.sync(client, start_date, end_date, resources=[resource])
+        
+        series = store.get_daily_series(resource, field, start_date, end_date)
+        click.echo(f"📈 {resource} {field} (Last {days} days)")
+        click.echo("=" * 40)
+        if not series:
+            click.echo("No data found")
+            return
+        
+        values = [value for _, value in series]
+        click.echo(f"Days: {len(series)}")
+        click.echo(f"Average: {sum(values) / len(values):.2f}")
+        click.echo(f"Min: {min(values):.2f}  Max: {max(values):.2f}")
+        for day, value in series[-7:]:
+            click.echo(f"  {day}: {value:.2f}")
+        
+    except Exception as e:
+        click.echo(f"❌ Trend failed: {e}")
+        ctx.exit(1)
+
+
 @cli.command()
 @click.pass_context
 def status(ctx):
@@ -21,8 +21,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.config import WhoopConfig
 from src.oauth import WhoopOAuth
 from src.client import WhoopClient
+from src.async_client import AsyncWhoopClient
 from src.token_manager import TokenManager
 
+# Missing in the standalone WHOOP container; the bot then skips the startup report
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+try:
+    from bot_status_utils import add_status_to_bot
+except ImportError:
+    add_status_to_bot = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -43,12 +51,14 @@ class WhoopDiscordBot(commands.Bot):
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix='!', intents=intents)
+        self.status_manager = add_status_to_bot(self, "Whoop Bot") if add_status_to_bot else None
         
         # Initialize WHOOP API
         self.whoop_config = WhoopConfig.from_env()
         self.whoop_oauth = WhoopOAuth(self.whoop_config)
         self.token_manager = TokenManager()
         self.whoop_client = WhoopClient(self.whoop_config, self.whoop_oauth, self.token_manager)
+        self.async_whoop_client = AsyncWhoopClient(self.whoop_config, self.whoop_oauth, self.token_manager)
         
         # Check if we have valid tokens
         if not self.whoop_client.is_authenticated():
@@ -62,6 +72,9 @@ class WhoopDiscordBot(commands.Bot):
         # Start the daily task
         self.daily_whoop_data.start()
         logger.info("Daily WHOOP data task started")
+        
+        if self.status_manager:
+            await self.status_manager.send_startup_message()
     
     def format_duration(self, seconds):
         """Format seconds into hours and minutes"""
@@ -92,74 +105,17 @@ class WhoopDiscordBot(commands.Bot):
         try:
             # Use UTC for date comparison since WHOOP timestamps are in UTC
             yesterday_utc = datetime.utcnow() - timedelta(days=1)
-            yesterday_str = yesterday_utc.strftime('%Y-%m-%d')
-            
-            logger.info(f"Fetching WHOOP data for {yesterday_str} (UTC)")
-            
-            # Get profile
-            profile = self.whoop_client.get_user_profile()
-            
-            # Get cycles (last 10 days to find yesterday's)
-            cycles = self.whoop_client.get_cycles(limit=10)
-            yesterday_cycle = None
-            logger.info(f"Checking {len(cycles.records)} cycles for date {yesterday_utc.date()}")
-            for cycle_data in cycles.records:
-                cycle = self.whoop_client.get_cycle(cycle_data['id'])
-                logger.info(f"Cycle date: {cycle.start.date()}, matches: {cycle.start.date() == yesterday_utc.date()}")
-                if cycle.start.date() == yesterday_utc.date():
-                    yesterday_cycle = cycle
-                    logger.info(f"Found yesterday's cycle: {cycle.id}")
-                    break
             
-            # Get sleep data (last 10 days to find yesterday's)
-            sleep_data = self.whoop_client.get_sleep_data(limit=10)
-            yesterday_sleep = None
-            logger.info(f"Checking {len(sleep_data.records)} sleep records for date {yesterday_utc.date()}")
-            for sleep_record in sleep_data.records:
-                sleep = self.whoop_client.get_sleep(sleep_record['id'])
-                logger.info(f"Sleep date: {sleep.start.date()}, matches: {sleep.start.date() == yesterday_utc.date()}")
-                if sleep.start.date() == yesterday_utc.date():
-                    yesterday_sleep = sleep
-                    logger.info(f"Found yesterday's sleep: {sleep.id}")
-                    break
+            logger.info(f"Fetching WHOOP data for {yesterday_utc.strftime('%Y-%m-%d')} (UTC)")
             
-            # Get recovery data (last 10 days to find yesterday's)
-            recovery_data = self.whoop_client.get_recovery_data(limit=10)
-            yesterday_recovery = None
-            logger.info(f"Checking {len(recovery_data.records)} recovery records for date {yesterday_utc.date()}")
-            for recovery_record in recovery_data.records:
-                # Recovery records don't have direct 'id' field, they have cycle_id
-                # We need to get the cycle first to get the start date
-                try:
-                    cycle = self.whoop_client.get_cycle(recovery_record['cycle_id'])
-                    logger.info(f"Recovery cycle date: {cycle.start.date()}, matches: {cycle.start.date() == yesterday_utc.date()}")
-                    if cycle.start.date() == yesterday_utc.date():
-                        yesterday_recovery = recovery_record
-                        logger.info(f"Found yesterday's recovery for cycle: {cycle.id}")
-                        break
-                except Exception as e:
-                    logger.warning(f"Error getting cycle for recovery: {e}")
-                    continue
+            # One bounded query per resource type, all four concurrently
+            data = await self.async_whoop_client.get_day_data(yesterday_utc.date())
             
-            # Get workouts from yesterday
-            workouts = self.whoop_client.get_workouts(limit=10)
-            yesterday_workouts = []
-            logger.info(f"Checking {len(workouts.records)} workouts for date {yesterday_utc.date()}")
-            for workout_record in workouts.records:
-                workout = self.whoop_client.get_workout(workout_record['id'])
-                logger.info(f"Workout date: {workout.start.date()}, matches: {workout.start.date() == yesterday_utc.date()}")
-                if workout.start.date() == yesterday_utc.date():
-                    yesterday_workouts.append(workout)
-                    logger.info(f"Found yesterday's workout: {workout.sport_name}")
-            
-            return {
-                'profile': profile,
-                'cycle': yesterday_cycle,
-                'sleep': yesterday_sleep,
-                'recovery': yesterday_recovery,
-                'workouts': yesterday_workouts,
-                'date': yesterday_str
-            }
+            logger.info(
+                f"Found cycle: {data['cycle'] is not None}, sleep: {data['sleep'] is not None}, "
+                f"recovery: {data['recovery'] is not None}, workouts: {len(data['workouts'])}"
+            )
+            return data
             
         except Exception as e:
             logger.error(f"Error fetching WHOOP data: {e}")
@@ -371,22 +327,8 @@ class WhoopDiscordBot(commands.Bot):
     async def whoop_now_command(self, ctx):
         """Get current WHOOP data (not just yesterday)"""
         try:
-            # Get recent data
-            profile = self.whoop_client.get_user_profile()
-            cycles = self.whoop_client.get_cycles(limit=1)
-            sleep_data = self.whoop_client.get_sleep_data(limit=1)
-            recovery_data = self.whoop_client.get_recovery_data(limit=1)
-            workouts = self.whoop_client.get_workouts(limit=5)
-            
-            # Create data structure
-            data = {
-                'profile': profile,
-                'cycle': self.whoop_client.get_cycle(cycles.records[0]['id']) if cycles.records else None,
-                'sleep': self.whoop_client.get_sleep(sleep_data.records[0]['id']) if sleep_data.records else None,
-                'recovery': self.whoop_client.get_recovery(recovery_data.records[0]['id']) if recovery_data.records else None,
-                'workouts': [self.whoop_client.get_workout(w['id']) for w in workouts.records[:3]],
-                'date': 'Latest'
-            }
+            # Get recent data (list records already carry the full details)
+            data = await self.async_whoop_client.get_latest_data()
             
             embed = self.create_whoop_embed(data)
             embed.title = "🏃‍♂️ WHOOP Current Data"
@@ -464,6 +406,11 @@ class WhoopDiscordBot(commands.Bot):
             await ctx.send(f"❌ Error testing scheduled task: {e}")
             logger.error(f"Error in whoop_test_schedule command: {e}")
 
+    async def close(self):
+        """Close the WHOOP HTTP connections together with the bot"""
+        await self.async_whoop_client.aclose()
+        await super().close()
+
 async def main():
     """Main function to run the bot"""
     if not DISCORD_TOKEN:
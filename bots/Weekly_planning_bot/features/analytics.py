@@ -2,14 +2,20 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Any, Optional, Tuple
 import io
-import numpy as np
+import os
+import sys
 from collections import defaultdict
 
+# Charting libraries load on the first analytics command, not at bot startup
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from lazy_imports import lazy_import, lazy_pyplot
+plt = lazy_pyplot()
+mdates = lazy_import("matplotlib.dates")
+np = lazy_import("numpy")
+
 from core.database import get_database
 from core.models import TaskCategory, Priority
 
@@ -1,11 +1,14 @@
 import os
+import sys
 import logging
-import asyncio
 from datetime import datetime, timedelta
 import pytz
-from notion_client import Client
 from dotenv import load_dotenv
 
+# Shared Notion gateway lives in the repository root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from notion_gateway import get_notion_gateway
+
 # Load environment variables
 load_dotenv()
 
@@ -22,8 +25,8 @@ class NotionManager:
         
         logger.info("Initializing Notion Manager")
         
-        # Create Notion client
-        self.notion = Client(auth=self.token)
+        # Shared async Notion gateway
+        self.notion = get_notion_gateway(self.token)
     
     async def get_latest_weekly_plan(self):
         """
@@ -34,9 +37,8 @@ class NotionManager:
         """
         try:
             # Query for the most recent weekly planning entry
-            response = await asyncio.to_thread(
-                self.notion.databases.query,
-                database_id=self.database_id,
+            response = await self.notion.query_database(
+                self.database_id,
                 sorts=[
                     {
                         "property": "Date",
@@ -222,4 +224,4 @@ class NotionManager:
             return True
         except Exception as e:
             logger.error(f"Error updating task status: {e}")
-            return False 
\ No newline at end of file
+            return False 
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import sys
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
@@ -6,11 +7,17 @@ import discord
 from discord.ext import commands
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from enhanced_data_loader import load_all_md_content, get_random_learning_content
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import pickle
 
+# Use the process-wide embedder when the bot runs inside the full repository
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+try:
+    from embedding_service import get_embedder
+except ImportError:
+    from sentence_transformers import SentenceTransformer as get_embedder
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,7 +40,7 @@ class SimpleRAG:
     
     def __init__(self):
         logger.info("Loading sentence transformer model...")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model = get_embedder('all-MiniLM-L6-v2')
         self.documents = []
         self.embeddings = []
         self.storage_path = Path("simple_rag_storage.pkl")
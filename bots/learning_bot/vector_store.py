@@ -1,16 +1,35 @@
 import logging
 from typing import List, Optional
 import os
+import sys
 from pathlib import Path
 from langchain.schema import Document as LangchainDocument
+from langchain_core.embeddings import Embeddings
 from langchain_community.vectorstores import FAISS
-from sentence_transformers import SentenceTransformer
-from langchain_community.embeddings import HuggingFaceEmbeddings
 import numpy as np
 import random
 
+# Shared embedding model from the repository root; without it each store loads its own copy
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+try:
+    from embedding_service import get_embedder
+except ImportError:
+    from sentence_transformers import SentenceTransformer as get_embedder
+
 logger = logging.getLogger(__name__)
 
+class SharedEmbeddings(Embeddings):
+    """LangChain embeddings backed by the shared embedding service."""
+    
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+        self.model = get_embedder(model_name)
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, normalize_embeddings=True).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode([text], normalize_embeddings=True)[0].tolist()
+
 class VectorStore:
     """Handles document storage and retrieval using FAISS vector store."""
     
@@ -24,13 +43,8 @@ class VectorStore:
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(exist_ok=True)
         
-        # Use HuggingFaceEmbeddings for better compatibility
-        logger.info("Loading embedding model...")
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name='all-MiniLM-L6-v2',
-            model_kwargs={'device': 'cpu'},
-            encode_kwargs={'normalize_embeddings': True}
-        )
+        # Same model and normalization as before, shared with the other bots
+        self.embeddings = SharedEmbeddings('all-MiniLM-L6-v2')
         
         # Initialize or load vector store
         self.store = self._load_or_create_store()
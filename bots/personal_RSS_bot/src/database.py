@@ -6,9 +6,11 @@ Handles SQLite database operations for storing articles, feeds, and summaries.
 import sqlite3
 import logging
 import hashlib
-from datetime import datetime, timezone
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 
 logger = logging.getLogger(__name__)
@@ -21,12 +23,40 @@ class DatabaseManager:
         """Initialize database manager with path to database file."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One shared connection (WAL mode) instead of a connect/commit per call
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        
         self.init_database()
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Open the pooled connection on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield the pooled connection inside a transaction (commit on success, rollback on error)."""
+        with self._lock:
+            conn = self._get_connection()
+            with conn:
+                yield conn
+    
+    def close(self) -> None:
+        """Close the pooled connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     def init_database(self) -> None:
         """Initialize database tables if they don't exist."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Create articles table
@@ -60,10 +90,26 @@ class DatabaseManager:
                         fetch_count INTEGER DEFAULT 0,
                         error_count INTEGER DEFAULT 0,
                         last_error TEXT,
+                        etag TEXT,
+                        last_modified TEXT,
+                        unchanged_count INTEGER DEFAULT 0,
+                        next_fetch_after TEXT,
+                        last_entry_id TEXT,
+                        last_entry_published TEXT,
                         created_at TEXT DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
                 
+                # Add HTTP cache columns to feed_sources tables created by older versions
+                self._ensure_columns(cursor, "feed_sources", {
+                    "etag": "TEXT",
+                    "last_modified": "TEXT",
+                    "unchanged_count": "INTEGER DEFAULT 0",
+                    "next_fetch_after": "TEXT",
+                    "last_entry_id": "TEXT",
+                    "last_entry_published": "TEXT"
+                })
+                
                 # Create weekly_summaries table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS weekly_summaries (
@@ -94,6 +140,10 @@ class DatabaseManager:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_published_date ON articles(published_date)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_relevance ON articles(relevance_score)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_feed_sources_category ON feed_sources(category)")
+                # Match the filters/sorts of get_unprocessed_articles and get_recent_articles
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_processed ON articles(processed)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_processed_published ON articles(processed, published_date)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_processed_relevance ON articles(processed, relevance_score)")
                 
                 conn.commit()
                 logger.info("Database initialized successfully")
@@ -102,15 +152,31 @@ class DatabaseManager:
             logger.error(f"Error initializing database: {e}")
             raise
     
+    @staticmethod
+    def _ensure_columns(cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]) -> None:
+        """Add any missing columns to an existing table."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+                logger.info(f"Added column {table}.{name}")
+    
     def add_feed_source(self, name: str, url: str, category: str, priority: int = 2) -> bool:
         """Add a new feed source to the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
+                # Upsert so fetch statistics and HTTP cache state survive restarts
                 cursor.execute("""
-                    INSERT OR REPLACE INTO feed_sources 
+                    INSERT INTO feed_sources 
                     (name, url, category, priority, active)
                     VALUES (?, ?, ?, ?, TRUE)
+                    ON CONFLICT(url) DO UPDATE SET
+                        name = excluded.name,
+                        category = excluded.category,
+                        priority = excluded.priority,
+                        active = TRUE
                 """, (name, url, category, priority))
                 conn.commit()
                 logger.info(f"Added feed source: {name}")
@@ -119,17 +185,24 @@ class DatabaseManager:
             logger.error(f"Error adding feed source {name}: {e}")
             return False
     
-    def get_active_feeds(self) -> List[Dict]:
-        """Get all active RSS feed sources."""
+    def get_active_feeds(self, due_only: bool = False) -> List[Dict]:
+        """
+        Get all active RSS feed sources.
+        With due_only, feeds still inside their adaptive back-off window are skipped.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, name, url, category, priority, last_fetched
+                due_clause = "AND (next_fetch_after IS NULL OR next_fetch_after <= ?)" if due_only else ""
+                params = (datetime.now(timezone.utc).isoformat(),) if due_only else ()
+                cursor.execute(f"""
+                    SELECT id, name, url, category, priority, last_fetched,
+                           etag, last_modified, unchanged_count, next_fetch_after,
+                           last_entry_id, last_entry_published
                     FROM feed_sources 
-                    WHERE active = TRUE
+                    WHERE active = TRUE {due_clause}
                     ORDER BY priority ASC, category
-                """)
+                """, params)
                 
                 columns = [description[0] for description in cursor.description]
                 feeds = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -147,7 +220,7 @@ class DatabaseManager:
             content_hash = hashlib.md5(f"{title}{url}".encode()).hexdigest()
             fetched_date = datetime.now(timezone.utc).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR IGNORE INTO articles 
@@ -171,10 +244,49 @@ class DatabaseManager:
             logger.error(f"Error adding article {title}: {e}")
             return False
     
+    def add_articles_bulk(self, articles: List[Dict]) -> Optional[int]:
+        """
+        Add many articles in a single transaction.
+        Each dict needs title, url, source, category and published_date and may
+        carry content_summary and relevance_score. Returns the number inserted,
+        or None if the transaction failed.
+        """
+        if not articles:
+            return 0
+        
+        fetched_date = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (
+                article['title'], article['url'], article['source'], article['category'],
+                article['published_date'], fetched_date, article.get('content_summary', ''),
+                # Same content hash as add_article for deduplication
+                hashlib.md5(f"{article['title']}{article['url']}".encode()).hexdigest(),
+                article.get('relevance_score', 0.0)
+            )
+            for article in articles
+        ]
+        
+        try:
+            with self._connect() as conn:
+                before = conn.total_changes
+                conn.executemany("""
+                    INSERT OR IGNORE INTO articles 
+                    (title, url, source, category, published_date, fetched_date,
+                     content_summary, content_hash, relevance_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                inserted = conn.total_changes - before
+            
+            logger.debug(f"Bulk insert: {inserted} of {len(rows)} articles were new")
+            return inserted
+        except sqlite3.Error as e:
+            logger.error(f"Error bulk adding {len(rows)} articles: {e}")
+            return None
+    
     def get_unprocessed_articles(self, limit: int = 50) -> List[Dict]:
         """Get articles that haven't been processed yet."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, title, url, source, category, published_date,
@@ -201,7 +313,7 @@ class DatabaseManager:
                 day=cutoff_date.day - days
             ).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, title, url, source, category, published_date,
@@ -222,7 +334,7 @@ class DatabaseManager:
     def mark_article_processed(self, article_id: int) -> bool:
         """Mark an article as processed."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE articles SET processed = TRUE 
@@ -237,7 +349,7 @@ class DatabaseManager:
     def update_article_relevance(self, article_id: int, relevance_score: float) -> bool:
         """Update the relevance score for an article."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE articles SET relevance_score = ? 
@@ -249,6 +361,49 @@ class DatabaseManager:
             logger.error(f"Error updating relevance for article {article_id}: {e}")
             return False
     
+    def update_relevance_bulk(self, scores: List[Tuple[int, float]], mark_processed: bool = True) -> int:
+        """
+        Update relevance scores for many articles in a single transaction.
+        scores holds (article_id, relevance_score) pairs. Returns the number of rows updated.
+        """
+        if not scores:
+            return 0
+        
+        try:
+            with self._connect() as conn:
+                before = conn.total_changes
+                if mark_processed:
+                    conn.executemany("""
+                        UPDATE articles SET relevance_score = ?, processed = TRUE 
+                        WHERE id = ?
+                    """, [(score, article_id) for article_id, score in scores])
+                else:
+                    conn.executemany("""
+                        UPDATE articles SET relevance_score = ? 
+                        WHERE id = ?
+                    """, [(score, article_id) for article_id, score in scores])
+                return conn.total_changes - before
+        except sqlite3.Error as e:
+            logger.error(f"Error bulk updating relevance for {len(scores)} articles: {e}")
+            return 0
+    
+    def mark_articles_processed_bulk(self, article_ids: List[int]) -> int:
+        """Mark many articles as processed in a single transaction."""
+        if not article_ids:
+            return 0
+        
+        try:
+            with self._connect() as conn:
+                before = conn.total_changes
+                conn.executemany("""
+                    UPDATE articles SET processed = TRUE 
+                    WHERE id = ?
+                """, [(article_id,) for article_id in article_ids])
+                return conn.total_changes - before
+        except sqlite3.Error as e:
+            logger.error(f"Error bulk marking {len(article_ids)} articles as processed: {e}")
+            return 0
+    
     def add_weekly_summary(self, week_start: str, week_end: str, 
                           summary_content: str, article_count: int,
                           categories_covered: List[str]) -> int:
@@ -256,7 +411,7 @@ class DatabaseManager:
         try:
             categories_json = json.dumps(categories_covered)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO weekly_summaries 
@@ -277,7 +432,7 @@ class DatabaseManager:
     def update_feed_stats(self, feed_id: int, success: bool, error_msg: str = "") -> bool:
         """Update feed statistics after fetch attempt."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 current_time = datetime.now(timezone.utc).isoformat()
                 
@@ -300,10 +455,89 @@ class DatabaseManager:
             logger.error(f"Error updating feed stats for feed {feed_id}: {e}")
             return False
     
+    def update_feed_cache(self, feed_id: int, etag: Optional[str], last_modified: Optional[str],
+                          changed: bool, min_interval_minutes: int = 15,
+                          max_interval_minutes: int = 360) -> bool:
+        """
+        Store HTTP cache validators for a feed and schedule its next fetch.
+        
+        Feeds that keep returning nothing new back off exponentially from
+        min_interval_minutes up to max_interval_minutes; any change resets them.
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT unchanged_count FROM feed_sources WHERE id = ?", (feed_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return False
+                
+                unchanged_count = 0 if changed else (row[0] or 0) + 1
+                interval = min(min_interval_minutes * (2 ** min(unchanged_count, 16)), max_interval_minutes)
+                next_fetch_after = (datetime.now(timezone.utc) + timedelta(minutes=interval)).isoformat()
+                
+                # Keep the stored validators when the server omits them on a 304
+                cursor.execute("""
+                    UPDATE feed_sources 
+                    SET etag = COALESCE(?, etag),
+                        last_modified = COALESCE(?, last_modified),
+                        unchanged_count = ?,
+                        next_fetch_after = ?
+                    WHERE id = ?
+                """, (etag, last_modified, unchanged_count, next_fetch_after, feed_id))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"Error updating cache state for feed {feed_id}: {e}")
+            return False
+    
+    def update_feed_high_water_mark(self, feed_id: int, entry_id: str, published: str) -> bool:
+        """Remember the newest entry seen in a feed so later polls can stop there."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE feed_sources 
+                    SET last_entry_id = ?,
+                        last_entry_published = MAX(COALESCE(last_entry_published, ''), ?)
+                    WHERE id = ?
+                """, (entry_id, published, feed_id))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"Error updating high-water mark for feed {feed_id}: {e}")
+            return False
+    
+    def article_url_exists(self, url: str) -> bool:
+        """Check whether an article with this URL is already stored."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM articles WHERE url = ? LIMIT 1", (url,))
+                return cursor.fetchone() is not None
+        except sqlite3.Error as e:
+            logger.error(f"Error checking article URL {url}: {e}")
+            return False
+    
+    def get_article_urls(self, limit: int = 100000) -> List[str]:
+        """Get URLs of the most recently fetched articles (for seeding the seen-URL filter)."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT url FROM articles 
+                    ORDER BY id DESC
+                    LIMIT ?
+                """, (limit,))
+                return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Error getting article URLs: {e}")
+            return []
+    
     def get_stats(self) -> Dict:
         """Get database statistics for monitoring."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Total articles
@@ -353,7 +587,7 @@ class DatabaseManager:
             cutoff_date = datetime.now(timezone.utc)
             cutoff_date = cutoff_date.replace(day=cutoff_date.day - days).isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     DELETE FROM articles 
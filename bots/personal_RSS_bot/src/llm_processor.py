@@ -4,6 +4,7 @@ Handles content analysis, relevance scoring, and summary generation using OpenRo
 """
 
 import os
+import sys
 import logging
 import asyncio
 import aiohttp
@@ -11,9 +12,21 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import json
 import re
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 import time
 
+from rate_limiter import LLMRateLimiter
+
+# Shared LLM response cache and API monitoring live in the production log bot directory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '00_production', 'log_bot'))
+try:
+    from llm_cache import get_llm_cache
+    from api_monitor_shared import track_llm_cache_lookup
+except ImportError:
+    get_llm_cache = None
+    track_llm_cache_lookup = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,7 +36,10 @@ class LLMProcessor:
     def __init__(self, api_key: str = None, base_url: str = "https://openrouter.ai/api/v1",
                  primary_model: str = "meta-llama/llama-3.1-8b-instruct:free",
                  fallback_model: str = "meta-llama/llama-3.1-8b-instruct:free",
-                 max_tokens: int = 1000, temperature: float = 0.3):
+                 max_tokens: int = 1000, temperature: float = 0.3,
+                 requests_per_minute: float = 20, tokens_per_minute: float = 40000,
+                 max_concurrent_requests: int = 4, relevance_batch_size: int = 10,
+                 context_window_tokens: int = 8000, use_response_cache: bool = True):
         """Initialize LLM processor with OpenRouter configuration."""
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
         self.base_url = base_url
@@ -35,15 +51,31 @@ class LLMProcessor:
         if not self.api_key:
             logger.warning("No OpenRouter API key provided. LLM features will be limited.")
         
-        # Initialize OpenAI client for OpenRouter
-        self.client = OpenAI(
+        # Async OpenAI client for OpenRouter on one pooled HTTP client shared by all calls
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrent_requests,
+                                max_keepalive_connections=max_concurrent_requests),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        ) if self.api_key else None
+        self.client = AsyncOpenAI(
             api_key=self.api_key,
-            base_url=self.base_url
+            base_url=self.base_url,
+            http_client=self.http_client
         ) if self.api_key else None
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # Minimum seconds between requests
+        # Rate limiting: token buckets for requests/min and tokens/min,
+        # plus a cap on requests in flight at once
+        self.rate_limiter = LLMRateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_concurrent_requests = max_concurrent_requests
+        self._in_flight = asyncio.Semaphore(max_concurrent_requests)
+        
+        # Batched relevance scoring: articles per prompt (1 disables batching),
+        # bounded so prompt plus answer fit the model's context window
+        self.relevance_batch_size = max(1, relevance_batch_size)
+        self.context_window_tokens = context_window_tokens
+        
+        # Shared on-disk cache so re-seen articles don't spend API quota again
+        self.response_cache = get_llm_cache() if (use_response_cache and get_llm_cache) else None
         
         # Topic keywords for relevance scoring
         self.topic_keywords = {
@@ -99,12 +131,10 @@ class LLMProcessor:
                 return keyword_score
             
             # Use LLM for more nuanced analysis if available
-            if self.client and keyword_score >= 0.3:
+            if self._needs_llm_analysis(keyword_score):
                 llm_score = await self._llm_relevance_analysis(article)
                 if llm_score is not None:
-                    # Combine keyword and LLM scores (weighted average)
-                    final_score = (keyword_score * 0.4) + (llm_score * 0.6)
-                    return min(1.0, final_score)
+                    return self._combine_scores(keyword_score, llm_score)
             
             return keyword_score
             
@@ -112,6 +142,24 @@ class LLMProcessor:
             logger.error(f"Error analyzing relevance for {article['title']}: {e}")
             return 0.5  # Default moderate relevance
     
+    def _needs_llm_analysis(self, keyword_score: float) -> bool:
+        """Only articles with a promising keyword score are worth an LLM call."""
+        return bool(self.client) and keyword_score >= 0.3
+    
+    @staticmethod
+    def _combine_scores(keyword_score: float, llm_score: float) -> float:
+        """Combine keyword and LLM scores (weighted average)."""
+        return min(1.0, (keyword_score * 0.4) + (llm_score * 0.6))
+    
+    @staticmethod
+    def _normalize_llm_score(score: float) -> float:
+        """Bring scores given out of 10 or 100 onto the 0.0-1.0 scale."""
+        if score > 10:  # Assume it's out of 100
+            score = score / 100
+        elif score > 1:  # Assume it's out of 10
+            score = score / 10
+        return min(1.0, max(0.0, score))
+    
     def _calculate_keyword_relevance(self, article: Dict) -> float:
         """Calculate relevance based on keyword matching."""
         text_content = f"{article.get('title', '')} {article.get('content_summary', '')}"
@@ -157,31 +205,20 @@ class LLMProcessor:
     async def _llm_relevance_analysis(self, article: Dict) -> Optional[float]:
         """Use LLM to analyze article relevance more deeply."""
         try:
-            await self._rate_limit()
-            
             prompt = self._create_relevance_prompt(article)
+            messages = [
+                {"role": "system", "content": "You are an expert content curator specializing in productivity, AI/LLM, cognitive science, flow states, and automation."},
+                {"role": "user", "content": prompt}
+            ]
             
-            response = self.client.chat.completions.create(
-                model=self.primary_model,
-                messages=[
-                    {"role": "system", "content": "You are an expert content curator specializing in productivity, AI/LLM, cognitive science, flow states, and automation."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=50,
-                temperature=0.1
-            )
-            
-            response_text = response.choices[0].message.content.strip()
+            response_text = await self._complete_text(messages=messages, max_tokens=50, temperature=0.1)
             
             # Extract score from response
             score_match = re.search(r'(\d+(?:\.\d+)?)', response_text)
             if score_match:
-                score = float(score_match.group(1))
-                if score > 10:  # Assume it's out of 100
-                    score = score / 100
-                elif score > 1:  # Assume it's out of 10
-                    score = score / 10
-                return min(1.0, max(0.0, score))
+                score = self._normalize_llm_score(float(score_match.group(1)))
+                self._cache_response(messages, response_text, 0.1)
+                return score
             
             return None
             
@@ -189,6 +226,104 @@ class LLMProcessor:
             logger.error(f"LLM relevance analysis failed: {e}")
             return None
     
+    def _chunk_for_relevance(self, articles: List[Dict]) -> List[List[Dict]]:
+        """Split articles into prompt-sized groups by count and estimated tokens."""
+        base_tokens = LLMRateLimiter.estimate_tokens(self._create_batch_relevance_prompt([]), 0)
+        budget = self.context_window_tokens - base_tokens
+        
+        chunks: List[List[Dict]] = []
+        current: List[Dict] = []
+        used = 0
+        for article in articles:
+            # Article text plus roughly 15 answer tokens per article
+            cost = LLMRateLimiter.estimate_tokens(self._format_batch_article(0, article), 15)
+            if current and (len(current) >= self.relevance_batch_size or used + cost > budget):
+                chunks.append(current)
+                current, used = [], 0
+            current.append(article)
+            used += cost
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    @staticmethod
+    def _format_batch_article(number: int, article: Dict) -> str:
+        return (f"[{number}] Title: {article.get('title', '')}\n"
+                f"Summary: {article.get('content_summary', '')[:200]}...\n")
+    
+    def _create_batch_relevance_prompt(self, articles: List[Dict]) -> str:
+        """Create one prompt that scores several articles at once."""
+        article_block = "\n".join(
+            self._format_batch_article(number, article) for number, article in enumerate(articles, 1)
+        )
+        return f"""
+Analyze the relevance of each article below to these topic areas:
+1. AI & LLM (30% weight) - Artificial intelligence, machine learning, language models
+2. Productivity (25% weight) - Personal productivity, efficiency, time management
+3. Cognitive Science (20% weight) - Brain research, psychology, learning, memory
+4. Automation (15% weight) - Workflow automation, tools, integrations
+5. Flow & Performance (10% weight) - Peak performance, focus, flow states
+
+Rate each article's overall relevance on a scale of 0.0 to 1.0 where:
+- 0.0-0.3: Not relevant or tangentially related
+- 0.4-0.6: Moderately relevant, some useful insights
+- 0.7-0.9: Highly relevant, valuable content
+- 1.0: Extremely relevant, must-read content
+
+Articles:
+{article_block}
+Respond with only a JSON array containing one object per article, for example:
+[{{"id": 1, "score": 0.75}}, {{"id": 2, "score": 0.3}}]
+"""
+    
+    def _parse_batch_relevance_response(self, response_text: str, count: int) -> Dict[int, float]:
+        """Parse a JSON array of scores into {article number: score}; bad items are skipped."""
+        start, end = response_text.find('['), response_text.rfind(']')
+        if start == -1 or end <= start:
+            return {}
+        try:
+            items = json.loads(response_text[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(items, list):
+            return {}
+        
+        scores: Dict[int, float] = {}
+        for position, item in enumerate(items, 1):
+            try:
+                if isinstance(item, dict):
+                    number, value = int(item['id']), float(item['score'])
+                else:
+                    # Bare list of numbers: take them in article order
+                    number, value = position, float(item)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 1 <= number <= count:
+                scores[number] = self._normalize_llm_score(value)
+        return scores
+    
+    async def _llm_batch_relevance_analysis(self, articles: List[Dict]) -> Dict[int, float]:
+        """Score a group of articles with one LLM call. Returns {index in group: score}."""
+        try:
+            messages = [
+                {"role": "system", "content": "You are an expert content curator specializing in productivity, AI/LLM, cognitive science, flow states, and automation."},
+                {"role": "user", "content": self._create_batch_relevance_prompt(articles)}
+            ]
+            response_text = await self._complete_text(
+                messages=messages,
+                max_tokens=20 + 15 * len(articles),
+                temperature=0.1
+            )
+            scores = self._parse_batch_relevance_response(response_text, len(articles))
+            if len(scores) == len(articles):
+                # Only complete answers are worth replaying
+                self._cache_response(messages, response_text, 0.1)
+            return {number - 1: score for number, score in scores.items()}
+            
+        except Exception as e:
+            logger.error(f"Batched LLM relevance analysis failed for {len(articles)} articles: {e}")
+            return {}
+    
     def _create_relevance_prompt(self, article: Dict) -> str:
         """Create prompt for relevance analysis."""
         return f"""
@@ -218,21 +353,14 @@ Respond with just the numeric score (e.g., 0.75).
             if not self.client:
                 return self._create_fallback_summary(article)
             
-            await self._rate_limit()
-            
             prompt = self._create_summary_prompt(article)
             
-            response = self.client.chat.completions.create(
-                model=self.primary_model,
-                messages=[
-                    {"role": "system", "content": "You are an expert at creating concise, actionable summaries of articles about productivity, AI, cognitive science, and automation."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.3
-            )
-            
-            summary = response.choices[0].message.content.strip()
+            messages = [
+                {"role": "system", "content": "You are an expert at creating concise, actionable summaries of articles about productivity, AI, cognitive science, and automation."},
+                {"role": "user", "content": prompt}
+            ]
+            summary = await self._complete_text(messages=messages, max_tokens=150, temperature=0.3)
+            self._cache_response(messages, summary, 0.3)
             return summary
             
         except Exception as e:
@@ -272,15 +400,12 @@ Create a concise, actionable summary:
             if not self.client or not articles:
                 return self._create_fallback_weekly_summary(articles)
             
-            await self._rate_limit()
-            
             # Group articles by category
             categorized_articles = self._categorize_articles(articles)
             
             prompt = self._create_weekly_summary_prompt(categorized_articles)
             
-            response = self.client.chat.completions.create(
-                model=self.primary_model,
+            response = await self._chat_completion(
                 messages=[
                     {"role": "system", "content": "You are an expert newsletter writer who creates engaging weekly summaries of the latest developments in AI, productivity, cognitive science, and automation."},
                     {"role": "user", "content": prompt}
@@ -362,53 +487,103 @@ Write a newsletter-style summary (800-1200 words):
         
         return summary
     
-    async def _rate_limit(self):
-        """Implement rate limiting for API requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    async def _chat_completion(self, messages: List[Dict], max_tokens: int,
+                               temperature: float, model: Optional[str] = None):
+        """Run one chat completion within the in-flight cap and the rate-limit budget."""
+        prompt_text = "".join(message['content'] for message in messages)
+        estimated_tokens = LLMRateLimiter.estimate_tokens(prompt_text, max_tokens)
+        
+        async with self._in_flight:
+            await self.rate_limiter.acquire(estimated_tokens)
+            return await self.client.chat.completions.create(
+                model=model or self.primary_model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+    
+    async def _complete_text(self, messages: List[Dict], max_tokens: int,
+                             temperature: float, model: Optional[str] = None) -> str:
+        """
+        Chat completion text, answered from the shared response cache when possible.
+        Fresh responses are not cached here; callers store them with _cache_response
+        once they parsed, so a malformed reply is not replayed until the TTL runs out.
+        """
+        model = model or self.primary_model
         
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            await asyncio.sleep(sleep_time)
+        if self.response_cache:
+            cached = self.response_cache.get(model, json.dumps(messages, ensure_ascii=False), temperature)
+            if track_llm_cache_lookup:
+                track_llm_cache_lookup("rss-bot", model, cached is not None)
+            if cached is not None:
+                return cached
         
-        self.last_request_time = time.time()
+        response = await self._chat_completion(messages, max_tokens, temperature, model)
+        return response.choices[0].message.content.strip()
     
-    def batch_analyze_articles(self, articles: List[Dict], 
-                              max_concurrent: int = 3) -> List[Dict]:
-        """Analyze multiple articles for relevance in batches."""
-        async def analyze_batch():
-            semaphore = asyncio.Semaphore(max_concurrent)
-            tasks = []
-            
-            async def analyze_single(article):
-                async with semaphore:
-                    relevance_score = await self.analyze_article_relevance(article)
-                    article['relevance_score'] = relevance_score
-                    return article
-            
-            for article in articles:
-                task = asyncio.create_task(analyze_single(article))
-                tasks.append(task)
-            
-            return await asyncio.gather(*tasks, return_exceptions=True)
+    def _cache_response(self, messages: List[Dict], response_text: str,
+                        temperature: float, model: Optional[str] = None):
+        """Store a response that was parsed successfully in the shared response cache."""
+        if self.response_cache and response_text:
+            self.response_cache.set(model or self.primary_model, json.dumps(messages, ensure_ascii=False),
+                                    response_text, temperature)
+    
+    async def batch_analyze_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Analyze multiple articles for relevance concurrently.
+        Articles that need the LLM are packed relevance_batch_size per prompt;
+        any article missing from a batched answer falls back to its own call.
+        Up to max_concurrent_requests LLM calls run at once, paced by the rate limiter.
+        Each returned article carries its 'relevance_score'; failed articles are left out.
+        """
+        batched_scores: Dict[int, float] = {}
         
-        # Run the batch analysis
-        try:
-            loop = asyncio.get_event_loop()
-            results = loop.run_until_complete(analyze_batch())
-            
-            # Filter out exceptions
-            valid_results = []
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Article analysis failed: {result}")
-                else:
-                    valid_results.append(result)
+        if self.client and self.relevance_batch_size > 1:
+            candidates = [
+                article for article in articles
+                if self._needs_llm_analysis(self._calculate_keyword_relevance(article))
+            ]
+            chunks = self._chunk_for_relevance(candidates)
+            chunk_results = await asyncio.gather(
+                *(self._llm_batch_relevance_analysis(chunk) for chunk in chunks)
+            )
+            for chunk, chunk_scores in zip(chunks, chunk_results):
+                for index, llm_score in chunk_scores.items():
+                    batched_scores[id(chunk[index])] = llm_score
             
-            return valid_results
-        except Exception as e:
-            logger.error(f"Batch analysis failed: {e}")
-            return articles
+            if candidates:
+                logger.info(
+                    f"Batched relevance: {len(batched_scores)}/{len(candidates)} articles scored "
+                    f"in {len(chunks)} LLM calls"
+                )
+        
+        async def analyze_single(article):
+            if id(article) in batched_scores:
+                keyword_score = self._calculate_keyword_relevance(article)
+                article['relevance_score'] = self._combine_scores(keyword_score, batched_scores[id(article)])
+            else:
+                article['relevance_score'] = await self.analyze_article_relevance(article)
+            return article
+        
+        results = await asyncio.gather(
+            *(analyze_single(article) for article in articles),
+            return_exceptions=True
+        )
+        
+        # Filter out exceptions
+        valid_results = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Article analysis failed: {result}")
+            else:
+                valid_results.append(result)
+        
+        return valid_results
+    
+    async def close(self):
+        """Close the pooled HTTP client."""
+        if self.http_client:
+            await self.http_client.aclose()
 
 
 # Utility functions
@@ -419,7 +594,12 @@ def load_llm_config() -> Dict:
         'primary_model': os.getenv('LLM_PRIMARY_MODEL', 'meta-llama/llama-3.1-8b-instruct:free'),
         'fallback_model': os.getenv('LLM_FALLBACK_MODEL', 'meta-llama/llama-3.1-8b-instruct:free'),
         'max_tokens': int(os.getenv('LLM_MAX_TOKENS', '1000')),
-        'temperature': float(os.getenv('LLM_TEMPERATURE', '0.3'))
+        'temperature': float(os.getenv('LLM_TEMPERATURE', '0.3')),
+        'requests_per_minute': float(os.getenv('LLM_REQUESTS_PER_MINUTE', '20')),
+        'tokens_per_minute': float(os.getenv('LLM_TOKENS_PER_MINUTE', '40000')),
+        'max_concurrent_requests': int(os.getenv('LLM_MAX_CONCURRENT', '4')),
+        'relevance_batch_size': int(os.getenv('LLM_RELEVANCE_BATCH_SIZE', '10')),
+        'context_window_tokens': int(os.getenv('LLM_CONTEXT_WINDOW_TOKENS', '8000'))
     }
 
 
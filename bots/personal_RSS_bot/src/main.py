@@ -79,10 +79,18 @@ class RSSNewsBot:
             'llm_fallback_model': os.getenv('FALLBACK_MODEL', 'meta-llama/llama-3.1-8b-instruct:free'),
             'llm_max_tokens': int(os.getenv('MAX_TOKENS', '1000')),
             'llm_temperature': float(os.getenv('TEMPERATURE', '0.3')),
+            'llm_requests_per_minute': float(os.getenv('LLM_REQUESTS_PER_MINUTE', '20')),
+            'llm_tokens_per_minute': float(os.getenv('LLM_TOKENS_PER_MINUTE', '40000')),
+            'llm_max_concurrent': int(os.getenv('LLM_MAX_CONCURRENT', '4')),
+            'llm_relevance_batch_size': int(os.getenv('LLM_RELEVANCE_BATCH_SIZE', '10')),
+            'llm_context_window_tokens': int(os.getenv('LLM_CONTEXT_WINDOW_TOKENS', '8000')),
+            'relevance_max_batches': int(os.getenv('RELEVANCE_MAX_BATCHES', '20')),
             
             # RSS processing configuration
             'rss_feeds_config': os.getenv('RSS_FEEDS_CONFIG', 'config/rss_feeds.json'),
             'max_concurrent_feeds': int(os.getenv('MAX_CONCURRENT_FEEDS', '5')),
+            'feed_min_interval_minutes': int(os.getenv('FEED_MIN_INTERVAL_MINUTES', '15')),
+            'feed_max_interval_minutes': int(os.getenv('FEED_MAX_INTERVAL_MINUTES', '360')),
             'min_relevance_score': float(os.getenv('MIN_RELEVANCE_SCORE', '0.7')),
             'max_articles_per_week': int(os.getenv('MAX_ARTICLES_PER_WEEK', '25')),
             
@@ -117,7 +125,10 @@ class RSSNewsBot:
             self.rss_manager = RSSFeedManager(
                 max_concurrent_feeds=self.config['max_concurrent_feeds']
             )
-            logger.info("RSS manager initialized")
+            # Seed the seen-URL filter so feed parsing stops at already-stored articles
+            self.rss_manager.seen_urls.update(self.db_manager.get_article_urls())
+            self.rss_manager.known_url_checker = self.db_manager.article_url_exists
+            logger.info(f"RSS manager initialized ({len(self.rss_manager.seen_urls)} known article URLs)")
             
             # Initialize LLM processor
             self.llm_processor = LLMProcessor(
@@ -125,7 +136,12 @@ class RSSNewsBot:
                 primary_model=self.config['llm_primary_model'],
                 fallback_model=self.config['llm_fallback_model'],
                 max_tokens=self.config['llm_max_tokens'],
-                temperature=self.config['llm_temperature']
+                temperature=self.config['llm_temperature'],
+                requests_per_minute=self.config['llm_requests_per_minute'],
+                tokens_per_minute=self.config['llm_tokens_per_minute'],
+                max_concurrent_requests=self.config['llm_max_concurrent'],
+                relevance_batch_size=self.config['llm_relevance_batch_size'],
+                context_window_tokens=self.config['llm_context_window_tokens']
             )
             logger.info("LLM processor initialized")
             
@@ -166,10 +182,10 @@ class RSSNewsBot:
         try:
             logger.info("Starting RSS feed processing...")
             
-            # Get active feeds from database
-            feeds = self.db_manager.get_active_feeds()
+            # Get active feeds that are due (rarely-changing feeds are backed off)
+            feeds = self.db_manager.get_active_feeds(due_only=True)
             if not feeds:
-                logger.warning("No active RSS feeds found")
+                logger.info("No RSS feeds due for fetching")
                 return 0
             
             logger.info(f"Processing {len(feeds)} RSS feeds")
@@ -190,24 +206,41 @@ class RSSNewsBot:
                     articles = result['articles']
                     total_articles += len(articles)
                     
-                    # Add articles to database
-                    for article in articles:
-                        if self.db_manager.add_article(
-                            title=article['title'],
-                            url=article['url'],
-                            source=article['source'],
-                            category=article['category'],
-                            published_date=article['published_date'],
-                            content_summary=article.get('content_summary', ''),
-                            relevance_score=0.0  # Will be calculated later
-                        ):
-                            new_articles += 1
+                    # Add the feed's articles in one transaction (relevance is calculated later)
+                    feed_new_articles = self.db_manager.add_articles_bulk(articles)
+                    if feed_new_articles is None:
+                        # Keep the high-water mark, seen URLs and cache validators so the
+                        # next fetch returns these entries again
+                        logger.error(f"Failed to store articles from {feed_info['name']}")
+                        if feed_id:
+                            self.db_manager.update_feed_stats(feed_id, False, "Failed to store articles")
+                        continue
+                    self.rss_manager.seen_urls.update(article['url'] for article in articles)
+                    new_articles += feed_new_articles
                     
-                    # Update feed statistics
+                    # Move the feed's high-water mark to its newest entry
+                    mark = result.get('high_water_mark')
+                    if feed_id and mark:
+                        self.db_manager.update_feed_high_water_mark(
+                            feed_id, mark['entry_id'], mark['published']
+                        )
+                    
+                    # Update feed statistics and conditional-GET state
                     if feed_id:
                         self.db_manager.update_feed_stats(feed_id, True)
+                        self.db_manager.update_feed_cache(
+                            feed_id,
+                            etag=result.get('etag'),
+                            last_modified=result.get('last_modified'),
+                            changed=feed_new_articles > 0,
+                            min_interval_minutes=self.config['feed_min_interval_minutes'],
+                            max_interval_minutes=self.config['feed_max_interval_minutes']
+                        )
                     
-                    logger.info(f"Processed {len(articles)} articles from {feed_info['name']}")
+                    if result.get('not_modified'):
+                        logger.info(f"{feed_info['name']} not modified since last fetch")
+                    else:
+                        logger.info(f"Processed {len(articles)} articles from {feed_info['name']}")
                 else:
                     logger.error(f"Failed to fetch {feed_info['name']}: {result['error_message']}")
                     if feed_id:
@@ -225,41 +258,45 @@ class RSSNewsBot:
         try:
             logger.info("Starting article relevance analysis...")
             
-            # Get unprocessed articles
-            articles = self.db_manager.get_unprocessed_articles(50)  # Process in batches
-            if not articles:
-                logger.info("No unprocessed articles found")
-                return 0
-            
-            logger.info(f"Analyzing relevance for {len(articles)} articles")
-            
             processed_count = 0
             
-            # Analyze articles in smaller batches to avoid rate limits
-            batch_size = 10
-            for i in range(0, len(articles), batch_size):
-                batch = articles[i:i + batch_size]
+            # Work through the backlog page by page until nothing is left,
+            # at most relevance_max_batches pages per run
+            seen_ids = set()
+            for _ in range(self.config['relevance_max_batches']):
+                articles = [article for article in self.db_manager.get_unprocessed_articles(50)
+                            if article['id'] not in seen_ids]
+                if not articles:
+                    break
+                seen_ids.update(article['id'] for article in articles)
+                
+                logger.info(f"Analyzing relevance for {len(articles)} articles")
+                
+                # Score concurrently; the LLM processor paces calls to the provider's limits
+                analyzed = await self.llm_processor.batch_analyze_articles(articles)
+                scores = [(article['id'], article['relevance_score']) for article in analyzed]
+                processed_count += len(scores)
                 
-                for article in batch:
-                    try:
-                        # Analyze relevance
-                        relevance_score = await self.llm_processor.analyze_article_relevance(article)
-                        
-                        # Update database
-                        self.db_manager.update_article_relevance(article['id'], relevance_score)
-                        self.db_manager.mark_article_processed(article['id'])
-                        
-                        processed_count += 1
-                        
-                        logger.debug(f"Analyzed: {article['title']} - Relevance: {relevance_score:.2f}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error analyzing article {article['id']}: {e}")
-                        # Mark as processed even if analysis failed
-                        self.db_manager.mark_article_processed(article['id'])
+                for article in analyzed:
+                    logger.debug(f"Analyzed: {article['title']} - Relevance: {article['relevance_score']:.2f}")
                 
-                # Small delay between batches
-                await asyncio.sleep(2)
+                # Write all scores in one transaction; mark failed articles as processed anyway
+                updated = self.db_manager.update_relevance_bulk(scores, mark_processed=True)
+                scored_ids = {article_id for article_id, _ in scores}
+                updated += self.db_manager.mark_articles_processed_bulk(
+                    [article['id'] for article in articles if article['id'] not in scored_ids]
+                )
+                if not updated:
+                    # The same page would come back on the next query and be scored again
+                    logger.error("Could not mark analyzed articles as processed; stopping relevance analysis")
+                    break
+            else:
+                logger.warning(f"Relevance backlog not finished after {self.config['relevance_max_batches']} "
+                               f"batches; continuing next run")
+            
+            if not processed_count:
+                logger.info("No unprocessed articles found")
+                return 0
             
             logger.info(f"Relevance analysis complete: {processed_count} articles processed")
             return processed_count
@@ -661,6 +698,14 @@ class RSSNewsBot:
             await self.discord_publisher.stop_bot()
             logger.info("Discord bot stopped")
         
+        # Close the pooled LLM HTTP client
+        if self.llm_processor:
+            await self.llm_processor.close()
+        
+        # Close the pooled database connection
+        if self.db_manager:
+            self.db_manager.close()
+        
         logger.info("RSS News Bot shutdown complete")
     
     def _signal_handler(self, signum, frame):
@@ -0,0 +1,62 @@
+"""
+Rate limiting for Personal RSS News Bot.
+Token buckets that keep LLM calls within provider requests/min and tokens/min limits.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Continuously refilling bucket of `capacity` units at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+
+class LLMRateLimiter:
+    """Async limiter enforcing requests/min and tokens/min together."""
+
+    def __init__(self, requests_per_minute: float = 20, tokens_per_minute: float = 40000):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        Wait until one request and `estimated_tokens` tokens fit the budget, then take them.
+        Callers queue in order; a caller only holds the lock while the budget is exhausted,
+        so nobody could proceed in the meantime anyway.
+        """
+        async with self._lock:
+            while True:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(estimated_tokens)
+                    return
+                await asyncio.sleep(wait)
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """Rough token estimate: ~4 characters per prompt token plus the completion budget."""
+        return len(prompt) // 4 + max_tokens
@@ -8,17 +8,101 @@ import requests
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse, urljoin
+import xml.etree.ElementTree as ET
 import hashlib
 import asyncio
 import aiohttp
 from pathlib import Path
 import json
 
+from bloom_filter import BloomFilter
+
 logger = logging.getLogger(__name__)
 
 
+class StreamingFeedParser:
+    """
+    Incremental RSS 2.0 / RSS 1.0 / Atom parser.
+    Bytes are fed as they arrive and completed entries are yielded as
+    feedparser-style dicts, so a caller can stop reading at any entry.
+    """
+    
+    ENTRY_TAGS = {'item', 'entry'}
+    
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=('end',))
+    
+    @staticmethod
+    def _local(tag: str) -> str:
+        """Strip the XML namespace from a tag."""
+        return tag.rsplit('}', 1)[-1]
+    
+    def feed(self, data: bytes) -> Iterator[Dict]:
+        """Feed a chunk of bytes and yield every entry completed by it."""
+        self._parser.feed(data)
+        for _, elem in self._parser.read_events():
+            if self._local(elem.tag) in self.ENTRY_TAGS:
+                yield self._entry_from_element(elem)
+                # Drop parsed entry contents so memory stays flat for long feeds
+                elem.clear()
+    
+    def _entry_from_element(self, elem: ET.Element) -> Dict:
+        """Map an <item>/<entry> element onto the feedparser entry keys we use."""
+        entry: Dict = {'tags': []}
+        
+        for child in elem:
+            name = self._local(child.tag)
+            text = (child.text or '').strip()
+            
+            if name == 'title':
+                entry['title'] = text
+            elif name == 'link':
+                href = child.get('href')
+                if href is None:
+                    entry.setdefault('link', text)
+                elif child.get('rel', 'alternate') == 'alternate':
+                    entry['link'] = href
+            elif name in ('guid', 'id'):
+                entry['id'] = text
+            elif name in ('pubDate', 'published', 'date', 'issued'):
+                self._set_date(entry, 'published', text)
+            elif name in ('updated', 'modified'):
+                self._set_date(entry, 'updated', text)
+            elif name in ('description', 'summary'):
+                entry['summary'] = text
+            elif name in ('encoded', 'content'):
+                entry.setdefault('content', [{'value': text}])
+            elif name in ('author', 'creator'):
+                author_name = next((c.text for c in child if self._local(c.tag) == 'name'), None)
+                entry['author'] = (author_name or text).strip()
+            elif name == 'category':
+                term = child.get('term') or text
+                if term:
+                    entry['tags'].append({'term': term})
+        
+        return entry
+    
+    @staticmethod
+    def _set_date(entry: Dict, field: str, text: str) -> None:
+        """Store the raw date plus a UTC struct_time like feedparser does."""
+        if not text:
+            return
+        try:
+            dt = parsedate_to_datetime(text)
+        except (TypeError, ValueError):
+            try:
+                dt = datetime.fromisoformat(text.replace('Z', '+00:00'))
+            except ValueError:
+                return
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        entry[field] = text
+        entry[f"{field}_parsed"] = dt.astimezone(timezone.utc).timetuple()
+
+
 class RSSFeedManager:
     """Manages RSS feed fetching and article extraction."""
     
@@ -30,6 +114,11 @@ class RSSFeedManager:
         self.rate_limit_delay = rate_limit_delay
         self.session = None
         
+        # URLs of articles already stored; used to stop parsing at the first known entry
+        self.seen_urls = BloomFilter()
+        # Optional exact check (e.g. a database lookup) to rule out Bloom false positives
+        self.known_url_checker: Optional[Callable[[str], bool]] = None
+        
         # Configure user agent for RSS requests
         self.headers = {
             'User-Agent': 'Personal RSS News Bot/1.0 (Educational Use)',
@@ -92,19 +181,65 @@ class RSSFeedManager:
             logger.error(error_msg)
             return False, None, error_msg
     
-    async def fetch_feed_async(self, feed_url: str) -> Tuple[bool, Optional[Dict], str]:
+    async def fetch_feed_async(self, feed_url: str, etag: Optional[str] = None,
+                               last_modified: Optional[str] = None) -> Tuple[bool, Optional[Dict], str]:
         """
         Asynchronously fetch and parse a single RSS feed.
         Returns: (success, parsed_feed, error_message)
+        A 304 Not Modified response yields (True, None, "").
         """
+        result = await self.fetch_feed_conditional_async(feed_url, etag, last_modified)
+        return result['success'], result['parsed_feed'], result['error_message']
+    
+    async def fetch_feed_conditional_async(
+            self, feed_url: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+            read_body: Optional[Callable[[aiohttp.ClientResponse], Awaitable[None]]] = None) -> Dict:
+        """
+        Fetch a feed with a conditional GET using stored ETag/Last-Modified validators.
+        Returns a dict with: success, parsed_feed, error_message, not_modified,
+        etag and last_modified (the validators sent back by the server).
+        If read_body is given, it consumes the body of a modified feed instead of
+        the full feedparser parse, and parsed_feed stays None.
+        """
+        result = {
+            'success': False,
+            'parsed_feed': None,
+            'error_message': "",
+            'not_modified': False,
+            'etag': None,
+            'last_modified': None
+        }
+        
         try:
             logger.debug(f"Async fetching RSS feed: {feed_url}")
             
             # Add rate limiting
             await asyncio.sleep(self.rate_limit_delay)
             
-            async with self.session.get(feed_url) as response:
+            conditional_headers = {}
+            if etag:
+                conditional_headers['If-None-Match'] = etag
+            if last_modified:
+                conditional_headers['If-Modified-Since'] = last_modified
+            
+            async with self.session.get(feed_url, headers=conditional_headers) as response:
+                result['etag'] = response.headers.get('ETag')
+                result['last_modified'] = response.headers.get('Last-Modified')
+                
+                if response.status == 304:
+                    # Nothing new since the last fetch - skip download and parsing
+                    logger.debug(f"Feed not modified: {feed_url}")
+                    result['success'] = True
+                    result['not_modified'] = True
+                    return result
+                
                 response.raise_for_status()
+                
+                if read_body:
+                    await read_body(response)
+                    result['success'] = True
+                    return result
+                
                 content = await response.read()
             
             # Parse the RSS feed
@@ -115,19 +250,24 @@ class RSSFeedManager:
                 logger.warning(f"Feed parsing had issues for {feed_url}: {parsed_feed.bozo_exception}")
             
             if not parsed_feed.entries:
-                return False, None, "No entries found in feed"
+                result['error_message'] = "No entries found in feed"
+                return result
             
             logger.info(f"Successfully fetched {len(parsed_feed.entries)} articles from {feed_url}")
-            return True, parsed_feed, ""
+            result['success'] = True
+            result['parsed_feed'] = parsed_feed
+            return result
             
         except aiohttp.ClientError as e:
             error_msg = f"Request error for {feed_url}: {str(e)}"
             logger.error(error_msg)
-            return False, None, error_msg
+            result['error_message'] = error_msg
+            return result
         except Exception as e:
             error_msg = f"Unexpected error fetching {feed_url}: {str(e)}"
             logger.error(error_msg)
-            return False, None, error_msg
+            result['error_message'] = error_msg
+            return result
     
     def extract_articles_from_feed(self, parsed_feed: Dict, source_name: str, 
                                   category: str) -> List[Dict]:
@@ -135,41 +275,145 @@ class RSSFeedManager:
         articles = []
         
         for entry in parsed_feed.entries:
-            try:
-                # Extract basic article information
-                title = entry.get('title', '').strip()
-                link = entry.get('link', '').strip()
-                
-                if not title or not link:
-                    continue
-                
-                # Extract publication date
-                published_date = self._extract_publication_date(entry)
-                
-                # Extract content/summary
-                content_summary = self._extract_content_summary(entry)
-                
-                # Create article dictionary
-                article = {
-                    'title': title,
-                    'url': link,
-                    'source': source_name,
-                    'category': category,
-                    'published_date': published_date,
-                    'content_summary': content_summary,
-                    'author': entry.get('author', '').strip(),
-                    'tags': self._extract_tags(entry)
-                }
-                
+            article = self._article_from_entry(entry, source_name, category)
+            if article:
                 articles.append(article)
-                
-            except Exception as e:
-                logger.warning(f"Error extracting article from {source_name}: {e}")
-                continue
         
         logger.info(f"Extracted {len(articles)} articles from {source_name}")
         return articles
     
+    def _article_from_entry(self, entry: Dict, source_name: str, category: str) -> Optional[Dict]:
+        """Normalize a single feed entry into an article dict (None if unusable)."""
+        try:
+            # Extract basic article information
+            title = entry.get('title', '').strip()
+            link = entry.get('link', '').strip()
+            
+            if not title or not link:
+                return None
+            
+            # Extract publication date
+            published_date = self._extract_publication_date(entry)
+            
+            # Extract content/summary
+            content_summary = self._extract_content_summary(entry)
+            
+            # Create article dictionary
+            return {
+                'title': title,
+                'url': link,
+                'guid': (entry.get('id') or link).strip(),
+                'source': source_name,
+                'category': category,
+                'published_date': published_date,
+                # False when published_date is only the fetch-time fallback
+                'date_known': any(entry.get(f"{field}_parsed") for field in ('published', 'updated', 'created')),
+                'content_summary': content_summary,
+                'author': entry.get('author', '').strip(),
+                'tags': self._extract_tags(entry)
+            }
+            
+        except Exception as e:
+            logger.warning(f"Error extracting article from {source_name}: {e}")
+            return None
+    
+    def _is_known_article(self, article: Dict, feed_info: Dict) -> bool:
+        """Check an article against the feed's high-water mark and the seen-URL filter."""
+        if feed_info.get('last_entry_id') and article['guid'] == feed_info['last_entry_id']:
+            return True
+        
+        last_published = feed_info.get('last_entry_published')
+        if last_published and article['date_known'] and article['published_date'] < last_published:
+            return True
+        
+        if article['url'] in self.seen_urls:
+            # Bloom filters can report false positives; confirm when we can
+            return self.known_url_checker(article['url']) if self.known_url_checker else True
+        
+        return False
+    
+    def _collect_new_articles(self, entries, feed_info: Dict, result: Dict) -> bool:
+        """
+        Append new articles from `entries` to result['articles'] until the first
+        already-known entry. Returns True once that cut-off has been reached.
+        """
+        for entry in entries:
+            article = self._article_from_entry(entry, feed_info['name'], feed_info['category'])
+            if not article:
+                continue
+            
+            result['entries_seen'] += 1
+            if self._is_known_article(article, feed_info):
+                return True
+            
+            result['articles'].append(article)
+            published = article['published_date'] if article['date_known'] else ''
+            mark = result['high_water_mark']
+            if not mark:
+                # Feeds list newest first, so the first new entry is the new mark
+                result['high_water_mark'] = {'entry_id': article['guid'], 'published': published}
+            elif published > mark['published']:
+                mark['published'] = published
+        return False
+    
+    async def fetch_new_articles_async(self, feed_info: Dict) -> Dict:
+        """
+        Conditionally fetch a feed and stream-parse it, stopping at the first
+        entry that is already known. Falls back to a full feedparser parse for
+        documents the XML pull parser rejects.
+        Returns the same result dict as fetch_multiple_feeds_async plus
+        'high_water_mark' and 'entries_seen'.
+        """
+        result = {
+            'feed_info': feed_info,
+            'articles': [],
+            'high_water_mark': None,
+            'entries_seen': 0
+        }
+        
+        fetched = await self.fetch_feed_conditional_async(
+            feed_info['url'], feed_info.get('etag'), feed_info.get('last_modified'),
+            read_body=lambda response: self._stream_new_articles(response, feed_info, result)
+        )
+        del fetched['parsed_feed']
+        result.update(fetched)
+        return result
+    
+    async def _stream_new_articles(self, response: aiohttp.ClientResponse, feed_info: Dict,
+                                   result: Dict) -> None:
+        """Read the response body chunk by chunk, collecting new articles into result."""
+        stream_parser = StreamingFeedParser()
+        buffered = bytearray()
+        streaming = True
+        cut_off = False
+        
+        async for chunk in response.content.iter_chunked(16 * 1024):
+            buffered.extend(chunk)
+            if not streaming:
+                continue
+            try:
+                cut_off = self._collect_new_articles(stream_parser.feed(chunk), feed_info, result)
+            except ET.ParseError as e:
+                # Not well-formed XML: fall back to feedparser on the full document
+                logger.debug(f"Streaming parse failed for {feed_info['url']}, falling back: {e}")
+                streaming = False
+                result['articles'] = []
+                result['high_water_mark'] = None
+                result['entries_seen'] = 0
+            if cut_off:
+                break
+        
+        if not streaming:
+            parsed_feed = feedparser.parse(bytes(buffered))
+            if parsed_feed.bozo:
+                logger.warning(f"Feed parsing had issues for {feed_info['url']}: {parsed_feed.bozo_exception}")
+            self._collect_new_articles(parsed_feed.entries, feed_info, result)
+        
+        logger.info(
+            f"{feed_info['name']}: {len(result['articles'])} new of {result['entries_seen']} entries read"
+            + (" (stopped at first known entry)" if cut_off else "")
+        )
+    
     def _extract_publication_date(self, entry: Dict) -> str:
         """Extract and normalize publication date from RSS entry."""
         # Try different date fields
@@ -244,29 +488,16 @@ class RSSFeedManager:
         """
         Fetch multiple RSS feeds concurrently.
         Each feed dict should have: {'id', 'name', 'url', 'category', 'priority'}
+        and may carry 'etag'/'last_modified' validators for conditional requests
+        and 'last_entry_id'/'last_entry_published' as its high-water mark.
+        Only articles newer than the first already-known entry are returned.
         """
         semaphore = asyncio.Semaphore(self.max_concurrent_feeds)
         tasks = []
         
         async def fetch_single_feed(feed_info):
             async with semaphore:
-                success, parsed_feed, error_msg = await self.fetch_feed_async(feed_info['url'])
-                
-                result = {
-                    'feed_info': feed_info,
-                    'success': success,
-                    'error_message': error_msg,
-                    'articles': []
-                }
-                
-                if success and parsed_feed:
-                    result['articles'] = self.extract_articles_from_feed(
-                        parsed_feed, 
-                        feed_info['name'], 
-                        feed_info['category']
-                    )
-                
-                return result
+                return await self.fetch_new_articles_async(feed_info)
         
         # Create tasks for all feeds
         for feed in feeds:
@@ -0,0 +1,496 @@
+"""
+Embedding Service
+Shared sentence embedding model for all bots: the model is loaded once per
+process (or once in a sidecar process), concurrent callers are merged into
+micro-batches, and embeddings of repeated texts come from a shared LRU cache.
+
+Usage from a bot:
+
+    from embedding_service import get_embedder
+    model = get_embedder("all-MiniLM-L6-v2")
+    vectors = model.encode(["some text"], normalize_embeddings=True)
+
+get_embedder returns an in-process EmbeddingService, or, when
+EMBEDDING_SERVICE_URL is set (unix:///tmp/embeddings.sock or
+tcp://127.0.0.1:8765), an EmbeddingClient talking to a sidecar started with
+
+    python embedding_service.py --listen unix:///tmp/embeddings.sock
+
+Both have the encode() / get_sentence_embedding_dimension() interface of
+SentenceTransformer, so they can replace it directly.
+
+Configuration (environment):
+    EMBEDDING_SERVICE_URL   Sidecar address; unset = load the model in-process
+    EMBEDDING_BACKEND       "torch" (default) or "onnx"
+    EMBEDDING_ONNX_FILE     ONNX file in the model repo, e.g.
+                            onnx/model_qint8_arm64.onnx (int8, Raspberry Pi)
+    EMBEDDING_CACHE_SIZE    Cached text embeddings per model (default 4096)
+"""
+
+import os
+import json
+import time
+import queue
+import socket
+import asyncio
+import argparse
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+class EmbeddingServiceError(Exception):
+    """Raised when the embedding sidecar cannot be reached or reports an error"""
+
+
+class _EncodeRequest:
+    """Texts of one caller waiting for the next micro-batch"""
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+
+
+class EmbeddingService:
+    """In-process embedding model with micro-batching and a shared vector cache
+
+    Callers from any thread or event loop put their uncached texts on a
+    queue. A single worker thread takes everything that arrives within
+    max_wait_ms (up to max_batch_size texts) and encodes it in one forward
+    pass, so concurrent searches of several bots share the model call.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, backend: str = None,
+                 onnx_file: str = None, cache_size: int = None,
+                 max_batch_size: int = 64, max_wait_ms: float = 10):
+        """
+        Args:
+            model_name: SentenceTransformer model name
+            backend: "torch" or "onnx" (defaults to EMBEDDING_BACKEND)
+            onnx_file: ONNX file to load with the onnx backend (defaults to EMBEDDING_ONNX_FILE)
+            cache_size: Maximum number of cached text embeddings
+            max_batch_size: Maximum number of texts encoded together
+            max_wait_ms: How long the worker waits for more callers before encoding
+        """
+        self.model_name = model_name
+        self.backend = backend or os.getenv("EMBEDDING_BACKEND", "torch")
+        self.onnx_file = onnx_file or os.getenv("EMBEDDING_ONNX_FILE")
+        self.cache_size = cache_size if cache_size is not None else int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._queue: "queue.Queue[_EncodeRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        # Raw (unnormalized) embeddings keyed by text
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    # ----- model -----
+
+    def _load_model(self):
+        """Load the model once; the onnx backend falls back to torch if it fails"""
+        with self._model_lock:
+            if self._model is not None:
+                return self._model
+
+            from sentence_transformers import SentenceTransformer
+
+            started = time.monotonic()
+            if self.backend == "onnx":
+                try:
+                    model_kwargs = {"file_name": self.onnx_file} if self.onnx_file else None
+                    self._model = SentenceTransformer(self.model_name, device="cpu", backend="onnx",
+                                                      model_kwargs=model_kwargs)
+                except Exception as e:
+                    logger.warning(f"ONNX backend unavailable for {self.model_name} ({e}), using torch")
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name, device="cpu")
+
+            logger.info(f"Loaded embedding model {self.model_name} ({self.backend}) "
+                        f"in {time.monotonic() - started:.1f}s")
+            return self._model
+
+    def warmup(self):
+        """Load the model now instead of on the first request"""
+        self._load_model()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding dimension of the model"""
+        return self._load_model().get_sentence_embedding_dimension()
+
+    # ----- batching -----
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name=f"embeddings:{self.model_name}",
+                                                daemon=True)
+                self._worker.start()
+
+    def _next_batch(self) -> List[_EncodeRequest]:
+        """Block for one request, then collect more until the batch is full or max_wait passed"""
+        batch = [self._queue.get()]
+        count = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            count += len(request.texts)
+
+        return batch
+
+    def _run_worker(self):
+        while True:
+            batch = self._next_batch()
+            texts = list(dict.fromkeys(text for request in batch for text in request.texts))
+            try:
+                model = self._load_model()
+                encoded = model.encode(texts, batch_size=self.max_batch_size, convert_to_numpy=True,
+                                       show_progress_bar=False)
+                encoded = np.asarray(encoded, dtype="float32").reshape(len(texts), -1)
+            except Exception as e:
+                logger.error(f"Error encoding {len(texts)} texts: {e}")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            vectors = dict(zip(texts, encoded))
+            self._cache_put(vectors)
+            self.batches += 1
+            self.batched_texts += len(texts)
+
+            for request in batch:
+                request.future.set_result(np.stack([vectors[text] for text in request.texts]))
+
+    # ----- cache -----
+
+    def _cache_get(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._cache_lock:
+            for text in texts:
+                vector = self._cache.get(text)
+                if vector is not None:
+                    self._cache.move_to_end(text)
+                    found[text] = vector
+            self.cache_hits += len(found)
+            self.cache_misses += len(texts) - len(found)
+        return found
+
+    def _cache_put(self, vectors: Dict[str, np.ndarray]):
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            for text, vector in vectors.items():
+                self._cache[text] = vector
+                self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ----- encoding -----
+
+    def _submit(self, texts: List[str]) -> Tuple[Dict[str, np.ndarray], List[str], Optional[Future]]:
+        """Cached vectors, the texts that still need encoding and a future for their vectors"""
+        unique = list(dict.fromkeys(texts))
+        found = self._cache_get(unique)
+        missing = [text for text in unique if text not in found]
+        if not missing:
+            return found, missing, None
+
+        self._ensure_worker()
+        request = _EncodeRequest(missing)
+        self._queue.put(request)
+        return found, missing, request.future
+
+    @staticmethod
+    def _assemble(texts: List[str], found: Dict[str, np.ndarray], missing: List[str],
+                  encoded: Optional[np.ndarray], normalize: bool) -> np.ndarray:
+        if encoded is not None:
+            found = {**found, **dict(zip(missing, encoded))}
+        if not texts:
+            return np.empty((0, 0), dtype="float32")
+        vectors = np.stack([found[text] for text in texts]).astype("float32")
+        if normalize:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+        return vectors
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = None,
+               show_progress_bar: bool = None, normalize_embeddings: bool = False,
+               convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        """
+        Encode texts like SentenceTransformer.encode (blocking)
+
+        batch_size and show_progress_bar are accepted for compatibility; the
+        service decides the batching itself.
+
+        Returns:
+            float32 array with one row per text, or one vector for a single string
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        found, missing, future = self._submit(texts)
+        encoded = future.result() if future else None
+        vectors = self._assemble(texts, found, missing, encoded, normalize_embeddings)
+        return vectors[0] if single else vectors
+
+    async def aencode(self, texts: List[str], normalize_embeddings: bool = False) -> np.ndarray:
+        """Encode texts without blocking the event loop"""
+        found, missing, future = self._submit(texts)
+        encoded = await asyncio.wrap_future(future) if future else None
+        return self._assemble(texts, found, missing, encoded, normalize_embeddings)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache and batching statistics"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "model_name": self.model_name,
+            "backend": self.backend,
+            "model_loaded": self._model is not None,
+            "cache_size": len(self._cache),
+            "cache_max_size": self.cache_size,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hits / total if total else 0.0,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_texts / self.batches if self.batches else 0.0,
+        }
+
+
+_services: Dict[str, EmbeddingService] = {}
+_clients: Dict[Tuple[str, str], "EmbeddingClient"] = {}
+_registry_lock = threading.Lock()
+
+
+def get_local_service(model_name: str = DEFAULT_MODEL) -> EmbeddingService:
+    """Process-wide in-process service for a model"""
+    with _registry_lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = EmbeddingService(model_name)
+            _services[model_name] = service
+        return service
+
+
+def get_embedder(model_name: str = DEFAULT_MODEL):
+    """Shared embedder for a model: sidecar client if EMBEDDING_SERVICE_URL is set, else in-process"""
+    url = os.getenv("EMBEDDING_SERVICE_URL")
+    if not url:
+        return get_local_service(model_name)
+
+    with _registry_lock:
+        client = _clients.get((url, model_name))
+        if client is None:
+            client = EmbeddingClient(url, model_name)
+            _clients[(url, model_name)] = client
+        return client
+
+
+# ----- sidecar -----
+#
+# Protocol: the client sends one JSON line per request,
+#   {"op": "encode", "model": "...", "texts": [...], "normalize": true}
+#   {"op": "info", "model": "..."}
+# and the server answers with one JSON header line, for "encode" followed by
+# count * dim little-endian float32 values:
+#   {"count": 2, "dim": 384}\n<bytes>      or      {"error": "..."}\n
+
+
+def _parse_address(address: str) -> Tuple[str, Any]:
+    """("unix", path) or ("tcp", (host, port)) from unix:///path, tcp://host:port or host:port"""
+    if address.startswith("unix://"):
+        return "unix", address[len("unix://"):]
+    if address.startswith("tcp://"):
+        address = address[len("tcp://"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+class EmbeddingServer:
+    """Serves in-process EmbeddingServices over a Unix socket or localhost TCP"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self._server = None
+
+    async def start(self):
+        """Start listening (returns once the socket is bound)"""
+        kind, target = _parse_address(self.address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.remove(target)
+            self._server = await asyncio.start_unix_server(self._handle, path=target)
+        else:
+            self._server = await asyncio.start_server(self._handle, host=target[0], port=target[1])
+        logger.info(f"Embedding service listening on {self.address}")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                payload = b""
+                try:
+                    request = json.loads(line)
+                    service = get_local_service(request.get("model") or DEFAULT_MODEL)
+                    if request.get("op") == "info":
+                        dim = await asyncio.to_thread(service.get_sentence_embedding_dimension)
+                        header = {"model": service.model_name, "dim": dim, "stats": service.get_stats()}
+                    else:
+                        vectors = await service.aencode(request.get("texts", []),
+                                                        normalize_embeddings=request.get("normalize", False))
+                        header = {"count": int(vectors.shape[0]), "dim": int(vectors.shape[1]) if vectors.size else 0}
+                        payload = vectors.astype("<f4").tobytes()
+                except Exception as e:
+                    header = {"error": str(e)}
+                writer.write(json.dumps(header).encode("utf-8") + b"\n" + payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+
+class EmbeddingClient:
+    """Blocking client for an EmbeddingServer with the SentenceTransformer encode() interface"""
+
+    def __init__(self, address: str, model_name: str = DEFAULT_MODEL, timeout: float = 120):
+        """
+        Args:
+            address: unix:///path or tcp://host:port of the server
+            model_name: Model the server should use
+            timeout: Socket timeout in seconds (the first request may load the model)
+        """
+        self.address = address
+        self.model_name = model_name
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+
+    def _connect(self):
+        kind, target = _parse_address(self.address)
+        family = socket.AF_UNIX if kind == "unix" else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(target)
+        self._sock = sock
+        self._file = sock.makefile("rb")
+
+    def _disconnect(self):
+        for closable in (self._file, self._sock):
+            try:
+                if closable:
+                    closable.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    def _call(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        """Send one request, reconnecting once if the connection was lost"""
+        data = json.dumps(request).encode("utf-8") + b"\n"
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(data)
+                    line = self._file.readline()
+                    if not line:
+                        raise ConnectionError("connection closed by embedding service")
+                    header = json.loads(line)
+                    size = header.get("count", 0) * header.get("dim", 0) * 4 if "count" in header else 0
+                    payload = self._file.read(size) if size else b""
+                    if len(payload) != size:
+                        raise ConnectionError("incomplete response from embedding service")
+                    break
+                except OSError as e:
+                    self._disconnect()
+                    if attempt == 1:
+                        raise EmbeddingServiceError(f"Embedding service at {self.address} unavailable: {e}")
+
+        if "error" in header:
+            raise EmbeddingServiceError(header["error"])
+        return header, payload
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dim is None:
+            header, _ = self._call({"op": "info", "model": self.model_name})
+            self._dim = header["dim"]
+        return self._dim
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = None,
+               show_progress_bar: bool = None, normalize_embeddings: bool = False,
+               convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        """Encode texts on the server (same arguments as EmbeddingService.encode)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        header, payload = self._call({
+            "op": "encode", "model": self.model_name, "texts": texts, "normalize": normalize_embeddings
+        })
+        vectors = np.frombuffer(payload, dtype="<f4").reshape(header["count"], header["dim"]).astype("float32")
+        return vectors[0] if single else vectors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistics of the server-side service"""
+        header, _ = self._call({"op": "info", "model": self.model_name})
+        return header.get("stats", {})
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared embedding model sidecar for the bots")
+    parser.add_argument("--listen", default=os.getenv("EMBEDDING_SERVICE_URL", "unix:///tmp/embeddings.sock"),
+                        help="unix:///path or tcp://127.0.0.1:port")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="model to load at startup")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    get_local_service(args.model).warmup()
+    try:
+        asyncio.run(EmbeddingServer(args.listen).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
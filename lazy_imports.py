@@ -0,0 +1,134 @@
+"""
+Lazy Imports
+Module proxies that import heavy libraries (matplotlib, pandas, numpy,
+seaborn, scikit-learn) on first attribute access instead of at bot startup
+
+Usage:
+
+    from lazy_imports import lazy_import, lazy_object, lazy_pyplot
+    pd = lazy_import("pandas")
+    plt = lazy_pyplot()          # matplotlib.pyplot with the Agg backend
+
+    def build_report():
+        return pd.DataFrame(...)  # pandas is imported here, on first use
+
+    openai = lazy_import("openai")
+    client = lazy_object(lambda: openai.OpenAI(api_key=...))  # created on first call
+
+Modules using pandas/numpy types in annotations need
+`from __future__ import annotations`, otherwise the annotation itself
+triggers the import when the function is defined.
+"""
+
+import sys
+import time
+import types
+import importlib
+import threading
+from typing import Callable, Dict, Optional
+
+_import_lock = threading.RLock()
+
+# Module name -> seconds the deferred import took
+_load_times: Dict[str, float] = {}
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported when one of its attributes is used"""
+
+    def __init__(self, name: str, before_import: Optional[Callable[[], None]] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_before_import"] = before_import
+        self.__dict__["_lazy_module"] = None
+
+    def _lazy_load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+
+        with _import_lock:
+            module = self.__dict__["_lazy_module"]
+            if module is None:
+                already_loaded = self.__name__ in sys.modules
+                started = time.perf_counter()
+                before_import = self.__dict__["_lazy_before_import"]
+                if before_import and not already_loaded:
+                    before_import()
+                module = importlib.import_module(self.__name__)
+                if not already_loaded:
+                    _load_times[self.__name__] = time.perf_counter() - started
+                self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._lazy_load(), attr)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str, before_import: Optional[Callable[[], None]] = None) -> LazyModule:
+    """
+    Lazy proxy for a module
+
+    Args:
+        name: Full module name, e.g. "matplotlib.dates"
+        before_import: Called once right before the real import (e.g. to pick a backend)
+
+    Returns:
+        Proxy that behaves like the module once an attribute is accessed
+    """
+    return LazyModule(name, before_import)
+
+
+class LazyObject:
+    """Stand-in for an object (e.g. an API client) that is created on first attribute access"""
+
+    def __init__(self, factory: Callable[[], object]):
+        self.__dict__["_lazy_factory"] = factory
+        self.__dict__["_lazy_object"] = None
+
+    def _lazy_get(self):
+        obj = self.__dict__["_lazy_object"]
+        if obj is None:
+            with _import_lock:
+                obj = self.__dict__["_lazy_object"]
+                if obj is None:
+                    obj = self.__dict__["_lazy_factory"]()
+                    self.__dict__["_lazy_object"] = obj
+        return obj
+
+    def __getattr__(self, attr):
+        return getattr(self._lazy_get(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._lazy_get(), attr, value)
+
+
+def lazy_object(factory: Callable[[], object]) -> LazyObject:
+    """Proxy that calls factory() on first use and then forwards to the result"""
+    return LazyObject(factory)
+
+
+def _use_agg_backend():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def lazy_pyplot() -> LazyModule:
+    """matplotlib.pyplot, imported on first use with the non-interactive Agg backend"""
+    return lazy_import("matplotlib.pyplot", before_import=_use_agg_backend)
+
+
+def is_loaded(name: str) -> bool:
+    """Whether a module has really been imported in this process"""
+    return name in sys.modules
+
+
+def get_lazy_load_times() -> Dict[str, float]:
+    """Seconds spent importing each lazily loaded module so far"""
+    return dict(_load_times)
@@ -0,0 +1,244 @@
+"""
+Notion Gateway
+Shared non-blocking Notion API client for all bots: cursor pagination,
+pooled HTTP connections, a process-wide request rate limit, retries on
+429/5xx with jitter, and coalescing of identical concurrent reads
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+
+class NotionAPIError(Exception):
+    """Raised when a Notion request fails after all retries"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(f"Notion API error {status} ({code}): {message}")
+        self.status = status
+        self.code = code
+
+
+class RequestRateLimiter:
+    """Thread-safe token bucket; callers reserve a slot and sleep until it is due
+
+    Works across event loops and threads, so every gateway in the process
+    (including sync callers running in worker threads) shares one budget.
+    """
+
+    def __init__(self, requests_per_second: float = 3.0, burst: float = None):
+        self.rate = requests_per_second
+        self.capacity = burst if burst is not None else requests_per_second
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token (possibly borrowing ahead) and return seconds to wait"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_shared_rate_limiter = RequestRateLimiter(float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3")))
+
+
+class NotionGateway:
+    """Async Notion client shared by all bots in a process"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, token: str, rate_limiter: RequestRateLimiter = None,
+                 max_retries: int = 5, max_connections: int = 10, timeout: float = 30.0):
+        self.token = token
+        self.rate_limiter = rate_limiter or _shared_rate_limiter
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.timeout = timeout
+        # httpx clients and in-flight futures are bound to the event loop that created them
+        self._clients: Dict[int, httpx.AsyncClient] = {}
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+
+    def _client(self) -> httpx.AsyncClient:
+        loop_id = id(asyncio.get_running_loop())
+        client = self._clients.get(loop_id)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=NOTION_API_URL,
+                headers={
+                    "Authorization": f"Bearer {self.token}",
+                    "Notion-Version": NOTION_VERSION,
+                    "Content-Type": "application/json"
+                },
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=self.timeout
+            )
+            self._clients[loop_id] = client
+        return client
+
+    @staticmethod
+    def _is_read(method: str, path: str) -> bool:
+        """Reads can be shared between identical concurrent callers"""
+        return method == "GET" or path.endswith("/query") or path == "/search"
+
+    async def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send one API request
+
+        Identical reads already in flight on this event loop are awaited
+        instead of being sent again.
+
+        Args:
+            method: HTTP method
+            path: API path, e.g. "/databases/<id>/query"
+            body: JSON body
+
+        Returns:
+            Decoded JSON response
+        """
+        if not self._is_read(method, path):
+            return await self._send(method, path, body)
+
+        key = (id(asyncio.get_running_loop()), method, path, json.dumps(body, sort_keys=True, default=str))
+        task = self._in_flight.get(key)
+        if task is None:
+            # The request runs in its own task, so a cancelled caller doesn't cancel it for the others
+            task = asyncio.ensure_future(self._send(method, path, body))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple, task: asyncio.Future):
+        """Drop a finished shared request; its exception counts as retrieved even if every caller left"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _send(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rate-limited request with retries on 429/5xx and network errors"""
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                response = await self._client().request(method, path, json=body)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Notion {method} {path} failed ({e}), retrying")
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                if response.status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                    try:
+                        error = response.json()
+                    except ValueError:
+                        error = {}
+                    raise NotionAPIError(response.status_code, error.get("code", "unknown"),
+                                         error.get("message", response.text[:200]))
+                if response.status_code == 429:
+                    retry_after = float(response.headers.get("Retry-After", 1))
+                logger.warning(f"Notion {method} {path} returned {response.status_code}, retrying")
+
+            # Exponential back-off with full jitter, never sooner than Retry-After
+            delay = random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def iterate_database(self, database_id: str, filter: Dict[str, Any] = None,
+                               sorts: List[Dict[str, Any]] = None,
+                               page_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every page matching a database query, following next_cursor
+
+        Args:
+            database_id: Notion database ID
+            filter: Notion filter object
+            sorts: Notion sorts list
+            page_size: Results per request (max 100)
+        """
+        body: Dict[str, Any] = {"page_size": page_size}
+        if filter:
+            body["filter"] = filter
+        if sorts:
+            body["sorts"] = sorts
+
+        while True:
+            response = await self.request("POST", f"/databases/{database_id}/query", body)
+            for page in response.get("results", []):
+                yield page
+            if not response.get("has_more"):
+                return
+            body = {**body, "start_cursor": response["next_cursor"]}
+
+    async def query_database_all(self, database_id: str, filter: Dict[str, Any] = None,
+                                 sorts: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """All pages matching a database query"""
+        return [page async for page in self.iterate_database(database_id, filter, sorts)]
+
+    async def query_database(self, database_id: str, **body) -> Dict[str, Any]:
+        """Single query request (one result page), e.g. with page_size=1"""
+        return await self.request("POST", f"/databases/{database_id}/query", body)
+
+    async def retrieve_database(self, database_id: str) -> Dict[str, Any]:
+        return await self.request("GET", f"/databases/{database_id}")
+
+    async def create_page(self, parent: Dict[str, Any], properties: Dict[str, Any], **extra) -> Dict[str, Any]:
+        return await self.request("POST", "/pages", {"parent": parent, "properties": properties, **extra})
+
+    async def update_page(self, page_id: str, **body) -> Dict[str, Any]:
+        return await self.request("PATCH", f"/pages/{page_id}", body)
+
+    async def close(self):
+        """Close the HTTP client of the current event loop"""
+        client = self._clients.pop(id(asyncio.get_running_loop()), None)
+        if client is not None:
+            await client.aclose()
+
+    def run_sync(self, coro):
+        """Run a gateway coroutine from synchronous code outside any event loop"""
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await self.close()
+        return asyncio.run(runner())
+
+
+_gateways: Dict[str, NotionGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_notion_gateway(token: str = None) -> NotionGateway:
+    """Process-wide gateway for a Notion token (defaults to NOTION_TOKEN)"""
+    token = token or os.getenv("NOTION_TOKEN", "")
+    with _gateways_lock:
+        gateway = _gateways.get(token)
+        if gateway is None:
+            gateway = NotionGateway(token)
+            _gateways[token] = gateway
+        return gateway
@@ -1,103 +1,190 @@
 #!/usr/bin/env python3
 """
 Discord Bot Dashboard Server
-Flask-based web dashboard for monitoring Discord bot status in real-time
+Async (aiohttp) web dashboard for monitoring Discord bot status in real-time
+
+Status updates come from a StatusHub (status_hub.py). run_all_bots.py
+--dashboard serves this app inside the bot supervisor, which publishes to
+the hub directly. Started on its own, the server watches the status file
+instead: one reader for all clients, and only when the file changed.
+
+All clients of /api/events share the payloads serialized by the hub; a
+client costs one small task, not a worker thread.
 """
 
 import os
 import json
-import time
-import threading
-from datetime import datetime
-from flask import Flask, render_template, jsonify, Response
+import asyncio
 import logging
+from datetime import datetime
+from typing import Optional
+
+from aiohttp import web
+
+from status_hub import StatusHub
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-
 # Configuration
 STATUS_FILE = '/app/data/bot_status.json'
-UPDATE_INTERVAL = 5  # seconds
+TEMPLATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'dashboard.html')
+UPDATE_INTERVAL = 5  # seconds between status file checks (standalone mode)
+KEEPALIVE_INTERVAL = 15  # seconds without events before a keepalive comment
+
+HUB_KEY = web.AppKey("hub", StatusHub)
 
-def get_bot_status():
+
+def default_status(error: Optional[str] = None) -> dict:
+    """Status shown before the first update arrives"""
+    status = {
+        "timestamp": datetime.now().isoformat(),
+        "system_start_time": datetime.now().isoformat(),
+        "system_uptime": "Starting...",
+        "total_bots": 0,
+        "running_count": 0,
+        "stopped_count": 0,
+        "failed_count": 0,
+        "bots": []
+    }
+    if error:
+        status["error"] = error
+    return status
+
+
+def read_status_file(path: str) -> dict:
     """Get current bot status from JSON file"""
     try:
-        if os.path.exists(STATUS_FILE):
-            with open(STATUS_FILE, 'r') as f:
-                return json.load(f)
-        else:
-            # Return default status if file doesn't exist
-            return {
-                "timestamp": datetime.now().isoformat(),
-                "system_start_time": datetime.now().isoformat(),
-                "system_uptime": "Starting...",
-                "total_bots": 12,
-                "running_count": 0,
-                "stopped_count": 0,
-                "failed_count": 12,
-                "bots": []
-            }
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default_status()
     except Exception as e:
         logger.error(f"Error reading status file: {e}")
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "error": str(e),
-            "total_bots": 12,
-            "running_count": 0,
-            "stopped_count": 0,
-            "failed_count": 12,
-            "bots": []
-        }
-
-@app.route('/')
-def dashboard():
+        return default_status(str(e))
+
+
+async def watch_status_file(hub: StatusHub, path: str = STATUS_FILE, interval: float = UPDATE_INTERVAL):
+    """Publish the status file to the hub whenever it changes"""
+    last_mtime = -1
+    while True:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != last_mtime:
+            last_mtime = mtime
+            hub.publish(await asyncio.to_thread(read_status_file, path))
+        await asyncio.sleep(interval)
+
+
+async def dashboard(request: web.Request) -> web.Response:
     """Main dashboard page"""
-    return render_template('dashboard.html')
+    return web.FileResponse(TEMPLATE_FILE)
+
 
-@app.route('/api/status')
-def api_status():
+async def api_status(request: web.Request) -> web.Response:
     """API endpoint for current bot status"""
-    return jsonify(get_bot_status())
+    return web.Response(body=request.app[HUB_KEY].status_json(), content_type='application/json')
+
+
+async def api_history(request: web.Request) -> web.Response:
+    """History points [timestamp, cpu_percent, rss_mb, running] per bot, optionally ?bot=<name>"""
+    return web.json_response(request.app[HUB_KEY].history(request.query.get('bot')))
 
-@app.route('/api/events')
-def events():
-    """Server-Sent Events endpoint for real-time updates"""
-    def generate():
+
+async def events(request: web.Request) -> web.StreamResponse:
+    """Server-Sent Events: one full snapshot, then diffs of the changed bots"""
+    hub = request.app[HUB_KEY]
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    await response.prepare(request)
+
+    queue = hub.subscribe()
+    logger.info(f"Dashboard client connected ({hub.client_count} open)")
+    try:
         while True:
             try:
-                status = get_bot_status()
-                yield f"data: {json.dumps(status)}\n\n"
-                time.sleep(UPDATE_INTERVAL)
-            except Exception as e:
-                logger.error(f"Error in SSE stream: {e}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-                time.sleep(UPDATE_INTERVAL)
-    
-    return Response(generate(), mimetype='text/plain')
-
-@app.route('/health')
-def health():
+                payload = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                payload = b": keepalive\n\n"
+            await response.write(payload)
+    except ConnectionResetError:
+        pass
+    finally:
+        hub.unsubscribe(queue)
+        logger.info(f"Dashboard client disconnected ({hub.client_count} open)")
+    return response
+
+
+async def health(request: web.Request) -> web.Response:
     """Health check endpoint"""
-    return jsonify({
+    hub = request.app[HUB_KEY]
+    return web.json_response({
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "dashboard": "running"
+        "dashboard": "running",
+        "clients": hub.client_count,
+        "version": hub.version
     })
 
+
+def create_app(hub: StatusHub) -> web.Application:
+    """
+    Build the dashboard application
+
+    Args:
+        hub: Hub the status updates are published to
+
+    Returns:
+        aiohttp application
+    """
+    app = web.Application()
+    app[HUB_KEY] = hub
+    app.router.add_get('/', dashboard)
+    app.router.add_get('/api/status', api_status)
+    app.router.add_get('/api/history', api_history)
+    app.router.add_get('/api/events', events)
+    app.router.add_get('/health', health)
+    return app
+
+
+async def start_dashboard(hub: StatusHub, host: str = '0.0.0.0', port: int = 8080) -> web.AppRunner:
+    """
+    Serve the dashboard on the running event loop
+
+    Args:
+        hub: Hub the status updates are published to
+        host: Interface to bind
+        port: Port to listen on
+
+    Returns:
+        Runner; await runner.cleanup() to stop serving
+    """
+    hub.attach(asyncio.get_running_loop())
+    runner = web.AppRunner(create_app(hub), shutdown_timeout=1)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"📊 Dashboard available at: http://localhost:{port}")
+    return runner
+
+
+async def main():
+    hub = StatusHub()
+    runner = await start_dashboard(hub)
+    try:
+        await watch_status_file(hub, STATUS_FILE)
+    finally:
+        await runner.cleanup()
+
+
 if __name__ == '__main__':
-    # Create templates directory if it doesn't exist
-    os.makedirs('/app/runBots/templates', exist_ok=True)
-    
     logger.info("🌐 Starting Discord Bot Dashboard Server...")
-    logger.info("📊 Dashboard will be available at: http://localhost:8080")
-    
-    # Run Flask app
-    app.run(
-        host='0.0.0.0',
-        port=8080,
-        debug=False,
-        threaded=True
-    ) 
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -7,6 +7,8 @@ import platform
 import logging
 import json
 import threading
+import argparse
+import asyncio
 from datetime import datetime, timedelta
 import glob
 
@@ -40,8 +42,15 @@ def discover_bots():
 
 # Get all bots
 bots = discover_bots()
-processes = []
 system_start_time = datetime.now()
+# ProcessSupervisor for one process per bot (default), MultiBotHost for --mode inprocess
+supervisor = None
+host = None
+# StatusHub when the dashboard is served from this process (--dashboard)
+hub = None
+
+STATUS_FILE = '/home/pi/Documents/discord/runBots/data/bot_status.json'
+HEALTH_FILE = '/home/pi/Documents/discord/runBots/data/bots_running'
 
 # Enhanced logging setup - using console only to avoid permission issues
 def setup_logging():
@@ -128,26 +137,39 @@ def update_status_file():
                 "working_dir": bot.get("directory", "")
             }
             
-            # Find corresponding process
-            process_info = None
-            for p in processes:
-                if p["name"] == bot["name"]:
-                    process_info = p
-                    break
-            
-            if process_info:
-                if process_info["process"].poll() is None:
-                    # Process is running
+            if host:
+                hosted = next((h for h in host.status() if h["name"] == bot["name"]), None)
+                if hosted and hosted["status"] in ("running", "restarting"):
                     bot_data["status"] = "running"
-                    bot_data["pid"] = process_info["process"].pid
-                    bot_data["start_time"] = process_info["start_time"].isoformat()
-                    bot_data["uptime"] = format_uptime(process_info["start_time"])
-                    bot_data["working_dir"] = process_info.get("working_dir", "")
+                    bot_data["pid"] = hosted["pid"]
+                    bot_data["start_time"] = hosted["start_time"]
+                    bot_data["uptime"] = format_uptime(datetime.fromisoformat(hosted["start_time"]))
+                    bot_data["restarts"] = hosted["restarts"]
                     status_data["running_count"] += 1
-                else:
-                    # Process has stopped
+                elif hosted and hosted["status"] == "stopped":
                     bot_data["status"] = "stopped"
-                    bot_data["start_time"] = process_info["start_time"].isoformat()
+                    status_data["stopped_count"] += 1
+                else:
+                    bot_data["status"] = "failed"
+                    status_data["failed_count"] += 1
+                status_data["bots"].append(bot_data)
+                continue
+
+            supervised = next((b for b in supervisor.status() if b["name"] == bot["name"]), None) if supervisor else None
+            if supervised:
+                bot_data["status"] = supervised["status"]
+                bot_data["pid"] = supervised["pid"]
+                bot_data["start_time"] = supervised["start_time"]
+                bot_data["working_dir"] = supervised["directory"]
+                for key in ("restarts", "last_exit_code", "next_restart_in", "cpu_percent", "rss_mb"):
+                    bot_data[key] = supervised[key]
+                if supervised["status"] == "running":
+                    bot_data["uptime"] = format_uptime(datetime.fromisoformat(supervised["start_time"]))
+                    status_data["running_count"] += 1
+                elif supervised["status"] in ("crash_loop", "failed"):
+                    status_data["failed_count"] += 1
+                else:
+                    # pending, restarting (waiting for its backoff) or stopped
                     status_data["stopped_count"] += 1
             else:
                 # Bot never started or failed to start
@@ -156,9 +178,15 @@ def update_status_file():
             
             status_data["bots"].append(bot_data)
         
-        # Write to status file
-        with open('/home/pi/Documents/discord/runBots/data/bot_status.json', 'w') as f:
+        # Write to status file; replace atomically so the dashboard never reads a partial file
+        tmp_path = f"{STATUS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(status_data, f, indent=2)
+        os.replace(tmp_path, STATUS_FILE)
+        
+        # Push to the in-process dashboard
+        if hub:
+            hub.publish(status_data)
         
         return status_data
         
@@ -203,7 +231,7 @@ def print_status_table():
     print(f"   🕒 Last Update: {datetime.now().strftime('%H:%M:%S')}")
     
     print(f"\n📋 BOT DETAILS:")
-    print(f"{'Bot Name':<20} {'Status':<10} {'PID':<8} {'Uptime':<15} {'Path'}")
+    print(f"{'Bot Name':<20} {'Status':<12} {'PID':<8} {'Uptime':<15} {'CPU':>6} {'RSS':>8} {'Restarts':>8}")
     print("-" * 80)
     
     for bot in status_data['bots']:
@@ -211,17 +239,39 @@ def print_status_table():
             'running': '✅',
             'stopped': '⏹️',
             'failed': '❌',
+            'restarting': '🔄',
+            'crash_loop': '🔥',
             'unknown': '❓'
         }.get(bot['status'], '❓')
         
         pid_str = str(bot['pid']) if bot['pid'] else 'N/A'
+        cpu_str = f"{bot['cpu_percent']:.0f}%" if bot.get('cpu_percent') is not None else '-'
+        rss_str = f"{bot['rss_mb']:.0f}MB" if bot.get('rss_mb') is not None else '-'
         
-        print(f"{bot['name']:<20} {status_icon} {bot['status']:<7} {pid_str:<8} {bot['uptime']:<15} {bot['path']}")
+        print(f"{bot['name']:<20} {status_icon} {bot['status']:<9} {pid_str:<8} {bot['uptime']:<15} {cpu_str:>6} {rss_str:>8} {bot.get('restarts', 0):>8}")
     
     print("="*80 + "\n")
 
+def write_health_file():
+    """Write the health check file with the number of running bots"""
+    try:
+        running = sum(1 for b in supervisor.status() if b["status"] == "running") if supervisor else 0
+        with open(HEALTH_FILE, 'w') as f:
+            f.write(f'running:{running}/{len(bots)}:{datetime.now().isoformat()}')
+    except Exception as e:
+        logger.error(f"❌ Error writing health check file: {e}")
+
+def on_supervisor_update(statuses):
+    """Called by the supervisor whenever a bot starts, exits or is sampled"""
+    update_status_file()
+    write_health_file()
+
 def start_bots():
-    """Start all available Discord bots"""
+    """Create the supervisor for all available Discord bots"""
+    global supervisor
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bots', '00_production'))
+    from process_supervisor import ManagedBot, ProcessSupervisor
+
     logger.info("="*50)
     logger.info("STARTING DISCORD BOT DEPLOYMENT")
     logger.info("="*50)
@@ -240,133 +290,66 @@ def start_bots():
         return False
     
     logger.info(f"Found {len(available_bots)} available bots out of {len(bots)} total")
+    os.makedirs(os.path.dirname(STATUS_FILE), exist_ok=True)
     
-    successful_starts = 0
-    
+    managed = []
     for bot in available_bots:
-        logger.info(f"Starting {bot['name']}...")
-        try:
-            # Create a new process for each bot with proper environment
-            env = os.environ.copy()
-            env['PYTHONPATH'] = '/home/pi/Documents/discord/runBots'
-            env['PYTHONUNBUFFERED'] = '1'
-            # Add bot startup environment variable
-            env['BOT_STARTUP_MESSAGE'] = 'true'
-            env['BOT_NAME'] = bot['name']
-            env['BOT_LOCATION'] = f"Docker Container - {bot.get('directory', 'root')}"
-            
-            # Determine working directory based on bot location
-            bot_dir = os.path.dirname(bot['path'])
-            if bot_dir:
-                working_dir = os.path.join('/home/pi/Documents/discord/runBots', bot_dir)
-            else:
-                working_dir = '/home/pi/Documents/discord/runBots'
-            
-            process = subprocess.Popen(
-                [sys.executable, bot['path']], 
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                env=env,
-                cwd=working_dir  # Set working directory to bot's directory
-            )
-            
-            processes.append({
-                "name": bot['name'], 
-                "process": process,
-                "path": bot['path'],
-                "start_time": datetime.now(),
-                "working_dir": working_dir
-            })
-            
-            logger.info(f"✅ {bot['name']} started with PID {process.pid} in {working_dir}")
-            successful_starts += 1
-            
-            # Small delay between bot starts to prevent overwhelming the system
-            time.sleep(3)
-            
-        except Exception as e:
-            logger.error(f"❌ Error starting {bot['name']}: {e}")
-    
-    # Create health check file
-    try:
-        with open('/home/pi/Documents/discord/runBots/data/bots_running', 'w') as f:
-            f.write(f'running:{successful_starts}/{len(available_bots)}:{datetime.now().isoformat()}')
-        logger.info("✅ Health check file created")
-    except Exception as e:
-        logger.error(f"❌ Error creating health check file: {e}")
-    
-    # Update initial status
-    update_status_file()
-    
-    logger.info("="*50)
-    logger.info(f"DEPLOYMENT COMPLETE: {successful_starts}/{len(available_bots)} bots started successfully")
-    logger.info("="*50)
+        # Create a new process for each bot with proper environment
+        env = os.environ.copy()
+        env['PYTHONPATH'] = '/home/pi/Documents/discord/runBots'
+        env['PYTHONUNBUFFERED'] = '1'
+        # Add bot startup environment variable
+        env['BOT_STARTUP_MESSAGE'] = 'true'
+        env['BOT_NAME'] = bot['name']
+        env['BOT_LOCATION'] = f"Docker Container - {bot.get('directory', 'root')}"
+        
+        # Determine working directory based on bot location
+        bot_dir = os.path.dirname(bot['path'])
+        if bot_dir:
+            working_dir = os.path.join('/home/pi/Documents/discord/runBots', bot_dir)
+        else:
+            working_dir = '/home/pi/Documents/discord/runBots'
+        
+        managed.append(ManagedBot(bot['name'], bot['path'], cwd=working_dir, env=env))
     
-    # Print initial status table
-    print_status_table()
+    # Bot output goes to one log file per bot instead of the console
+    supervisor = ProcessSupervisor(
+        managed,
+        log_dir='/home/pi/Documents/discord/runBots/logs/bots',
+        stagger=0.5,
+        echo=False
+    )
+    supervisor.listeners.append(on_supervisor_update)
     
-    if successful_starts > 0:
-        logger.info("🌐 Dashboard will be available at: http://localhost:8080")
-        logger.info("Press Ctrl+C to stop all bots")
-        return True
-    else:
-        logger.error("No bots started successfully!")
-        return False
+    logger.info("🌐 Dashboard will be available at: http://localhost:8080")
+    logger.info("Press Ctrl+C to stop all bots")
+    return True
 
-def monitor_bots():
-    """Monitor bot processes and restart failed ones"""
-    while True:
-        try:
-            failed_bots = []
-            for p in processes:
-                if p["process"].poll() is not None:  # Process has terminated
-                    failed_bots.append(p)
-            
-            if failed_bots:
-                logger.warning(f"Detected {len(failed_bots)} failed bots")
-                for failed_bot in failed_bots:
-                    logger.warning(f"Bot {failed_bot['name']} (PID {failed_bot['process'].pid}) has stopped")
-                    # Remove from active processes
-                    processes.remove(failed_bot)
-
-                    # Retry starting the bot
-                    logger.info(f"Retrying {failed_bot['name']}...")
-                    try:
-                        process = subprocess.Popen(
-                            [sys.executable, failed_bot['path']], 
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            universal_newlines=True,
-                            env=os.environ.copy(),
-                            cwd=failed_bot['working_dir']
-                        )
-
-                        processes.append({
-                            "name": failed_bot['name'], 
-                            "process": process,
-                            "path": failed_bot['path'],
-                            "start_time": datetime.now(),
-                            "working_dir": failed_bot['working_dir']
-                        })
+async def start_embedded_dashboard():
+    """Serve the dashboard from this process if --dashboard was given; returns its runner"""
+    if not hub:
+        return None
+    from dashboard_server import start_dashboard
+    return await start_dashboard(hub, port=int(os.getenv('DASHBOARD_PORT', '8080')))
 
-                        logger.info(f"✅ {failed_bot['name']} restarted with PID {process.pid}")
-                    except Exception as e:
-                        logger.error(f"❌ Error restarting {failed_bot['name']}: {e}")
+async def run_supervised():
+    """Run the supervisor and print the status table every minute"""
+    async def print_periodically():
+        while True:
+            await asyncio.sleep(60)
+            try:
+                print_status_table()
+            except Exception as e:
+                logger.error(f"Error in status printer: {e}")
 
-            # Update status file
-            update_status_file()
-            
-            # Update health check
-            with open('/home/pi/Documents/discord/runBots/data/bots_running', 'w') as f:
-                active_count = len([p for p in processes if p["process"].poll() is None])
-                f.write(f'running:{active_count}/{len(bots)}:{datetime.now().isoformat()}')
-            
-            time.sleep(30)  # Check every 30 seconds
-            
-        except Exception as e:
-            logger.error(f"Error in bot monitoring: {e}")
-            time.sleep(60)  # Wait longer if there's an error
+    dashboard = await start_embedded_dashboard()
+    printer = asyncio.create_task(print_periodically())
+    try:
+        await supervisor.run()
+    finally:
+        printer.cancel()
+        if dashboard:
+            await dashboard.cleanup()
 
 def status_printer():
     """Print status table periodically"""
@@ -384,37 +367,30 @@ def stop_bots():
     logger.info("STOPPING ALL BOTS...")
     logger.info("="*50)
     
-    for p in processes:
+    # The supervisor stops its children when run() ends; catch any left over after an error
+    for bot in (supervisor.bots if supervisor else []):
+        if not bot.pid:
+            continue
         try:
-            logger.info(f"Stopping {p['name']} (PID: {p['process'].pid})...")
-            
+            logger.info(f"Stopping {bot.name} (PID: {bot.pid})...")
             if platform.system() == "Windows":
-                subprocess.call(['taskkill', '/F', '/T', '/PID', str(p["process"].pid)])
+                subprocess.call(['taskkill', '/F', '/T', '/PID', str(bot.pid)])
             else:
-                # Send SIGTERM first (graceful shutdown)
-                os.kill(p["process"].pid, signal.SIGTERM)
-                time.sleep(5)  # Give it time to shutdown gracefully
-                
-                # Check if still running
-                if p["process"].poll() is None:
-                    logger.warning(f"Force killing {p['name']}")
-                    os.kill(p["process"].pid, signal.SIGKILL)
-            
-            logger.info(f"✅ Stopped {p['name']}")
-            
+                os.kill(bot.pid, signal.SIGKILL)
+            logger.info(f"✅ Stopped {bot.name}")
         except Exception as e:
-            logger.error(f"❌ Error stopping {p['name']}: {e}")
+            logger.error(f"❌ Error stopping {bot.name}: {e}")
     
     # Remove health check file
     try:
-        os.remove('/home/pi/Documents/discord/runBots/data/bots_running')
+        os.remove(HEALTH_FILE)
         logger.info("✅ Health check file removed")
     except:
         pass
     
     # Remove status file
     try:
-        os.remove('/home/pi/Documents/discord/runBots/data/bot_status.json')
+        os.remove(STATUS_FILE)
         logger.info("✅ Status file removed")
     except:
         pass
@@ -423,20 +399,70 @@ def stop_bots():
     logger.info("ALL BOTS STOPPED")
     logger.info("="*50)
 
+def run_inprocess():
+    """Run all bots as plugins of this process (see bots/00_production/multibot_host.py)"""
+    global host
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bots', '00_production'))
+    import multibot_host
+
+    available_bots = validate_bot_files()
+    if not available_bots:
+        logger.error("No valid bot files found! Exiting...")
+        return False
+
+    host = multibot_host.MultiBotHost(
+        [(bot['name'], bot['path']) for bot in available_bots],
+        log_dir='/home/pi/Documents/discord/runBots/logs/bots',
+        stagger=3
+    )
+    host.setup_output()
+    logger.info(f"Hosting {len(available_bots)} bots in process {os.getpid()}")
+
+    def status_updater():
+        while True:
+            time.sleep(30)
+            update_status_file()
+
+    async def run_host():
+        dashboard = await start_embedded_dashboard()
+        try:
+            await host.run()
+        finally:
+            if dashboard:
+                await dashboard.cleanup()
+
+    threading.Thread(target=status_updater, daemon=True).start()
+    threading.Thread(target=status_printer, daemon=True).start()
+    asyncio.run(run_host())
+    return True
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run all Discord bots")
+    parser.add_argument("--mode", choices=["subprocess", "inprocess"],
+                        default=os.getenv("MULTIBOT_MODE", "subprocess"),
+                        help="one process per bot (default) or all bots in one process")
+    parser.add_argument("--dashboard", action="store_true",
+                        default=os.getenv("DASHBOARD_EMBEDDED", "false").lower() == "true",
+                        help="serve the status dashboard from this process (port DASHBOARD_PORT, default 8080)")
+    args = parser.parse_args()
+
+    if args.dashboard:
+        from status_hub import StatusHub
+        hub = StatusHub()
+
+    if args.mode == "inprocess":
+        try:
+            if not run_inprocess():
+                sys.exit(1)
+        finally:
+            stop_bots()
+        sys.exit(0)
+
     try:
         if start_bots():
-            # Start monitoring in separate threads
-            monitor_thread = threading.Thread(target=monitor_bots, daemon=True)
-            monitor_thread.start()
-            
-            # Start status printer thread
-            status_thread = threading.Thread(target=status_printer, daemon=True)
-            status_thread.start()
-            
-            # Keep the main script running
-            while True:
-                time.sleep(1)
+            # Restarts, output draining and status updates are event driven
+            asyncio.run(run_supervised())
+            stop_bots()
         else:
             logger.error("Failed to start bots. Exiting.")
             sys.exit(1)
@@ -447,4 +473,4 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         stop_bots()
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
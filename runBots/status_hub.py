@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Status Hub
+In-process pub/sub for bot status, shared by all dashboard clients
+
+The bot supervisor (or the status file watcher of a standalone dashboard)
+calls publish() with the same dict that goes into bot_status.json. The hub
+compares it with the previous state and serializes one Server-Sent Event
+with only the bot entries that changed. That payload is handed to every
+connected client as-is, so ten open dashboards cost one json.dumps, not ten.
+
+It also keeps a ring buffer of CPU/RSS/running samples per bot for the
+sparkline charts.
+"""
+
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# One history point per bot every HISTORY_INTERVAL seconds, HISTORY_SIZE points (1 hour)
+HISTORY_INTERVAL = 10
+HISTORY_SIZE = 360
+
+# Events a slow client may lag behind before it is resynced with a full snapshot
+SUBSCRIBER_QUEUE_SIZE = 32
+
+# Fields that change on every update without carrying new information;
+# clients derive the uptimes from the start times
+VOLATILE_FIELDS = ("uptime", "system_uptime", "timestamp")
+
+
+def _sse(event: str, data: dict) -> bytes:
+    """Serialize one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+def _comparable(bot: dict) -> dict:
+    return {k: v for k, v in bot.items() if k not in VOLATILE_FIELDS}
+
+
+class StatusHub:
+    """Latest bot status, per-bot history and the connected SSE clients."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._summary: dict = {}
+        self._bots: Dict[str, dict] = {}
+        self._history: Dict[str, Deque[list]] = {}
+        self._last_sample: Dict[str, float] = {}
+        self._subscribers: List[asyncio.Queue] = []
+        self._snapshot: Optional[bytes] = None
+        self._status_json: Optional[bytes] = None
+        self.version = 0
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Bind the hub to the event loop that serves the clients; call from that loop"""
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+
+    # ----- publishing -----
+
+    def publish(self, status_data: dict):
+        """
+        Publish a new status; safe to call from any thread
+
+        Args:
+            status_data: Same structure as bot_status.json
+        """
+        if not status_data:
+            return
+        loop = self._loop
+        if loop and loop.is_running() and threading.get_ident() != self._loop_thread:
+            loop.call_soon_threadsafe(self._publish, status_data)
+        else:
+            self._publish(status_data)
+
+    def _publish(self, status_data: dict):
+        bots = {bot["name"]: bot for bot in status_data.get("bots", [])}
+        summary = {k: v for k, v in status_data.items() if k != "bots"}
+
+        changed = [bot for name, bot in bots.items()
+                   if name not in self._bots or _comparable(self._bots[name]) != _comparable(bot)]
+        removed = [name for name in self._bots if name not in bots]
+        history = self._record_history(bots)
+        summary_changed = _comparable(summary) != _comparable(self._summary)
+
+        self._summary = summary
+        self._bots = bots
+        if not (changed or removed or history or summary_changed):
+            return
+
+        self.version += 1
+        self._snapshot = None
+        self._status_json = None
+        payload = _sse("diff", {
+            "version": self.version,
+            "summary": summary,
+            "bots": changed,
+            "removed": removed,
+            "history": history,
+        })
+        for queue in list(self._subscribers):
+            self._deliver(queue, payload)
+
+    def _record_history(self, bots: Dict[str, dict]) -> Dict[str, list]:
+        """Append a sample per bot if HISTORY_INTERVAL has passed; returns the new points"""
+        now = time.time()
+        points = {}
+        for name, bot in bots.items():
+            if now - self._last_sample.get(name, 0) < HISTORY_INTERVAL:
+                continue
+            self._last_sample[name] = now
+            point = [int(now), bot.get("cpu_percent"), bot.get("rss_mb"), 1 if bot.get("status") == "running" else 0]
+            self._history.setdefault(name, deque(maxlen=HISTORY_SIZE)).append(point)
+            points[name] = point
+        for name in list(self._history):
+            if name not in bots:
+                del self._history[name]
+                self._last_sample.pop(name, None)
+        return points
+
+    def _deliver(self, queue: asyncio.Queue, payload: bytes):
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Client can't keep up; replace its backlog with one full snapshot
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self.snapshot_event())
+
+    # ----- reading -----
+
+    def status(self) -> dict:
+        """Current status in the bot_status.json format"""
+        return {**self._summary, "bots": list(self._bots.values())}
+
+    def status_json(self) -> bytes:
+        """status() as JSON, serialized once per version"""
+        if self._status_json is None:
+            self._status_json = json.dumps(self.status()).encode("utf-8")
+        return self._status_json
+
+    def history(self, name: Optional[str] = None) -> Dict[str, list]:
+        """History points [timestamp, cpu_percent, rss_mb, running] per bot"""
+        if name is not None:
+            return {name: list(self._history.get(name, ()))}
+        return {bot: list(points) for bot, points in self._history.items()}
+
+    def snapshot_event(self) -> bytes:
+        """Full status as one SSE payload, serialized once per version"""
+        if self._snapshot is None:
+            self._snapshot = _sse("snapshot", {"version": self.version, **self.status()})
+        return self._snapshot
+
+    # ----- subscribers -----
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue of SSE payloads for one client, starting with a full snapshot"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        queue.put_nowait(self.snapshot_event())
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
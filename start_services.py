@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Discord Bot Services Startup Script
-Runs both the bot runner and dashboard server simultaneously
+Runs the bot runner, which also serves the status dashboard
 """
 
 import subprocess
@@ -39,7 +39,7 @@ def start_bot_runner():
         env['PYTHONUNBUFFERED'] = '1'
         
         process = subprocess.Popen(
-            [sys.executable, '/app/runBots/run_all_bots.py'],
+            [sys.executable, '/app/runBots/run_all_bots.py', '--dashboard'],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             universal_newlines=True,
@@ -61,41 +61,6 @@ def start_bot_runner():
         logger.error(f"❌ Failed to start Bot Runner: {e}")
         return None
 
-def start_dashboard_server():
-    """Start the dashboard server process"""
-    logger.info("🌐 Starting Dashboard Server...")
-    try:
-        # Wait a moment for bot runner to initialize
-        time.sleep(5)
-        
-        env = os.environ.copy()
-        env['PYTHONPATH'] = '/app'
-        env['PYTHONUNBUFFERED'] = '1'
-        
-        process = subprocess.Popen(
-            [sys.executable, '/app/runBots/dashboard_server.py'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            env=env,
-            cwd='/app'
-        )
-        
-        processes.append({
-            "name": "Dashboard Server",
-            "process": process,
-            "start_time": datetime.now(),
-            "type": "dashboard"
-        })
-        
-        logger.info(f"✅ Dashboard Server started with PID {process.pid}")
-        logger.info("📊 Dashboard will be available at: http://localhost:8080")
-        return process
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to start Dashboard Server: {e}")
-        return None
-
 def monitor_processes():
     """Monitor all processes and log output"""
     while True:
@@ -126,9 +91,6 @@ def monitor_processes():
                 if failed['type'] == 'bot_runner':
                     logger.info("🔄 Restarting Bot Runner...")
                     start_bot_runner()
-                elif failed['type'] == 'dashboard':
-                    logger.info("🔄 Restarting Dashboard Server...")
-                    start_dashboard_server()
             
             time.sleep(10)  # Check every 10 seconds
             
@@ -176,14 +138,10 @@ def main():
     try:
         # Start services
         bot_runner = start_bot_runner()
-        dashboard_server = start_dashboard_server()
         
         if not bot_runner:
             logger.error("❌ Failed to start Bot Runner. Exiting.")
             return False
-            
-        if not dashboard_server:
-            logger.warning("⚠️ Dashboard Server failed to start, continuing with bots only")
         
         logger.info("="*60)
         logger.info("✅ ALL SERVICES STARTED SUCCESSFULLY")
@@ -0,0 +1,62 @@
+import pytest
+import asyncio
+import os
+import sys
+
+# Add the repository root for the shared gateway
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from notion_gateway import NotionGateway
+
+
+class TestNotionGatewayCoalescing:
+    """Test sharing identical concurrent reads"""
+
+    @pytest.fixture
+    def gateway(self):
+        gateway = NotionGateway("token")
+        gateway.sent = []
+        gateway.release = None
+
+        async def send(method, path, body):
+            gateway.sent.append((method, path))
+            await gateway.release.wait()
+            return {"results": [path]}
+
+        gateway._send = send
+        return gateway
+
+    def test_identical_reads_are_sent_once(self, gateway):
+        """Test concurrent identical queries share one request"""
+        async def run():
+            gateway.release = asyncio.Event()
+            callers = [asyncio.ensure_future(gateway.request("POST", "/databases/db/query", {"page_size": 100}))
+                       for _ in range(3)]
+            await asyncio.sleep(0)
+            gateway.release.set()
+            return await asyncio.gather(*callers)
+
+        results = asyncio.run(run())
+        assert results == [{"results": ["/databases/db/query"]}] * 3
+        assert gateway.sent == [("POST", "/databases/db/query")]
+        assert gateway._in_flight == {}
+
+    def test_cancelling_first_caller_keeps_request_for_others(self, gateway):
+        """Test the caller that started a shared read can be cancelled without failing the rest"""
+        async def run():
+            gateway.release = asyncio.Event()
+            first = asyncio.ensure_future(gateway.request("GET", "/pages/p"))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(gateway.request("GET", "/pages/p"))
+            await asyncio.sleep(0)
+
+            first.cancel()
+            await asyncio.sleep(0)
+            gateway.release.set()
+            return first, await second
+
+        first, result = asyncio.run(run())
+        assert first.cancelled()
+        assert result == {"results": ["/pages/p"]}
+        assert gateway.sent == [("GET", "/pages/p")]
+        assert gateway._in_flight == {}
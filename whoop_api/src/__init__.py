@@ -11,10 +11,12 @@ __author__ = "WHOOP API Integration"
 from .config import WhoopConfig
 from .oauth import WhoopOAuth
 from .client import WhoopClient
+from .store import WhoopDataStore
 from .models import *
 
 __all__ = [
     "WhoopConfig",
     "WhoopOAuth", 
     "WhoopClient",
+    "WhoopDataStore",
 ]
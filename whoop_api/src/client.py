@@ -46,7 +46,8 @@ class WhoopClient:
         self.token_manager = token_manager or TokenManager()
         self.rate_limiter = WhoopRateLimiter(
             rpm=config.rate_limit_rpm,
-            rpd=config.rate_limit_rpd
+            rpd=config.rate_limit_rpd,
+            state_file=config.rate_limit_state_file
         )
         self._current_tokens = None
         
@@ -136,10 +137,14 @@ class WhoopClient:
                 timeout=30
             )
             
+            # Let the limiter follow the server's counters (Retry-After, X-RateLimit-*)
+            self.rate_limiter.update_from_headers(response.headers)
+            
             # Handle rate limiting
             if response.status_code == 429:
                 retry_after = int(response.headers.get("Retry-After", 60))
-                time.sleep(retry_after)
+                if "Retry-After" not in response.headers:
+                    self.rate_limiter.penalize(retry_after)
                 raise WhoopRateLimitError(f"Rate limit exceeded. Retry after {retry_after} seconds")
             
             # Handle authentication errors
@@ -26,6 +26,7 @@ class WhoopConfig:
     # Rate Limiting
     rate_limit_rpm: int = 100
     rate_limit_rpd: int = 10000
+    rate_limit_state_file: Optional[str] = None  # day counter file, set by from_env
     
     # Database
     database_url: str = "sqlite:///whoop_data.db"
@@ -59,6 +60,7 @@ class WhoopConfig:
             token_url=os.getenv("WHOOP_TOKEN_URL", "https://api.prod.whoop.com/oauth/oauth2/token"),
             rate_limit_rpm=int(os.getenv("WHOOP_RATE_LIMIT_RPM", "100")),
             rate_limit_rpd=int(os.getenv("WHOOP_RATE_LIMIT_RPD", "10000")),
+            rate_limit_state_file=os.getenv("WHOOP_RATE_LIMIT_STATE_FILE", ".whoop_rate_limit.json"),
             database_url=os.getenv("DATABASE_URL", "sqlite:///whoop_data.db"),
             webhook_secret=os.getenv("WEBHOOK_SECRET"),
             webhook_port=int(os.getenv("WEBHOOK_PORT", "8080")),
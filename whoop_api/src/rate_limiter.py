@@ -1,105 +1,199 @@
 """
 Rate limiting implementation for WHOOP API.
 Handles requests per minute and per day limits.
+
+The minute limit uses GCRA (generic cell rate algorithm): a single
+"theoretical arrival time" per limiter replaces the list of request
+timestamps, so every check is O(1). The day limit is a counter per UTC day
+that can be persisted to disk so restarts do not reset it.
 """
 
+import os
+import json
 import time
-from datetime import datetime, timedelta
-from typing import Optional
-from collections import deque
+import asyncio
 import threading
+from datetime import datetime, timedelta, timezone
+from typing import Mapping, Optional, Tuple
 
 
 class WhoopRateLimiter:
     """Rate limiter for WHOOP API requests."""
-    
-    def __init__(self, rpm: int = 100, rpd: int = 10000):
-        """Initialize rate limiter with requests per minute and per day limits."""
+
+    def __init__(self, rpm: int = 100, rpd: int = 10000, state_file: Optional[str] = None):
+        """
+        Initialize rate limiter with requests per minute and per day limits.
+
+        Args:
+            rpm: Requests per minute (bursts of up to rpm requests are allowed)
+            rpd: Requests per UTC day
+            state_file: JSON file for the day counter, not persisted if None
+        """
         self.rpm = rpm
         self.rpd = rpd
-        
-        # Thread-safe request tracking
+        self.state_file = state_file
+
+        # GCRA state: requests are spaced by _interval, with up to a minute of burst
+        self._interval = 60.0 / rpm
+        self._burst = 60.0 - self._interval
+        self._tat = 0.0  # theoretical arrival time (monotonic clock)
+
+        # Set from Retry-After / X-RateLimit-* headers
+        self._blocked_until = 0.0
+
         self._lock = threading.Lock()
-        self._minute_requests = deque()
-        self._day_requests = deque()
-        
-        # Cleanup thread
-        self._cleanup_thread = threading.Thread(target=self._cleanup_old_requests, daemon=True)
-        self._cleanup_thread.start()
-    
-    def _cleanup_old_requests(self):
-        """Background thread to clean up old request timestamps."""
-        while True:
-            time.sleep(60)  # Run every minute
-            with self._lock:
-                now = time.time()
-                
-                # Remove requests older than 1 minute
-                while self._minute_requests and self._minute_requests[0] < now - 60:
-                    self._minute_requests.popleft()
-                
-                # Remove requests older than 1 day
-                while self._day_requests and self._day_requests[0] < now - 86400:
-                    self._day_requests.popleft()
-    
-    def can_make_request(self) -> bool:
-        """Check if a request can be made without exceeding rate limits."""
+        self._day, self._day_count = self._load_day_counter()
+
+    # ----- day counter -----
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _seconds_until_tomorrow() -> float:
+        now = datetime.now(timezone.utc)
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (tomorrow - now).total_seconds()
+
+    def _load_day_counter(self) -> Tuple[str, int]:
+        """Read today's request count from the state file."""
+        today = self._today()
+        if self.state_file and os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r") as f:
+                    state = json.load(f)
+                if state.get("day") == today:
+                    return today, int(state.get("count", 0))
+            except (OSError, ValueError):
+                pass
+        return today, 0
+
+    def _save_day_counter(self):
+        """Write the day counter atomically (lock held)."""
+        if not self.state_file:
+            return
+        try:
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"day": self._day, "count": self._day_count}, f)
+            os.replace(tmp_path, self.state_file)
+        except OSError:
+            pass
+
+    def _roll_day(self):
+        """Reset the day counter after UTC midnight (lock held)."""
+        today = self._today()
+        if today != self._day:
+            self._day, self._day_count = today, 0
+
+    # ----- reservations -----
+
+    def _reserve(self) -> Tuple[bool, float]:
+        """
+        Reserve the next request slot without waiting.
+
+        Returns:
+            (reserved, wait): if reserved, the caller may send after `wait`
+            seconds; if not (day limit reached), retry after `wait` seconds
+        """
         with self._lock:
-            now = time.time()
-            
-            # Check minute limit
-            minute_requests = len([t for t in self._minute_requests if t > now - 60])
-            if minute_requests >= self.rpm:
-                return False
-            
-            # Check day limit
-            day_requests = len([t for t in self._day_requests if t > now - 86400])
-            if day_requests >= self.rpd:
-                return False
-            
-            return True
-    
+            self._roll_day()
+            if self._day_count >= self.rpd:
+                return False, self._seconds_until_tomorrow()
+
+            now = time.monotonic()
+            start = max(now, self._blocked_until, self._tat - self._burst)
+            self._tat = max(self._tat, start) + self._interval
+            self._day_count += 1
+            self._save_day_counter()
+            return True, start - now
+
     def wait_if_needed(self) -> float:
         """Wait if necessary to respect rate limits. Returns wait time in seconds."""
+        waited = 0.0
+        while True:
+            reserved, wait = self._reserve()
+            # Sleep outside the lock so other callers can reserve their own slots
+            if wait > 0:
+                time.sleep(wait)
+                waited += wait
+            if reserved:
+                return waited
+
+    async def acquire(self) -> float:
+        """Asyncio version of wait_if_needed. Returns wait time in seconds."""
+        waited = 0.0
+        while True:
+            reserved, wait = self._reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+            if reserved:
+                return waited
+
+    # ----- server feedback -----
+
+    def penalize(self, seconds: float):
+        """Hold back all requests for the given number of seconds (e.g. Retry-After)."""
         with self._lock:
-            now = time.time()
-            
-            # Check minute limit
-            minute_requests = [t for t in self._minute_requests if t > now - 60]
-            if len(minute_requests) >= self.rpm:
-                # Wait until oldest request in current minute expires
-                wait_time = 60 - (now - minute_requests[0])
-                if wait_time > 0:
-                    time.sleep(wait_time)
-                    now = time.time()
-            
-            # Check day limit
-            day_requests = [t for t in self._day_requests if t > now - 86400]
-            if len(day_requests) >= self.rpd:
-                # Wait until oldest request in current day expires
-                wait_time = 86400 - (now - day_requests[0])
-                if wait_time > 0:
-                    time.sleep(wait_time)
-                    now = time.time()
-            
-            # Record this request
-            self._minute_requests.append(now)
-            self._day_requests.append(now)
-            
-            return 0
-    
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Apply the server's view of the limits from response headers.
+
+        Honours Retry-After and, when X-RateLimit-Remaining is 0, waits for
+        X-RateLimit-Reset seconds.
+        """
+        retry_after = _first_number(headers.get("Retry-After"))
+        if retry_after is not None:
+            self.penalize(retry_after)
+
+        remaining = _first_number(headers.get("X-RateLimit-Remaining"))
+        reset = _first_number(headers.get("X-RateLimit-Reset"))
+        if remaining is not None and remaining <= 0 and reset is not None:
+            self.penalize(reset)
+
+    # ----- status -----
+
+    def _minute_requests(self, now: float) -> int:
+        """Requests still counted in the current minute window (lock held)."""
+        backlog = self._tat - now
+        return max(0, min(self.rpm, int(-(-backlog // self._interval)))) if backlog > 0 else 0
+
+    def _allowed(self, now: float) -> bool:
+        """Whether a request sent now would be within all limits (lock held)."""
+        self._roll_day()
+        return (self._day_count < self.rpd and now >= self._blocked_until
+                and self._tat - self._burst <= now)
+
+    def can_make_request(self) -> bool:
+        """Check if a request can be made without exceeding rate limits."""
+        with self._lock:
+            return self._allowed(time.monotonic())
+
     def get_status(self) -> dict:
         """Get current rate limiting status."""
         with self._lock:
-            now = time.time()
-            
-            minute_requests = len([t for t in self._minute_requests if t > now - 60])
-            day_requests = len([t for t in self._day_requests if t > now - 86400])
-            
+            now = time.monotonic()
+            can_make_request = self._allowed(now)
+
             return {
-                "minute_requests": minute_requests,
+                "minute_requests": self._minute_requests(now),
                 "minute_limit": self.rpm,
-                "day_requests": day_requests,
+                "day_requests": self._day_count,
                 "day_limit": self.rpd,
-                "can_make_request": minute_requests < self.rpm and day_requests < self.rpd,
+                "can_make_request": can_make_request,
+                "blocked_for_seconds": max(0.0, self._blocked_until - now),
             }
+
+
+def _first_number(value: Optional[str]) -> Optional[float]:
+    """First number of a header value such as "10" or "100, 100;window=60"."""
+    if value is None:
+        return None
+    try:
+        return float(str(value).split(",")[0].split(";")[0].strip())
+    except ValueError:
+        return None
@@ -0,0 +1,246 @@
+"""
+Local time-series store for WHOOP data.
+Keeps cycles, sleep, recovery and workouts in SQLite and syncs them
+incrementally, so exports and trend queries are served from disk.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple
+
+from .models import WhoopCycle, WhoopSleep, WhoopRecovery, WhoopWorkout
+
+
+class WhoopDataStore:
+    """SQLite store of WHOOP records with a synced time range per resource type.
+
+    For every resource the store remembers the covered range [synced_from,
+    synced_until]. A sync only requests what lies outside that range, plus a
+    refresh window before synced_until because WHOOP finalizes scores after
+    a cycle or sleep has ended.
+    """
+
+    RESOURCES = {
+        "cycle": ("get_cycles", WhoopCycle),
+        "sleep": ("get_sleep_data", WhoopSleep),
+        "recovery": ("get_recovery_data", WhoopRecovery),
+        "workout": ("get_workouts", WhoopWorkout),
+    }
+
+    def __init__(self, db_path: str = "whoop_data.db", refresh_days: int = 3):
+        """Open (or create) the store."""
+        self.db_path = db_path
+        self.refresh_days = refresh_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+
+    @classmethod
+    def from_config(cls, config) -> "WhoopDataStore":
+        """Create a store at the sqlite:/// path of config.database_url."""
+        url = config.database_url or "sqlite:///whoop_data.db"
+        path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else "whoop_data.db"
+        return cls(path)
+
+    def _init_db(self):
+        """Create tables and indexes."""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    resource TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    start TEXT,
+                    day TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (resource, id)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_records_start ON records(resource, start)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    resource TEXT PRIMARY KEY,
+                    synced_from TEXT,
+                    synced_until TEXT
+                )
+            """)
+            self._conn.commit()
+
+    # ----- syncing -----
+
+    def get_sync_range(self, resource: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Covered time range of a resource, (None, None) if never synced."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_from, synced_until FROM sync_state WHERE resource = ?", (resource,)
+            ).fetchone()
+        if not row:
+            return None, None
+        return datetime.fromisoformat(row[0]), datetime.fromisoformat(row[1])
+
+    def sync(self, client, start: datetime, end: Optional[datetime] = None,
+             resources: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Make the store cover [start, end] for the given resources.
+
+        Args:
+            client: WhoopClient used for missing ranges
+            start: Oldest time that must be covered
+            end: Newest time (now if None)
+            resources: Resource names, all if None
+
+        Returns:
+            Number of records fetched from the API per resource
+        """
+        end = _as_utc(end or datetime.now(timezone.utc))
+        start = _as_utc(start)
+        fetched = {}
+
+        for resource in resources or list(self.RESOURCES):
+            synced_from, synced_until = self.get_sync_range(resource)
+            count = 0
+
+            if synced_from is None:
+                count += self._fetch(client, resource, start, end)
+                synced_from, synced_until = start, end
+            else:
+                if start < synced_from:
+                    # Backfill older history once
+                    count += self._fetch(client, resource, start, synced_from)
+                    synced_from = start
+                if end > synced_until - timedelta(days=self.refresh_days):
+                    # New records plus the window whose scores may still change
+                    count += self._fetch(client, resource, synced_until - timedelta(days=self.refresh_days), end)
+                    synced_until = max(synced_until, end)
+
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (resource, synced_from, synced_until) VALUES (?, ?, ?)",
+                    (resource, synced_from.isoformat(), synced_until.isoformat())
+                )
+                self._conn.commit()
+            fetched[resource] = count
+
+        return fetched
+
+    def _fetch(self, client, resource: str, start: datetime, end: datetime) -> int:
+        """Download one time range of a resource page by page and store it."""
+        method_name, _ = self.RESOURCES[resource]
+        list_method = getattr(client, method_name)
+        next_token = None
+        count = 0
+
+        while True:
+            response = list_method(start=start, end=end, limit=25, next_token=next_token)
+            self.store_records(resource, response.records)
+            count += len(response.records)
+            if not response.next_token:
+                return count
+            next_token = response.next_token
+
+    def store_records(self, resource: str, records: List[Dict[str, Any]]):
+        """Upsert raw API records of a resource."""
+        rows = []
+        for record in records:
+            record_id = record.get("id", record.get("cycle_id"))
+            start = _normalize_timestamp(record.get("start") or record.get("created_at"))
+            rows.append((resource, str(record_id), start, (start or "")[:10], json.dumps(record)))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (resource, id, start, day, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    # ----- queries -----
+
+    def get_records(self, resource: str, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Raw stored records of a resource with start <= record start < end, oldest first."""
+        query = "SELECT data FROM records WHERE resource = ?"
+        params: list = [resource]
+        if start:
+            query += " AND start >= ?"
+            params.append(_isoformat_z(start))
+        if end:
+            query += " AND start < ?"
+            params.append(_isoformat_z(end))
+        query += " ORDER BY start"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_models(self, resource: str, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> list:
+        """Stored records parsed into their models (WhoopCycle, WhoopSleep, ...)."""
+        _, model = self.RESOURCES[resource]
+        return [model(**record) for record in self.get_records(resource, start, end)]
+
+    def get_daily_series(self, resource: str, field: str, start: Optional[datetime] = None,
+                         end: Optional[datetime] = None) -> List[Tuple[str, float]]:
+        """
+        Daily average of one field, e.g. ("cycle", "score.strain").
+
+        Returns:
+            List of (YYYY-MM-DD, value) tuples, oldest first
+        """
+        query = (
+            "SELECT day, AVG(json_extract(data, ?)) FROM records "
+            "WHERE resource = ? AND json_extract(data, ?) IS NOT NULL"
+        )
+        path = f"$.{field}"
+        params: list = [path, resource, path]
+        if start:
+            query += " AND start >= ?"
+            params.append(_isoformat_z(start))
+        if end:
+            query += " AND start < ?"
+            params.append(_isoformat_z(end))
+        query += " GROUP BY day ORDER BY day"
+
+        with self._lock:
+            return [(day, value) for day, value in self._conn.execute(query, params).fetchall()]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Stored record counts and covered ranges per resource."""
+        status = {}
+        for resource in self.RESOURCES:
+            synced_from, synced_until = self.get_sync_range(resource)
+            with self._lock:
+                count = self._conn.execute(
+                    "SELECT COUNT(*) FROM records WHERE resource = ?", (resource,)
+                ).fetchone()[0]
+            status[resource] = {
+                "records": count,
+                "synced_from": synced_from.isoformat() if synced_from else None,
+                "synced_until": synced_until.isoformat() if synced_until else None,
+            }
+        return status
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _isoformat_z(value: datetime) -> str:
+    """UTC timestamp in the format WHOOP uses for start times, for string comparison."""
+    return _as_utc(value).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _normalize_timestamp(value: Optional[str]) -> Optional[str]:
+    """Bring API timestamps (with or without milliseconds/offset) into _isoformat_z format."""
+    if not value:
+        return None
+    try:
+        return _isoformat_z(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return value
@@ -4,7 +4,9 @@ Tests for rate limiting implementation.
 
 import pytest
 import time
-from unittest.mock import patch
+import asyncio
+import threading
+from unittest.mock import patch, AsyncMock
 from src.rate_limiter import WhoopRateLimiter
 
 
@@ -17,8 +19,8 @@ class TestWhoopRateLimiter:
         
         assert limiter.rpm == 100
         assert limiter.rpd == 10000
-        assert len(limiter._minute_requests) == 0
-        assert len(limiter._day_requests) == 0
+        assert limiter.get_status()["minute_requests"] == 0
+        assert limiter.get_status()["day_requests"] == 0
     
     def test_can_make_request_initial(self):
         """Test can make request when no requests made yet."""
@@ -117,28 +119,88 @@ class TestWhoopRateLimiter:
         assert status["minute_requests"] == 3
         assert status["can_make_request"] is False
     
-    @patch('time.time')
-    def test_cleanup_old_requests(self, mock_time):
-        """Test cleanup of old requests."""
+    @patch('time.monotonic')
+    def test_minute_window_slides(self, mock_monotonic):
+        """Test capacity returns as the minute window moves on."""
+        mock_monotonic.return_value = 1000.0
+        limiter = WhoopRateLimiter(rpm=3, rpd=100)
+        
+        for _ in range(3):
+            limiter.wait_if_needed()
+        assert limiter.can_make_request() is False
+        
+        # One request interval (20s) later one slot is free again
+        mock_monotonic.return_value = 1020.0
+        assert limiter.can_make_request() is True
+        assert limiter.get_status()["minute_requests"] == 2
+    
+    def test_waiting_caller_does_not_block_others(self):
+        """Test a caller sleeping for its slot does not hold the lock."""
+        limiter = WhoopRateLimiter(rpm=1, rpd=100)
+        limiter.wait_if_needed()
+        sleeping = threading.Event()
+        release = threading.Event()
+        
+        def fake_sleep(seconds):
+            sleeping.set()
+            release.wait(5)
+        
+        with patch('time.sleep', side_effect=fake_sleep):
+            waiter = threading.Thread(target=limiter.wait_if_needed)
+            waiter.start()
+            assert sleeping.wait(5)
+            
+            # The lock is free while the other caller sleeps
+            assert limiter.can_make_request() is False
+            assert limiter.get_status()["day_requests"] == 2
+            
+            release.set()
+            waiter.join(5)
+    
+    def test_day_counter_persists(self, tmp_path):
+        """Test the day counter survives a restart."""
+        state_file = str(tmp_path / "rate_limit.json")
+        limiter = WhoopRateLimiter(rpm=100, rpd=3, state_file=state_file)
+        for _ in range(3):
+            limiter.wait_if_needed()
+        
+        restarted = WhoopRateLimiter(rpm=100, rpd=3, state_file=state_file)
+        
+        assert restarted.get_status()["day_requests"] == 3
+        assert restarted.can_make_request() is False
+    
+    def test_retry_after_header(self):
+        """Test Retry-After holds back the next request."""
         limiter = WhoopRateLimiter(rpm=100, rpd=10000)
+        limiter.update_from_headers({"Retry-After": "5"})
         
-        # Mock time progression
-        current_time = 1000.0
-        mock_time.return_value = current_time
+        assert limiter.can_make_request() is False
+        with patch('time.sleep') as mock_sleep:
+            limiter.wait_if_needed()
+        assert mock_sleep.call_args[0][0] == pytest.approx(5, abs=0.5)
+    
+    def test_rate_limit_headers(self):
+        """Test X-RateLimit-Remaining 0 waits for X-RateLimit-Reset."""
+        limiter = WhoopRateLimiter(rpm=100, rpd=10000)
         
-        # Add some old requests
-        limiter._minute_requests.extend([900.0, 950.0, 1000.0])  # 100s, 50s, 0s old
-        limiter._day_requests.extend([100.0, 500.0, 1000.0])  # 900s, 500s, 0s old
+        limiter.update_from_headers({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "30"})
+        assert limiter.can_make_request() is True
         
-        # Mock time to be 70 seconds later (oldest minute request is 100s old)
-        mock_time.return_value = current_time + 70
+        limiter.update_from_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"})
+        assert limiter.can_make_request() is False
+        assert limiter.get_status()["blocked_for_seconds"] == pytest.approx(30, abs=0.5)
+    
+    def test_async_acquire(self):
+        """Test acquire waits with asyncio.sleep."""
+        limiter = WhoopRateLimiter(rpm=2, rpd=100)
         
-        # Trigger cleanup
-        limiter._cleanup_old_requests()
+        async def run():
+            with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+                waits = [await limiter.acquire() for _ in range(3)]
+            return waits, mock_sleep
         
-        # Should have removed the 100s old request from minute_requests
-        assert len(limiter._minute_requests) == 2
-        assert 900.0 not in limiter._minute_requests
+        waits, mock_sleep = asyncio.run(run())
         
-        # Day requests should still be there (all less than 1 day old)
-        assert len(limiter._day_requests) == 3
+        assert waits[:2] == [0, 0]
+        assert waits[2] == pytest.approx(30, abs=0.5)
+        mock_sleep.assert_called_once()
@@ -0,0 +1,82 @@
+"""
+Tests for the local WHOOP data store.
+"""
+
+import pytest
+from unittest.mock import Mock
+from datetime import datetime, timedelta
+
+from src.store import WhoopDataStore
+from src.models import WhoopPaginatedResponse, WhoopCycle
+
+
+def make_cycle(cycle_id, start, strain):
+    return {
+        "id": cycle_id,
+        "user_id": 1,
+        "start": start,
+        "end": None,
+        "timezone_offset": "+02:00",
+        "score": {"strain": strain}
+    }
+
+
+class TestWhoopDataStore:
+    """Test cases for WhoopDataStore class."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create store in a temporary directory."""
+        return WhoopDataStore(str(tmp_path / "whoop.db"))
+    
+    @pytest.fixture
+    def client(self):
+        """Create mock client returning two pages of cycles."""
+        client = Mock()
+        client.get_cycles.side_effect = [
+            WhoopPaginatedResponse(records=[make_cycle("c1", "2024-01-14T06:00:00.000Z", 10.0)], next_token="page2"),
+            WhoopPaginatedResponse(records=[make_cycle("c2", "2024-01-15T06:00:00Z", 14.0)]),
+        ]
+        return client
+    
+    def test_first_sync_fetches_all_pages(self, store, client):
+        """Test first sync downloads the whole range."""
+        fetched = store.sync(client, datetime(2024, 1, 10), datetime(2024, 1, 16), resources=["cycle"])
+        
+        assert fetched == {"cycle": 2}
+        assert client.get_cycles.call_count == 2
+        cycles = store.get_models("cycle")
+        assert [c.id for c in cycles] == ["c1", "c2"]
+        assert isinstance(cycles[0], WhoopCycle)
+    
+    def test_incremental_sync_only_fetches_refresh_window(self, store, client):
+        """Test later syncs start at the watermark minus the refresh window."""
+        store.sync(client, datetime(2024, 1, 10), datetime(2024, 1, 16), resources=["cycle"])
+        client.get_cycles.side_effect = None
+        client.get_cycles.return_value = WhoopPaginatedResponse(records=[])
+        
+        store.sync(client, datetime(2024, 1, 10), datetime(2024, 1, 17), resources=["cycle"])
+        
+        kwargs = client.get_cycles.call_args.kwargs
+        assert kwargs["start"].date() == (datetime(2024, 1, 16) - timedelta(days=store.refresh_days)).date()
+        assert kwargs["end"].date() == datetime(2024, 1, 17).date()
+    
+    def test_backfill_older_history(self, store, client):
+        """Test a range before the covered one is fetched once."""
+        store.sync(client, datetime(2024, 1, 10), datetime(2024, 1, 16), resources=["cycle"])
+        client.get_cycles.side_effect = None
+        client.get_cycles.return_value = WhoopPaginatedResponse(records=[])
+        
+        store.sync(client, datetime(2024, 1, 1), datetime(2024, 1, 12), resources=["cycle"])
+        
+        kwargs = client.get_cycles.call_args.kwargs
+        assert kwargs["start"].date() == datetime(2024, 1, 1).date()
+        assert kwargs["end"].date() == datetime(2024, 1, 10).date()
+    
+    def test_queries_from_disk(self, store, client):
+        """Test range queries and daily series use normalized start times."""
+        store.sync(client, datetime(2024, 1, 10), datetime(2024, 1, 16), resources=["cycle"])
+        
+        assert len(store.get_records("cycle", datetime(2024, 1, 15), datetime(2024, 1, 16))) == 1
+        assert store.get_daily_series("cycle", "score.strain") == [("2024-01-14", 10.0), ("2024-01-15", 14.0)]
+        assert store.get_status()["cycle"]["records"] == 2